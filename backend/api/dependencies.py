@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from fastapi import Request
+
+from backend.app.turn_service import TurnService
+from backend.infra.repo_factory import create_repo, storage_backend_name
+from backend.infra.repository import Repository
+from backend.services.keyring import get_keyring_path
+from backend.services.llm_config import get_llm_config_path
+
+_RepoKey = Tuple[Path, str]
+_LLMStamp = Tuple[Optional[int], Optional[int]]
+
+
+def _mtime_ns(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+class ServiceContainer:
+    # App-scoped services shared by every request. Repos are keyed by storage
+    # root and backend, so their directory setup runs once per root. The turn
+    # service owns the LLM client (config plus decrypted key) and is rebuilt
+    # only when llm_config.json or keyring.json changes on disk.
+    def __init__(self) -> None:
+        self._guard = threading.Lock()
+        self._repos: Dict[_RepoKey, Repository] = {}
+        self._turn_services: Dict[_RepoKey, Tuple[_LLMStamp, TurnService]] = {}
+        self.llm_reloads = 0
+
+    def storage_root(self) -> Path:
+        return Path.cwd() / "storage"
+
+    def repo(self) -> Repository:
+        return self._repo(self._repo_key())
+
+    def turn_service(self) -> TurnService:
+        key = self._repo_key()
+        stamp = self._llm_stamp()
+        with self._guard:
+            entry = self._turn_services.get(key)
+        if entry is not None and entry[0] == stamp:
+            return entry[1]
+        # Built outside the guard: loading the config can prompt for the
+        # keyring passphrase. A failed build is not cached.
+        service = TurnService(self._repo(key))
+        with self._guard:
+            if entry is not None:
+                self.llm_reloads += 1
+            self._turn_services[key] = (stamp, service)
+        return service
+
+    async def aturn_service(self) -> TurnService:
+        # For async routes: the stat check stays on the loop, but a rebuild
+        # (config parse, keyring decrypt, passphrase prompt) runs in a thread.
+        with self._guard:
+            entry = self._turn_services.get(self._repo_key())
+        if entry is not None and entry[0] == self._llm_stamp():
+            return entry[1]
+        return await asyncio.to_thread(self.turn_service)
+
+    def preload(self) -> bool:
+        # Loads the LLM config and decrypts the API key, prompting for the
+        # keyring passphrase if needed, before the first turn asks for them.
+        if not get_llm_config_path().exists():
+            return False
+        self.turn_service()
+        return True
+
+    def clear(self) -> None:
+        with self._guard:
+            self._repos.clear()
+            self._turn_services.clear()
+
+    def _repo_key(self) -> _RepoKey:
+        return (self.storage_root(), storage_backend_name())
+
+    def _repo(self, key: _RepoKey) -> Repository:
+        with self._guard:
+            repo = self._repos.get(key)
+            if repo is None:
+                repo = create_repo(key[0], backend=key[1])
+                self._repos[key] = repo
+            return repo
+
+    def _llm_stamp(self) -> _LLMStamp:
+        return (_mtime_ns(get_llm_config_path()), _mtime_ns(get_keyring_path()))
+
+
+def get_services(request: Request) -> ServiceContainer:
+    return request.app.state.services
@@ -1,9 +1,37 @@
 from __future__ import annotations
 
+import os
+import warnings
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from backend.api.dependencies import ServiceContainer
 from backend.api.routes import campaign, characters, chat, map, settings, world
+from backend.infra.campaign_journal import checkpoint_shared_campaign_journals
+from backend.infra.llm_transport import aclose_shared_llm_transports
+
+LLM_PRELOAD_ENV = "AI_TRPG_LLM_PRELOAD"
+
+
+def _llm_preload_enabled() -> bool:
+    return os.getenv(LLM_PRELOAD_ENV, "1").strip().lower() in {"1", "true", "yes"}
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    if _llm_preload_enabled():
+        try:
+            app.state.services.preload()
+        except Exception as exc:
+            # Startup still succeeds; the first turn retries and reports it.
+            warnings.warn(f"LLM config preload failed: {exc}", RuntimeWarning)
+    yield
+    app.state.services.clear()
+    checkpoint_shared_campaign_journals()
+    await aclose_shared_llm_transports()
 
 
 def create_app() -> FastAPI:
@@ -12,7 +40,9 @@ def create_app() -> FastAPI:
         openapi_url="/api/v1/openapi.json",
         docs_url="/api/v1/docs",
         redoc_url="/api/v1/redoc",
+        lifespan=_lifespan,
     )
+    app.state.services = ServiceContainer()
     app.add_middleware(
         CORSMiddleware,
         allow_origin_regex=r"http://(localhost|127\.0\.0\.1)(:\d+)?$",
@@ -1,23 +1,28 @@
 from __future__ import annotations
 
-from pathlib import Path
-from typing import List, Optional
+import json
+from typing import Any, Dict, Iterator, List, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
-from backend.app.turn_service import TurnService
-from backend.infra.file_repo import FileRepo
+from backend.api.dependencies import ServiceContainer, get_services
+from backend.app.turn_history_service import (
+    DEFAULT_TURN_PAGE_LIMIT,
+    TurnHistoryRequestError,
+    get_turn_history_page,
+    iter_turn_history,
+    parse_turn_cursor,
+    parse_turn_fields,
+)
+from backend.app.turn_replay import TurnReplayError, rollback_to_turn
+from backend.app.turn_service import CampaignBusyError
+from backend.infra.file_repo import StaleCampaignError
 
 router = APIRouter(prefix="/campaign", tags=["campaign"])
 
 
-def _service() -> TurnService:
-    storage_root = Path.cwd() / "storage"
-    repo = FileRepo(storage_root)
-    return TurnService(repo)
-
-
 class CreateCampaignRequest(BaseModel):
     world_id: Optional[str] = None
     map_id: Optional[str] = None
@@ -76,8 +81,43 @@ class AdvanceMilestoneResponse(BaseModel):
     milestone: CampaignStatusMilestoneResponse
 
 
+class TurnHistoryResponse(BaseModel):
+    campaign_id: str
+    turns: List[Dict[str, Any]] = Field(default_factory=list)
+    has_more: bool
+    next_after: Optional[str] = None
+    next_before: Optional[str] = None
+
+
+class CheckpointResponse(BaseModel):
+    turn_id: str
+    row_count: int
+    size_bytes: int
+
+
+class CheckpointListResponse(BaseModel):
+    campaign_id: str
+    checkpoints: List[CheckpointResponse] = Field(default_factory=list)
+
+
+class RollbackRequest(BaseModel):
+    turn_id: str
+
+
+class RollbackResponse(BaseModel):
+    campaign_id: str
+    turn_id: str
+    checkpoint_turn_id: Optional[str] = None
+    replayed_turns: int
+    dropped_turns: int
+    dropped_checkpoints: int
+
+
 @router.post("/create", response_model=CreateCampaignResponse)
-def create_campaign(request: CreateCampaignRequest) -> CreateCampaignResponse:
+def create_campaign(
+    request: CreateCampaignRequest,
+    services: ServiceContainer = Depends(get_services),
+) -> CreateCampaignResponse:
     world_id = request.world_id or "world_001"
     map_id = request.map_id or "map_001"
     party_character_ids = request.party_character_ids or ["pc_001"]
@@ -85,7 +125,7 @@ def create_campaign(request: CreateCampaignRequest) -> CreateCampaignResponse:
     if active_actor_id not in party_character_ids:
         party_character_ids = [active_actor_id] + party_character_ids
 
-    service = _service()
+    service = services.turn_service()
     campaign_id = service.create_campaign(
         world_id=world_id,
         map_id=map_id,
@@ -96,8 +136,10 @@ def create_campaign(request: CreateCampaignRequest) -> CreateCampaignResponse:
 
 
 @router.get("/list", response_model=CampaignListResponse)
-def list_campaigns() -> CampaignListResponse:
-    service = _service()
+def list_campaigns(
+    services: ServiceContainer = Depends(get_services),
+) -> CampaignListResponse:
+    service = services.turn_service()
     campaigns = service.list_campaigns()
     return CampaignListResponse(
         campaigns=[
@@ -112,12 +154,17 @@ def list_campaigns() -> CampaignListResponse:
 
 
 @router.post("/select_actor", response_model=SelectActorResponse)
-def select_actor(request: SelectActorRequest) -> SelectActorResponse:
-    service = _service()
+def select_actor(
+    request: SelectActorRequest,
+    services: ServiceContainer = Depends(get_services),
+) -> SelectActorResponse:
+    service = services.turn_service()
     try:
         campaign = service.select_actor(request.campaign_id, request.active_actor_id)
     except FileNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except StaleCampaignError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
@@ -128,8 +175,11 @@ def select_actor(request: SelectActorRequest) -> SelectActorResponse:
 
 
 @router.get("/status", response_model=CampaignStatusResponse)
-def campaign_status(campaign_id: str) -> CampaignStatusResponse:
-    repo = FileRepo(Path.cwd() / "storage")
+def campaign_status(
+    campaign_id: str,
+    services: ServiceContainer = Depends(get_services),
+) -> CampaignStatusResponse:
+    repo = services.repo()
     try:
         campaign = repo.get_campaign(campaign_id)
     except FileNotFoundError as exc:
@@ -151,8 +201,11 @@ def campaign_status(campaign_id: str) -> CampaignStatusResponse:
 
 
 @router.post("/milestone/advance", response_model=AdvanceMilestoneResponse)
-def advance_milestone(request: AdvanceMilestoneRequest) -> AdvanceMilestoneResponse:
-    repo = FileRepo(Path.cwd() / "storage")
+def advance_milestone(
+    request: AdvanceMilestoneRequest,
+    services: ServiceContainer = Depends(get_services),
+) -> AdvanceMilestoneResponse:
+    repo = services.repo()
     try:
         campaign = repo.get_campaign(request.campaign_id)
     except FileNotFoundError as exc:
@@ -168,7 +221,10 @@ def advance_milestone(request: AdvanceMilestoneRequest) -> AdvanceMilestoneRespo
     campaign.milestone.last_advanced_turn += 1
     campaign.milestone.pressure = 0
     campaign.milestone.summary = request.summary
-    repo.save_campaign(campaign)
+    try:
+        repo.save_campaign(campaign)
+    except StaleCampaignError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
     return AdvanceMilestoneResponse(
         campaign_id=campaign.id,
         milestone=CampaignStatusMilestoneResponse(
@@ -180,3 +236,107 @@ def advance_milestone(request: AdvanceMilestoneRequest) -> AdvanceMilestoneRespo
             summary=campaign.milestone.summary,
         ),
     )
+
+
+@router.get("/{campaign_id}/turns", response_model=TurnHistoryResponse)
+def list_turns(
+    campaign_id: str,
+    after: Optional[str] = Query(None),
+    before: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1),
+    fields: Optional[str] = Query(None),
+    output_format: str = Query("json", alias="format", pattern="^(json|ndjson)$"),
+    services: ServiceContainer = Depends(get_services),
+):
+    repo = services.repo()
+    if not repo.campaign_exists(campaign_id):
+        raise HTTPException(status_code=404, detail=f"Campaign not found: {campaign_id}")
+    try:
+        after_number = parse_turn_cursor(after)
+        before_number = parse_turn_cursor(before)
+        projected_fields = parse_turn_fields(fields)
+    except TurnHistoryRequestError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    if output_format == "ndjson":
+        rows = iter_turn_history(
+            repo,
+            campaign_id,
+            after=after_number,
+            before=before_number,
+            fields=projected_fields,
+        )
+        return StreamingResponse(
+            _ndjson_lines(rows, limit), media_type="application/x-ndjson"
+        )
+
+    page = get_turn_history_page(
+        repo,
+        campaign_id,
+        after=after_number,
+        before=before_number,
+        limit=limit or DEFAULT_TURN_PAGE_LIMIT,
+        fields=projected_fields,
+    )
+    return TurnHistoryResponse(
+        campaign_id=campaign_id,
+        turns=page.turns,
+        has_more=page.has_more,
+        next_after=page.next_after,
+        next_before=page.next_before,
+    )
+
+
+@router.get("/{campaign_id}/checkpoints", response_model=CheckpointListResponse)
+def list_checkpoints(
+    campaign_id: str,
+    services: ServiceContainer = Depends(get_services),
+) -> CheckpointListResponse:
+    repo = services.repo()
+    if not repo.campaign_exists(campaign_id):
+        raise HTTPException(status_code=404, detail=f"Campaign not found: {campaign_id}")
+    return CheckpointListResponse(
+        campaign_id=campaign_id,
+        checkpoints=[
+            CheckpointResponse(
+                turn_id=checkpoint.turn_id,
+                row_count=checkpoint.row_count,
+                size_bytes=checkpoint.size_bytes,
+            )
+            for checkpoint in repo.list_checkpoints(campaign_id)
+        ],
+    )
+
+
+@router.post("/{campaign_id}/rollback", response_model=RollbackResponse)
+def rollback_campaign(
+    campaign_id: str,
+    request: RollbackRequest,
+    services: ServiceContainer = Depends(get_services),
+) -> RollbackResponse:
+    repo = services.repo()
+    try:
+        result = rollback_to_turn(repo, campaign_id, request.turn_id)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except (CampaignBusyError, StaleCampaignError, TurnReplayError) as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return RollbackResponse(
+        campaign_id=result.campaign_id,
+        turn_id=result.turn_id,
+        checkpoint_turn_id=result.checkpoint_turn_id,
+        replayed_turns=result.replayed_turns,
+        dropped_turns=result.dropped_turns,
+        dropped_checkpoints=result.dropped_checkpoints,
+    )
+
+
+def _ndjson_lines(
+    rows: Iterator[Dict[str, Any]], limit: Optional[int]
+) -> Iterator[str]:
+    for index, row in enumerate(rows):
+        if limit is not None and index >= limit:
+            break
+        yield json.dumps(row, ensure_ascii=False) + "\n"
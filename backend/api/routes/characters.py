@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-from pathlib import Path
 from typing import Any, Dict, List
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, ConfigDict, Field
 
+from backend.api.dependencies import ServiceContainer, get_services
 from backend.app.character_fact_api_service import (
     CharacterFactApiService,
     CharacterFactNotFoundError,
@@ -15,15 +15,13 @@ from backend.app.character_fact_generation import (
     CharacterFactRequestError,
     CharacterFactValidationError,
 )
-from backend.infra.file_repo import FileRepo
+from backend.infra.file_repo import StaleCampaignError
 
 router = APIRouter(prefix="/campaigns", tags=["characters"])
 
 
-def _service() -> CharacterFactApiService:
-    storage_root = Path.cwd() / "storage"
-    repo = FileRepo(storage_root)
-    return CharacterFactApiService(repo)
+def _service(services: ServiceContainer) -> CharacterFactApiService:
+    return CharacterFactApiService(services.repo())
 
 
 class CharacterGenerateConstraints(BaseModel):
@@ -90,13 +88,14 @@ class CharacterFactAdoptResponse(BaseModel):
     "/{campaign_id}/characters/generate",
     response_model=CharacterGenerateRefsResponse,
 )
-def generate_character_facts(
+async def generate_character_facts(
     campaign_id: str,
     request: CharacterGenerateRequest,
+    services: ServiceContainer = Depends(get_services),
 ) -> CharacterGenerateRefsResponse:
-    service = _service()
+    service = _service(services)
     try:
-        result = service.generate(campaign_id, request.to_payload())
+        result = await service.agenerate(campaign_id, request.to_payload())
     except CharacterFactNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     except CharacterFactConflictError as exc:
@@ -126,8 +125,9 @@ def generate_character_facts(
 def list_generated_batches(
     campaign_id: str,
     limit: int = Query(20, ge=1, le=200),
+    services: ServiceContainer = Depends(get_services),
 ) -> CharacterBatchListResponse:
-    service = _service()
+    service = _service(services)
     try:
         batches = service.list_batches(campaign_id, limit=limit)
     except CharacterFactNotFoundError as exc:
@@ -139,8 +139,12 @@ def list_generated_batches(
 
 
 @router.get("/{campaign_id}/characters/generated/batches/{request_id}")
-def get_generated_batch(campaign_id: str, request_id: str) -> Dict[str, Any]:
-    service = _service()
+def get_generated_batch(
+    campaign_id: str,
+    request_id: str,
+    services: ServiceContainer = Depends(get_services),
+) -> Dict[str, Any]:
+    service = _service(services)
     try:
         return service.get_batch(campaign_id, request_id)
     except CharacterFactNotFoundError as exc:
@@ -148,8 +152,12 @@ def get_generated_batch(campaign_id: str, request_id: str) -> Dict[str, Any]:
 
 
 @router.get("/{campaign_id}/characters/facts/{character_id}")
-def get_character_fact(campaign_id: str, character_id: str) -> Dict[str, Any]:
-    service = _service()
+def get_character_fact(
+    campaign_id: str,
+    character_id: str,
+    services: ServiceContainer = Depends(get_services),
+) -> Dict[str, Any]:
+    service = _service(services)
     try:
         return service.get_fact(campaign_id, character_id)
     except CharacterFactNotFoundError as exc:
@@ -166,8 +174,9 @@ def adopt_character_fact(
     campaign_id: str,
     character_id: str,
     request: CharacterFactAdoptRequest,
+    services: ServiceContainer = Depends(get_services),
 ) -> CharacterFactAdoptResponse:
-    service = _service()
+    service = _service(services)
     try:
         result = service.adopt_fact(
             campaign_id,
@@ -178,4 +187,6 @@ def adopt_character_fact(
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     except CharacterFactValidationError as exc:
         raise HTTPException(status_code=422, detail=str(exc)) from exc
+    except StaleCampaignError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
     return CharacterFactAdoptResponse(**result)
@@ -1,21 +1,20 @@
 from __future__ import annotations
 
-from pathlib import Path
-from typing import Any, Dict, List, Optional
+import json
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, List, Literal, Optional, Union
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
-from backend.app.turn_service import CampaignBusyError, SemanticGuardError, TurnService
-from backend.infra.file_repo import FileRepo
+from backend.api.dependencies import ServiceContainer, get_services
+from backend.app.turn_service import CampaignBusyError, SemanticGuardError, turn_lock_stats
+from backend.infra.file_repo import StaleCampaignError
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
-
-def _service() -> TurnService:
-    storage_root = Path.cwd() / "storage"
-    repo = FileRepo(storage_root)
-    return TurnService(repo)
+MAX_BATCH_TURNS = 100
 
 
 class TurnRequest(BaseModel):
@@ -37,25 +36,170 @@ class TurnResponse(BaseModel):
     debug: Optional[Dict[str, Any]] = None
 
 
+class BatchTurnItem(BaseModel):
+    user_input: str
+    actor_id: Optional[str] = None
+    execution: Optional[Dict[str, Any]] = None
+
+
+class BatchTurnRequest(BaseModel):
+    campaign_id: str
+    turns: List[BatchTurnItem]
+    save_mode: Literal["end", "per_turn"] = "end"
+
+
+class BatchTurnError(BaseModel):
+    index: int
+    status_code: int
+    detail: str
+
+
+class BatchTurnResponse(BaseModel):
+    campaign_id: str
+    completed: int
+    results: List[TurnResponse] = Field(default_factory=list)
+    error: Optional[BatchTurnError] = None
+
+
 @router.post("/turn", response_model=TurnResponse)
-def submit_turn(request: TurnRequest) -> TurnResponse:
-    service = _service()
+async def submit_turn(
+    request: TurnRequest,
+    services: ServiceContainer = Depends(get_services),
+) -> TurnResponse:
+    service = await services.aturn_service()
+    try:
+        response = await service.asubmit_turn(
+            request.campaign_id, request.user_input, actor_id=_effective_actor_id(request)
+        )
+    except Exception as exc:
+        status_code = _error_status(exc)
+        if status_code is None:
+            raise
+        raise HTTPException(status_code=status_code, detail=str(exc)) from exc
+    return TurnResponse(**response)
+
+
+@router.post("/turn/stream")
+async def stream_turn(
+    request: TurnRequest,
+    services: ServiceContainer = Depends(get_services),
+) -> StreamingResponse:
+    # Opt-in SSE variant of /turn. Errors raised before the turn starts (missing
+    # campaign, busy lock, bad actor) keep their HTTP status; later failures
+    # arrive as an "error" event because the 200 header is already sent.
+    service = await services.aturn_service()
+    events = service.astream_turn(
+        request.campaign_id, request.user_input, actor_id=_effective_actor_id(request)
+    )
+    try:
+        first = await events.__anext__()
+    except Exception as exc:
+        await events.aclose()
+        status_code = _error_status(exc)
+        if status_code is None:
+            raise
+        raise HTTPException(status_code=status_code, detail=str(exc)) from exc
+    return StreamingResponse(
+        _sse_stream(first, events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/turns", response_model=BatchTurnResponse)
+async def submit_turns(
+    request: BatchTurnRequest,
+    services: ServiceContainer = Depends(get_services),
+) -> BatchTurnResponse:
+    # Ordered turns under one campaign lock and load. Errors before the first
+    # turn starts (missing campaign, busy lock) keep their HTTP status; a turn
+    # that fails stops the batch and is reported in `error` next to the
+    # results of the turns before it.
+    if not request.turns:
+        raise HTTPException(status_code=400, detail="turns must not be empty")
+    if len(request.turns) > MAX_BATCH_TURNS:
+        raise HTTPException(
+            status_code=400, detail=f"turns must not exceed {MAX_BATCH_TURNS}"
+        )
+    service = await services.aturn_service()
+    try:
+        responses, error = await service.asubmit_turns(
+            request.campaign_id,
+            [(turn.user_input, _effective_actor_id(turn)) for turn in request.turns],
+            save_each_turn=request.save_mode == "per_turn",
+        )
+    except Exception as exc:
+        status_code = _error_status(exc)
+        if status_code is None:
+            raise
+        raise HTTPException(status_code=status_code, detail=str(exc)) from exc
+    batch_error = None
+    if error is not None:
+        status_code = _error_status(error)
+        batch_error = BatchTurnError(
+            index=len(responses),
+            status_code=status_code or 500,
+            detail=str(error) if status_code is not None else "Turn failed.",
+        )
+    return BatchTurnResponse(
+        campaign_id=request.campaign_id,
+        completed=len(responses),
+        results=[TurnResponse(**response) for response in responses],
+        error=batch_error,
+    )
+
+
+@router.get("/turn_queue/stats")
+def turn_queue_stats() -> Dict[str, Any]:
+    return turn_lock_stats()
+
+
+def _effective_actor_id(request: Union[TurnRequest, BatchTurnItem]) -> Optional[str]:
     execution_actor_id: Optional[str] = None
     if isinstance(request.execution, dict):
         candidate = request.execution.get("actor_id")
         if isinstance(candidate, str) and candidate.strip():
             execution_actor_id = candidate.strip()
-    effective_actor_id = execution_actor_id or request.actor_id
+    return execution_actor_id or request.actor_id
+
+
+def _error_status(exc: Exception) -> Optional[int]:
+    if isinstance(exc, FileNotFoundError):
+        return 404
+    if isinstance(exc, SemanticGuardError):
+        return 422
+    if isinstance(exc, (CampaignBusyError, StaleCampaignError)):
+        return 409
+    if isinstance(exc, ValueError):
+        return 400
+    return None
+
+
+async def _sse_stream(
+    first: Dict[str, Any], events: AsyncGenerator[Dict[str, Any], None]
+) -> AsyncIterator[str]:
     try:
-        response = service.submit_turn(
-            request.campaign_id, request.user_input, actor_id=effective_actor_id
+        yield _format_sse(first)
+        async for event in events:
+            if event["event"] == "final":
+                event = {
+                    "event": "final",
+                    "data": jsonable_encoder(TurnResponse(**event["data"])),
+                }
+            yield _format_sse(event)
+    except Exception as exc:
+        status_code = _error_status(exc)
+        detail = str(exc) if status_code is not None else "Turn failed."
+        yield _format_sse(
+            {
+                "event": "error",
+                "data": {"status_code": status_code or 500, "detail": detail},
+            }
         )
-    except FileNotFoundError as exc:
-        raise HTTPException(status_code=404, detail=str(exc)) from exc
-    except SemanticGuardError as exc:
-        raise HTTPException(status_code=422, detail=str(exc)) from exc
-    except CampaignBusyError as exc:
-        raise HTTPException(status_code=409, detail=str(exc)) from exc
-    except ValueError as exc:
-        raise HTTPException(status_code=400, detail=str(exc)) from exc
-    return TurnResponse(**response)
+    finally:
+        await events.aclose()
+
+
+def _format_sse(event: Dict[str, Any]) -> str:
+    data = json.dumps(event["data"], ensure_ascii=False)
+    return f"event: {event['event']}\ndata: {data}\n\n"
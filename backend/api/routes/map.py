@@ -1,21 +1,15 @@
 from __future__ import annotations
 
-from pathlib import Path
 from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 
-from backend.infra.file_repo import FileRepo
+from backend.api.dependencies import ServiceContainer, get_services
 
 router = APIRouter(prefix="/map", tags=["map"])
 
 
-def _repo() -> FileRepo:
-    storage_root = Path.cwd() / "storage"
-    return FileRepo(storage_root)
-
-
 class MapAreaView(BaseModel):
     id: str
     name: str
@@ -33,8 +27,9 @@ class MapViewResponse(BaseModel):
 def view_map(
     campaign_id: str = Query(...),
     actor_id: Optional[str] = Query(None),
+    services: ServiceContainer = Depends(get_services),
 ) -> MapViewResponse:
-    repo = _repo()
+    repo = services.repo()
     try:
         campaign = repo.get_campaign(campaign_id)
     except FileNotFoundError as exc:
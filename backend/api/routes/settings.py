@@ -1,22 +1,20 @@
 from __future__ import annotations
 
-from pathlib import Path
 from typing import Any, Dict, List
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
 
+from backend.api.dependencies import ServiceContainer, get_services
 from backend.app.settings_service import SettingsService
 from backend.domain.models import SettingsSnapshot
-from backend.infra.file_repo import FileRepo
+from backend.infra.file_repo import StaleCampaignError
 
 router = APIRouter(prefix="/settings", tags=["settings"])
 
 
-def _service() -> SettingsService:
-    storage_root = Path.cwd() / "storage"
-    repo = FileRepo(storage_root)
-    return SettingsService(repo)
+def _service(services: ServiceContainer) -> SettingsService:
+    return SettingsService(services.repo())
 
 
 class SettingDefinitionResponse(BaseModel):
@@ -45,8 +43,11 @@ class SettingsApplyResponse(BaseModel):
 
 
 @router.get("/schema", response_model=SettingsSchemaResponse)
-def get_schema(campaign_id: str = Query(...)) -> SettingsSchemaResponse:
-    service = _service()
+def get_schema(
+    campaign_id: str = Query(...),
+    services: ServiceContainer = Depends(get_services),
+) -> SettingsSchemaResponse:
+    service = _service(services)
     try:
         definitions, snapshot = service.get_schema(campaign_id)
     except FileNotFoundError as exc:
@@ -63,14 +64,19 @@ def get_schema(campaign_id: str = Query(...)) -> SettingsSchemaResponse:
 
 
 @router.post("/apply", response_model=SettingsApplyResponse)
-def apply_settings(request: SettingsApplyRequest) -> SettingsApplyResponse:
-    service = _service()
+def apply_settings(
+    request: SettingsApplyRequest,
+    services: ServiceContainer = Depends(get_services),
+) -> SettingsApplyResponse:
+    service = _service(services)
     try:
         snapshot, changed_keys = service.apply_patch(
             request.campaign_id, request.patch
         )
     except FileNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except StaleCampaignError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     return SettingsApplyResponse(snapshot=snapshot, change_summary=changed_keys)
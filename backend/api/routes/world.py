@@ -1,21 +1,14 @@
 from __future__ import annotations
 
-from pathlib import Path
-
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 
+from backend.api.dependencies import ServiceContainer, get_services
 from backend.domain.world_models import WorldGenerator
-from backend.infra.file_repo import FileRepo
 
 router = APIRouter(prefix="/campaigns", tags=["world"])
 
 
-def _repo() -> FileRepo:
-    storage_root = Path.cwd() / "storage"
-    return FileRepo(storage_root)
-
-
 class WorldResponse(BaseModel):
     world_id: str
     name: str
@@ -30,8 +23,11 @@ class WorldResponse(BaseModel):
 
 
 @router.get("/{campaign_id}/world", response_model=WorldResponse)
-def get_world_for_campaign(campaign_id: str) -> WorldResponse:
-    repo = _repo()
+def get_world_for_campaign(
+    campaign_id: str,
+    services: ServiceContainer = Depends(get_services),
+) -> WorldResponse:
+    repo = services.repo()
     try:
         campaign = repo.get_campaign(campaign_id)
     except FileNotFoundError as exc:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import json
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
@@ -17,7 +18,7 @@ from backend.domain.character_fact_schema import (
 )
 from backend.domain.models import Campaign
 from backend.domain.state_utils import ensure_actor
-from backend.infra.file_repo import FileRepo
+from backend.infra.repository import Repository
 
 MAX_GENERATE_REQUEST_BYTES = 200_000
 
@@ -29,7 +30,7 @@ class CharacterFactNotFoundError(FileNotFoundError):
 class CharacterFactApiService:
     def __init__(
         self,
-        repo: FileRepo,
+        repo: Repository,
         generation_service: Optional[CharacterFactGenerationService] = None,
     ) -> None:
         self.repo = repo
@@ -40,6 +41,24 @@ class CharacterFactApiService:
         campaign_id: str,
         request_payload: Dict[str, Any],
     ) -> CharacterFactBatchWriteResult:
+        request = self._build_generation_request(campaign_id, request_payload)
+        return self.generation_service.generate_and_persist(request)
+
+    async def agenerate(
+        self,
+        campaign_id: str,
+        request_payload: Dict[str, Any],
+    ) -> CharacterFactBatchWriteResult:
+        request = await asyncio.to_thread(
+            self._build_generation_request, campaign_id, request_payload
+        )
+        return await self.generation_service.agenerate_and_persist(request)
+
+    def _build_generation_request(
+        self,
+        campaign_id: str,
+        request_payload: Dict[str, Any],
+    ) -> CharacterFactGenerationRequest:
         campaign = self._require_campaign(campaign_id)
         payload_size = len(json.dumps(request_payload, ensure_ascii=False).encode("utf-8"))
         if payload_size > MAX_GENERATE_REQUEST_BYTES:
@@ -60,7 +79,7 @@ class CharacterFactApiService:
         draft_mode = _read_draft_mode(campaign)
         request_snapshot["draft_mode"] = draft_mode
 
-        request = CharacterFactGenerationRequest(
+        return CharacterFactGenerationRequest(
             campaign_id=campaign_id,
             request_id=request_id,
             language=_read_string(request_payload.get("language"), "zh-CN"),
@@ -75,7 +94,6 @@ class CharacterFactApiService:
             draft_mode=draft_mode,
             extra_params=request_snapshot,
         )
-        return self.generation_service.generate_and_persist(request)
 
     def list_batches(self, campaign_id: str, limit: int = 20) -> List[Dict[str, Any]]:
         self._require_campaign(campaign_id)
@@ -145,7 +163,8 @@ class CharacterFactApiService:
             "source_draft_ref": source_ref,
         }
         acceptance_changed = acceptance_before != accepted_payload
-        # V1.1: single-process semantics; keep write path simple and leave lock strategy for a later milestone.
+        # The profile save is a revision compare-and-swap: a turn saving the
+        # campaign meanwhile surfaces as StaleCampaignError (409), not a lost update.
         acceptance_path = self.repo.save_character_fact_acceptance(
             campaign_id,
             character_id,
@@ -5,7 +5,7 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, List, Tuple, TYPE_CHECKING
 
 from backend.domain.models import Campaign
-from backend.infra.file_repo import FileRepo
+from backend.infra.repository import Repository
 
 if TYPE_CHECKING:
     from backend.app.character_fact_generation import CharacterFactGenerationRequest
@@ -34,7 +34,7 @@ class CharacterFactPromptBuildResult:
 class CharacterFactContextBuilder:
     def build(
         self,
-        repo: FileRepo,
+        repo: Repository,
         request: CharacterFactGenerationRequest,
         count: int,
     ) -> CharacterFactPromptBuildResult:
@@ -78,7 +78,7 @@ class CharacterFactContextBuilder:
         )
 
 
-def _build_authoritative_party_context(repo: FileRepo, campaign: Campaign) -> List[Dict[str, Any]]:
+def _build_authoritative_party_context(repo: Repository, campaign: Campaign) -> List[Dict[str, Any]]:
     items: List[Dict[str, Any]] = []
     for actor_id in campaign.selected.party_character_ids:
         if not isinstance(actor_id, str) or not actor_id.strip():
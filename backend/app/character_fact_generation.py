@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Mapping, Optional, Protocol, Sequence
@@ -15,7 +16,7 @@ from backend.domain.character_fact_schema import (
     is_valid_character_id,
     validate_character_fact,
 )
-from backend.infra.file_repo import FileRepo
+from backend.infra.repository import Repository
 
 FORBIDDEN_RUNTIME_FIELDS = {"position", "hp", "character_state"}
 CHARACTER_FACT_SCHEMA_ID = "character_fact.v1"
@@ -164,7 +165,7 @@ class DeterministicDraftGenerator:
 class LLMDraftGenerator:
     def __init__(
         self,
-        repo: FileRepo,
+        repo: Repository,
         context_builder: CharacterFactContextBuilder,
         adapter: CharacterFactLLMAdapter,
     ) -> None:
@@ -187,11 +188,36 @@ class LLMDraftGenerator:
             warnings=[*build_result.warnings, *llm_result.warnings],
         )
 
+    async def agenerate(
+        self,
+        request: CharacterFactGenerationRequest,
+        count: int,
+    ) -> DraftGenerationResult:
+        build_result = await asyncio.to_thread(
+            self.context_builder.build, self.repo, request, count
+        )
+        agenerate_drafts = getattr(self.adapter, "agenerate_drafts", None)
+        if agenerate_drafts is not None:
+            llm_result: CharacterFactLLMResult = await agenerate_drafts(
+                system_prompt=build_result.system_prompt,
+                user_payload=build_result.user_payload,
+            )
+        else:
+            llm_result = await asyncio.to_thread(
+                self.adapter.generate_drafts,
+                system_prompt=build_result.system_prompt,
+                user_payload=build_result.user_payload,
+            )
+        return DraftGenerationResult(
+            drafts=llm_result.drafts,
+            warnings=[*build_result.warnings, *llm_result.warnings],
+        )
+
 
 class CharacterFactGenerationService:
     def __init__(
         self,
-        repo: FileRepo,
+        repo: Repository,
         config: CharacterFactGenerationConfig | None = None,
         *,
         context_builder: Optional[CharacterFactContextBuilder] = None,
@@ -297,6 +323,22 @@ class CharacterFactGenerationService:
             warnings=warnings,
         )
 
+    async def agenerate_and_persist(
+        self,
+        request: CharacterFactGenerationRequest,
+    ) -> CharacterFactBatchWriteResult:
+        self._validate_request(request)
+        count, warnings = self._resolve_count(request)
+        draft_result = await self._agenerate_drafts(request, count)
+        warnings = [*warnings, *draft_result.warnings]
+        return await asyncio.to_thread(
+            self.persist_generated_batch,
+            request,
+            draft_result.drafts,
+            count_override=count,
+            warnings=warnings,
+        )
+
     def make_request_id(self) -> str:
         timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
         return f"req_{timestamp}_{uuid4().hex[:6]}"
@@ -338,28 +380,58 @@ class CharacterFactGenerationService:
         request: CharacterFactGenerationRequest,
         count: int,
     ) -> DraftGenerationResult:
-        deterministic = DeterministicDraftGenerator(self)
         if request.draft_mode != "llm":
-            return deterministic.generate(request, count)
+            return DeterministicDraftGenerator(self).generate(request, count)
 
         try:
-            llm_generator = LLMDraftGenerator(
-                repo=self.repo,
-                context_builder=self.context_builder,
-                adapter=self._get_llm_adapter(),
-            )
-            llm_result = llm_generator.generate(request, count)
+            llm_result = self._llm_draft_generator().generate(request, count)
         except Exception as exc:
-            fallback = deterministic.generate(request, count)
-            fallback.warnings.append(
-                f"LLM draft_mode fallback to deterministic: {exc.__class__.__name__}."
-            )
-            return fallback
+            return self._llm_error_fallback(request, count, exc)
+        return self._accept_llm_drafts(request, count, llm_result)
+
+    async def _agenerate_drafts(
+        self,
+        request: CharacterFactGenerationRequest,
+        count: int,
+    ) -> DraftGenerationResult:
+        if request.draft_mode != "llm":
+            return DeterministicDraftGenerator(self).generate(request, count)
+
+        try:
+            llm_result = await self._llm_draft_generator().agenerate(request, count)
+        except Exception as exc:
+            return self._llm_error_fallback(request, count, exc)
+        return self._accept_llm_drafts(request, count, llm_result)
+
+    def _llm_draft_generator(self) -> LLMDraftGenerator:
+        return LLMDraftGenerator(
+            repo=self.repo,
+            context_builder=self.context_builder,
+            adapter=self._get_llm_adapter(),
+        )
 
+    def _llm_error_fallback(
+        self,
+        request: CharacterFactGenerationRequest,
+        count: int,
+        exc: Exception,
+    ) -> DraftGenerationResult:
+        fallback = DeterministicDraftGenerator(self).generate(request, count)
+        fallback.warnings.append(
+            f"LLM draft_mode fallback to deterministic: {exc.__class__.__name__}."
+        )
+        return fallback
+
+    def _accept_llm_drafts(
+        self,
+        request: CharacterFactGenerationRequest,
+        count: int,
+        llm_result: DraftGenerationResult,
+    ) -> DraftGenerationResult:
         if llm_result.drafts:
             return llm_result
 
-        fallback = deterministic.generate(request, count)
+        fallback = DeterministicDraftGenerator(self).generate(request, count)
         fallback.warnings.extend(llm_result.warnings)
         fallback.warnings.append(
             "LLM draft_mode returned no usable items; fallback to deterministic."
@@ -1,10 +1,14 @@
 ﻿from __future__ import annotations
 
 import json
-import urllib.request
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
+from backend.infra.llm_transport import (
+    LLMTransport,
+    shared_llm_transport,
+    transport_settings,
+)
 from backend.services.keyring import get_api_key
 from backend.services.llm_config import get_active_profile, load_llm_config
 
@@ -18,6 +22,9 @@ class CharacterFactLLMAdapterConfig:
     timeout_sec: int
     max_tokens: Optional[int] = None
     response_format: Optional[Dict[str, Any]] = None
+    profile_name: str = "default"
+    max_concurrency: Optional[int] = None
+    connect_timeout_sec: Optional[int] = None
 
     @classmethod
     def from_config(cls) -> "CharacterFactLLMAdapterConfig":
@@ -31,6 +38,9 @@ class CharacterFactLLMAdapterConfig:
             timeout_sec=profile.timeout_sec,
             max_tokens=profile.max_tokens,
             response_format=profile.response_format or {"type": "json_object"},
+            profile_name=profile.name,
+            max_concurrency=profile.max_concurrency,
+            connect_timeout_sec=profile.connect_timeout_sec,
         )
 
 
@@ -41,8 +51,19 @@ class CharacterFactLLMResult:
 
 
 class CharacterFactLLMAdapter:
-    def __init__(self, config: Optional[CharacterFactLLMAdapterConfig] = None) -> None:
+    def __init__(
+        self,
+        config: Optional[CharacterFactLLMAdapterConfig] = None,
+        *,
+        transport: Optional[LLMTransport] = None,
+    ) -> None:
         self.config = config or CharacterFactLLMAdapterConfig.from_config()
+        self.transport = transport or shared_llm_transport(
+            f"{self.config.profile_name}:{self.config.base_url}",
+            transport_settings(
+                self.config.max_concurrency, self.config.connect_timeout_sec
+            ),
+        )
 
     def generate_drafts(
         self,
@@ -50,6 +71,33 @@ class CharacterFactLLMAdapter:
         system_prompt: str,
         user_payload: Dict[str, Any],
     ) -> CharacterFactLLMResult:
+        response = self.transport.post_json(
+            _endpoint(self.config.base_url, "chat/completions"),
+            self._build_payload(system_prompt, user_payload),
+            api_key=self.config.api_key,
+            timeout=self.config.timeout_sec,
+        )
+        content = _extract_content(response)
+        return _parse_draft_content(content)
+
+    async def agenerate_drafts(
+        self,
+        *,
+        system_prompt: str,
+        user_payload: Dict[str, Any],
+    ) -> CharacterFactLLMResult:
+        response = await self.transport.apost_json(
+            _endpoint(self.config.base_url, "chat/completions"),
+            self._build_payload(system_prompt, user_payload),
+            api_key=self.config.api_key,
+            timeout=self.config.timeout_sec,
+        )
+        content = _extract_content(response)
+        return _parse_draft_content(content)
+
+    def _build_payload(
+        self, system_prompt: str, user_payload: Dict[str, Any]
+    ) -> Dict[str, Any]:
         messages = [
             {"role": "system", "content": system_prompt},
             {
@@ -65,15 +113,7 @@ class CharacterFactLLMAdapter:
         }
         if self.config.max_tokens is not None:
             payload["max_tokens"] = self.config.max_tokens
-
-        response = _post_json(
-            _endpoint(self.config.base_url, "chat/completions"),
-            payload,
-            api_key=self.config.api_key,
-            timeout=self.config.timeout_sec,
-        )
-        content = _extract_content(response)
-        return _parse_draft_content(content)
+        return payload
 
 
 def _endpoint(base_url: str, path: str) -> str:
@@ -83,28 +123,6 @@ def _endpoint(base_url: str, path: str) -> str:
     return f"{base}/{path.lstrip('/')}"
 
 
-def _post_json(
-    url: str,
-    payload: Dict[str, Any],
-    *,
-    api_key: str,
-    timeout: int,
-) -> Dict[str, Any]:
-    data = json.dumps(payload).encode("utf-8")
-    request = urllib.request.Request(
-        url,
-        data=data,
-        method="POST",
-        headers={
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {api_key}",
-        },
-    )
-    with urllib.request.urlopen(request, timeout=timeout) as response:
-        body = response.read().decode("utf-8")
-    return json.loads(body)
-
-
 def _extract_content(response: Dict[str, Any]) -> str:
     try:
         return response["choices"][0]["message"]["content"]
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from backend.domain.models import ActorState, MapData
+
+# Areas unreachable from the active actor sort after every reachable one.
+UNREACHABLE_DISTANCE = 1 << 30
+
+
+class BudgetCandidate(NamedTuple):
+    # Tuple ordering: priority first, then kind and key for a stable order.
+    priority: int
+    kind: str
+    key: str
+
+
+def area_distances(map_data: MapData, start_area_id: Optional[str]) -> Dict[str, int]:
+    # Hop count from the start area over reachable_area_ids, connections and
+    # parent links, all treated as undirected: an area one hop away is relevant
+    # whichever side declared the edge.
+    if not isinstance(start_area_id, str) or start_area_id not in map_data.areas:
+        return {}
+    neighbours: Dict[str, List[str]] = {area_id: [] for area_id in map_data.areas}
+
+    def link(left: Optional[str], right: Optional[str]) -> None:
+        if left in neighbours and right in neighbours and left != right:
+            neighbours[left].append(right)
+            neighbours[right].append(left)
+
+    for area_id, area in map_data.areas.items():
+        for target in area.reachable_area_ids:
+            link(area_id, target)
+        link(area_id, area.parent_area_id)
+    for connection in map_data.connections:
+        link(connection.from_area_id, connection.to_area_id)
+
+    distances = {start_area_id: 0}
+    queue = deque([start_area_id])
+    while queue:
+        current = queue.popleft()
+        for neighbour in neighbours[current]:
+            if neighbour not in distances:
+                distances[neighbour] = distances[current] + 1
+                queue.append(neighbour)
+    return distances
+
+
+def actor_priority(
+    actor_id: str,
+    actor: ActorState,
+    *,
+    effective_actor_id: str,
+    distances: Dict[str, int],
+    recent_actor_ids: Sequence[str],
+) -> int:
+    # Same scale as area distance so actors interleave with the areas around
+    # them: co-located actors rank with the active area, and actors seen in
+    # recent turns are pulled one hop closer.
+    if actor_id == effective_actor_id:
+        return 0
+    distance = distances.get(actor.position or "", UNREACHABLE_DISTANCE)
+    if actor_id in recent_actor_ids:
+        return distance
+    return distance + 1
+
+
+def pack_by_priority(
+    candidates: Iterable[BudgetCandidate],
+    cost_of: Callable[[BudgetCandidate], int],
+    budget: int,
+) -> List[BudgetCandidate]:
+    # Greedy in priority order, stopping at the first candidate that does not
+    # fit: nothing less relevant is sent while something more relevant is not,
+    # and costs (which encode the item) are only computed for what is packed.
+    packed: List[BudgetCandidate] = []
+    remaining = budget
+    for candidate in sorted(candidates):
+        cost = cost_of(candidate)
+        if cost > remaining:
+            break
+        packed.append(candidate)
+        remaining -= cost
+    return packed
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+DEFAULT_FRAGMENT_CACHE_SIZE = 2048
+
+# Fragments use json.dumps defaults (", " / ": " separators, no indent) so an
+# object assembled with encode_object() is byte-identical to json.dumps of the
+# equivalent dict.
+_FragmentKey = Tuple[str, str, bytes]
+
+
+class Encoded(str):
+    # Marks a value that is already serialized JSON. Only recognised as a direct
+    # value of encode_object(); nest objects by encoding them first.
+    pass
+
+
+def dump_value(value: Any) -> str:
+    if isinstance(value, Encoded):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+def encode_object(payload: Mapping[str, Any]) -> Encoded:
+    return Encoded(
+        "{"
+        + ", ".join(f"{dump_value(key)}: {dump_value(value)}" for key, value in payload.items())
+        + "}"
+    )
+
+
+def _model_json(model: object) -> str:
+    if hasattr(model, "model_dump_json"):
+        return model.model_dump_json()  # type: ignore[no-any-return]
+    if hasattr(model, "json"):
+        return model.json()  # type: ignore[no-any-return]
+    raise TypeError("Unsupported model type")
+
+
+def _model_dict(model: object) -> Dict[str, Any]:
+    if hasattr(model, "model_dump"):
+        return model.model_dump()  # type: ignore[no-any-return]
+    if hasattr(model, "dict"):
+        return model.dict()  # type: ignore[no-any-return]
+    return {}
+
+
+class PromptFragmentCache:
+    # Serialized prompt sections keyed by (kind, hash of the source model's
+    # JSON), so sections that are unchanged since an earlier turn (maps,
+    # untouched actors) skip encoding. The hash itself is memoized per model
+    # object: a section is dumped once after it is loaded or reported changed
+    # through forget(), not on every prompt built from it.
+    def __init__(self, max_entries: int = DEFAULT_FRAGMENT_CACHE_SIZE) -> None:
+        self.max_entries = max(1, max_entries)
+        self._guard = threading.Lock()
+        self._entries: "OrderedDict[_FragmentKey, Encoded]" = OrderedDict()
+        # id(model) -> (weak ref, digest). Plain dict operations only, so the
+        # weakref callback cannot deadlock on _guard when it fires mid-lookup.
+        self._digests: Dict[int, Tuple["weakref.ref[object]", bytes]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def model_fragment(
+        self,
+        kind: str,
+        model: object,
+        build: Optional[Callable[[Any], Any]] = None,
+    ) -> Encoded:
+        # `build` maps the model to the value to encode and must depend only on
+        # the model; `kind` names it so different builds never share entries.
+        key = (kind, type(model).__name__, self._digest(model))
+        with self._guard:
+            fragment = self._entries.get(key)
+            if fragment is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return fragment
+            self.misses += 1
+        fragment = Encoded(
+            dump_value(build(model) if build is not None else _model_dict(model))
+        )
+        with self._guard:
+            self._entries[key] = fragment
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return fragment
+
+    def forget(self, *models: object) -> None:
+        # Callers that mutate a section in place report it here; its next
+        # fragment is looked up by a freshly computed hash.
+        for model in models:
+            self._digests.pop(id(model), None)
+
+    def clear(self) -> None:
+        with self._guard:
+            self._entries.clear()
+        self._digests.clear()
+
+    def _digest(self, model: object) -> bytes:
+        key = id(model)
+        memo = self._digests.get(key)
+        if memo is not None and memo[0]() is model:
+            return memo[1]
+        digest = hashlib.blake2b(
+            _model_json(model).encode("utf-8"), digest_size=16
+        ).digest()
+        digests = self._digests
+
+        def drop(ref: "weakref.ref[object]") -> None:
+            if digests.get(key, (None, b""))[0] is ref:
+                digests.pop(key, None)
+
+        try:
+            digests[key] = (weakref.ref(model, drop), digest)
+        except TypeError:
+            # Models without weakref support are hashed on every call.
+            pass
+        return digest
+
+    def stats(self) -> Dict[str, int]:
+        with self._guard:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "memoized_digests": len(self._digests),
+                "max_entries": self.max_entries,
+            }
@@ -4,11 +4,15 @@ from typing import Any, Dict, List, Tuple
 
 from backend.domain.models import SettingsSnapshot
 from backend.domain.settings import SettingDefinition, apply_settings_patch, get_definitions
-from backend.infra.file_repo import FileRepo
+from backend.infra.file_repo import StaleCampaignError
+from backend.infra.repository import Repository
+
+# A patch is re-applied to a fresh load when a turn saved the campaign first.
+_SAVE_ATTEMPTS = 3
 
 
 class SettingsService:
-    def __init__(self, repo: FileRepo) -> None:
+    def __init__(self, repo: Repository) -> None:
         self.repo = repo
 
     def get_schema(self, campaign_id: str) -> Tuple[List[SettingDefinition], SettingsSnapshot]:
@@ -18,12 +22,19 @@ class SettingsService:
     def apply_patch(
         self, campaign_id: str, patch: Dict[str, Any]
     ) -> Tuple[SettingsSnapshot, List[str]]:
-        campaign = self.repo.get_campaign(campaign_id)
-        updated_snapshot, changed_keys = apply_settings_patch(
-            campaign.settings_snapshot, patch
-        )
-        if changed_keys:
-            campaign.settings_snapshot = updated_snapshot
-            campaign.settings_revision += 1
-            self.repo.save_campaign(campaign)
-        return updated_snapshot, changed_keys
+        for attempt in range(1, _SAVE_ATTEMPTS + 1):
+            campaign = self.repo.get_campaign(campaign_id)
+            updated_snapshot, changed_keys = apply_settings_patch(
+                campaign.settings_snapshot, patch
+            )
+            if changed_keys:
+                campaign.settings_snapshot = updated_snapshot
+                campaign.settings_revision += 1
+                try:
+                    self.repo.save_campaign(campaign)
+                except StaleCampaignError:
+                    if attempt == _SAVE_ATTEMPTS:
+                        raise
+                    continue
+            return updated_snapshot, changed_keys
+        raise AssertionError("unreachable")
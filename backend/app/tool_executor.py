@@ -7,6 +7,7 @@ from typing import List, Optional, Tuple
 from backend.app.actor_service import spawn_actor
 from backend.app.character_facade_factory import create_runtime_character_facade
 from backend.app.world_service import generate_world
+from backend.domain.campaign_undo import CampaignUndoLog
 from backend.domain.character_access import (
     CharacterFacade,
     CharacterState,
@@ -23,7 +24,7 @@ from backend.domain.state_machine import resolve_tool_permission
 from backend.infra.map_generators.deterministic_generator import (
     DeterministicMapGenerator,
 )
-from backend.infra.file_repo import FileRepo
+from backend.infra.repository import Repository
 
 
 def execute_tool_calls(
@@ -31,7 +32,8 @@ def execute_tool_calls(
     actor_id: str,
     tool_calls: List[ToolCall],
     *,
-    repo: Optional[FileRepo] = None,
+    repo: Optional[Repository] = None,
+    undo_log: Optional[CampaignUndoLog] = None,
 ) -> Tuple[List[AppliedAction], Optional[ToolFeedback]]:
     applied_actions: List[AppliedAction] = []
     failed_calls: List[FailedCall] = []
@@ -63,6 +65,8 @@ def execute_tool_calls(
             )
             continue
 
+        if undo_log is not None:
+            _record_undo(undo_log, actor_id, call)
         allowed, reason = _check_state_permission(
             campaign, actor_id, call, character_facade
         )
@@ -116,6 +120,20 @@ def _check_actor_context_consistency(
     return True, ""
 
 
+def _record_undo(undo_log: CampaignUndoLog, actor_id: str, call: ToolCall) -> None:
+    # Facade reads write normalized state back, so the acting actor is
+    # recorded for every call, before the permission check reads it.
+    undo_log.record_actor(actor_id)
+    if call.tool == "hp_delta":
+        target_id = call.args.get("target_character_id")
+        if isinstance(target_id, str):
+            undo_log.record_actor(target_id)
+    elif call.tool == "map_generate":
+        undo_log.record_map()
+    elif call.tool == "actor_spawn":
+        undo_log.record_actor_ids()
+
+
 def _check_state_permission(
     campaign: Campaign,
     actor_id: str,
@@ -123,7 +141,7 @@ def _check_state_permission(
     character_facade: CharacterFacade,
 ) -> Tuple[bool, str]:
     if actor_id in campaign.actors:
-        actor_state = character_facade.get_state(campaign, actor_id).character_state
+        actor_state = character_facade.read_state(campaign, actor_id).character_state
     else:
         actor_state = "alive"
     target_is_actor = False
@@ -145,7 +163,7 @@ def _apply_tool_call(
     call: ToolCall,
     character_facade: CharacterFacade,
     *,
-    repo: Optional[FileRepo],
+    repo: Optional[Repository],
 ) -> Tuple[Optional[AppliedAction], Optional[str]]:
     timestamp = datetime.now(timezone.utc).isoformat()
     if call.tool == "move":
@@ -323,7 +341,7 @@ def _apply_move_options(
         return None
     if actor_id not in campaign.actors:
         return None
-    current_area_id = character_facade.get_state(campaign, actor_id).position
+    current_area_id = character_facade.read_state(campaign, actor_id).position
     if not isinstance(current_area_id, str):
         return None
     area = campaign.map.areas.get(current_area_id)
@@ -459,7 +477,7 @@ def _apply_world_generate(
     call: ToolCall,
     timestamp: str,
     *,
-    repo: Optional[FileRepo],
+    repo: Optional[Repository],
 ) -> Tuple[Optional[AppliedAction], Optional[str]]:
     if repo is None:
         return None, "invalid_args"
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from backend.domain.models import TurnLogEntry
+from backend.infra.repository import Repository
+
+DEFAULT_TURN_PAGE_LIMIT = 50
+MAX_TURN_PAGE_LIMIT = 200
+
+
+class TurnHistoryRequestError(ValueError):
+    pass
+
+
+@dataclass
+class TurnHistoryPage:
+    turns: List[Dict[str, Any]] = field(default_factory=list)
+    has_more: bool = False
+    next_after: Optional[str] = None
+    next_before: Optional[str] = None
+
+
+def _turn_log_fields() -> List[str]:
+    model_fields = getattr(TurnLogEntry, "model_fields", None)
+    if model_fields is None:
+        model_fields = getattr(TurnLogEntry, "__fields__", {})
+    return list(model_fields.keys())
+
+
+def parse_turn_cursor(value: Optional[str]) -> Optional[int]:
+    if value is None:
+        return None
+    raw = value.strip()
+    if not raw:
+        return None
+    suffix = raw.split("_", 1)[1] if raw.startswith("turn_") else raw
+    if not suffix.isdigit():
+        raise TurnHistoryRequestError(f"invalid turn cursor: {value}")
+    return int(suffix)
+
+
+def parse_turn_fields(value: Optional[str]) -> Optional[List[str]]:
+    if value is None:
+        return None
+    requested = [item.strip() for item in value.split(",") if item.strip()]
+    if not requested:
+        return None
+    known = set(_turn_log_fields())
+    unknown = [item for item in requested if item not in known]
+    if unknown:
+        raise TurnHistoryRequestError(f"unknown turn fields: {', '.join(unknown)}")
+    if "turn_id" not in requested:
+        requested.insert(0, "turn_id")
+    return requested
+
+
+def iter_turn_history(
+    repo: Repository,
+    campaign_id: str,
+    *,
+    after: Optional[int] = None,
+    before: Optional[int] = None,
+    fields: Optional[Sequence[str]] = None,
+    reverse: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    # Turn ids follow row numbers, so the cursors seek straight to their row.
+    rows = repo.iter_turn_log_rows(
+        campaign_id,
+        reverse=reverse,
+        state_summary=fields is None or "state_summary" in fields,
+        after_row=0 if reverse or after is None else after,
+        before_row=before,
+    )
+    for row in rows:
+        if reverse and after is not None and _row_turn_number(row) <= after:
+            return
+        yield _project_row(row, fields)
+
+
+def get_turn_history_page(
+    repo: Repository,
+    campaign_id: str,
+    *,
+    after: Optional[int] = None,
+    before: Optional[int] = None,
+    limit: int = DEFAULT_TURN_PAGE_LIMIT,
+    fields: Optional[Sequence[str]] = None,
+) -> TurnHistoryPage:
+    capped = max(1, min(limit, MAX_TURN_PAGE_LIMIT))
+    # Without an `after` cursor the page is anchored at the newest turns, so
+    # the log is walked from EOF; results are always returned oldest-first.
+    reverse = after is None
+    turns: List[Dict[str, Any]] = []
+    has_more = False
+    for row in iter_turn_history(
+        repo, campaign_id, after=after, before=before, fields=fields, reverse=reverse
+    ):
+        if len(turns) >= capped:
+            has_more = True
+            break
+        turns.append(row)
+    if reverse:
+        turns.reverse()
+    return TurnHistoryPage(
+        turns=turns,
+        has_more=has_more,
+        next_after=turns[-1].get("turn_id") if turns else None,
+        next_before=turns[0].get("turn_id") if turns else None,
+    )
+
+
+def _row_turn_number(row: Dict[str, Any]) -> int:
+    turn_id = row.get("turn_id")
+    if not isinstance(turn_id, str) or "_" not in turn_id:
+        return 0
+    suffix = turn_id.split("_", 1)[1]
+    return int(suffix) if suffix.isdigit() else 0
+
+
+def _project_row(
+    row: Dict[str, Any], fields: Optional[Sequence[str]]
+) -> Dict[str, Any]:
+    if fields is None:
+        return row
+    return {key: row.get(key) for key in fields}
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from backend.app.tool_executor import execute_tool_calls
+from backend.app.turn_service import (
+    _CAMPAIGN_TURN_LOCKS,
+    _advance_milestone,
+    _build_starter_campaign,
+    _ensure_minimum_state,
+    _mark_ended_if_needed,
+    _pin_spawned_actor_ids,
+    _state_summary_dict,
+    _turn_id_to_number,
+)
+from backend.domain.models import Campaign, Selected, ToolCall
+from backend.infra.repository import Repository
+
+
+class TurnReplayError(ValueError):
+    pass
+
+
+@dataclass
+class ReplayDivergence:
+    turn_id: str
+    row_number: int
+    fields: List[str]
+    expected: Dict[str, Any] = field(default_factory=dict)
+    actual: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class ReplayResult:
+    campaign: Campaign
+    turns_replayed: int = 0
+    tool_calls_replayed: int = 0
+    divergence_count: int = 0
+    divergence: Optional[ReplayDivergence] = None
+
+
+@dataclass
+class RollbackResult:
+    campaign_id: str
+    turn_id: str
+    # None when no checkpoint was at or before the turn and the whole log
+    # was replayed from the starting state.
+    checkpoint_turn_id: Optional[str]
+    replayed_turns: int
+    dropped_turns: int
+    dropped_checkpoints: int
+
+
+def starter_campaign_for(repo: Repository, campaign: Campaign) -> Campaign:
+    # The state create_campaign wrote for this campaign, rebuilt from its
+    # current selection minus the party members actor_spawn added later (the
+    # replay adds them back); the usual base for replaying its whole log.
+    spawned_ids = set()
+    for row in repo.iter_turn_log_rows(campaign.id, state_summary=False):
+        actions = row.get("applied_actions")
+        for action in actions if isinstance(actions, list) else []:
+            if isinstance(action, dict) and action.get("tool") == "actor_spawn":
+                spawned_ids.add(action.get("result", {}).get("actor_id"))
+    selected = Selected(
+        world_id=campaign.selected.world_id,
+        map_id=campaign.selected.map_id,
+        party_character_ids=[
+            actor_id
+            for actor_id in campaign.selected.party_character_ids
+            if actor_id not in spawned_ids
+        ],
+        active_actor_id=campaign.selected.active_actor_id,
+    )
+    return _build_starter_campaign(campaign.id, selected)
+
+
+def replay_turn_log(
+    repo: Repository,
+    campaign_id: str,
+    base: Campaign,
+    *,
+    verify: bool = True,
+    stop_on_divergence: bool = True,
+    after_row: int = 0,
+    until_row: Optional[int] = None,
+) -> ReplayResult:
+    # Re-runs logged turns' tool calls against `base` (mutated in place)
+    # without the LLM, in the order the turn commit applies them. Rows are
+    # streamed, so memory holds one row plus the campaign. With verify, each
+    # turn's applied tools and state summary are checked against the log.
+    # after_row/until_row bound the replay to rows after_row+1..until_row,
+    # for a base that already reflects the first after_row rows.
+    result = ReplayResult(campaign=base)
+    row_number = max(0, after_row)
+    for row in repo.iter_turn_log_rows(campaign_id, after_row=row_number):
+        if until_row is not None and row_number >= until_row:
+            break
+        row_number += 1
+        turn_id = str(row.get("turn_id", ""))
+        logged_summary = row.get("state_summary")
+        if not isinstance(logged_summary, dict):
+            logged_summary = {}
+        actor_id = logged_summary.get("active_actor_id")
+        if not isinstance(actor_id, str) or not actor_id:
+            actor_id = base.selected.active_actor_id
+        tool_calls = _logged_tool_calls(row, turn_id)
+
+        _ensure_minimum_state(base)
+        applied_actions, _ = execute_tool_calls(base, actor_id, tool_calls, repo=repo)
+        _pin_spawned_actor_ids(base, applied_actions, row.get("applied_actions"))
+        _advance_milestone(base, _turn_id_to_number(turn_id), _logged_retries(row))
+        _mark_ended_if_needed(base)
+        result.turns_replayed += 1
+        result.tool_calls_replayed += len(tool_calls)
+        if not verify:
+            continue
+
+        divergence = _compare_turn(
+            turn_id,
+            row_number,
+            row,
+            [action.tool for action in applied_actions],
+            logged_summary,
+            {"active_actor_id": actor_id, **_state_summary_dict(base, active_actor_id=actor_id)},
+        )
+        if divergence is None:
+            continue
+        result.divergence_count += 1
+        if result.divergence is None:
+            result.divergence = divergence
+        if stop_on_divergence:
+            break
+    return result
+
+
+def rollback_to_turn(repo: Repository, campaign_id: str, turn_id: str) -> RollbackResult:
+    # Restores the campaign as of turn_id: the newest checkpoint at or before
+    # it is loaded and the turns between are replayed (at most one checkpoint
+    # interval while the ring buffer still holds it). A turn older than every
+    # kept checkpoint is replayed from the starting state instead.
+    # campaign.json is saved before the turn log and newer checkpoints are
+    # cut, so an interrupted rollback can simply be run again.
+    campaign_lock = _CAMPAIGN_TURN_LOCKS.acquire(
+        campaign_id, repo.turn_lock_path(campaign_id)
+    )
+    try:
+        if not repo.campaign_exists(campaign_id):
+            raise FileNotFoundError(f"Campaign not found: {campaign_id}")
+        target = _turn_id_to_number(turn_id)
+        if target < 1 or target > repo.turn_log_row_count(campaign_id):
+            raise ValueError(f"turn not in turn log: {turn_id}")
+        checkpoint = next(
+            (
+                checkpoint
+                for checkpoint in reversed(repo.list_checkpoints(campaign_id))
+                if checkpoint.row_count <= target
+            ),
+            None,
+        )
+        current = repo.get_campaign(campaign_id)
+        if checkpoint is None:
+            campaign = _rollback_base(repo, current)
+        else:
+            campaign = repo.load_checkpoint(campaign_id, checkpoint)
+        replay = replay_turn_log(
+            repo,
+            campaign_id,
+            campaign,
+            after_row=checkpoint.row_count if checkpoint is not None else 0,
+            until_row=target,
+        )
+        if replay.divergence is not None:
+            raise TurnReplayError(
+                f"replay diverged at {replay.divergence.turn_id}: "
+                + ", ".join(replay.divergence.fields)
+            )
+        # The checkpoint carries the revision it was taken at; the restored
+        # state is saved as the next revision of the current campaign.
+        campaign.revision = current.revision
+        _CAMPAIGN_TURN_LOCKS.confirm(campaign_lock)
+        repo.save_campaign(campaign)
+        dropped_turns = repo.truncate_turn_log(campaign_id, target)
+        dropped_checkpoints = repo.drop_checkpoints_after(campaign_id, target)
+    finally:
+        _CAMPAIGN_TURN_LOCKS.release(campaign_lock)
+    return RollbackResult(
+        campaign_id=campaign_id,
+        turn_id=turn_id,
+        checkpoint_turn_id=checkpoint.turn_id if checkpoint is not None else None,
+        replayed_turns=replay.turns_replayed,
+        dropped_turns=dropped_turns,
+        dropped_checkpoints=dropped_checkpoints,
+    )
+
+
+def _rollback_base(repo: Repository, current: Campaign) -> Campaign:
+    # The starter state only has default settings and goal. Turns never change
+    # either, so the current ones are kept; the settings' rules also steer
+    # the replayed tool calls.
+    base = starter_campaign_for(repo, current)
+    base.settings_snapshot = current.settings_snapshot
+    base.settings_revision = current.settings_revision
+    base.goal = current.goal
+    return base
+
+
+def _logged_tool_calls(row: Dict[str, Any], turn_id: str) -> List[ToolCall]:
+    structured = row.get("assistant_structured")
+    raw_calls = structured.get("tool_calls") if isinstance(structured, dict) else None
+    if not isinstance(raw_calls, list):
+        return []
+    try:
+        return [ToolCall(**call) for call in raw_calls]
+    except (TypeError, ValueError) as exc:
+        raise TurnReplayError(f"{turn_id}: unreadable tool_calls") from exc
+
+
+def _logged_retries(row: Dict[str, Any]) -> int:
+    report = row.get("conflict_report")
+    retries = report.get("retries") if isinstance(report, dict) else None
+    return retries if isinstance(retries, int) else 0
+
+
+def _compare_turn(
+    turn_id: str,
+    row_number: int,
+    row: Dict[str, Any],
+    applied_tools: List[str],
+    logged_summary: Dict[str, Any],
+    summary: Dict[str, Any],
+) -> Optional[ReplayDivergence]:
+    # Applied actions are compared by tool only: results carry timestamps and
+    # world_generate reports whether it created the world this time.
+    expected: Dict[str, Any] = {}
+    actual: Dict[str, Any] = {}
+    logged_actions = row.get("applied_actions")
+    logged_tools = [
+        action.get("tool")
+        for action in (logged_actions if isinstance(logged_actions, list) else [])
+        if isinstance(action, dict)
+    ]
+    if logged_tools != applied_tools:
+        expected["applied_actions"] = logged_tools
+        actual["applied_actions"] = applied_tools
+    # Fields missing from older rows are not checked.
+    for key, value in logged_summary.items():
+        if summary.get(key) != value:
+            expected[key] = value
+            actual[key] = summary.get(key)
+    if not expected:
+        return None
+    return ReplayDivergence(
+        turn_id=turn_id,
+        row_number=row_number,
+        fields=list(expected),
+        expected=expected,
+        actual=actual,
+    )
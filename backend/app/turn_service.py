@@ -1,24 +1,53 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import hashlib
-import threading
-from copy import deepcopy
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Generator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 
 from backend.app.character_facade_factory import create_runtime_character_facade
 from backend.app.conflict_detector import detect_conflicts
+from backend.app.context_budget import (
+    UNREACHABLE_DISTANCE,
+    BudgetCandidate,
+    actor_priority,
+    area_distances,
+    pack_by_priority,
+)
+from backend.app.prompt_fragments import (
+    Encoded,
+    PromptFragmentCache,
+    dump_value,
+    encode_object,
+)
 from backend.app.tool_executor import execute_tool_calls
+from backend.domain.campaign_undo import CampaignUndoLog
 from backend.domain.character_access import (
     CharacterState,
 )
 from backend.domain.dialog_rules import DEFAULT_DIALOG_TYPE, DIALOG_TYPES
 from backend.domain.map_models import normalize_map
 from backend.domain.models import (
+    AppliedAction,
     AssistantStructured,
     Campaign,
     CampaignSummary,
+    ConflictItem,
     ConflictReport,
     Goal,
     FailedCall,
@@ -37,44 +66,116 @@ from backend.domain.state_utils import (
     DEFAULT_CHARACTER_STATE,
     DEFAULT_HP,
 )
-from backend.infra.file_repo import FileRepo
-from backend.infra.llm_client import LLMClient
+from backend.infra.campaign_turn_locks import (
+    CampaignBusyError,
+    CampaignTurnLockRegistry,
+    _CampaignTurnLock,
+)
+from backend.infra.file_repo import StaleCampaignError
+from backend.infra.llm_client import LLMClient, SystemPrompt, prompt_byte_sizes
+from backend.infra.repository import Repository
 
 _CHARACTER_FACADE = create_runtime_character_facade()
+_PROMPT_FRAGMENTS = PromptFragmentCache()
 
+# (system_prompt, user_input, debug_append) handed to the LLM by a turn step.
+_LLMRequest = Tuple[str, str, Optional[str]]
 
-class SemanticGuardError(ValueError):
-    pass
 
+class _Speculation(NamedTuple):
+    # Candidate requests to run concurrently. The driver sends back one
+    # _CandidateResult per completed request, in completion order, for as long
+    # as the step answers with _NEXT_CANDIDATE; anything else ends the round
+    # and the driver drops the requests still in flight.
+    requests: Tuple[_LLMRequest, ...]
 
-class CampaignBusyError(RuntimeError):
-    pass
+
+class _TurnLockRequest(NamedTuple):
+    # First step of every session: the driver answers with the acquired
+    # campaign turn lock or throws CampaignBusyError into the steps.
+    campaign_id: str
+    lock_path: Optional[Path]
 
 
-class CampaignTurnLockRegistry:
-    def __init__(self) -> None:
-        self._guard = threading.Lock()
-        self._locks: Dict[str, threading.Lock] = {}
+class _CandidateResult(NamedTuple):
+    index: int
+    llm_output: Optional[Dict[str, object]]
+    error: Optional[BaseException]
 
-    def try_acquire(self, campaign_id: str) -> Optional[threading.Lock]:
-        with self._guard:
-            lock = self._locks.get(campaign_id)
-            if lock is None:
-                lock = threading.Lock()
-                self._locks[campaign_id] = lock
-        if not lock.acquire(blocking=False):
-            return None
-        return lock
 
-    def release(self, lock: threading.Lock) -> None:
-        lock.release()
+class _LLMOutcome(NamedTuple):
+    llm_output: Dict[str, object]
+    dialog_type: str
+    dialog_type_source: str
+    tool_calls: List[ToolCall]
+    applied_actions: List[AppliedAction]
+    tool_feedback: Optional[ToolFeedback]
+    conflicts: List[ConflictItem]
+
+
+_NEXT_CANDIDATE = object()
+_TurnSteps = Generator[object, object, Dict[str, object]]
+# Responses of the turns that ran, and the error that stopped the batch.
+_BatchResult = Tuple[List[Dict[str, object]], Optional[Exception]]
+_T = TypeVar("_T")
+
+
+class _PendingTurn:
+    # A committed turn whose changes are not saved yet, kept so they can be
+    # re-applied when the save finds the campaign saved by someone else.
+    def __init__(
+        self,
+        actor_id: str,
+        tool_calls: List[ToolCall],
+        applied_actions: List[AppliedAction],
+        tool_feedback: Optional[ToolFeedback],
+        turn_number: int,
+        retry_count: int,
+    ) -> None:
+        self.actor_id = actor_id
+        self.tool_calls = tool_calls
+        self.applied_actions = applied_actions
+        self.tool_feedback = tool_feedback
+        self.turn_number = turn_number
+        self.retry_count = retry_count
+
+
+class _CampaignSession:
+    # Save state shared by the turns run under one lock and load: `dirty`
+    # marks changes not yet written and `pending` the turns that made them;
+    # with save_each_turn off, committed turns leave them for the single save
+    # when the session ends. `saved_rows` is then the turn log length at load,
+    # where the log is cut back to if that save fails.
+    def __init__(self, lock: _CampaignTurnLock, *, save_each_turn: bool) -> None:
+        self.lock = lock
+        self.save_each_turn = save_each_turn
+        self.dirty = False
+        self.pending: List[_PendingTurn] = []
+        self.saved_rows: Optional[int] = None
+
+    def confirm_lock(self) -> None:
+        # Before every campaign, turn log or checkpoint write: in file lock
+        # mode a stalled worker may have lost its lease to another worker.
+        _CAMPAIGN_TURN_LOCKS.confirm(self.lock)
+
+
+class SemanticGuardError(ValueError):
+    pass
+
+
+# Saves tried per commit before a revision conflict fails the turn.
+_COMMIT_ATTEMPTS = 3
 
 
 _CAMPAIGN_TURN_LOCKS = CampaignTurnLockRegistry()
 
 
+def turn_lock_stats() -> Dict[str, object]:
+    return _CAMPAIGN_TURN_LOCKS.stats()
+
+
 class TurnService:
-    def __init__(self, repo: FileRepo) -> None:
+    def __init__(self, repo: Repository) -> None:
         self.repo = repo
         self.llm = LLMClient()
 
@@ -85,153 +186,446 @@ class TurnService:
         party_character_ids: List[str],
         active_actor_id: str,
     ) -> str:
-        campaign_id = self.repo.next_campaign_id()
-        starter_map = MapData(
-            areas={
-                "area_001": MapArea(
-                    id="area_001",
-                    name="Starting Area",
-                    description="A quiet checkpoint lit by a flickering lantern.",
-                    reachable_area_ids=["area_002"],
-                ),
-                "area_002": MapArea(
-                    id="area_002",
-                    name="Side Room",
-                    description="A cramped side room with scattered crates.",
-                    reachable_area_ids=[],
-                ),
-            },
-            connections=[],
-        )
-        actors = {
-            character_id: ActorState(
-                position="area_001",
-                hp=DEFAULT_HP,
-                character_state=DEFAULT_CHARACTER_STATE,
-                meta={},
-            )
-            for character_id in party_character_ids
-        }
-        if active_actor_id not in actors:
-            actors[active_actor_id] = ActorState(
-                position="area_001",
-                hp=DEFAULT_HP,
-                character_state=DEFAULT_CHARACTER_STATE,
-                meta={},
-            )
-        selected = Selected(
-            world_id=world_id,
-            map_id=map_id,
-            party_character_ids=party_character_ids,
-            active_actor_id=active_actor_id,
-        )
-        campaign = Campaign(
-            id=campaign_id,
-            selected=selected,
-            settings_snapshot=SettingsSnapshot(),
-            goal=Goal(text="Define the main objective", status="active"),
-            milestone=Milestone(current="intro", last_advanced_turn=0),
-            map=starter_map,
-            actors=actors,
+        campaign = _build_starter_campaign(
+            self.repo.next_campaign_id(),
+            Selected(
+                world_id=world_id,
+                map_id=map_id,
+                party_character_ids=party_character_ids,
+                active_actor_id=active_actor_id,
+            ),
         )
-        normalize_map(campaign.map)
         self.repo.create_campaign(campaign)
-        return campaign_id
+        return campaign.id
 
     def list_campaigns(self) -> List[CampaignSummary]:
         return self.repo.list_campaigns()
 
     def select_actor(self, campaign_id: str, actor_id: str) -> Campaign:
-        campaign = self.repo.get_campaign(campaign_id)
-        if actor_id not in campaign.selected.party_character_ids:
-            raise ValueError("actor_id not in party_character_ids")
-        return self.repo.update_active_actor(campaign, actor_id)
+        # Runs without the turn lock; a turn saving first means a reload.
+        attempts = 0
+        while True:
+            campaign = self.repo.get_campaign(campaign_id)
+            if actor_id not in campaign.selected.party_character_ids:
+                raise ValueError("actor_id not in party_character_ids")
+            try:
+                return self.repo.update_active_actor(campaign, actor_id)
+            except StaleCampaignError:
+                attempts += 1
+                if attempts >= _COMMIT_ATTEMPTS:
+                    raise
 
     def submit_turn(
         self, campaign_id: str, user_input: str, actor_id: Optional[str] = None
     ) -> Dict[str, object]:
-        campaign_lock = _CAMPAIGN_TURN_LOCKS.try_acquire(campaign_id)
-        if campaign_lock is None:
-            raise CampaignBusyError(
-                "campaign turn is already running; wait and retry."
+        return self._drive(self._turn_steps(campaign_id, user_input, actor_id))
+
+    def submit_turns(
+        self,
+        campaign_id: str,
+        turns: Sequence[Tuple[str, Optional[str]]],
+        *,
+        save_each_turn: bool = False,
+    ) -> _BatchResult:
+        # (user_input, actor_id) pairs run in order under one lock and one
+        # campaign load; the campaign is saved once at the end unless
+        # save_each_turn is set. Turn logs are still appended per turn and cut
+        # back if that final save fails.
+        return self._drive(
+            self._batch_steps(campaign_id, turns, save_each_turn=save_each_turn)
+        )
+
+    def _drive(self, steps: Generator[object, object, _T]) -> _T:
+        done, value = _resume_turn(steps, None)
+        while not done:
+            if isinstance(value, _TurnLockRequest):
+                try:
+                    campaign_lock = _CAMPAIGN_TURN_LOCKS.acquire(
+                        value.campaign_id, value.lock_path
+                    )
+                except CampaignBusyError as exc:
+                    done, value = _resume_turn(steps, None, exc)
+                else:
+                    done, value = _resume_turn(steps, campaign_lock)
+                continue
+            if isinstance(value, _Speculation):
+                done, value = self._generate_candidates(steps, value)
+                continue
+            try:
+                llm_output = self.llm.generate(*value)
+            except Exception as exc:
+                done, value = _resume_turn(steps, None, exc)
+            else:
+                done, value = _resume_turn(steps, llm_output)
+        return value
+
+    async def asubmit_turn(
+        self, campaign_id: str, user_input: str, actor_id: Optional[str] = None
+    ) -> Dict[str, object]:
+        # Same turn as submit_turn, but the LLM call is awaited on the event loop
+        # instead of holding a worker thread; storage steps still run in one.
+        return await self._adrive(self._turn_steps(campaign_id, user_input, actor_id))
+
+    async def asubmit_turns(
+        self,
+        campaign_id: str,
+        turns: Sequence[Tuple[str, Optional[str]]],
+        *,
+        save_each_turn: bool = False,
+    ) -> _BatchResult:
+        return await self._adrive(
+            self._batch_steps(campaign_id, turns, save_each_turn=save_each_turn)
+        )
+
+    async def _adrive(self, steps: Generator[object, object, _T]) -> _T:
+        try:
+            done, value = await self._astart(steps)
+            while not done:
+                if isinstance(value, _Speculation):
+                    done, value = await self._agenerate_candidates(steps, value)
+                    continue
+                try:
+                    llm_output = await self._agenerate(value)
+                except Exception as exc:
+                    done, value = await asyncio.to_thread(_resume_turn, steps, None, exc)
+                else:
+                    done, value = await asyncio.to_thread(_resume_turn, steps, llm_output)
+            return value
+        finally:
+            _close_turn(steps)
+
+    async def _astart(self, steps: Generator[object, object, _T]) -> Tuple[bool, object]:
+        # Runs the steps to their first LLM request. The turn lock is awaited
+        # on the event loop, so queued turns do not park worker threads.
+        done, value = _resume_turn(steps, None)
+        if done or not isinstance(value, _TurnLockRequest):
+            return done, value
+        try:
+            campaign_lock = await _CAMPAIGN_TURN_LOCKS.aacquire(
+                value.campaign_id, value.lock_path
             )
+        except CampaignBusyError as exc:
+            return _resume_turn(steps, None, exc)
+        return await asyncio.to_thread(_resume_turn, steps, campaign_lock)
+
+    async def astream_turn(
+        self, campaign_id: str, user_input: str, actor_id: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, object]]:
+        # Event stream for one turn: "start" once the turn is locked and the
+        # prompt is built, "delta" for assistant_text as it streams, "retry"
+        # before each conflict retry, and "final" with the committed response.
+        # Speculative candidates are not streamed; their round is one "retry".
+        steps = self._turn_steps(campaign_id, user_input, actor_id)
+        try:
+            done, value = await self._astart(steps)
+            yield {"event": "start", "data": {"campaign_id": campaign_id}}
+            attempt = 0
+            while not done:
+                attempt += 1
+                if isinstance(value, _Speculation):
+                    yield {
+                        "event": "retry",
+                        "data": {"attempt": attempt, "candidates": len(value.requests)},
+                    }
+                    done, value = await self._agenerate_candidates(steps, value)
+                    continue
+                if attempt > 1:
+                    yield {"event": "retry", "data": {"attempt": attempt}}
+                llm_output: Dict[str, object] = {}
+                try:
+                    async for kind, payload in self._astream_llm(value):
+                        if kind == "delta":
+                            yield {
+                                "event": "delta",
+                                "data": {"attempt": attempt, "text": payload},
+                            }
+                        else:
+                            llm_output = payload
+                except Exception as exc:
+                    done, value = await asyncio.to_thread(_resume_turn, steps, None, exc)
+                else:
+                    done, value = await asyncio.to_thread(_resume_turn, steps, llm_output)
+            yield {"event": "final", "data": value}
+        finally:
+            _close_turn(steps)
+
+    def _generate_candidates(
+        self, steps: _TurnSteps, speculation: _Speculation
+    ) -> Tuple[bool, object]:
+        executor = ThreadPoolExecutor(
+            max_workers=len(speculation.requests),
+            thread_name_prefix="turn-candidate",
+        )
+        try:
+            futures = {
+                executor.submit(self.llm.generate, *request): index
+                for index, request in enumerate(speculation.requests)
+            }
+            for future in as_completed(futures):
+                error = future.exception()
+                done, value = _resume_turn(
+                    steps,
+                    _CandidateResult(
+                        futures[future], None if error else future.result(), error
+                    ),
+                )
+                if done or value is not _NEXT_CANDIDATE:
+                    return done, value
+            raise RuntimeError("speculative round ended without a decision")
+        finally:
+            # Requests still in flight cannot be interrupted; their results
+            # are discarded.
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _agenerate_candidates(
+        self, steps: _TurnSteps, speculation: _Speculation
+    ) -> Tuple[bool, object]:
+        tasks = {
+            asyncio.ensure_future(self._agenerate(request)): index
+            for index, request in enumerate(speculation.requests)
+        }
+        pending = set(tasks)
+        try:
+            while pending:
+                finished, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in sorted(finished, key=tasks.__getitem__):
+                    error = task.exception()
+                    done, value = await asyncio.to_thread(
+                        _resume_turn,
+                        steps,
+                        _CandidateResult(
+                            tasks[task], None if error else task.result(), error
+                        ),
+                    )
+                    if done or value is not _NEXT_CANDIDATE:
+                        return done, value
+            raise RuntimeError("speculative round ended without a decision")
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _agenerate(self, request: _LLMRequest) -> Dict[str, object]:
+        agenerate = getattr(self.llm, "agenerate", None)
+        if agenerate is not None:
+            return await agenerate(*request)
+        return await asyncio.to_thread(self.llm.generate, *request)
+
+    async def _astream_llm(
+        self, request: _LLMRequest
+    ) -> AsyncIterator[Tuple[str, object]]:
+        astream = getattr(self.llm, "astream", None)
+        if astream is not None:
+            async for item in astream(*request):
+                yield item
+            return
+        llm_output = await self._agenerate(request)
+        text = llm_output.get("assistant_text")
+        if text:
+            yield ("delta", text)
+        yield ("output", llm_output)
+
+    def _turn_steps(
+        self, campaign_id: str, user_input: str, actor_id: Optional[str]
+    ) -> _TurnSteps:
+        # Yields each LLM request and receives its parsed output, so the sync
+        # and async drivers share one implementation of the turn.
+        def run(campaign: Campaign, session: _CampaignSession) -> _TurnSteps:
+            return (
+                yield from self._campaign_turn_steps(
+                    campaign, user_input, actor_id, session
+                )
+            )
+
+        return self._session_steps(campaign_id, run, save_each_turn=True)
+
+    def _batch_steps(
+        self,
+        campaign_id: str,
+        turns: Sequence[Tuple[str, Optional[str]]],
+        *,
+        save_each_turn: bool,
+    ) -> Generator[object, object, _BatchResult]:
+        # Runs the turns in order on one loaded campaign under one lock. A turn
+        # that raises stops the batch; its error is returned with the
+        # responses of the turns before it.
+        def run(
+            campaign: Campaign, session: _CampaignSession
+        ) -> Generator[object, object, _BatchResult]:
+            responses: List[Dict[str, object]] = []
+            for user_input, actor_id in turns:
+                try:
+                    response = yield from self._campaign_turn_steps(
+                        campaign, user_input, actor_id, session
+                    )
+                except Exception as exc:
+                    return responses, exc
+                responses.append(response)
+            return responses, None
+
+        return self._session_steps(campaign_id, run, save_each_turn=save_each_turn)
+
+    def _session_steps(
+        self,
+        campaign_id: str,
+        run: Callable[[Campaign, _CampaignSession], Generator[object, object, _T]],
+        *,
+        save_each_turn: bool,
+    ) -> Generator[object, object, _T]:
+        campaign_lock = yield _TurnLockRequest(
+            campaign_id, self.repo.turn_lock_path(campaign_id)
+        )
+        assert isinstance(campaign_lock, _CampaignTurnLock)
+        # Mutations are coalesced into as few saves as possible: the session
+        # tracks unsaved changes and the finally block flushes them when the
+        # turns exit without saving.
+        campaign: Optional[Campaign] = None
+        session = _CampaignSession(campaign_lock, save_each_turn=save_each_turn)
         try:
             campaign = self.repo.get_campaign(campaign_id)
-            state_updated = _ensure_minimum_state(campaign)
-            if state_updated:
+            if not save_each_turn:
+                session.saved_rows = self.repo.turn_log_row_count(campaign_id)
+            return (yield from run(campaign, session))
+        finally:
+            try:
+                if session.dirty and campaign is not None:
+                    self._flush_session(campaign, session)
+            finally:
+                _CAMPAIGN_TURN_LOCKS.release(campaign_lock)
+
+    def _flush_session(self, campaign: Campaign, session: _CampaignSession) -> None:
+        # Deferred turns are logged (and checkpointed) as they run. If their
+        # single save fails they never reached the campaign file, so their log
+        # rows and checkpoints are dropped and the log does not run ahead.
+        try:
+            self._save_session(campaign, session)
+        except CampaignBusyError:
+            # The lease is gone: the log now belongs to another worker.
+            raise
+        except BaseException:
+            if session.saved_rows is not None:
+                self.repo.truncate_turn_log(campaign.id, session.saved_rows)
+                self.repo.drop_checkpoints_after(campaign.id, session.saved_rows)
+            raise
+
+    def _save_session(self, campaign: Campaign, session: _CampaignSession) -> bool:
+        # Settings edits, actor selection and fact adoption save without the
+        # turn lock, so the compare-and-swap can find a newer revision. The
+        # session's unsaved turns are then re-applied to a fresh copy, which
+        # replaces the session state in place. Returns whether that happened.
+        rebased = False
+        attempts = 0
+        while True:
+            session.confirm_lock()
+            try:
                 self.repo.save_campaign(campaign)
+            except StaleCampaignError:
+                attempts += 1
+                if attempts >= _COMMIT_ATTEMPTS:
+                    raise
+                fresh = self.repo.get_campaign(campaign.id)
+                _reapply_turns(self.repo, fresh, session.pending)
+                _adopt_campaign_state(campaign, fresh)
+                rebased = True
+                continue
+            session.dirty = False
+            session.pending.clear()
+            return rebased
+
+    def _campaign_turn_steps(
+        self,
+        campaign: Campaign,
+        user_input: str,
+        actor_id: Optional[str],
+        session: _CampaignSession,
+    ) -> _TurnSteps:
+        # One turn on an already loaded, locked campaign. Tool changes of an
+        # attempt that does not commit are rolled back before leaving.
+        campaign_id = campaign.id
+        undo_log: Optional[CampaignUndoLog] = None
+        pending: Optional[_PendingTurn] = None
+        try:
+            if _ensure_minimum_state(campaign):
+                _forget_prompt_sections(campaign)
+                session.dirty = True
             effective_actor_id = actor_id or campaign.selected.active_actor_id
             if effective_actor_id not in campaign.selected.party_character_ids:
                 raise ValueError("actor_id not in party_character_ids")
             if _mark_ended_if_needed(campaign):
-                self.repo.save_campaign(campaign)
+                _PROMPT_FRAGMENTS.forget(campaign.lifecycle)
+                session.dirty = True
             _assert_turn_writable(campaign, effective_actor_id)
             response_debug = (
                 _build_turn_debug_payload(campaign, effective_actor_id)
                 if campaign.settings_snapshot.dialog.turn_profile_trace_enabled
                 else None
             )
-            system_prompt = _build_system_prompt(campaign, effective_actor_id)
+            recent_actor_ids = (
+                _recent_actor_ids(self.repo, campaign_id)
+                if campaign.settings_snapshot.context.budget_enabled
+                else []
+            )
+            system_prompt = _build_system_prompt(
+                campaign, effective_actor_id, recent_actor_ids
+            )
             retry_count = 0
             last_conflicts = []
             debug_append = None
             max_retries = 2
+            speculative_candidates = (
+                campaign.settings_snapshot.dialog.speculative_retry_candidates
+            )
+            summaries = _StateSummaries(campaign, effective_actor_id)
 
             while True:
-                llm_output = self.llm.generate(system_prompt, user_input, debug_append)
-                raw_dialog_type = llm_output.get("dialog_type")
-                _enforce_dialog_type_guard(
-                    raw_dialog_type,
-                    strict_mode=campaign.settings_snapshot.dialog.strict_semantic_guard,
-                )
-                dialog_type, dialog_type_source = _resolve_dialog_type(raw_dialog_type)
-                tool_calls = _parse_tool_calls(llm_output.get("tool_calls", []))
-                tool_calls, suppressed_failed_calls = _suppress_repeated_illegal_requests(
-                    self.repo,
-                    campaign_id,
-                    tool_calls,
-                )
-                state_before = _snapshot_state(campaign)
-                applied_actions, tool_feedback = execute_tool_calls(
-                    campaign, effective_actor_id, tool_calls, repo=self.repo
-                )
-                if suppressed_failed_calls:
-                    failed_calls = list(suppressed_failed_calls)
-                    if tool_feedback:
-                        failed_calls.extend(tool_feedback.failed_calls)
-                    tool_feedback = ToolFeedback(failed_calls=failed_calls)
-                state_after = _state_summary_dict(
-                    campaign, active_actor_id=effective_actor_id
-                )
-                conflicts = detect_conflicts(
-                    llm_output.get("assistant_text", ""),
-                    dialog_type,
-                    applied_actions,
-                    tool_feedback,
-                    state_before,
-                    state_after,
-                    enable_text_checks=(
-                        campaign.settings_snapshot.dialog.conflict_text_checks_enabled
-                    ),
-                )
-
-                if conflicts:
-                    _restore_state(campaign, state_before)
-                    last_conflicts = conflicts
-                    if retry_count < max_retries:
+                if response_debug is not None:
+                    _record_prompt_bytes(
+                        response_debug, system_prompt, user_input, debug_append
+                    )
+                llm_output = yield (system_prompt, user_input, debug_append)
+                undo_log = summaries.open_undo_log()
+                outcome = _apply_llm_output(self.repo, summaries, llm_output, undo_log)
+
+                if outcome.conflicts:
+                    summaries.rollback(undo_log)
+                    last_conflicts = outcome.conflicts
+                    if retry_count == 0 and speculative_candidates > 1:
+                        # One parallel round of candidates replaces the serial
+                        # retries; a round with no clean candidate fails the turn.
+                        outcome, undo_log = yield from _speculative_retry(
+                            self.repo,
+                            summaries,
+                            (system_prompt, user_input),
+                            outcome.conflicts,
+                            speculative_candidates,
+                            response_debug,
+                        )
+                        retry_count = 1 if not outcome.conflicts else speculative_candidates
+                        last_conflicts = outcome.conflicts or last_conflicts
+                    elif retry_count < max_retries:
                         retry_count += 1
-                        debug_append = _build_debug_append(conflicts, campaign)
+                        debug_append = _build_debug_append(
+                            outcome.conflicts, summaries.get()
+                        )
                         continue
-                    conflict_report = ConflictReport(
-                        retries=retry_count, conflicts=conflicts
-                    )
-                    return _build_failure_response(
-                        conflict_report,
-                        campaign,
-                        effective_actor_id,
-                        dialog_type,
-                        debug_payload=response_debug,
-                    )
+                    if outcome.conflicts:
+                        conflict_report = ConflictReport(
+                            retries=retry_count, conflicts=outcome.conflicts
+                        )
+                        return _build_failure_response(
+                            conflict_report,
+                            summaries.get(),
+                            outcome.dialog_type,
+                            debug_payload=response_debug,
+                        )
+
+                llm_output = outcome.llm_output
+                dialog_type = outcome.dialog_type
+                dialog_type_source = outcome.dialog_type_source
+                tool_calls = outcome.tool_calls
+                applied_actions = outcome.applied_actions
+                tool_feedback = outcome.tool_feedback
 
                 turn_id = self.repo.next_turn_id(campaign_id)
                 turn_number = _turn_id_to_number(turn_id)
@@ -241,9 +635,29 @@ class TurnService:
                     retry_count=retry_count,
                 )
                 lifecycle_changed = _mark_ended_if_needed(campaign)
+                if milestone_changed or lifecycle_changed:
+                    _PROMPT_FRAGMENTS.forget(campaign.milestone, campaign.lifecycle)
 
+                pending = _PendingTurn(
+                    effective_actor_id,
+                    tool_calls,
+                    applied_actions,
+                    tool_feedback,
+                    turn_number,
+                    retry_count,
+                )
+                session.pending.append(pending)
                 if applied_actions or milestone_changed or lifecycle_changed:
-                    self.repo.save_campaign(campaign)
+                    session.dirty = True
+                if session.dirty and session.save_each_turn:
+                    if self._save_session(campaign, session):
+                        # The undo log points at the replaced state.
+                        undo_log = None
+                        summaries.mark_mutated()
+                        applied_actions = pending.applied_actions
+                        tool_feedback = pending.tool_feedback
+                if session.save_each_turn:
+                    session.pending.clear()
 
                 conflict_report = (
                     ConflictReport(retries=retry_count, conflicts=last_conflicts)
@@ -263,41 +677,328 @@ class TurnService:
                     applied_actions=applied_actions,
                     tool_feedback=tool_feedback,
                     conflict_report=conflict_report,
-                    state_summary=StateSummary(active_actor_id=effective_actor_id),
-                )
-                (
-                    positions,
-                    positions_parent,
-                    positions_child,
-                    hp,
-                    character_states,
-                ) = _derive_character_state_maps(campaign)
-                entry.state_summary.positions = positions
-                entry.state_summary.positions_parent = positions_parent
-                entry.state_summary.positions_child = positions_child
-                entry.state_summary.hp = hp
-                entry.state_summary.character_states = character_states
-                entry.state_summary.inventories = _all_actor_inventories(campaign)
-                entry.state_summary.objective = campaign.goal.text.strip()
-                (
-                    entry.state_summary.active_area_id,
-                    entry.state_summary.active_area_name,
-                    entry.state_summary.active_area_description,
-                ) = _active_area_context(campaign, effective_actor_id)
-                entry.state_summary.active_actor_inventory = _active_actor_inventory(
-                    campaign, effective_actor_id
+                    state_summary=StateSummary(**summaries.get()),
                 )
+                session.confirm_lock()
                 self.repo.append_turn_log(campaign_id, entry)
+                undo_log = None
+                if _checkpoint_due(campaign, turn_number):
+                    session.confirm_lock()
+                    self.repo.save_checkpoint(
+                        campaign,
+                        turn_id,
+                        keep=campaign.settings_snapshot.rollback.max_checkpoints,
+                    )
                 return _build_success_response(
                     entry,
                     tool_calls,
                     applied_actions,
                     tool_feedback,
                     effective_actor_id=effective_actor_id,
+                    state_summary=summaries.get(),
                     debug_payload=response_debug,
                 )
-        finally:
-            _CAMPAIGN_TURN_LOCKS.release(campaign_lock)
+        except BaseException:
+            if undo_log is not None:
+                undo_log.rollback()
+            if pending in session.pending:
+                session.pending.remove(pending)
+            raise
+
+
+def _resume_turn(
+    steps: _TurnSteps,
+    sent: object,
+    error: Optional[Exception] = None,
+) -> Tuple[bool, object]:
+    # StopIteration cannot cross asyncio.to_thread, so completion is returned
+    # as (done, value): value is the next LLM request (or speculation step) or
+    # the turn response.
+    try:
+        if error is not None:
+            return False, steps.throw(error)
+        return False, steps.send(sent)
+    except StopIteration as stop:
+        return True, stop.value
+
+
+def _close_turn(steps: _TurnSteps) -> None:
+    # Runs the step generator's finally block (pending save, lock release) when
+    # an async driver is cancelled mid-turn. A step still executing in a worker
+    # thread cannot be closed here; it is finalized once that thread drops it.
+    if not steps.gi_running:
+        steps.close()
+
+
+class _StateSummaries:
+    # Per-turn memo of the state summary. `version` moves on whenever tool
+    # calls may have changed the campaign and goes back on rollback, so each
+    # distinct state is summarized once and the same dict is shared by the
+    # conflict check, the turn log entry and the response.
+    def __init__(self, campaign: Campaign, active_actor_id: str) -> None:
+        self.campaign = campaign
+        self.active_actor_id = active_actor_id
+        self.version = 0
+        self._next_version = 1
+        self._undo_version = 0
+        self._summaries: Dict[int, Dict[str, object]] = {}
+
+    def get(self) -> Dict[str, object]:
+        summary = self._summaries.get(self.version)
+        if summary is None:
+            summary = {
+                "active_actor_id": self.active_actor_id,
+                **_state_summary_dict(self.campaign, active_actor_id=self.active_actor_id),
+            }
+            self._summaries[self.version] = summary
+        return summary
+
+    def mark_mutated(self) -> None:
+        self.version = self._next_version
+        self._next_version += 1
+
+    def open_undo_log(self) -> CampaignUndoLog:
+        self._undo_version = self.version
+        return CampaignUndoLog(self.campaign)
+
+    def rollback(self, undo_log: CampaignUndoLog) -> None:
+        undo_log.rollback()
+        self.version = self._undo_version
+
+
+def _apply_llm_output(
+    repo: Repository,
+    summaries: _StateSummaries,
+    llm_output: Dict[str, object],
+    undo_log: CampaignUndoLog,
+) -> _LLMOutcome:
+    # Applies the output's tool calls to the campaign, recording what they
+    # touch in undo_log; the caller rolls it back when there are conflicts.
+    campaign = summaries.campaign
+    effective_actor_id = summaries.active_actor_id
+    raw_dialog_type = llm_output.get("dialog_type")
+    _enforce_dialog_type_guard(
+        raw_dialog_type,
+        strict_mode=campaign.settings_snapshot.dialog.strict_semantic_guard,
+    )
+    dialog_type, dialog_type_source = _resolve_dialog_type(raw_dialog_type)
+    tool_calls = _parse_tool_calls(llm_output.get("tool_calls", []))
+    tool_calls, suppressed_failed_calls = _suppress_repeated_illegal_requests(
+        repo,
+        campaign.id,
+        tool_calls,
+    )
+    state_before = summaries.get()
+    applied_actions, tool_feedback = execute_tool_calls(
+        campaign, effective_actor_id, tool_calls, repo=repo, undo_log=undo_log
+    )
+    if tool_calls:
+        summaries.mark_mutated()
+        _forget_touched_prompt_sections(campaign, undo_log)
+    if suppressed_failed_calls:
+        failed_calls = list(suppressed_failed_calls)
+        if tool_feedback:
+            failed_calls.extend(tool_feedback.failed_calls)
+        tool_feedback = ToolFeedback(failed_calls=failed_calls)
+    state_after = summaries.get()
+    conflicts = detect_conflicts(
+        llm_output.get("assistant_text", ""),
+        dialog_type,
+        applied_actions,
+        tool_feedback,
+        state_before,
+        state_after,
+        enable_text_checks=campaign.settings_snapshot.dialog.conflict_text_checks_enabled,
+    )
+    return _LLMOutcome(
+        llm_output=llm_output,
+        dialog_type=dialog_type,
+        dialog_type_source=dialog_type_source,
+        tool_calls=tool_calls,
+        applied_actions=applied_actions,
+        tool_feedback=tool_feedback,
+        conflicts=conflicts,
+    )
+
+
+def _speculative_retry(
+    repo: Repository,
+    summaries: _StateSummaries,
+    prompt: Tuple[str, str],
+    conflicts: List[ConflictItem],
+    candidate_count: int,
+    response_debug: Optional[Dict[str, object]],
+) -> Generator[object, object, Tuple[_LLMOutcome, CampaignUndoLog]]:
+    # Issues candidate_count corrected requests at once and validates each
+    # result as it arrives against the pre-turn state, rolling back every
+    # conflicting candidate. Returns the first conflict-free outcome with the
+    # undo log of its changes, or the last conflicting one; raises
+    # the last error when no candidate produced an output at all.
+    system_prompt, user_input = prompt
+    requests = []
+    for index in range(candidate_count):
+        debug_append = _build_debug_append(
+            conflicts, summaries.get(), candidate=(index + 1, candidate_count)
+        )
+        if response_debug is not None:
+            _record_prompt_bytes(response_debug, system_prompt, user_input, debug_append)
+        requests.append((system_prompt, user_input, debug_append))
+
+    rejected: Optional[_LLMOutcome] = None
+    last_error: Optional[BaseException] = None
+    result = yield _Speculation(tuple(requests))
+    for received in range(1, candidate_count + 1):
+        assert isinstance(result, _CandidateResult)
+        if result.error is not None:
+            last_error = result.error
+        elif result.llm_output is not None:
+            undo_log = summaries.open_undo_log()
+            try:
+                outcome = _apply_llm_output(repo, summaries, result.llm_output, undo_log)
+            except SemanticGuardError as exc:
+                summaries.rollback(undo_log)
+                last_error = exc
+            except BaseException:
+                # Any other failure ends the turn; the candidate's partial
+                # tool changes must not reach a later save.
+                summaries.rollback(undo_log)
+                raise
+            else:
+                if not outcome.conflicts:
+                    return outcome, undo_log
+                summaries.rollback(undo_log)
+                rejected = outcome
+        if received < candidate_count:
+            result = yield _NEXT_CANDIDATE
+    if rejected is None:
+        assert last_error is not None
+        raise last_error
+    return rejected, summaries.open_undo_log()
+
+
+def _build_starter_campaign(campaign_id: str, selected: Selected) -> Campaign:
+    # The state create_campaign persists: starter map, party at area_001.
+    starter_map = MapData(
+        areas={
+            "area_001": MapArea(
+                id="area_001",
+                name="Starting Area",
+                description="A quiet checkpoint lit by a flickering lantern.",
+                reachable_area_ids=["area_002"],
+            ),
+            "area_002": MapArea(
+                id="area_002",
+                name="Side Room",
+                description="A cramped side room with scattered crates.",
+                reachable_area_ids=[],
+            ),
+        },
+        connections=[],
+    )
+    actors = {
+        character_id: ActorState(
+            position="area_001",
+            hp=DEFAULT_HP,
+            character_state=DEFAULT_CHARACTER_STATE,
+            meta={},
+        )
+        for character_id in selected.party_character_ids
+    }
+    if selected.active_actor_id not in actors:
+        actors[selected.active_actor_id] = ActorState(
+            position="area_001",
+            hp=DEFAULT_HP,
+            character_state=DEFAULT_CHARACTER_STATE,
+            meta={},
+        )
+    campaign = Campaign(
+        id=campaign_id,
+        selected=selected,
+        settings_snapshot=SettingsSnapshot(),
+        goal=Goal(text="Define the main objective", status="active"),
+        milestone=Milestone(current="intro", last_advanced_turn=0),
+        map=starter_map,
+        actors=actors,
+    )
+    normalize_map(campaign.map)
+    return campaign
+
+
+def _pin_spawned_actor_ids(
+    campaign: Campaign,
+    applied_actions: List[AppliedAction],
+    logged_actions: object,
+) -> None:
+    # actor_spawn allocates random ids; renaming each replayed spawn to the
+    # id its logged counterpart got keeps later turns' actor ids resolvable.
+    logged_ids = [
+        action.get("result", {}).get("actor_id")
+        for action in (logged_actions if isinstance(logged_actions, list) else [])
+        if isinstance(action, dict) and action.get("tool") == "actor_spawn"
+    ]
+    replayed_ids = [
+        action.result.get("actor_id")
+        for action in applied_actions
+        if action.tool == "actor_spawn"
+    ]
+    for old_id, new_id in zip(replayed_ids, logged_ids):
+        if not isinstance(old_id, str) or not isinstance(new_id, str) or old_id == new_id:
+            continue
+        if new_id in campaign.actors:
+            continue
+        for name in ("actors", "positions", "hp", "character_states"):
+            setattr(campaign, name, _renamed(getattr(campaign, name), old_id, new_id))
+        for name in ("positions", "positions_parent", "positions_child"):
+            setattr(
+                campaign.state, name, _renamed(getattr(campaign.state, name), old_id, new_id)
+            )
+        selected = campaign.selected
+        selected.party_character_ids = [
+            new_id if actor_id == old_id else actor_id
+            for actor_id in selected.party_character_ids
+        ]
+        if selected.active_actor_id == old_id:
+            selected.active_actor_id = new_id
+
+
+def _renamed(mapping: Dict[str, Any], old_key: str, new_key: str) -> Dict[str, Any]:
+    return {(new_key if key == old_key else key): value for key, value in mapping.items()}
+
+
+def _reapply_turns(repo: Repository, campaign: Campaign, turns: List[_PendingTurn]) -> None:
+    # Replays unsaved turns' tool calls on a fresh copy of the campaign, in
+    # commit order. A turn whose tools no longer apply the same way would
+    # contradict its narration, so that is a conflict the turn cannot absorb.
+    _ensure_minimum_state(campaign)
+    for turn in turns:
+        applied_actions, tool_feedback = execute_tool_calls(
+            campaign, turn.actor_id, turn.tool_calls, repo=repo
+        )
+        if [action.tool for action in applied_actions] != [
+            action.tool for action in turn.applied_actions
+        ]:
+            raise StaleCampaignError(
+                f"campaign {campaign.id} changed during the turn and its tool "
+                "calls no longer apply; retry the turn."
+            )
+        _pin_spawned_actor_ids(
+            campaign,
+            applied_actions,
+            [_model_to_dict(action) for action in turn.applied_actions],
+        )
+        for applied, original in zip(applied_actions, turn.applied_actions):
+            if applied.tool == "actor_spawn":
+                applied.result = original.result
+        turn.applied_actions = applied_actions
+        turn.tool_feedback = tool_feedback
+        _advance_milestone(campaign, turn.turn_number, turn.retry_count)
+        _mark_ended_if_needed(campaign)
+
+
+def _adopt_campaign_state(campaign: Campaign, source: Campaign) -> None:
+    fields = getattr(type(source), "model_fields", None) or source.__fields__
+    for name in fields:
+        setattr(campaign, name, getattr(source, name))
 
 
 def _ensure_minimum_state(campaign: Campaign) -> bool:
@@ -373,44 +1074,6 @@ def _model_to_dict(model: object) -> Dict[str, object]:
     return {}
 
 
-def _snapshot_state(campaign: Campaign) -> Dict[str, object]:
-    if hasattr(campaign.map, "model_copy"):
-        map_copy = campaign.map.model_copy(deep=True)
-    elif hasattr(campaign.map, "copy"):
-        map_copy = campaign.map.copy(deep=True)
-    else:
-        map_copy = deepcopy(campaign.map)
-    (
-        positions,
-        positions_parent,
-        positions_child,
-        hp,
-        character_states,
-    ) = _derive_character_state_maps(campaign)
-    return {
-        "actors": deepcopy(campaign.actors),
-        "state": deepcopy(campaign.state),
-        "campaign_positions": deepcopy(campaign.positions),
-        "campaign_hp": deepcopy(campaign.hp),
-        "campaign_character_states": deepcopy(campaign.character_states),
-        "positions": positions,
-        "positions_parent": positions_parent,
-        "positions_child": positions_child,
-        "hp": hp,
-        "character_states": character_states,
-        "map": map_copy,
-    }
-
-
-def _restore_state(campaign: Campaign, snapshot: Dict[str, object]) -> None:
-    campaign.actors = snapshot["actors"]
-    campaign.state = snapshot["state"]
-    campaign.positions = snapshot["campaign_positions"]
-    campaign.hp = snapshot["campaign_hp"]
-    campaign.character_states = snapshot["campaign_character_states"]
-    campaign.map = snapshot["map"]
-
-
 def _state_summary_dict(
     campaign: Campaign, active_actor_id: Optional[str] = None
 ) -> Dict[str, object]:
@@ -450,34 +1113,128 @@ def _derive_character_state_maps(campaign: Campaign) -> tuple[
     return _CHARACTER_FACADE.build_state_maps(campaign)
 
 
-def _build_actor_prompt_payloads(
-    campaign: Campaign,
-) -> tuple[Dict[str, Dict[str, object]], Dict[str, Dict[str, object]]]:
-    actors_payload: Dict[str, Dict[str, object]] = {}
+def _actor_prompt_payload(actor: ActorState) -> Dict[str, object]:
+    actor_meta = actor.meta if isinstance(actor.meta, dict) else {}
+    return {
+        "position": actor.position,
+        "hp": actor.hp,
+        "character_state": actor.character_state,
+        "inventory": _normalized_inventory(actor),
+        "meta": {key: value for key, value in actor_meta.items() if key != "profile"},
+    }
+
+
+def _adopted_profiles_by_actor(campaign: Campaign) -> Dict[str, Dict[str, object]]:
     adopted_profiles_by_actor: Dict[str, Dict[str, object]] = {}
     for actor_id in sorted(campaign.actors.keys()):
-        actor = campaign.actors[actor_id]
-        actor_meta = actor.meta if isinstance(actor.meta, dict) else {}
-        meta_payload = {key: value for key, value in actor_meta.items() if key != "profile"}
-        actors_payload[actor_id] = {
-            "position": actor.position,
-            "hp": actor.hp,
-            "character_state": actor.character_state,
-            "inventory": _active_actor_inventory(campaign, actor_id),
-            "meta": meta_payload,
-        }
-        profile_payload = actor_meta.get("profile")
+        actor_meta = campaign.actors[actor_id].meta
+        profile_payload = actor_meta.get("profile") if isinstance(actor_meta, dict) else None
         if isinstance(profile_payload, dict):
             adopted_profiles_by_actor[actor_id] = dict(profile_payload)
-    return actors_payload, adopted_profiles_by_actor
+    return adopted_profiles_by_actor
+
+
+def _forget_prompt_sections(campaign: Campaign) -> None:
+    _PROMPT_FRAGMENTS.forget(
+        campaign.selected,
+        campaign.settings_snapshot,
+        campaign.goal,
+        campaign.lifecycle,
+        campaign.milestone,
+        campaign.map,
+        campaign.state,
+        *campaign.map.areas.values(),
+        *campaign.actors.values(),
+    )
 
 
-def _build_system_prompt(campaign: Campaign, effective_actor_id: str) -> str:
+def _forget_touched_prompt_sections(campaign: Campaign, undo_log: CampaignUndoLog) -> None:
+    # Tools change sections in place, so their memoized hashes are dropped for
+    # whatever the undo log saw them touch. Spawning and moving actors also
+    # edit the party list and the state position maps.
+    recorded = undo_log.recorded
+    if not recorded:
+        return
+    _PROMPT_FRAGMENTS.forget(campaign.selected, campaign.state)
+    for kind, key in recorded:
+        if kind == "actor":
+            _PROMPT_FRAGMENTS.forget(campaign.actors.get(key))
+        elif kind == "map":
+            _PROMPT_FRAGMENTS.forget(campaign.map, *campaign.map.areas.values())
+
+
+def _actors_prompt_fragment(campaign: Campaign) -> Encoded:
+    # Each actor's payload depends only on its ActorState, so actors untouched
+    # since an earlier turn reuse their cached fragment.
+    return encode_object(
+        {
+            actor_id: _PROMPT_FRAGMENTS.model_fragment(
+                "actor_prompt", campaign.actors[actor_id], _actor_prompt_payload
+            )
+            for actor_id in sorted(campaign.actors.keys())
+        }
+    )
+
+
+# Constant GM rules and examples. Kept out of the per-turn context so the first
+# system message is byte-identical across turns and campaigns (prompt caching).
+_GM_INSTRUCTIONS = (
+    "You are the AI GM. Output JSON with keys 'assistant_text', 'dialog_type', and 'tool_calls'. "
+    "The world state is authoritative and can change only via tool_calls. "
+    "Movement is a state change. If you narrate that an actor moved/entered/arrived/left/changed location, "
+    "you MUST include a 'move' tool_call in the same response. "
+    "Inventory gain is a state change. If you narrate gaining/obtaining/receiving/picking up an item, "
+    "you MUST include an 'inventory_add' tool_call in the same response. "
+    "HP change is a state change. If you narrate injury/damage/healing/recovery, "
+    "you MUST include an 'hp_delta' tool_call in the same response. "
+    "For move tool_calls, args must include to_area_id and may include actor_id; do NOT include from_area_id. "
+    "If you do not include a 'move' tool_call, do not narrate any completed movement or location change; "
+    "you may describe the current scene or discuss options/intentions. "
+    "Priority and fallback for movement intent: If the user expresses intent to move (go/move/enter a place), "
+    "you MUST output a 'move' tool_call first. When you output a move or move_options tool_call, "
+    "assistant_text must be empty ('') or a single very short plan_note; do not narrate completed movement. "
+    "If the target is unclear, do not narrate movement; "
+    "call 'move_options' to fetch 1-hop options and state that no movement happened yet. "
+    "If tool_calls is empty, assistant_text must not describe any completed movement or location change. "
+    "If tool_calls is empty, assistant_text MUST be a non-empty GM response (answer, description, or guidance). "
+    "assistant_text may be empty ONLY when you are making a tool call. "
+    "For questions like 'Can I move?' or 'Where can I go?', call 'move_options' and list the returned "
+    "1-hop options; explicitly state that no movement has happened yet. "
+    "Examples (JSON outputs, schema-accurate). "
+    "Example 1 (move intent is explicit and IDs are known; assistant_text empty; "
+    "to_area_id must come from the user's specified target; actor_id may be omitted "
+    "to use Context.effective_actor_id; from_area_id is derived by the backend "
+    "from Context.actors[...].position and MUST NOT be included): "
+    "{\"assistant_text\":\"\",\"dialog_type\":\"scene_description\","
+    "\"tool_calls\":[{\"id\":\"call_move_1\",\"tool\":\"move\",\"args\":"
+    "{\"actor_id\":\"pc_001\",\"to_area_id\":\"area_002\"}}]} "
+    "Example 2 (target unclear or user asks where they can go; use move_options; no movement yet; "
+    "actor_id should come from Context.effective_actor_id): "
+    "{\"assistant_text\":\"No movement yet. I will fetch 1-hop options.\","
+    "\"dialog_type\":\"scene_description\","
+    "\"tool_calls\":[{\"id\":\"call_move_options_1\",\"tool\":\"move_options\",\"args\":"
+    "{\"actor_id\":\"pc_001\"}}]} "
+    "Example 3 (no tool call required; MUST respond with non-empty assistant_text): "
+    "{\"assistant_text\":\"You are currently in area_002. The corridor is quiet. What do you do next?\","
+    "\"dialog_type\":\"scene_description\",\"tool_calls\":[]} "
+    "For descriptive character facts, prioritize Context.adopted_profiles_by_actor[actor_id] "
+    "when present; otherwise fallback to Context.actors[actor_id].meta. "
+    "Do not modify rules, maps, or character sheets."
+)
+
+
+def _build_system_prompt(
+    campaign: Campaign,
+    effective_actor_id: str,
+    recent_actor_ids: Sequence[str] = (),
+) -> SystemPrompt:
+    if campaign.settings_snapshot.context.budget_enabled:
+        return _build_budgeted_system_prompt(campaign, effective_actor_id, recent_actor_ids)
     positions, _, _, hp, character_states = _derive_character_state_maps(campaign)
-    actors_payload, adopted_profiles_by_actor = _build_actor_prompt_payloads(campaign)
+    adopted_profiles_by_actor = _adopted_profiles_by_actor(campaign)
     compress_enabled = campaign.settings_snapshot.context.compress_enabled
     if compress_enabled:
-        active_state = _CHARACTER_FACADE.get_state(campaign, effective_actor_id)
+        active_state = _CHARACTER_FACADE.read_state(campaign, effective_actor_id)
         _, active_area_name, active_area_description = _active_area_context(
             campaign, effective_actor_id
         )
@@ -487,11 +1244,11 @@ def _build_system_prompt(campaign: Campaign, effective_actor_id: str) -> str:
             "default_dialog_type": DEFAULT_DIALOG_TYPE,
             "allowlist": campaign.allowlist,
             "effective_actor_id": effective_actor_id,
-            "selected": _model_to_dict(campaign.selected),
-            "settings_snapshot": _model_to_dict(campaign.settings_snapshot),
-            "goal": _model_to_dict(campaign.goal),
-            "lifecycle": _model_to_dict(campaign.lifecycle),
-            "milestone": _model_to_dict(campaign.milestone),
+            "selected": _PROMPT_FRAGMENTS.model_fragment("model", campaign.selected),
+            "settings_snapshot": _PROMPT_FRAGMENTS.model_fragment("model", campaign.settings_snapshot),
+            "goal": _PROMPT_FRAGMENTS.model_fragment("model", campaign.goal),
+            "lifecycle": _PROMPT_FRAGMENTS.model_fragment("model", campaign.lifecycle),
+            "milestone": _PROMPT_FRAGMENTS.model_fragment("model", campaign.milestone),
             "map_summary": {
                 "area_count": len(campaign.map.areas),
                 "active_actor_area_id": active_state.position,
@@ -524,14 +1281,14 @@ def _build_system_prompt(campaign: Campaign, effective_actor_id: str) -> str:
             "default_dialog_type": DEFAULT_DIALOG_TYPE,
             "allowlist": campaign.allowlist,
             "effective_actor_id": effective_actor_id,
-            "selected": _model_to_dict(campaign.selected),
-            "settings_snapshot": _model_to_dict(campaign.settings_snapshot),
-            "goal": _model_to_dict(campaign.goal),
-            "lifecycle": _model_to_dict(campaign.lifecycle),
-            "milestone": _model_to_dict(campaign.milestone),
-            "map": _model_to_dict(campaign.map),
-            "state": _model_to_dict(campaign.state),
-            "actors": actors_payload,
+            "selected": _PROMPT_FRAGMENTS.model_fragment("model", campaign.selected),
+            "settings_snapshot": _PROMPT_FRAGMENTS.model_fragment("model", campaign.settings_snapshot),
+            "goal": _PROMPT_FRAGMENTS.model_fragment("model", campaign.goal),
+            "lifecycle": _PROMPT_FRAGMENTS.model_fragment("model", campaign.lifecycle),
+            "milestone": _PROMPT_FRAGMENTS.model_fragment("model", campaign.milestone),
+            "map": _PROMPT_FRAGMENTS.model_fragment("model", campaign.map),
+            "state": _PROMPT_FRAGMENTS.model_fragment("model", campaign.state),
+            "actors": _actors_prompt_fragment(campaign),
             "adopted_profiles_by_actor": adopted_profiles_by_actor,
             "positions": positions,
             "hp": hp,
@@ -542,56 +1299,139 @@ def _build_system_prompt(campaign: Campaign, effective_actor_id: str) -> str:
                 "tool_calls": "array of tool calls",
             },
         }
-    return (
-        "You are the AI GM. Output JSON with keys 'assistant_text', 'dialog_type', and 'tool_calls'. "
-        "The world state is authoritative and can change only via tool_calls. "
-        "Movement is a state change. If you narrate that an actor moved/entered/arrived/left/changed location, "
-        "you MUST include a 'move' tool_call in the same response. "
-        "Inventory gain is a state change. If you narrate gaining/obtaining/receiving/picking up an item, "
-        "you MUST include an 'inventory_add' tool_call in the same response. "
-        "HP change is a state change. If you narrate injury/damage/healing/recovery, "
-        "you MUST include an 'hp_delta' tool_call in the same response. "
-        "For move tool_calls, args must include to_area_id and may include actor_id; do NOT include from_area_id. "
-        "If you do not include a 'move' tool_call, do not narrate any completed movement or location change; "
-        "you may describe the current scene or discuss options/intentions. "
-        "Priority and fallback for movement intent: If the user expresses intent to move (go/move/enter a place), "
-        "you MUST output a 'move' tool_call first. When you output a move or move_options tool_call, "
-        "assistant_text must be empty ('') or a single very short plan_note; do not narrate completed movement. "
-        "If the target is unclear, do not narrate movement; "
-        "call 'move_options' to fetch 1-hop options and state that no movement happened yet. "
-        "If tool_calls is empty, assistant_text must not describe any completed movement or location change. "
-        "If tool_calls is empty, assistant_text MUST be a non-empty GM response (answer, description, or guidance). "
-        "assistant_text may be empty ONLY when you are making a tool call. "
-        "For questions like 'Can I move?' or 'Where can I go?', call 'move_options' and list the returned "
-        "1-hop options; explicitly state that no movement has happened yet. "
-        "Examples (JSON outputs, schema-accurate). "
-        "Example 1 (move intent is explicit and IDs are known; assistant_text empty; "
-        "to_area_id must come from the user's specified target; actor_id may be omitted "
-        "to use Context.effective_actor_id; from_area_id is derived by the backend "
-        "from Context.actors[...].position and MUST NOT be included): "
-        "{\"assistant_text\":\"\",\"dialog_type\":\"scene_description\","
-        "\"tool_calls\":[{\"id\":\"call_move_1\",\"tool\":\"move\",\"args\":"
-        "{\"actor_id\":\"pc_001\",\"to_area_id\":\"area_002\"}}]} "
-        "Example 2 (target unclear or user asks where they can go; use move_options; no movement yet; "
-        "actor_id should come from Context.effective_actor_id): "
-        "{\"assistant_text\":\"No movement yet. I will fetch 1-hop options.\","
-        "\"dialog_type\":\"scene_description\","
-        "\"tool_calls\":[{\"id\":\"call_move_options_1\",\"tool\":\"move_options\",\"args\":"
-        "{\"actor_id\":\"pc_001\"}}]} "
-        "Example 3 (no tool call required; MUST respond with non-empty assistant_text): "
-        "{\"assistant_text\":\"You are currently in area_002. The corridor is quiet. What do you do next?\","
-        "\"dialog_type\":\"scene_description\",\"tool_calls\":[]} "
-        "For descriptive character facts, prioritize Context.adopted_profiles_by_actor[actor_id] "
-        "when present; otherwise fallback to Context.actors[actor_id].meta. "
-        "Do not modify rules, maps, or character sheets. "
-        f"Context: {json.dumps(payload, ensure_ascii=False)}"
+    # Assembled from cached section fragments; the bytes match
+    # json.dumps(payload, ensure_ascii=False) of the fully expanded payload.
+    return SystemPrompt(_GM_INSTRUCTIONS, f"Context: {encode_object(payload)}")
+
+
+def _build_budgeted_system_prompt(
+    campaign: Campaign,
+    effective_actor_id: str,
+    recent_actor_ids: Sequence[str],
+) -> SystemPrompt:
+    # Fixed sections first, then areas and actors ranked by distance from the
+    # active actor are packed until the Context message reaches budget_bytes.
+    budget_bytes = campaign.settings_snapshot.context.budget_bytes
+    active_state = _CHARACTER_FACADE.read_state(campaign, effective_actor_id)
+    distances = area_distances(campaign.map, active_state.position)
+    adopted_profiles_by_actor = _adopted_profiles_by_actor(campaign)
+    budget = {
+        "budget_bytes": budget_bytes,
+        "area_count": len(campaign.map.areas),
+        "areas_included": 0,
+        "actor_count": len(campaign.actors),
+        "actors_included": 0,
+    }
+    payload: Dict[str, object] = {
+        "context_mode": "budgeted",
+        "dialog_types": DIALOG_TYPES,
+        "default_dialog_type": DEFAULT_DIALOG_TYPE,
+        "allowlist": campaign.allowlist,
+        "effective_actor_id": effective_actor_id,
+        "selected": _PROMPT_FRAGMENTS.model_fragment("model", campaign.selected),
+        "settings_snapshot": _PROMPT_FRAGMENTS.model_fragment(
+            "model", campaign.settings_snapshot
+        ),
+        "goal": _PROMPT_FRAGMENTS.model_fragment("model", campaign.goal),
+        "lifecycle": _PROMPT_FRAGMENTS.model_fragment("model", campaign.lifecycle),
+        "milestone": _PROMPT_FRAGMENTS.model_fragment("model", campaign.milestone),
+        "active_actor_inventory": _active_actor_inventory(campaign, effective_actor_id),
+        "context_budget": budget,
+        "map": {"areas": {}},
+        "actors": {},
+        "adopted_profiles_by_actor": {},
+        "response_format": {
+            "assistant_text": "string narrative",
+            "dialog_type": "one of dialog_types",
+            "tool_calls": "array of tool calls",
+        },
+    }
+    # The budget counters are filled in after packing; reserve room for them.
+    base_bytes = _utf8_len(f"Context: {encode_object(payload)}") + 64
+
+    candidates = [
+        BudgetCandidate(distances.get(area_id, UNREACHABLE_DISTANCE), "area", area_id)
+        for area_id in campaign.map.areas
+    ]
+    candidates.extend(
+        BudgetCandidate(
+            actor_priority(
+                actor_id,
+                actor,
+                effective_actor_id=effective_actor_id,
+                distances=distances,
+                recent_actor_ids=recent_actor_ids,
+            ),
+            "actor",
+            actor_id,
+        )
+        for actor_id, actor in campaign.actors.items()
     )
+    fragments: Dict[BudgetCandidate, Encoded] = {}
+
+    def cost_of(candidate: BudgetCandidate) -> int:
+        # An entry costs its key, its value and the ", " / ": " separators; an
+        # actor also brings its adopted profile, if any.
+        if candidate.kind == "area":
+            fragment = _PROMPT_FRAGMENTS.model_fragment(
+                "model", campaign.map.areas[candidate.key]
+            )
+        else:
+            fragment = _PROMPT_FRAGMENTS.model_fragment(
+                "actor_prompt", campaign.actors[candidate.key], _actor_prompt_payload
+            )
+        fragments[candidate] = fragment
+        key_bytes = _utf8_len(dump_value(candidate.key)) + 4
+        cost = key_bytes + _utf8_len(fragment)
+        profile = adopted_profiles_by_actor.get(candidate.key)
+        if candidate.kind == "actor" and profile is not None:
+            cost += key_bytes + _utf8_len(dump_value(profile))
+        return cost
+
+    areas: Dict[str, Encoded] = {}
+    actors: Dict[str, Encoded] = {}
+    profiles: Dict[str, Dict[str, object]] = {}
+    for candidate in pack_by_priority(candidates, cost_of, budget_bytes - base_bytes):
+        if candidate.kind == "area":
+            areas[candidate.key] = fragments[candidate]
+            continue
+        actors[candidate.key] = fragments[candidate]
+        if candidate.key in adopted_profiles_by_actor:
+            profiles[candidate.key] = adopted_profiles_by_actor[candidate.key]
+    budget["areas_included"] = len(areas)
+    budget["actors_included"] = len(actors)
+    payload["map"] = encode_object({"areas": encode_object(areas)})
+    payload["actors"] = encode_object(actors)
+    payload["adopted_profiles_by_actor"] = profiles
+    return SystemPrompt(_GM_INSTRUCTIONS, f"Context: {encode_object(payload)}")
+
+
+def _utf8_len(text: str) -> int:
+    return len(text.encode("utf-8"))
+
+
+def _recent_actor_ids(repo: Repository, campaign_id: str, limit: int = 8) -> List[str]:
+    # Actors touched by applied actions in the last `limit` turns, newest first.
+    recent: List[str] = []
+    for index, row in enumerate(
+        repo.iter_turn_log_rows(campaign_id, reverse=True, state_summary=False)
+    ):
+        if index >= limit:
+            break
+        for action in row.get("applied_actions") or []:
+            if not isinstance(action, dict):
+                continue
+            for source in (action.get("result"), action.get("args")):
+                actor_id = source.get("actor_id") if isinstance(source, dict) else None
+                if isinstance(actor_id, str) and actor_id not in recent:
+                    recent.append(actor_id)
+    return recent
 
 
 def _build_turn_debug_payload(
     campaign: Campaign, active_actor_id: str
 ) -> Dict[str, object]:
-    _, adopted_profiles_by_actor = _build_actor_prompt_payloads(campaign)
+    adopted_profiles_by_actor = _adopted_profiles_by_actor(campaign)
     encoded = json.dumps(
         adopted_profiles_by_actor,
         sort_keys=True,
@@ -609,11 +1449,35 @@ def _build_turn_debug_payload(
     return payload
 
 
-def _build_debug_append(conflicts: List[object], campaign: Campaign) -> str:
-    payload = {
+def _record_prompt_bytes(
+    debug_payload: Dict[str, object],
+    system_prompt: str,
+    user_input: str,
+    debug_append: Optional[str],
+) -> None:
+    # Totals over every attempt of the turn, retries included.
+    static_bytes, dynamic_bytes = prompt_byte_sizes(system_prompt, user_input, debug_append)
+    totals = debug_payload.setdefault(
+        "prompt_bytes", {"attempts": 0, "static_bytes": 0, "dynamic_bytes": 0}
+    )
+    totals["attempts"] += 1
+    totals["static_bytes"] += static_bytes
+    totals["dynamic_bytes"] += dynamic_bytes
+
+
+def _build_debug_append(
+    conflicts: List[object],
+    state_summary: Dict[str, object],
+    candidate: Optional[Tuple[int, int]] = None,
+) -> str:
+    payload: Dict[str, object] = {
         "conflicts": [_model_to_dict(conflict) for conflict in conflicts],
-        "authoritative_state": _state_summary_dict(campaign),
+        "authoritative_state": state_summary,
     }
+    if candidate is not None:
+        # Distinct per speculative candidate so providers do not serve one
+        # cached completion to every request of the round.
+        payload["candidate"] = {"index": candidate[0], "of": candidate[1]}
     return (
         "Your last output conflicted with authoritative state. "
         "Fix narrative/tool_calls to comply. "
@@ -649,14 +1513,9 @@ def _build_success_response(
     tool_feedback: object,
     *,
     effective_actor_id: str,
+    state_summary: Dict[str, object],
     debug_payload: Optional[Dict[str, object]] = None,
 ) -> Dict[str, object]:
-    if hasattr(entry.state_summary, "model_dump"):
-        state_summary = entry.state_summary.model_dump()
-    elif hasattr(entry.state_summary, "dict"):
-        state_summary = entry.state_summary.dict()
-    else:
-        state_summary = entry.state_summary
     tool_calls_payload = [_model_to_dict(call) for call in tool_calls]
     applied_actions_payload = [_model_to_dict(action) for action in applied_actions]
     tool_feedback_payload = _model_to_dict(tool_feedback) if tool_feedback else None
@@ -682,43 +1541,19 @@ def _build_success_response(
 
 def _build_failure_response(
     conflict_report: ConflictReport,
-    campaign: Campaign,
-    effective_actor_id: str,
+    state_summary: Dict[str, object],
     dialog_type: str,
     debug_payload: Optional[Dict[str, object]] = None,
 ) -> Dict[str, object]:
-    state_summary = StateSummary(active_actor_id=effective_actor_id)
-    (
-        positions,
-        positions_parent,
-        positions_child,
-        hp,
-        character_states,
-    ) = _derive_character_state_maps(campaign)
-    state_summary.positions = positions
-    state_summary.positions_parent = positions_parent
-    state_summary.positions_child = positions_child
-    state_summary.hp = hp
-    state_summary.character_states = character_states
-    state_summary.inventories = _all_actor_inventories(campaign)
-    state_summary.objective = campaign.goal.text.strip()
-    (
-        state_summary.active_area_id,
-        state_summary.active_area_name,
-        state_summary.active_area_description,
-    ) = _active_area_context(campaign, effective_actor_id)
-    state_summary.active_actor_inventory = _active_actor_inventory(
-        campaign, effective_actor_id
-    )
     response = {
-        "effective_actor_id": effective_actor_id,
+        "effective_actor_id": state_summary["active_actor_id"],
         "narrative_text": "",
         "dialog_type": dialog_type,
         "tool_calls": [],
         "applied_actions": [],
         "tool_feedback": None,
         "conflict_report": _model_to_dict(conflict_report),
-        "state_summary": _model_to_dict(state_summary),
+        "state_summary": state_summary,
     }
     if debug_payload:
         response["debug"] = dict(debug_payload)
@@ -739,7 +1574,13 @@ def _active_area_context(
 
 def _active_actor_inventory(campaign: Campaign, actor_id: str) -> Dict[str, int]:
     actor = campaign.actors.get(actor_id)
-    if actor is None or not isinstance(actor.inventory, dict):
+    if actor is None:
+        return {}
+    return _normalized_inventory(actor)
+
+
+def _normalized_inventory(actor: ActorState) -> Dict[str, int]:
+    if not isinstance(actor.inventory, dict):
         return {}
     inventory: Dict[str, int] = {}
     for item_id, qty in actor.inventory.items():
@@ -765,12 +1606,12 @@ def _assert_turn_writable(campaign: Campaign, active_actor_id: str) -> None:
     if campaign.lifecycle.ended:
         reason = campaign.lifecycle.reason or "ended"
         raise ValueError(f"campaign has ended: {reason}")
-    active_state = _CHARACTER_FACADE.get_state(campaign, active_actor_id)
+    active_state = _CHARACTER_FACADE.read_state(campaign, active_actor_id)
     if active_state.character_state != "unconscious":
         return
     has_actionable_peer = any(
         actor_id != active_actor_id
-        and _CHARACTER_FACADE.get_state(campaign, actor_id).character_state == "alive"
+        and _CHARACTER_FACADE.read_state(campaign, actor_id).character_state == "alive"
         for actor_id in campaign.selected.party_character_ids
     )
     if has_actionable_peer:
@@ -780,7 +1621,7 @@ def _assert_turn_writable(campaign: Campaign, active_actor_id: str) -> None:
 
 
 def _suppress_repeated_illegal_requests(
-    repo: FileRepo,
+    repo: Repository,
     campaign_id: str,
     tool_calls: List[ToolCall],
 ) -> tuple[List[ToolCall], List[FailedCall]]:
@@ -806,9 +1647,9 @@ def _suppress_repeated_illegal_requests(
 
 
 def _load_repeat_illegal_signatures(
-    repo: FileRepo, campaign_id: str, *, window: int
+    repo: Repository, campaign_id: str, *, window: int
 ) -> set[str]:
-    # V1.1: single-process assumption. Future lock provider can guard read/write windows.
+    # Runs under the campaign turn lock, which spans worker processes in file lock mode.
     rows = repo.read_recent_turn_log_rows(campaign_id, limit=window)
     if len(rows) < window:
         return set()
@@ -897,6 +1738,16 @@ def _advance_milestone(campaign: Campaign, turn_number: int, retry_count: int) -
     return changed
 
 
+def _checkpoint_due(campaign: Campaign, turn_number: int) -> bool:
+    # Every checkpoint_interval turns, and on the turn a milestone advances.
+    rollback = campaign.settings_snapshot.rollback
+    if rollback.max_checkpoints <= 0 or turn_number <= 0:
+        return False
+    if campaign.milestone.last_advanced_turn == turn_number:
+        return True
+    return turn_number % max(1, rollback.checkpoint_interval) == 0
+
+
 def _next_milestone_label(current: str) -> str:
     if current == "intro":
         return "milestone_1"
@@ -925,7 +1776,7 @@ def _compute_end_reason(campaign: Campaign) -> Optional[str]:
         return "goal_achieved"
 
     party_states = [
-        _CHARACTER_FACADE.get_state(campaign, actor_id).character_state
+        _CHARACTER_FACADE.read_state(campaign, actor_id).character_state
         for actor_id in campaign.selected.party_character_ids
     ]
     if not party_states:
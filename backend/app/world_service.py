@@ -5,13 +5,13 @@ from typing import Any, Dict, Optional, Tuple
 
 from backend.domain.models import Campaign
 from backend.domain.world_models import World, stable_seed_from_world_id
-from backend.infra.file_repo import FileRepo
+from backend.infra.repository import Repository
 
 
 def generate_world(
     args: Dict[str, Any],
     campaign: Campaign,
-    repo: FileRepo,
+    repo: Repository,
 ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
     world_id_arg, error = _parse_world_id_arg(args)
     if error:
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from copy import deepcopy
+from typing import Any, Callable, Dict, FrozenSet, List, Set, Tuple
+
+from backend.domain.models import ActorState, Campaign, CampaignState, MapData
+
+_MISSING = object()
+
+# Top-level campaign fields a tool call may mutate or replace.
+_TRACKED_FIELDS = ("actors", "state", "positions", "hp", "character_states", "map")
+
+
+class CampaignUndoLog:
+    # Undo log for one attempt at applying tool calls. Callers record the
+    # fields a tool is about to touch; the first record of each field keeps its
+    # prior value and rollback() replays them in reverse. Opening a log and
+    # committing (dropping it) cost nothing beyond the records themselves.
+    def __init__(self, campaign: Campaign) -> None:
+        self.campaign = campaign
+        self._fields = {name: getattr(campaign, name) for name in _TRACKED_FIELDS}
+        self._state_maps = _state_maps(campaign.state)
+        self._recorded: Set[Tuple[str, str]] = set()
+        self._undo: List[Callable[[], None]] = []
+
+    def record_actor(self, actor_id: str) -> None:
+        # The actor and its entries in every legacy mirror (positions, hp,
+        # character_states and campaign.state position maps).
+        if not self._first_record("actor", actor_id):
+            return
+        actors = self._fields["actors"]
+        actor = actors.get(actor_id, _MISSING) if isinstance(actors, dict) else _MISSING
+        saved_actor = _copy_actor(actor)
+        mirrors = [
+            mirror
+            for mirror in (
+                self._fields["positions"],
+                self._fields["hp"],
+                self._fields["character_states"],
+                *self._state_maps,
+            )
+            if isinstance(mirror, dict)
+        ]
+        saved_mirrors = [(mirror, mirror.get(actor_id, _MISSING)) for mirror in mirrors]
+
+        def undo() -> None:
+            if isinstance(actors, dict):
+                _restore_entry(actors, actor_id, saved_actor)
+            for mirror, value in saved_mirrors:
+                _restore_entry(mirror, actor_id, value)
+
+        self._undo.append(undo)
+
+    def record_actor_ids(self) -> None:
+        # Actors added after this point are removed on rollback.
+        if not self._first_record("actor_ids", ""):
+            return
+        actors = self._fields["actors"]
+        if not isinstance(actors, dict):
+            return
+        existing = set(actors)
+
+        def undo() -> None:
+            for actor_id in [key for key in actors if key not in existing]:
+                del actors[actor_id]
+
+        self._undo.append(undo)
+
+    def record_map(self) -> None:
+        if not self._first_record("map", ""):
+            return
+        map_data = self._fields["map"]
+        saved_map = _copy_map(map_data)
+
+        def undo() -> None:
+            self._fields["map"] = saved_map
+
+        self._undo.append(undo)
+
+    @property
+    def recorded(self) -> FrozenSet[Tuple[str, str]]:
+        # (kind, key) of everything recorded so far; cleared by rollback().
+        return frozenset(self._recorded)
+
+    def rollback(self) -> None:
+        undo, self._undo = self._undo, []
+        for step in reversed(undo):
+            step()
+        self._recorded.clear()
+        state = self._fields["state"]
+        for name, value in self._fields.items():
+            setattr(self.campaign, name, value)
+        if isinstance(state, CampaignState):
+            (
+                state.positions,
+                state.positions_parent,
+                state.positions_child,
+            ) = self._state_maps
+
+    def _first_record(self, kind: str, key: str) -> bool:
+        marker = (kind, key)
+        if marker in self._recorded:
+            return False
+        self._recorded.add(marker)
+        return True
+
+
+def _state_maps(state: object) -> Tuple[Any, Any, Any]:
+    if not isinstance(state, CampaignState):
+        return ({}, {}, {})
+    return (state.positions, state.positions_parent, state.positions_child)
+
+
+def _restore_entry(target: Dict[str, Any], key: str, value: object) -> None:
+    if value is _MISSING:
+        target.pop(key, None)
+    else:
+        target[key] = value
+
+
+def _copy_actor(actor: object) -> object:
+    if isinstance(actor, ActorState):
+        if hasattr(actor, "model_copy"):
+            return actor.model_copy(deep=True)
+        return actor.copy(deep=True)
+    if actor is _MISSING:
+        return actor
+    return deepcopy(actor)
+
+
+def _copy_map(map_data: object) -> object:
+    if isinstance(map_data, MapData):
+        if hasattr(map_data, "model_copy"):
+            return map_data.model_copy(deep=True)
+        return map_data.copy(deep=True)
+    return deepcopy(map_data)
@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Protocol, Sequence, Tuple
 
-from backend.domain.models import Campaign
+from backend.domain.models import ActorState, Campaign
 from backend.domain.state_utils import (
     DEFAULT_CHARACTER_STATE,
     DEFAULT_HP,
@@ -51,6 +51,9 @@ class CharacterStateStore(Protocol):
     def get_state(self, campaign: Campaign, character_id: str) -> CharacterState:
         ...
 
+    def read_state(self, campaign: Campaign, character_id: str) -> CharacterState:
+        ...
+
     def set_state(
         self, campaign: Campaign, character_id: str, state: CharacterState
     ) -> None:
@@ -76,6 +79,26 @@ class CampaignCharacterStateStore:
         self._apply_state(campaign, character_id, state)
         return state
 
+    def read_state(self, campaign: Campaign, character_id: str) -> CharacterState:
+        # Pure read of ActorState. Repositories fold legacy maps into actors
+        # when a campaign is loaded and set_state keeps both in step, so unlike
+        # get_state this neither creates the actor nor writes anything back.
+        actors = campaign.actors if isinstance(campaign.actors, dict) else {}
+        actor = actors.get(character_id)
+        if not isinstance(actor, ActorState):
+            return CharacterState(
+                position=None, hp=DEFAULT_HP, character_state=DEFAULT_CHARACTER_STATE
+            )
+        return CharacterState(
+            position=actor.position if isinstance(actor.position, str) else None,
+            hp=self._normalize_hp(actor.hp) if isinstance(actor.hp, int) else DEFAULT_HP,
+            character_state=(
+                actor.character_state
+                if isinstance(actor.character_state, str)
+                else DEFAULT_CHARACTER_STATE
+            ),
+        )
+
     def set_state(
         self, campaign: Campaign, character_id: str, state: CharacterState
     ) -> None:
@@ -223,6 +246,9 @@ class CharacterFacade:
     def get_state(self, campaign: Campaign, character_id: str) -> CharacterState:
         return self.state_store.get_state(campaign, character_id)
 
+    def read_state(self, campaign: Campaign, character_id: str) -> CharacterState:
+        return self.state_store.read_state(campaign, character_id)
+
     def set_state(
         self, campaign: Campaign, character_id: str, state: CharacterState
     ) -> None:
@@ -273,7 +299,7 @@ class CharacterFacade:
         for character_id in character_ids:
             if not isinstance(character_id, str):
                 continue
-            state = self.get_state(campaign, character_id)
+            state = self.read_state(campaign, character_id)
             if state.position is not None:
                 positions[character_id] = state.position
             hp[character_id] = state.hp
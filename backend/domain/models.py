@@ -34,12 +34,15 @@ class Selected(BaseModel):
 class ContextSettings(BaseModel):
     full_context_enabled: bool = True
     compress_enabled: bool = False
+    budget_enabled: bool = False
+    budget_bytes: int = 16000
 
 
 class DialogSettings(BaseModel):
     auto_type_enabled: bool = True
     strict_semantic_guard: bool = False
     conflict_text_checks_enabled: bool = False
+    speculative_retry_candidates: int = 0
     turn_profile_trace_enabled: bool = False
 
 
@@ -49,6 +52,7 @@ class RulesSettings(BaseModel):
 
 class RollbackSettings(BaseModel):
     max_checkpoints: int = 0
+    checkpoint_interval: int = 10
 
 
 class CharacterFactGenerationSettings(BaseModel):
@@ -105,6 +109,8 @@ class ActorState(BaseModel):
 
 class Campaign(BaseModel):
     id: str
+    # Bumped by every save; a save only lands on the revision it was loaded at.
+    revision: int = 0
     selected: Selected
     settings_snapshot: SettingsSnapshot = Field(default_factory=SettingsSnapshot)
     settings_revision: int = 0
@@ -37,6 +37,24 @@ _DEFINITIONS: List[SettingDefinition] = [
         ui_hint="toggle",
         effect_tags=["context"],
     ),
+    SettingDefinition(
+        key="context.budget_enabled",
+        type="bool",
+        default=False,
+        scope="campaign",
+        validation={},
+        ui_hint="toggle",
+        effect_tags=["context"],
+    ),
+    SettingDefinition(
+        key="context.budget_bytes",
+        type="int",
+        default=16000,
+        scope="campaign",
+        validation={"min": 2000, "max": 400000},
+        ui_hint="number",
+        effect_tags=["context"],
+    ),
     SettingDefinition(
         key="rules.hp_zero_ends_game",
         type="bool",
@@ -55,6 +73,15 @@ _DEFINITIONS: List[SettingDefinition] = [
         ui_hint="number",
         effect_tags=["rollback"],
     ),
+    SettingDefinition(
+        key="rollback.checkpoint_interval",
+        type="int",
+        default=10,
+        scope="campaign",
+        validation={"min": 1, "max": 1000},
+        ui_hint="number",
+        effect_tags=["rollback"],
+    ),
     SettingDefinition(
         key="dialog.auto_type_enabled",
         type="bool",
@@ -82,6 +109,15 @@ _DEFINITIONS: List[SettingDefinition] = [
         ui_hint="toggle",
         effect_tags=["dialog", "conflict"],
     ),
+    SettingDefinition(
+        key="dialog.speculative_retry_candidates",
+        type="int",
+        default=0,
+        scope="campaign",
+        validation={"min": 0, "max": 4},
+        ui_hint="number",
+        effect_tags=["dialog", "conflict", "llm"],
+    ),
     SettingDefinition(
         key="dialog.turn_profile_trace_enabled",
         type="bool",
@@ -178,10 +214,16 @@ def _validate_value(definition: SettingDefinition, value: Any) -> None:
 
 
 def _validate_snapshot(snapshot: SettingsSnapshot) -> None:
-    if snapshot.context.full_context_enabled and snapshot.context.compress_enabled:
+    context = snapshot.context
+    if context.full_context_enabled and context.compress_enabled:
         raise ValueError(
             "context.full_context_enabled and context.compress_enabled cannot both be true"
         )
+    if context.budget_enabled and (context.full_context_enabled or context.compress_enabled):
+        raise ValueError(
+            "context.budget_enabled requires context.full_context_enabled and "
+            "context.compress_enabled to be false"
+        )
 
 
 def _set_by_path(data: Dict[str, Any], key: str, value: Any) -> None:
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Hashable, Optional, Tuple
+
+from backend.domain.models import Campaign
+
+DEFAULT_CAMPAIGN_CACHE_SIZE = 64
+
+
+def _encode_campaign(campaign: Campaign) -> str:
+    if hasattr(campaign, "model_dump_json"):
+        return campaign.model_dump_json()
+    if hasattr(campaign, "json"):
+        return campaign.json()
+    raise TypeError("Unsupported model type")
+
+
+def _decode_campaign(encoded: str) -> Campaign:
+    if hasattr(Campaign, "model_validate_json"):
+        return Campaign.model_validate_json(encoded)
+    if hasattr(Campaign, "parse_raw"):
+        return Campaign.parse_raw(encoded)
+    raise TypeError("Unsupported model type")
+
+
+class CampaignCache:
+    # Entries hold the normalized campaign as JSON and every hit decodes a fresh
+    # model, so callers can mutate what they receive without touching the cache.
+    # A hit still validates that JSON; it skips the file read, the dict parse
+    # and the legacy migrations. A deep model copy would be slower than this
+    # decode under pydantic v2.
+    def __init__(self, max_entries: int = DEFAULT_CAMPAIGN_CACHE_SIZE) -> None:
+        self.max_entries = max(1, max_entries)
+        self._guard = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Hashable, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, campaign_id: str, signature: Hashable) -> Optional[Campaign]:
+        with self._guard:
+            entry = self._entries.get(campaign_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            cached_signature, encoded = entry
+            if cached_signature != signature:
+                del self._entries[campaign_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(campaign_id)
+            self.hits += 1
+        return _decode_campaign(encoded)
+
+    def put(self, campaign_id: str, signature: Hashable, campaign: Campaign) -> None:
+        encoded = _encode_campaign(campaign)
+        with self._guard:
+            self._entries[campaign_id] = (signature, encoded)
+            self._entries.move_to_end(campaign_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, campaign_id: str) -> None:
+        with self._guard:
+            self._entries.pop(campaign_id, None)
+
+    def clear(self) -> None:
+        with self._guard:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._guard:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+
+_SHARED_CACHES: Dict[Path, CampaignCache] = {}
+_SHARED_CACHES_GUARD = threading.Lock()
+
+
+def shared_campaign_cache(campaigns_root: Path) -> CampaignCache:
+    # Repos built for the same root (per app, script or test) share one cache.
+    key = campaigns_root.resolve()
+    with _SHARED_CACHES_GUARD:
+        cache = _SHARED_CACHES.get(key)
+        if cache is None:
+            cache = CampaignCache()
+            _SHARED_CACHES[key] = cache
+        return cache
@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import json
+import os
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, Optional, Set, Tuple
+
+JOURNAL_FILENAME = ".campaign_journal.wal"
+DEFAULT_CHECKPOINT_BYTES = 8 * 1024 * 1024
+_RECORD_MAGIC = b"CJR1"
+_RECORD = struct.Struct("<4sIII")
+
+
+def fsync_dir(path: Path) -> None:
+    # Directory fsync makes a rename durable; not every platform allows
+    # opening a directory, in which case the rename is best effort.
+    try:
+        fd = os.open(str(path), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write_bytes(path: Path, payload: bytes, *, fsync: bool = False) -> None:
+    tmp_path = path.with_name(
+        f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+    try:
+        with tmp_path.open("wb", buffering=0) as handle:
+            handle.write(payload)
+            if fsync:
+                os.fsync(handle.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            tmp_path.unlink()
+        except FileNotFoundError:
+            pass
+        raise
+    if fsync:
+        fsync_dir(path.parent)
+
+
+class CampaignJournal:
+    # Write-ahead journal for group commit. A save appends its payload here and
+    # only renames campaign.json into place once the journal fsync covering the
+    # record has finished; one fsync covers every saver that queued up while
+    # the previous one was running. Once the journal grows past
+    # checkpoint_bytes and no rename is in flight, the touched files are
+    # fsynced and the journal is truncated.
+    def __init__(
+        self,
+        path: Path,
+        *,
+        checkpoint_bytes: int = DEFAULT_CHECKPOINT_BYTES,
+    ) -> None:
+        self.path = path
+        self.root = path.parent
+        self.checkpoint_bytes = max(1, checkpoint_bytes)
+        self._cond = threading.Condition()
+        self._handle: Optional[BinaryIO] = None
+        self._appended = 0
+        self._synced = 0
+        self._syncing = False
+        self._applying = 0
+        self._size = 0
+        self._dirty_paths: Set[Path] = set()
+        self.commits = 0
+        self.fsyncs = 0
+        self.checkpoints = 0
+
+    def commit(self, relative: str, payload: bytes) -> None:
+        # `relative` is the target path under the journal directory, e.g.
+        # "camp_0001/campaign.json". The record is durable before the target
+        # is renamed into place, so a crash at any point leaves either the old
+        # file or a journal record that recover() can apply.
+        target = self._resolve(relative)
+        if target is None:
+            raise ValueError(f"invalid journal target: {relative}")
+        record = _encode_record(relative, payload)
+        with self._cond:
+            handle = self._open()
+            handle.write(record)
+            self._size += len(record)
+            self._appended += 1
+            sequence = self._appended
+            self._dirty_paths.add(target)
+            self._applying += 1
+            self.commits += 1
+        try:
+            self._wait_synced(handle, sequence)
+            atomic_write_bytes(target, payload)
+        finally:
+            with self._cond:
+                self._applying -= 1
+                if (
+                    self._applying == 0
+                    and not self._syncing
+                    and self._size >= self.checkpoint_bytes
+                ):
+                    self._checkpoint_locked()
+                self._cond.notify_all()
+
+    def checkpoint(self) -> None:
+        with self._cond:
+            while self._syncing or self._applying:
+                self._cond.wait()
+            self._checkpoint_locked()
+
+    def recover(self) -> int:
+        # Rewrites every file whose last journaled payload did not make it to
+        # disk, then empties the journal. Returns the number of files restored.
+        # A file already at a newer revision than its record (saved later in
+        # another durability mode, rolled back or re-imported) is left alone.
+        with self._cond:
+            latest: Dict[str, bytes] = {}
+            if self.path.exists():
+                for relative, payload in _iter_records(self.path):
+                    latest[relative] = payload
+            restored = 0
+            for relative, payload in latest.items():
+                target = self._resolve(relative)
+                if target is None or not target.parent.is_dir():
+                    continue
+                try:
+                    current = target.read_bytes()
+                except FileNotFoundError:
+                    current = None
+                if current != payload and _journal_is_newer(payload, current):
+                    atomic_write_bytes(target, payload, fsync=True)
+                    restored += 1
+            if self.path.exists():
+                self._dirty_paths.clear()
+                self._open()
+                self._truncate_locked()
+            return restored
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {
+                "commits": self.commits,
+                "fsyncs": self.fsyncs,
+                "checkpoints": self.checkpoints,
+                "journal_bytes": self._size,
+            }
+
+    def close(self) -> None:
+        with self._cond:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+    def _wait_synced(self, handle: BinaryIO, sequence: int) -> None:
+        with self._cond:
+            while self._synced < sequence:
+                if not self._syncing:
+                    self._syncing = True
+                    break
+                self._cond.wait()
+            else:
+                return
+            upto = self._appended
+        synced = False
+        try:
+            os.fsync(handle.fileno())
+            synced = True
+        finally:
+            with self._cond:
+                if synced:
+                    self.fsyncs += 1
+                    self._synced = max(self._synced, upto)
+                self._syncing = False
+                self._cond.notify_all()
+
+    def _open(self) -> BinaryIO:
+        if self._handle is None:
+            self._handle = self.path.open("ab", buffering=0)
+            self._size = self._handle.seek(0, 2)
+        return self._handle
+
+    def _checkpoint_locked(self) -> None:
+        directories = set()
+        for target in self._dirty_paths:
+            try:
+                with target.open("rb") as handle:
+                    os.fsync(handle.fileno())
+            except FileNotFoundError:
+                continue
+            directories.add(target.parent)
+        for directory in directories:
+            fsync_dir(directory)
+        self._dirty_paths.clear()
+        self._open()
+        self._truncate_locked()
+        self._synced = self._appended
+        self.checkpoints += 1
+
+    def _truncate_locked(self) -> None:
+        handle = self._open()
+        os.ftruncate(handle.fileno(), 0)
+        os.fsync(handle.fileno())
+        self._size = 0
+
+    def _resolve(self, relative: str) -> Optional[Path]:
+        parts = Path(relative).parts
+        if not parts or ".." in parts or Path(relative).is_absolute():
+            return None
+        return self.root / relative
+
+
+def _encode_record(relative: str, payload: bytes) -> bytes:
+    name = relative.encode("utf-8")
+    checksum = zlib.crc32(payload, zlib.crc32(name))
+    return _RECORD.pack(_RECORD_MAGIC, len(name), len(payload), checksum) + name + payload
+
+
+def _payload_revision(payload: bytes) -> Optional[int]:
+    try:
+        data = json.loads(payload)
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    revision = data.get("revision", 0)
+    return revision if isinstance(revision, int) else None
+
+
+def _journal_is_newer(payload: bytes, current: Optional[bytes]) -> bool:
+    # A missing or unreadable target (a crash before or during its rename) is
+    # always restored; otherwise only a strictly newer revision wins.
+    if current is None:
+        return True
+    current_revision = _payload_revision(current)
+    if current_revision is None:
+        return True
+    journaled_revision = _payload_revision(payload)
+    return journaled_revision is not None and journaled_revision > current_revision
+
+
+def _iter_records(path: Path) -> Iterator[Tuple[str, bytes]]:
+    # Stops at the first torn or corrupt record: anything after it was never
+    # acknowledged to a caller.
+    with path.open("rb") as handle:
+        while True:
+            header = handle.read(_RECORD.size)
+            if len(header) < _RECORD.size:
+                return
+            magic, name_len, payload_len, checksum = _RECORD.unpack(header)
+            if magic != _RECORD_MAGIC:
+                return
+            name = handle.read(name_len)
+            payload = handle.read(payload_len)
+            if len(name) < name_len or len(payload) < payload_len:
+                return
+            if zlib.crc32(payload, zlib.crc32(name)) != checksum:
+                return
+            yield name.decode("utf-8"), payload
+
+
+_SHARED_JOURNALS: Dict[Path, CampaignJournal] = {}
+_SHARED_JOURNALS_GUARD = threading.Lock()
+
+
+def shared_campaign_journal(campaigns_root: Path) -> CampaignJournal:
+    # One journal per storage root so concurrent repos share fsyncs; the first
+    # user replays whatever a previous process left behind.
+    key = campaigns_root.resolve()
+    with _SHARED_JOURNALS_GUARD:
+        journal = _SHARED_JOURNALS.get(key)
+        if journal is None:
+            journal = CampaignJournal(key / JOURNAL_FILENAME)
+            journal.recover()
+            _SHARED_JOURNALS[key] = journal
+        return journal
+
+
+def checkpoint_shared_campaign_journals() -> None:
+    # Clean shutdown: fsync every journaled file and empty the journals, so
+    # the next start has nothing to replay.
+    with _SHARED_JOURNALS_GUARD:
+        journals = list(_SHARED_JOURNALS.values())
+        _SHARED_JOURNALS.clear()
+    for journal in journals:
+        journal.checkpoint()
+        journal.close()
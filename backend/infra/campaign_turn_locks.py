@@ -0,0 +1,581 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO, Deque, Dict, Iterator, List, Optional, Protocol
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+# Pending turns allowed per campaign while one runs; 0 rejects any concurrent
+# turn with 409 straight away.
+TURN_QUEUE_DEPTH_ENV = "AI_TRPG_TURN_QUEUE_DEPTH"
+TURN_QUEUE_TIMEOUT_ENV = "AI_TRPG_TURN_QUEUE_TIMEOUT"
+DEFAULT_TURN_QUEUE_TIMEOUT_SECONDS = 30.0
+# process: in-memory locks only (one server process per storage root);
+# file: also take a lease in the campaign's lock file so several workers can
+# share it.
+TURN_LOCK_MODE_ENV = "AI_TRPG_TURN_LOCK_MODE"
+TURN_LOCK_MODES = ("process", "file")
+TURN_LOCK_SHARDS_ENV = "AI_TRPG_TURN_LOCK_SHARDS"
+DEFAULT_TURN_LOCK_SHARDS = 16
+TURN_LOCK_LEASE_ENV = "AI_TRPG_TURN_LOCK_LEASE"
+DEFAULT_TURN_LOCK_LEASE_SECONDS = 30.0
+_MIN_TURN_LOCK_LEASE_SECONDS = 0.05
+TURN_LOCK_FILENAME = ".turn.lock"
+# How often a queued turn retries a lock held by another process.
+_FILE_LOCK_POLL_SECONDS = 0.01
+
+
+class CampaignBusyError(RuntimeError):
+    pass
+
+
+def _turn_queue_depth(value: Optional[int] = None) -> int:
+    if value is None:
+        raw = os.getenv(TURN_QUEUE_DEPTH_ENV, "0").strip()
+        value = int(raw) if raw else 0
+    return max(0, value)
+
+
+def _turn_queue_timeout(value: Optional[float] = None) -> float:
+    if value is None:
+        raw = os.getenv(TURN_QUEUE_TIMEOUT_ENV, "").strip()
+        value = float(raw) if raw else DEFAULT_TURN_QUEUE_TIMEOUT_SECONDS
+    return max(0.0, value)
+
+
+def _turn_lock_mode(value: Optional[str] = None) -> str:
+    raw = value if value is not None else os.getenv(TURN_LOCK_MODE_ENV, "process")
+    mode = raw.strip().lower() or "process"
+    if mode not in TURN_LOCK_MODES:
+        raise ValueError(f"unknown turn lock mode: {raw}")
+    return mode
+
+
+def _turn_lock_shards(value: Optional[int] = None) -> int:
+    if value is None:
+        raw = os.getenv(TURN_LOCK_SHARDS_ENV, "").strip()
+        value = int(raw) if raw else DEFAULT_TURN_LOCK_SHARDS
+    return max(1, value)
+
+
+def _turn_lock_lease(value: Optional[float] = None) -> float:
+    if value is None:
+        raw = os.getenv(TURN_LOCK_LEASE_ENV, "").strip()
+        value = float(raw) if raw else DEFAULT_TURN_LOCK_LEASE_SECONDS
+    return max(_MIN_TURN_LOCK_LEASE_SECONDS, value)
+
+
+class TurnLockProvider(Protocol):
+    # Cross-process half of a campaign turn lock, taken after the in-process
+    # one. try_lock returns None instead of waiting when another process
+    # holds the campaign; the registry does the queueing.
+    name: str
+
+    def try_lock(self, campaign_id: str, lock_path: Path) -> Optional[object]: ...
+
+    def unlock(self, handle: object) -> None: ...
+
+    def confirm(self, handle: object) -> bool: ...
+
+    def stats(self) -> Dict[str, object]: ...
+
+
+class _FileLease:
+    def __init__(self, campaign_id: str, path: Path, token: str) -> None:
+        self.campaign_id = campaign_id
+        self.path = path
+        self.token = token
+        self.lost = False
+
+
+class FileLockProvider:
+    # Leases recorded in the campaign's lock file: {"token", "pid", "host",
+    # "expires_at"}, read and written under a short flock. A background
+    # heartbeat renews held leases every third of lease_seconds. A lease is
+    # free once it expires or, on this host, once its process is gone, so a
+    # crashed worker holds a campaign for at most one lease period (and not
+    # at all for workers on the same machine).
+    name = "file"
+
+    def __init__(self, *, lease_seconds: Optional[float] = None) -> None:
+        if fcntl is None:
+            raise ValueError("file turn locks need fcntl (POSIX)")
+        self.lease_seconds = _turn_lock_lease(lease_seconds)
+        self._host = socket.gethostname()
+        self._guard = threading.Lock()
+        self._leases: Dict[str, _FileLease] = {}
+        self._heartbeat: Optional[threading.Thread] = None
+        self._renewed = 0
+        self._recovered = 0
+        self._lost = 0
+
+    def try_lock(self, campaign_id: str, lock_path: Path) -> Optional[_FileLease]:
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with _locked_record(lock_path) as handle:
+            record = _read_lease(handle)
+            if record is not None:
+                if self._lease_live(record):
+                    return None
+                with self._guard:
+                    self._recovered += 1
+            lease = _FileLease(campaign_id, lock_path, uuid.uuid4().hex)
+            _write_lease(handle, self._record(lease.token))
+        with self._guard:
+            self._leases[lease.token] = lease
+            if self._heartbeat is None:
+                self._heartbeat = threading.Thread(
+                    target=self._run_heartbeat, name="turn-lock-heartbeat", daemon=True
+                )
+                self._heartbeat.start()
+        return lease
+
+    def unlock(self, handle: object) -> None:
+        assert isinstance(handle, _FileLease)
+        with self._guard:
+            self._leases.pop(handle.token, None)
+        with _locked_record(handle.path) as file:
+            record = _read_lease(file)
+            if record is not None and record.get("token") == handle.token:
+                file.truncate(0)
+            else:
+                handle.lost = True
+        if handle.lost:
+            with self._guard:
+                self._lost += 1
+
+    def confirm(self, handle: object) -> bool:
+        # Checks the lease file itself rather than trusting `lost`: after a
+        # stall the heartbeat may not have run yet. A lease still held is
+        # renewed, so the write that follows has a full lease period.
+        assert isinstance(handle, _FileLease)
+        if not handle.lost:
+            self._renew(handle)
+        return not handle.lost
+
+    def stats(self) -> Dict[str, object]:
+        with self._guard:
+            return {
+                "lease_seconds": self.lease_seconds,
+                "leases_held": len(self._leases),
+                "leases_renewed": self._renewed,
+                "leases_recovered": self._recovered,
+                "leases_lost": self._lost,
+            }
+
+    def _record(self, token: str) -> Dict[str, Any]:
+        return {
+            "token": token,
+            "pid": os.getpid(),
+            "host": self._host,
+            "expires_at": time.time() + self.lease_seconds,
+        }
+
+    def _lease_live(self, record: Dict[str, Any]) -> bool:
+        expires_at = record.get("expires_at")
+        if not isinstance(expires_at, (int, float)) or expires_at <= time.time():
+            return False
+        pid = record.get("pid")
+        if record.get("host") != self._host or not isinstance(pid, int):
+            return True
+        return _pid_alive(pid)
+
+    def _run_heartbeat(self) -> None:
+        # Exits once nothing is held; the next try_lock starts a new one.
+        while True:
+            time.sleep(self.lease_seconds / 3)
+            with self._guard:
+                leases = list(self._leases.values())
+                if not leases:
+                    self._heartbeat = None
+                    return
+            for lease in leases:
+                self._renew(lease)
+
+    def _renew(self, lease: _FileLease) -> None:
+        with _locked_record(lease.path) as handle:
+            with self._guard:
+                if lease.token not in self._leases:
+                    return
+            record = _read_lease(handle)
+            if record is None or record.get("token") != lease.token:
+                # Expired and taken over (the holder stalled past its lease).
+                lease.lost = True
+                return
+            _write_lease(handle, self._record(lease.token))
+        with self._guard:
+            self._renewed += 1
+
+
+@contextmanager
+def _locked_record(path: Path) -> Iterator[BinaryIO]:
+    handle = open(os.open(path, os.O_RDWR | os.O_CREAT, 0o644), "r+b")
+    try:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        yield handle
+    finally:
+        handle.close()
+
+
+def _read_lease(handle: BinaryIO) -> Optional[Dict[str, Any]]:
+    handle.seek(0)
+    raw = handle.read()
+    if not raw.strip():
+        return None
+    try:
+        record = json.loads(raw)
+    except ValueError:
+        # A torn write; treat it as an expired lease.
+        return {}
+    return record if isinstance(record, dict) else {}
+
+
+def _write_lease(handle: BinaryIO, record: Dict[str, Any]) -> None:
+    handle.seek(0)
+    handle.truncate(0)
+    handle.write(json.dumps(record, separators=(",", ":")).encode("utf-8"))
+    handle.flush()
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class _TurnLockWaiter:
+    # One queued turn. `granted` is only read and written under the shard
+    # guard and decides who owns the lock when a grant races a timeout.
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        self.granted = False
+        self.loop = loop
+        self.event = threading.Event() if loop is None else None
+        self.future: Optional["asyncio.Future[None]"] = (
+            loop.create_future() if loop is not None else None
+        )
+
+    def grant(self) -> bool:
+        self.granted = True
+        if self.event is not None:
+            self.event.set()
+            return True
+        try:
+            assert self.loop is not None
+            self.loop.call_soon_threadsafe(_resolve_future, self.future)
+        except RuntimeError:
+            # The waiting loop is gone; hand the lock to the next waiter.
+            self.granted = False
+            return False
+        return True
+
+
+def _resolve_future(future: Optional["asyncio.Future[None]"]) -> None:
+    if future is not None and not future.done():
+        future.set_result(None)
+
+
+class _CampaignTurnLock:
+    # Exists only while a turn holds the campaign or waits for it: released
+    # with nobody queued, the entry is dropped, so idle campaigns cost nothing.
+    def __init__(self, campaign_id: str, shard: "_LockShard") -> None:
+        self.campaign_id = campaign_id
+        self.shard = shard
+        self.waiters: Deque[_TurnLockWaiter] = deque()
+        self.held_since = time.monotonic()
+        self.shared: Optional[object] = None
+
+
+class _LockShard:
+    def __init__(self) -> None:
+        self.guard = threading.Lock()
+        self.locks: Dict[str, _CampaignTurnLock] = {}
+        self.guard_waits = 0
+        self.acquired = 0
+        self.contended = 0
+        self.queued = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.released = 0
+        self.hold_seconds_total = 0.0
+        self.hold_seconds_max = 0.0
+
+    @contextmanager
+    def locked(self) -> Iterator["_LockShard"]:
+        # Counts guard acquisitions that had to block: a direct measure of
+        # how much turns on different campaigns collide on this shard.
+        if not self.guard.acquire(blocking=False):
+            self.guard.acquire()
+            self.guard_waits += 1
+        try:
+            yield self
+        finally:
+            self.guard.release()
+
+
+class CampaignTurnLockRegistry:
+    # One turn per campaign at a time. Campaigns are spread over `shards`
+    # independently guarded maps. try_acquire never waits; acquire and
+    # aacquire queue up to queue_depth turns per campaign in FIFO order, each
+    # waiting at most wait_timeout seconds, and hand the lock straight to the
+    # next waiter on release. With a provider (file mode) the holder also
+    # takes the cross-process lock on lock_path.
+    def __init__(
+        self,
+        *,
+        queue_depth: Optional[int] = None,
+        wait_timeout: Optional[float] = None,
+        shards: Optional[int] = None,
+        mode: Optional[str] = None,
+        provider: Optional[TurnLockProvider] = None,
+    ) -> None:
+        self.queue_depth = _turn_queue_depth(queue_depth)
+        self.wait_timeout = _turn_queue_timeout(wait_timeout)
+        if provider is None and _turn_lock_mode(mode) == "file":
+            provider = FileLockProvider()
+        self.provider = provider
+        self.mode = provider.name if provider is not None else "process"
+        self._shards: List[_LockShard] = [
+            _LockShard() for _ in range(_turn_lock_shards(shards))
+        ]
+
+    def try_acquire(
+        self, campaign_id: str, lock_path: Optional[Path] = None
+    ) -> Optional[_CampaignTurnLock]:
+        shard = self._shard(campaign_id)
+        with shard.locked():
+            if campaign_id in shard.locks:
+                shard.contended += 1
+                shard.rejected += 1
+                return None
+            lock = self._take(shard, campaign_id)
+        if self.provider is not None and not self._lock_shared(lock, lock_path):
+            self.release(lock)
+            return None
+        return lock
+
+    def acquire(
+        self, campaign_id: str, lock_path: Optional[Path] = None
+    ) -> _CampaignTurnLock:
+        started = time.monotonic()
+        shard = self._shard(campaign_id)
+        with shard.locked():
+            lock = self._enqueue(shard, campaign_id, None)
+        if isinstance(lock, _TurnLockWaiter):
+            waiter = lock
+            waiter.event.wait(self.wait_timeout)  # type: ignore[union-attr]
+            lock = self._settle(shard, campaign_id, waiter, started)
+        if self.provider is not None:
+            deadline = started + self.wait_timeout
+            while not self._lock_shared(lock, lock_path):
+                if self.queue_depth == 0 or time.monotonic() >= deadline:
+                    self._shared_busy(lock)
+                time.sleep(_FILE_LOCK_POLL_SECONDS)
+        return lock
+
+    async def aacquire(
+        self, campaign_id: str, lock_path: Optional[Path] = None
+    ) -> _CampaignTurnLock:
+        # Waits on the event loop instead of parking a worker thread.
+        started = time.monotonic()
+        shard = self._shard(campaign_id)
+        with shard.locked():
+            lock = self._enqueue(shard, campaign_id, asyncio.get_running_loop())
+        if isinstance(lock, _TurnLockWaiter):
+            waiter = lock
+            try:
+                await asyncio.wait_for(waiter.future, self.wait_timeout)  # type: ignore[arg-type]
+            except asyncio.TimeoutError:
+                pass
+            except BaseException:
+                with shard.locked():
+                    granted = waiter.granted
+                    if not granted:
+                        shard.locks[campaign_id].waiters.remove(waiter)
+                if granted:
+                    self.release(shard.locks[campaign_id])
+                raise
+            lock = self._settle(shard, campaign_id, waiter, started)
+        if self.provider is not None:
+            deadline = started + self.wait_timeout
+            try:
+                while not self._lock_shared(lock, lock_path):
+                    if self.queue_depth == 0 or time.monotonic() >= deadline:
+                        self._shared_busy(lock)
+                    await asyncio.sleep(_FILE_LOCK_POLL_SECONDS)
+            except asyncio.CancelledError:
+                self.release(lock)
+                raise
+        return lock
+
+    def confirm(self, lock: _CampaignTurnLock) -> None:
+        # Called before a turn writes the campaign, its log or a checkpoint.
+        # A holder that stalled past its lease may have lost the campaign to
+        # another worker; it must not write anything after that.
+        if lock.shared is None:
+            return
+        assert self.provider is not None
+        if not self.provider.confirm(lock.shared):
+            raise CampaignBusyError(
+                "campaign turn lease was lost to another worker; retry the turn."
+            )
+
+    def release(self, lock: _CampaignTurnLock) -> None:
+        if lock.shared is not None:
+            shared, lock.shared = lock.shared, None
+            assert self.provider is not None
+            self.provider.unlock(shared)
+        shard = lock.shard
+        with shard.locked():
+            held = time.monotonic() - lock.held_since
+            shard.released += 1
+            shard.hold_seconds_total += held
+            shard.hold_seconds_max = max(shard.hold_seconds_max, held)
+            while lock.waiters:
+                if lock.waiters.popleft().grant():
+                    lock.held_since = time.monotonic()
+                    return
+            if shard.locks.get(lock.campaign_id) is lock:
+                del shard.locks[lock.campaign_id]
+
+    def stats(self) -> Dict[str, object]:
+        totals: Dict[str, float] = {}
+        held = waiting = 0
+        wait_max = hold_max = 0.0
+        for shard in self._shards:
+            with shard.guard:
+                held += len(shard.locks)
+                waiting += sum(len(lock.waiters) for lock in shard.locks.values())
+                for name in (
+                    "guard_waits",
+                    "acquired",
+                    "contended",
+                    "queued",
+                    "rejected",
+                    "timed_out",
+                    "released",
+                    "wait_seconds_total",
+                    "hold_seconds_total",
+                ):
+                    totals[name] = totals.get(name, 0) + getattr(shard, name)
+                wait_max = max(wait_max, shard.wait_seconds_max)
+                hold_max = max(hold_max, shard.hold_seconds_max)
+        stats: Dict[str, object] = {
+            "mode": self.mode,
+            "shards": len(self._shards),
+            "queue_depth": self.queue_depth,
+            "wait_timeout_seconds": self.wait_timeout,
+            "held": held,
+            "waiting": waiting,
+            "acquired": int(totals["acquired"]),
+            "contended": int(totals["contended"]),
+            "queued": int(totals["queued"]),
+            "rejected": int(totals["rejected"]),
+            "timed_out": int(totals["timed_out"]),
+            "guard_waits": int(totals["guard_waits"]),
+            "wait_ms_total": round(totals["wait_seconds_total"] * 1000, 3),
+            "wait_ms_max": round(wait_max * 1000, 3),
+            "released": int(totals["released"]),
+            "hold_ms_total": round(totals["hold_seconds_total"] * 1000, 3),
+            "hold_ms_max": round(hold_max * 1000, 3),
+        }
+        if self.provider is not None:
+            stats.update(self.provider.stats())
+        return stats
+
+    def _shard(self, campaign_id: str) -> _LockShard:
+        return self._shards[hash(campaign_id) % len(self._shards)]
+
+    def _take(self, shard: _LockShard, campaign_id: str) -> _CampaignTurnLock:
+        lock = _CampaignTurnLock(campaign_id, shard)
+        shard.locks[campaign_id] = lock
+        shard.acquired += 1
+        return lock
+
+    def _enqueue(
+        self,
+        shard: _LockShard,
+        campaign_id: str,
+        loop: Optional[asyncio.AbstractEventLoop],
+    ) -> object:
+        # Caller holds the shard guard. Returns the lock when it was free,
+        # otherwise the queued waiter.
+        lock = shard.locks.get(campaign_id)
+        if lock is None:
+            return self._take(shard, campaign_id)
+        shard.contended += 1
+        if len(lock.waiters) >= self.queue_depth:
+            shard.rejected += 1
+            if self.queue_depth == 0:
+                raise CampaignBusyError(
+                    "campaign turn is already running; wait and retry."
+                )
+            raise CampaignBusyError("campaign turn queue is full; wait and retry.")
+        waiter = _TurnLockWaiter(loop)
+        lock.waiters.append(waiter)
+        shard.queued += 1
+        return waiter
+
+    def _settle(
+        self,
+        shard: _LockShard,
+        campaign_id: str,
+        waiter: _TurnLockWaiter,
+        started: float,
+    ) -> _CampaignTurnLock:
+        waited = time.monotonic() - started
+        with shard.locked():
+            lock = shard.locks[campaign_id]
+            if not waiter.granted:
+                lock.waiters.remove(waiter)
+                shard.timed_out += 1
+                raise CampaignBusyError(
+                    "timed out waiting in the campaign turn queue; retry later."
+                )
+            shard.acquired += 1
+            shard.wait_seconds_total += waited
+            shard.wait_seconds_max = max(shard.wait_seconds_max, waited)
+            return lock
+
+    def _lock_shared(self, lock: _CampaignTurnLock, lock_path: Optional[Path]) -> bool:
+        assert self.provider is not None
+        if lock_path is None:
+            self.release(lock)
+            raise ValueError(f"{self.mode} turn locks need a lock path")
+        try:
+            lock.shared = self.provider.try_lock(lock.campaign_id, lock_path)
+        except BaseException:
+            self.release(lock)
+            raise
+        return lock.shared is not None
+
+    def _shared_busy(self, lock: _CampaignTurnLock) -> None:
+        # Another process holds the campaign: give up the in-process lock too.
+        shard = lock.shard
+        with shard.locked():
+            if self.queue_depth:
+                shard.timed_out += 1
+            else:
+                shard.rejected += 1
+        self.release(lock)
+        if self.queue_depth:
+            raise CampaignBusyError(
+                "timed out waiting in the campaign turn queue; retry later."
+            )
+        raise CampaignBusyError("campaign turn is already running; wait and retry.")
@@ -13,7 +13,7 @@ from backend.domain.character_fact_schema import (
     validate_character_fact,
 )
 from backend.domain.models import Campaign
-from backend.infra.file_repo import FileRepo
+from backend.infra.repo_factory import create_repo
 
 
 class GeneratedCharacterFactStore(CharacterFactStore):
@@ -23,7 +23,7 @@ class GeneratedCharacterFactStore(CharacterFactStore):
         fallback_store: Optional[CharacterFactStore] = None,
     ) -> None:
         root = storage_root or Path("storage")
-        self.repo = FileRepo(root)
+        self.repo = create_repo(root)
         self.fallback_store = fallback_store or StubCharacterFactStore()
 
     def get_fact(self, campaign: Campaign, character_id: str) -> CharacterFact:
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import json
+import os
 import re
-from datetime import datetime, timezone
+import threading
+from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 from backend.domain.map_models import migrate_map_dict, normalize_map, require_valid_map
 from backend.domain.models import ActorState, Campaign, CampaignSummary, TurnLogEntry
@@ -14,30 +17,55 @@ from backend.domain.state_utils import (
     ensure_actor,
     validate_actors_state,
 )
-from backend.domain.world_models import (
-    World,
-    build_world_stub,
-    normalize_world,
-    require_valid_world,
+from backend.infra.campaign_cache import CampaignCache, shared_campaign_cache
+from backend.infra.campaign_checkpoints import CampaignCheckpoint
+from backend.infra.campaign_journal import (
+    CampaignJournal,
+    atomic_write_bytes,
+    shared_campaign_journal,
 )
+from backend.infra.campaign_turn_locks import _turn_lock_mode
+from backend.infra.storage_files import (
+    StorageFileMethods,
+    StorageFiles,
+    _model_from_dict,
+    _model_to_dict,
+)
+from backend.infra.turn_log_codec import (
+    DEFAULT_KEYFRAME_INTERVAL,
+    TURN_LOG_FORMAT_V1,
+    TURN_LOG_FORMAT_V2,
+    TURN_LOG_FORMATS,
+    TurnLogConversionResult,
+    choose_v2_encoding,
+    decode_row,
+    encode_row_line,
+    keyframe_summary,
+    row_keyframe_number,
+    row_log_format,
+)
+from backend.infra.turn_log_index import TurnLogIndex, TurnLogRebuildResult
 
-BATCH_FILE_PATTERN = re.compile(r"^batch_(\d{8}T\d{6}Z)_(.+)\.json$")
-
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
 
-def _model_to_dict(model: object) -> Dict[str, Any]:
-    if hasattr(model, "model_dump"):
-        return model.model_dump()  # type: ignore[no-any-return]
-    if hasattr(model, "dict"):
-        return model.dict()  # type: ignore[no-any-return]
-    raise TypeError("Unsupported model type")
+TURN_LOG_REVERSE_BLOCK_BYTES = 64 * 1024
+CAMPAIGN_DURABILITY_ENV = "AI_TRPG_CAMPAIGN_DURABILITY"
+# none: atomic rename only; fsync: fsync file + directory on every save;
+# group: journal the payload and share one fsync across concurrent saves.
+CAMPAIGN_DURABILITY_MODES = ("none", "fsync", "group")
+# Format for new turn logs; an existing log keeps the format of its first row.
+TURN_LOG_FORMAT_ENV = "AI_TRPG_TURN_LOG_FORMAT"
+_KEYFRAME_CACHE_SIZE = 8
+_SAVE_GUARD = threading.Lock()
+_REVISION_PATTERN = re.compile(rb'^\{"id":"(?:[^"\\]|\\.)*","revision":(\d+)[,}]')
+_REVISION_HEAD_BYTES = 512
 
 
-def _model_from_dict(model_cls: object, data: Dict[str, Any]) -> object:
-    if hasattr(model_cls, "model_validate"):
-        return model_cls.model_validate(data)  # type: ignore[no-any-return]
-    if hasattr(model_cls, "parse_obj"):
-        return model_cls.parse_obj(data)  # type: ignore[no-any-return]
-    raise TypeError("Unsupported model type")
+class StaleCampaignError(RuntimeError):
+    pass
 
 
 def _read_dict(value: object) -> Dict[str, Any]:
@@ -134,306 +162,214 @@ def _migrate_actors_if_needed(campaign: Campaign, data: Dict[str, Any]) -> bool:
     return True
 
 
-class FileRepo:
-    def __init__(self, storage_root: Path) -> None:
-        self.storage_root = storage_root
-        self.campaigns_root = storage_root / "campaigns"
-        self.worlds_root = storage_root / "worlds"
-        self.campaigns_root.mkdir(parents=True, exist_ok=True)
-        self.worlds_root.mkdir(parents=True, exist_ok=True)
+def _hydrate_campaign(data: Dict[str, Any]) -> tuple[Campaign, bool]:
+    map_data = data.get("map")
+    if isinstance(map_data, dict):
+        migrate_map_dict(map_data)
+    campaign = _model_from_dict(Campaign, data)
+    updated = _migrate_actors_if_needed(campaign, data)
+    if "inventory_add" not in campaign.allowlist:
+        campaign.allowlist.append("inventory_add")
+        updated = True
+    for actor_id in campaign.selected.party_character_ids:
+        if actor_id not in campaign.actors:
+            ensure_actor(campaign, actor_id)
+            updated = True
+    if campaign.selected.active_actor_id not in campaign.actors:
+        ensure_actor(campaign, campaign.selected.active_actor_id)
+        updated = True
+    if validate_actors_state(campaign, campaign.map):
+        updated = True
+    normalize_map(campaign.map)
+    return campaign, updated
 
-    def _campaign_dir(self, campaign_id: str) -> Path:
-        return self.campaigns_root / campaign_id
 
-    def _campaign_path(self, campaign_id: str) -> Path:
-        return self._campaign_dir(campaign_id) / "campaign.json"
+def _prepare_campaign_for_save(campaign: Campaign) -> Dict[str, Any]:
+    validate_actors_state(campaign, campaign.map)
+    campaign.positions = {}
+    campaign.hp = {}
+    campaign.character_states = {}
+    campaign.state.positions = {}
+    campaign.state.positions_parent = {}
+    campaign.state.positions_child = {}
+    require_valid_map(campaign.map)
+    normalize_map(campaign.map)
+    return _model_to_dict(campaign)
+
+
+def _encode_campaign_payload(data: Dict[str, Any]) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _campaign_durability(value: Optional[str] = None) -> str:
+    raw = value if value is not None else os.getenv(CAMPAIGN_DURABILITY_ENV, "none")
+    mode = raw.strip().lower() or "none"
+    if mode not in CAMPAIGN_DURABILITY_MODES:
+        raise ValueError(f"unknown campaign durability mode: {raw}")
+    return mode
+
+
+def _turn_log_format(value: Optional[int] = None) -> int:
+    if value is None:
+        raw = os.getenv(TURN_LOG_FORMAT_ENV, str(TURN_LOG_FORMAT_V2)).strip().lower()
+        value = int(raw[1:] if raw.startswith("v") else raw) if raw else TURN_LOG_FORMAT_V2
+    if value not in TURN_LOG_FORMATS:
+        raise ValueError(f"unknown turn log format: {value}")
+    return value
+
+
+def _remember_keyframe(
+    keyframes: Dict[int, Dict[str, Any]], number: int, summary: Dict[str, Any]
+) -> None:
+    if number not in keyframes and len(keyframes) >= _KEYFRAME_CACHE_SIZE:
+        keyframes.pop(next(iter(keyframes)))
+    keyframes[number] = summary
+
+
+@contextmanager
+def _campaign_save_lock(campaign_dir: Path) -> Iterator[None]:
+    # Makes the revision check and the write one step across threads and
+    # worker processes by flocking the campaign directory itself; without
+    # fcntl it only covers this process.
+    if fcntl is None:
+        with _SAVE_GUARD:
+            yield
+        return
+    fd = os.open(campaign_dir, os.O_RDONLY)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+
+def _stale_campaign(campaign: Campaign, stored: int) -> StaleCampaignError:
+    return StaleCampaignError(
+        f"campaign {campaign.id} was saved elsewhere (revision {stored}, "
+        f"loaded at {campaign.revision}); reload and retry."
+    )
 
-    def _turn_log_path(self, campaign_id: str) -> Path:
-        return self._campaign_dir(campaign_id) / "turn_log.jsonl"
 
-    def _generated_characters_dir(self, campaign_id: str) -> Path:
-        return self._campaign_dir(campaign_id) / "characters" / "generated"
+def _stored_revision(path: Path) -> Optional[int]:
+    # Saves write "revision" right after "id", so the head of the file holds
+    # it. Pretty-printed or hand-edited files are parsed in full; files from
+    # before revisions were tracked are at revision 0.
+    try:
+        with path.open("rb") as handle:
+            head = handle.read(_REVISION_HEAD_BYTES)
+            match = _REVISION_PATTERN.search(head)
+            if match:
+                return int(match.group(1))
+            data = json.loads(head + handle.read())
+    except FileNotFoundError:
+        return None
+    except ValueError:
+        return 0
+    revision = data.get("revision", 0) if isinstance(data, dict) else 0
+    return revision if isinstance(revision, int) else 0
 
-    def _world_dir(self, world_id: str) -> Path:
-        return self.worlds_root / world_id
 
-    def world_path(self, world_id: str) -> Path:
-        return self._world_dir(world_id) / "world.json"
+def _file_signature(path: Path) -> Optional[tuple[int, int, int]]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def _iter_lines(path: Path, offset: int = 0) -> Iterator[bytes]:
+    with path.open("rb") as handle:
+        if offset:
+            handle.seek(offset)
+        yield from handle
+
+
+def _iter_lines_reverse(
+    path: Path, block_size: Optional[int] = None, end: Optional[int] = None
+) -> Iterator[bytes]:
+    block_size = block_size or TURN_LOG_REVERSE_BLOCK_BYTES
+    with path.open("rb") as handle:
+        position = handle.seek(0, 2) if end is None else end
+        remainder = b""
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            handle.seek(position)
+            block = handle.read(read_size) + remainder
+            lines = block.split(b"\n")
+            remainder = lines[0]
+            for line in reversed(lines[1:]):
+                yield line
+        yield remainder
+
+
+def _parse_row(raw: bytes) -> Optional[Dict[str, Any]]:
+    raw = raw.strip()
+    if not raw:
+        return None
+    try:
+        payload = json.loads(raw)
+    except Exception:
+        return None
+    return payload if isinstance(payload, dict) else None
 
-    def _sanitize_request_id(self, request_id: str) -> str:
-        cleaned = re.sub(r"[^a-zA-Z0-9_-]+", "_", request_id.strip())
-        return cleaned or "req"
 
-    def _sanitize_character_file_id(self, character_id: str) -> str:
-        cleaned = re.sub(r"[^a-zA-Z0-9_-]+", "_", character_id.strip())
-        return cleaned or "character"
+def _turn_number(turn_id: str) -> int:
+    suffix = turn_id.split("_", 1)[1] if turn_id.startswith("turn_") else ""
+    return int(suffix) if suffix.isdigit() else 0
 
-    def to_storage_relative_path(self, path: Path) -> str:
-        try:
-            relative = path.relative_to(self.storage_root)
-            if self.storage_root.name == "storage":
-                return str(Path("storage") / relative).replace("\\", "/")
-            return str(relative).replace("\\", "/")
-        except ValueError:
-            return str(path).replace("\\", "/")
-
-    def _read_json_file(self, path: Path) -> Optional[Any]:
-        try:
-            return json.loads(path.read_text(encoding="utf-8"))
-        except Exception:
-            return None
 
-    def _extract_batch_parts(self, path: Path) -> tuple[Optional[str], Optional[str]]:
-        match = BATCH_FILE_PATTERN.match(path.name)
-        if not match:
-            return None, None
-        return match.group(1), match.group(2)
+def _ends_with_newline(path: Path, size: int) -> bool:
+    with path.open("rb") as handle:
+        handle.seek(size - 1)
+        return handle.read(1) == b"\n"
 
-    def get_world(self, world_id: str) -> Optional[World]:
-        normalized_world_id = world_id.strip()
-        if not normalized_world_id:
-            return None
-        path = self.world_path(normalized_world_id)
-        if not path.exists():
-            return None
-        payload = self._read_json_file(path)
-        if not isinstance(payload, dict):
-            raise ValueError(f"Invalid world JSON: {path}")
-        world = _model_from_dict(World, payload)
-        require_valid_world(world)
-        normalize_world(world)
-        return world
-
-    def save_world(self, world: World) -> None:
-        require_valid_world(world)
-        normalize_world(world)
-        world_dir = self._world_dir(world.world_id)
-        world_dir.mkdir(parents=True, exist_ok=True)
-        path = self.world_path(world.world_id)
-        payload = _model_to_dict(world)
-        path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
-
-    def get_or_create_world_stub(
+
+class FileRepo(StorageFileMethods):
+    def __init__(
         self,
-        world_id: str,
+        storage_root: Path,
         *,
-        seed_source: str = "world_id_hash",
-        generator_default: str = "stub",
-    ) -> World:
-        normalized_world_id = world_id.strip()
-        if not normalized_world_id:
-            raise ValueError("world_id is required")
-
-        existing = self.get_world(normalized_world_id)
-        if existing is not None:
-            return existing
-
-        world = build_world_stub(
-            normalized_world_id,
-            seed_source=seed_source,
-            generator_default=generator_default,
+        campaign_cache: Optional[CampaignCache] = None,
+        durability: Optional[str] = None,
+        turn_log_format: Optional[int] = None,
+        turn_log_keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL,
+    ) -> None:
+        self.files = StorageFiles(storage_root)
+        self.storage_root = storage_root
+        self.campaigns_root = self.files.campaigns_root
+        self.campaign_cache = (
+            campaign_cache
+            if campaign_cache is not None
+            else shared_campaign_cache(self.campaigns_root)
         )
-        world_dir = self._world_dir(normalized_world_id)
-        world_dir.mkdir(parents=True, exist_ok=True)
-        path = self.world_path(normalized_world_id)
-        payload = _model_to_dict(world)
-
-        try:
-            with path.open("x", encoding="utf-8") as handle:
-                json.dump(payload, handle, indent=2)
-            return world
-        except FileExistsError:
-            # Concurrent request won the race; read the winner.
-            existing_after_race = self.get_world(normalized_world_id)
-            if existing_after_race is None:
-                raise
-            return existing_after_race
-
-    def find_character_fact_batch_path(
-        self,
-        campaign_id: str,
-        request_id: str,
-    ) -> Optional[Path]:
-        generated_dir = self._generated_characters_dir(campaign_id)
-        if not generated_dir.exists():
-            return None
-
-        safe_request_id = self._sanitize_request_id(request_id)
-        unreadable_candidate: Optional[Path] = None
-
-        for path in sorted(generated_dir.glob("batch_*.json"), reverse=True):
-            payload = self._read_json_file(path)
-            if isinstance(payload, dict):
-                stored_request_id = payload.get("request_id")
-                if isinstance(stored_request_id, str) and stored_request_id == request_id:
-                    return path
-            _, suffix = self._extract_batch_parts(path)
-            if suffix == safe_request_id and not isinstance(payload, dict):
-                unreadable_candidate = path
-
-        return unreadable_candidate
-
-    def save_character_fact_batch(
-        self,
-        campaign_id: str,
-        request_id: str,
-        payload: Dict[str, Any],
-        utc_ts: Optional[str] = None,
-    ) -> Path:
-        generated_dir = self._generated_characters_dir(campaign_id)
-        generated_dir.mkdir(parents=True, exist_ok=True)
-        existing = self.find_character_fact_batch_path(campaign_id, request_id)
-        if existing is not None:
-            raise FileExistsError(
-                f"Character batch already exists for request_id={request_id}"
+        self.durability = _campaign_durability(durability)
+        if self.durability == "group" and _turn_lock_mode() == "file":
+            # The journal is per process; several workers would replay each
+            # other's stale records over newer saves.
+            raise ValueError(
+                "group campaign durability is not supported with file turn locks; "
+                "use none or fsync"
             )
-        timestamp = utc_ts or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
-        safe_request_id = self._sanitize_request_id(request_id)
-        path = generated_dir / f"batch_{timestamp}_{safe_request_id}.json"
-        with path.open("x", encoding="utf-8") as handle:
-            json.dump(payload, handle, indent=2)
-        return path
-
-    def save_character_fact_draft(
-        self,
-        campaign_id: str,
-        character_file_id: str,
-        payload: Dict[str, Any],
-    ) -> Path:
-        generated_dir = self._generated_characters_dir(campaign_id)
-        generated_dir.mkdir(parents=True, exist_ok=True)
-        safe_character_id = self._sanitize_character_file_id(character_file_id)
-        path = generated_dir / f"{safe_character_id}.fact.draft.json"
-        path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
-        return path
-
-    def character_fact_draft_path(self, campaign_id: str, character_id: str) -> Path:
-        safe_character_id = self._sanitize_character_file_id(character_id)
-        return self._generated_characters_dir(campaign_id) / (
-            f"{safe_character_id}.fact.draft.json"
-        )
-
-    def character_fact_acceptance_path(self, campaign_id: str, character_id: str) -> Path:
-        safe_character_id = self._sanitize_character_file_id(character_id)
-        return self._generated_characters_dir(campaign_id) / (
-            f"{safe_character_id}.fact.accepted.json"
+        self.campaign_journal: Optional[CampaignJournal] = (
+            shared_campaign_journal(self.campaigns_root)
+            if self.durability == "group"
+            else None
         )
+        self.turn_log_format = _turn_log_format(turn_log_format)
+        self.turn_log_keyframe_interval = max(1, turn_log_keyframe_interval)
 
-    def save_character_fact_acceptance(
-        self,
-        campaign_id: str,
-        character_id: str,
-        payload: Dict[str, Any],
-    ) -> Path:
-        generated_dir = self._generated_characters_dir(campaign_id)
-        generated_dir.mkdir(parents=True, exist_ok=True)
-        path = self.character_fact_acceptance_path(campaign_id, character_id)
-        path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
-        return path
-
-    def load_character_fact_acceptance(
-        self,
-        campaign_id: str,
-        character_id: str,
-    ) -> Optional[Dict[str, Any]]:
-        path = self.character_fact_acceptance_path(campaign_id, character_id)
-        if not path.exists():
-            return None
-        payload = self._read_json_file(path)
-        if isinstance(payload, dict):
-            return payload
-        return None
-
-    def load_character_fact_draft(
-        self,
-        campaign_id: str,
-        character_id: str,
-    ) -> Optional[Dict[str, Any]]:
-        path = self.character_fact_draft_path(campaign_id, character_id)
-        if not path.exists():
-            return None
-        data = self._read_json_file(path)
-        if isinstance(data, dict):
-            return data
-        return None
-
-    def load_character_fact_batch(
-        self,
-        campaign_id: str,
-        request_id: str,
-    ) -> Optional[Dict[str, Any]]:
-        path = self.find_character_fact_batch_path(campaign_id, request_id)
-        if path is None:
-            return None
-        payload = self._read_json_file(path)
-        if isinstance(payload, dict):
-            return payload
-        return None
-
-    def load_character_fact_from_batches(
-        self,
-        campaign_id: str,
-        character_id: str,
-    ) -> Optional[Dict[str, Any]]:
-        generated_dir = self._generated_characters_dir(campaign_id)
-        if not generated_dir.exists():
-            return None
-        batch_paths = sorted(generated_dir.glob("batch_*.json"), reverse=True)
-        for path in batch_paths:
-            payload = self._read_json_file(path)
-            if not isinstance(payload, dict):
-                continue
-            items = payload.get("items")
-            if not isinstance(items, list):
-                continue
-            for item in items:
-                if not isinstance(item, dict):
-                    continue
-                if item.get("character_id") == character_id:
-                    return item
-        return None
+    def _campaign_path(self, campaign_id: str) -> Path:
+        return self.files.campaign_dir(campaign_id) / "campaign.json"
 
-    def character_fact_id_exists(self, campaign_id: str, character_id: str) -> bool:
-        if self.load_character_fact_draft(campaign_id, character_id) is not None:
-            return True
-        return self.load_character_fact_from_batches(campaign_id, character_id) is not None
+    def _turn_log_path(self, campaign_id: str) -> Path:
+        return self.files.campaign_dir(campaign_id) / "turn_log.jsonl"
 
-    def list_character_fact_batches(
-        self,
-        campaign_id: str,
-        limit: int = 20,
-    ) -> List[Dict[str, Any]]:
-        generated_dir = self._generated_characters_dir(campaign_id)
-        if not generated_dir.exists():
-            return []
-        capped_limit = max(1, min(limit, 200))
-        summaries: List[Dict[str, Any]] = []
-        for path in sorted(generated_dir.glob("batch_*.json"), reverse=True):
-            payload = self._read_json_file(path)
-            utc_ts, request_suffix = self._extract_batch_parts(path)
-            request_id = request_suffix or ""
-            count = 0
-            if isinstance(payload, dict):
-                raw_request_id = payload.get("request_id")
-                if isinstance(raw_request_id, str) and raw_request_id.strip():
-                    request_id = raw_request_id
-                raw_utc_ts = payload.get("utc_ts")
-                if isinstance(raw_utc_ts, str) and raw_utc_ts.strip():
-                    utc_ts = raw_utc_ts
-                items = payload.get("items")
-                if isinstance(items, list):
-                    count = len(items)
-            summaries.append(
-                {
-                    "request_id": request_id,
-                    "utc_ts": utc_ts or "",
-                    "path": self.to_storage_relative_path(path),
-                    "count": count,
-                }
-            )
-            if len(summaries) >= capped_limit:
-                break
-        return summaries
+    def _turn_log_index(self, campaign_id: str) -> TurnLogIndex:
+        return TurnLogIndex(
+            self._turn_log_path(campaign_id),
+            self.files.campaign_dir(campaign_id) / "turn_log.idx",
+        )
 
     def next_campaign_id(self) -> str:
         max_id = 0
@@ -444,18 +380,19 @@ class FileRepo:
         return f"camp_{max_id + 1:04d}"
 
     def next_turn_id(self, campaign_id: str) -> str:
-        path = self._turn_log_path(campaign_id)
-        if not path.exists():
-            return "turn_0001"
-        count = 0
-        with path.open("r", encoding="utf-8") as handle:
-            for line in handle:
-                if line.strip():
-                    count += 1
+        count = self._turn_log_index(campaign_id).ensure_synced()
         return f"turn_{count + 1:04d}"
 
+    def turn_log_row_count(self, campaign_id: str) -> int:
+        return self._turn_log_index(campaign_id).ensure_synced()
+
+    def rebuild_turn_log_index(
+        self, campaign_id: str, *, repair: bool = False
+    ) -> TurnLogRebuildResult:
+        return self._turn_log_index(campaign_id).rebuild(repair=repair)
+
     def create_campaign(self, campaign: Campaign) -> None:
-        campaign_dir = self._campaign_dir(campaign.id)
+        campaign_dir = self.files.campaign_dir(campaign.id)
         campaign_dir.mkdir(parents=True, exist_ok=True)
         path = self._campaign_path(campaign.id)
         if path.exists():
@@ -463,46 +400,58 @@ class FileRepo:
         self.save_campaign(campaign)
 
     def save_campaign(self, campaign: Campaign) -> None:
+        # Compare-and-swap: lands only while campaign.json still holds the
+        # revision this copy was loaded at, and moves both to the next one.
         path = self._campaign_path(campaign.id)
-        validate_actors_state(campaign, campaign.map)
-        campaign.positions = {}
-        campaign.hp = {}
-        campaign.character_states = {}
-        campaign.state.positions = {}
-        campaign.state.positions_parent = {}
-        campaign.state.positions_child = {}
-        require_valid_map(campaign.map)
-        normalize_map(campaign.map)
-        data = _model_to_dict(campaign)
-        path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        with _campaign_save_lock(self.files.campaign_dir(campaign.id)):
+            stored = _stored_revision(path)
+            if stored is not None and stored != campaign.revision:
+                raise _stale_campaign(campaign, stored)
+            data = _prepare_campaign_for_save(campaign)
+            data["revision"] = campaign.revision + 1
+            payload = _encode_campaign_payload(data)
+            if self.campaign_journal is not None:
+                # Journals the payload first, then renames it into place.
+                self.campaign_journal.commit(f"{campaign.id}/campaign.json", payload)
+            else:
+                atomic_write_bytes(path, payload, fsync=self.durability == "fsync")
+            campaign.revision += 1
+            signature = _file_signature(path)
+        if signature is None:
+            self.campaign_cache.invalidate(campaign.id)
+        else:
+            self.campaign_cache.put(campaign.id, signature, campaign)
 
     def get_campaign(self, campaign_id: str) -> Campaign:
         path = self._campaign_path(campaign_id)
-        if not path.exists():
+        signature = _file_signature(path)
+        if signature is None:
+            self.campaign_cache.invalidate(campaign_id)
             raise FileNotFoundError(f"Campaign not found: {campaign_id}")
-        data = json.loads(path.read_text(encoding="utf-8"))
-        map_data = data.get("map")
-        if isinstance(map_data, dict):
-            migrate_map_dict(map_data)
-        campaign = _model_from_dict(Campaign, data)
-        updated = _migrate_actors_if_needed(campaign, data)
-        if "inventory_add" not in campaign.allowlist:
-            campaign.allowlist.append("inventory_add")
-            updated = True
-        for actor_id in campaign.selected.party_character_ids:
-            if actor_id not in campaign.actors:
-                ensure_actor(campaign, actor_id)
-                updated = True
-        if campaign.selected.active_actor_id not in campaign.actors:
-            ensure_actor(campaign, campaign.selected.active_actor_id)
-            updated = True
-        if validate_actors_state(campaign, campaign.map):
-            updated = True
-        normalize_map(campaign.map)
+        cached = self.campaign_cache.get(campaign_id, signature)
+        if cached is not None:
+            return cached
+        campaign, updated = _hydrate_campaign(json.loads(path.read_text(encoding="utf-8")))
         if updated:
-            self.save_campaign(campaign)
+            try:
+                self.save_campaign(campaign)
+            except StaleCampaignError:
+                # Another reader saved the same migration first. Its copy is
+                # read once more and returned without another save attempt;
+                # if it still needs migrating, its next save writes that.
+                campaign, _ = _hydrate_campaign(
+                    json.loads(path.read_text(encoding="utf-8"))
+                )
+        else:
+            self.campaign_cache.put(campaign_id, signature, campaign)
         return campaign
 
+    def campaign_exists(self, campaign_id: str) -> bool:
+        return self._campaign_path(campaign_id).exists()
+
+    def campaign_cache_stats(self) -> Dict[str, int]:
+        return self.campaign_cache.stats()
+
     def list_campaigns(self) -> List[CampaignSummary]:
         summaries: List[CampaignSummary] = []
         for path in self.campaigns_root.glob("camp_*"):
@@ -526,31 +475,235 @@ class FileRepo:
 
     def append_turn_log(self, campaign_id: str, entry: TurnLogEntry) -> None:
         path = self._turn_log_path(campaign_id)
-        data = _model_to_dict(entry)
-        line = json.dumps(data)
-        with path.open("a", encoding="utf-8") as handle:
-            handle.write(line + "\n")
+        index = self._turn_log_index(campaign_id)
+        row_count = index.ensure_synced()
+        row = self._encode_turn_log_row(campaign_id, _model_to_dict(entry), row_count)
+        line = encode_row_line(row)
+        with path.open("ab") as handle:
+            offset = handle.tell()
+            if offset > 0 and not _ends_with_newline(path, offset):
+                handle.write(b"\n")
+                offset += 1
+            handle.write(line)
+        index.append(offset, offset + len(line))
 
     def read_recent_turn_log_rows(
         self, campaign_id: str, limit: int = 3
     ) -> List[Dict[str, Any]]:
+        capped = max(1, min(limit, 200))
+        return list(
+            islice(self.iter_turn_log_rows(campaign_id, reverse=True), capped)
+        )
+
+    def get_turn_log_row(
+        self, campaign_id: str, turn_id: str
+    ) -> Optional[Dict[str, Any]]:
         path = self._turn_log_path(campaign_id)
         if not path.exists():
-            return []
-        capped = max(1, min(limit, 200))
-        rows: List[Dict[str, Any]] = []
-        with path.open("r", encoding="utf-8") as handle:
-            lines = handle.readlines()
-        for line in reversed(lines):
-            raw = line.strip()
-            if not raw:
+            return None
+        # turn ids are allocated from the row count, so turn_000N normally
+        # lives in row N-1; fall back to a scan for hand-edited logs.
+        number = _turn_number(turn_id)
+        if number > 0:
+            payload = self._read_turn_log_row_at(campaign_id, number)
+            if payload is not None and payload.get("turn_id") == turn_id:
+                return decode_row(payload, self._keyframe_loader(campaign_id, {}))
+        for payload in self.iter_turn_log_rows(campaign_id):
+            if payload.get("turn_id") == turn_id:
+                return payload
+        return None
+
+    def get_turn_state_summary(
+        self, campaign_id: str, turn_id: str
+    ) -> Optional[Dict[str, Any]]:
+        row = self.get_turn_log_row(campaign_id, turn_id)
+        if row is None:
+            return None
+        summary = row.get("state_summary")
+        return summary if isinstance(summary, dict) else None
+
+    def iter_turn_log_rows(
+        self,
+        campaign_id: str,
+        *,
+        reverse: bool = False,
+        state_summary: bool = True,
+        after_row: int = 0,
+        before_row: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        # Rows are yielded in the v1 shape whatever the on-disk format; pass
+        # state_summary=False to skip reconstructing summaries. after_row
+        # starts a forward read past the first after_row rows and before_row
+        # stops short of row before_row (a reverse read starts just below
+        # it); both seek through the index.
+        if reverse and after_row:
+            raise ValueError("after_row only applies to forward reads")
+        path = self._turn_log_path(campaign_id)
+        if not path.exists():
+            return
+        if before_row is not None and before_row <= max(1, after_row + 1):
+            return
+        index = self._turn_log_index(campaign_id)
+        offset = 0
+        if after_row > 0:
+            offsets = index.offsets(after_row, after_row + 1)
+            if not offsets:
+                return
+            offset = offsets[0]
+        end: Optional[int] = None
+        if reverse and before_row is not None:
+            offsets = index.offsets(before_row - 1, before_row)
+            end = offsets[0] if offsets else None
+        keyframes: Dict[int, Dict[str, Any]] = {}
+        load_keyframe = self._keyframe_loader(campaign_id, keyframes)
+        lines = _iter_lines_reverse(path, end=end) if reverse else _iter_lines(path, offset)
+        row_number = max(0, after_row)
+        for raw in lines:
+            if not raw.strip():
                 continue
-            try:
-                payload = json.loads(raw)
-            except Exception:
+            row_number += 1
+            if not reverse and before_row is not None and row_number >= before_row:
+                return
+            payload = _parse_row(raw)
+            if payload is None:
                 continue
-            if isinstance(payload, dict):
-                rows.append(payload)
-            if len(rows) >= capped:
-                break
-        return rows
+            if state_summary and not reverse:
+                summary = keyframe_summary(payload)
+                if summary is not None:
+                    _remember_keyframe(keyframes, row_number, summary)
+            yield decode_row(payload, load_keyframe, state_summary=state_summary)
+
+    def truncate_turn_log(self, campaign_id: str, row_count: int) -> int:
+        # Keeps the first row_count rows; returns how many were dropped.
+        if not self._turn_log_path(campaign_id).exists():
+            return 0
+        return self._turn_log_index(campaign_id).truncate(row_count)
+
+    def save_checkpoint(
+        self, campaign: Campaign, turn_id: str, *, keep: int
+    ) -> CampaignCheckpoint:
+        # Snapshot of the campaign as of the last logged row; the oldest
+        # checkpoints beyond `keep` are dropped.
+        return self.files.checkpoint_store(campaign.id).save(
+            self.turn_log_row_count(campaign.id),
+            turn_id,
+            _prepare_campaign_for_save(campaign),
+            keep=keep,
+        )
+
+    def list_checkpoints(self, campaign_id: str) -> List[CampaignCheckpoint]:
+        return self.files.checkpoint_store(campaign_id).list()
+
+    def load_checkpoint(self, campaign_id: str, checkpoint: CampaignCheckpoint) -> Campaign:
+        campaign, _ = _hydrate_campaign(self.files.checkpoint_store(campaign_id).load(checkpoint))
+        return campaign
+
+    def drop_checkpoints_after(self, campaign_id: str, row_count: int) -> int:
+        return self.files.checkpoint_store(campaign_id).drop_after(row_count)
+
+    def convert_turn_log(
+        self,
+        campaign_id: str,
+        *,
+        log_format: int = TURN_LOG_FORMAT_V2,
+        keyframe_interval: Optional[int] = None,
+    ) -> TurnLogConversionResult:
+        # Rewrites the whole log in the requested format. Unparseable rows are
+        # copied verbatim so row numbers (and turn ids) stay aligned.
+        if log_format not in TURN_LOG_FORMATS:
+            raise ValueError(f"unknown turn log format: {log_format}")
+        interval = max(1, keyframe_interval or self.turn_log_keyframe_interval)
+        path = self._turn_log_path(campaign_id)
+        if not path.exists():
+            return TurnLogConversionResult(
+                row_count=0, log_format=log_format, bytes_before=0, bytes_after=0
+            )
+        bytes_before = path.stat().st_size
+        old_keyframes: Dict[int, Dict[str, Any]] = {}
+        load_old_keyframe = self._keyframe_loader(campaign_id, old_keyframes)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.convert.tmp")
+        row_number = 0
+        key_number: Optional[int] = None
+        key_summary: Optional[Dict[str, Any]] = None
+        try:
+            with tmp_path.open("wb") as out:
+                for raw in _iter_lines(path):
+                    if not raw.strip():
+                        continue
+                    row_number += 1
+                    payload = _parse_row(raw)
+                    if payload is None:
+                        out.write(raw.rstrip(b"\r\n") + b"\n")
+                        continue
+                    summary = keyframe_summary(payload)
+                    if summary is not None:
+                        _remember_keyframe(old_keyframes, row_number, summary)
+                    row = decode_row(payload, load_old_keyframe)
+                    if log_format == TURN_LOG_FORMAT_V2:
+                        if key_number is not None and row_number - key_number >= interval:
+                            key_number = key_summary = None
+                        row = choose_v2_encoding(row, key_number, key_summary)
+                        new_summary = keyframe_summary(row)
+                        if new_summary is not None:
+                            key_number, key_summary = row_number, new_summary
+                    out.write(encode_row_line(row))
+            os.replace(tmp_path, path)
+        except BaseException:
+            if tmp_path.exists():
+                tmp_path.unlink()
+            raise
+        self._turn_log_index(campaign_id).rebuild()
+        return TurnLogConversionResult(
+            row_count=row_number,
+            log_format=log_format,
+            bytes_before=bytes_before,
+            bytes_after=path.stat().st_size,
+        )
+
+    def _read_turn_log_row_at(
+        self, campaign_id: str, row_number: int
+    ) -> Optional[Dict[str, Any]]:
+        if row_number < 1:
+            return None
+        offsets = self._turn_log_index(campaign_id).offsets(row_number - 1, row_number)
+        if not offsets:
+            return None
+        with self._turn_log_path(campaign_id).open("rb") as handle:
+            handle.seek(offsets[0])
+            return _parse_row(handle.readline())
+
+    def _keyframe_loader(
+        self, campaign_id: str, keyframes: Dict[int, Dict[str, Any]]
+    ) -> Callable[[int], Optional[Dict[str, Any]]]:
+        def _load(number: int) -> Optional[Dict[str, Any]]:
+            summary = keyframes.get(number)
+            if summary is None:
+                row = self._read_turn_log_row_at(campaign_id, number)
+                summary = keyframe_summary(row) if row is not None else None
+                if summary is not None:
+                    _remember_keyframe(keyframes, number, summary)
+            return summary
+
+        return _load
+
+    def _encode_turn_log_row(
+        self, campaign_id: str, row: Dict[str, Any], row_count: int
+    ) -> Dict[str, Any]:
+        if row_count == 0:
+            log_format = self.turn_log_format
+        else:
+            first = self._read_turn_log_row_at(campaign_id, 1)
+            log_format = row_log_format(first) if first is not None else TURN_LOG_FORMAT_V1
+        if log_format != TURN_LOG_FORMAT_V2:
+            return row
+        last = self._read_turn_log_row_at(campaign_id, row_count)
+        key_number = row_keyframe_number(last, row_count) if last is not None else None
+        key_summary: Optional[Dict[str, Any]] = None
+        if key_number is not None and row_count + 1 - key_number < self.turn_log_keyframe_interval:
+            key_row = last if key_number == row_count else self._read_turn_log_row_at(
+                campaign_id, key_number
+            )
+            key_summary = keyframe_summary(key_row) if key_row is not None else None
+        return choose_v2_encoding(
+            row, key_number if key_summary is not None else None, key_summary
+        )
@@ -1,14 +1,83 @@
 from __future__ import annotations
 
 import json
-import urllib.request
+import re
+import threading
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
+from backend.infra.llm_transport import (
+    LLMTransport,
+    shared_llm_transport,
+    transport_settings,
+)
 from backend.services.keyring import get_api_key
 from backend.services.llm_config import get_active_profile, load_llm_config
 
 
+class SystemPrompt(str):
+    # System prompt split into a constant prefix and a per-turn context. The str
+    # value is the legacy single-message text; LLMClient sends the parts as two
+    # system messages so providers can cache the byte-identical prefix.
+    prefix: str
+    context: str
+
+    def __new__(cls, prefix: str, context: str) -> "SystemPrompt":
+        prompt = super().__new__(cls, f"{prefix} {context}")
+        prompt.prefix = prefix
+        prompt.context = context
+        return prompt
+
+
+class PromptByteStats:
+    # Process-wide count of prompt bytes sent, split into the cacheable static
+    # prefix and everything that changes per request.
+    def __init__(self) -> None:
+        self._guard = threading.Lock()
+        self._requests = 0
+        self._static_bytes = 0
+        self._dynamic_bytes = 0
+
+    def record(self, static_bytes: int, dynamic_bytes: int) -> None:
+        with self._guard:
+            self._requests += 1
+            self._static_bytes += static_bytes
+            self._dynamic_bytes += dynamic_bytes
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._guard:
+            return {
+                "requests": self._requests,
+                "static_bytes": self._static_bytes,
+                "dynamic_bytes": self._dynamic_bytes,
+            }
+
+    def reset(self) -> None:
+        with self._guard:
+            self._requests = 0
+            self._static_bytes = 0
+            self._dynamic_bytes = 0
+
+
+PROMPT_BYTE_STATS = PromptByteStats()
+
+
+def prompt_byte_sizes(
+    system_prompt: str, user_input: str, debug_append: Optional[str] = None
+) -> Tuple[int, int]:
+    # (static, dynamic) UTF-8 bytes of one request's message contents.
+    static = system_prompt.prefix if isinstance(system_prompt, SystemPrompt) else ""
+    dynamic = [
+        system_prompt.context if isinstance(system_prompt, SystemPrompt) else system_prompt,
+        debug_append or "",
+        user_input,
+    ]
+    return (
+        len(static.encode("utf-8")),
+        sum(len(part.encode("utf-8")) for part in dynamic),
+    )
+
+
 @dataclass
 class LLMConfig:
     base_url: str
@@ -18,6 +87,9 @@ class LLMConfig:
     timeout_sec: int
     max_tokens: Optional[int] = None
     response_format: Optional[Dict[str, Any]] = None
+    profile_name: str = "default"
+    max_concurrency: Optional[int] = None
+    connect_timeout_sec: Optional[int] = None
 
     @classmethod
     def from_config(cls) -> "LLMConfig":
@@ -33,19 +105,88 @@ class LLMConfig:
             timeout_sec=profile.timeout_sec,
             max_tokens=profile.max_tokens,
             response_format=response_format,
+            profile_name=profile.name,
+            max_concurrency=profile.max_concurrency,
+            connect_timeout_sec=profile.connect_timeout_sec,
         )
 
 
 class LLMClient:
-    def __init__(self, config: Optional[LLMConfig] = None) -> None:
+    def __init__(
+        self,
+        config: Optional[LLMConfig] = None,
+        *,
+        transport: Optional[LLMTransport] = None,
+    ) -> None:
         self.config = config or LLMConfig.from_config()
+        self.transport = transport or shared_llm_transport(
+            f"{self.config.profile_name}:{self.config.base_url}",
+            transport_settings(
+                self.config.max_concurrency, self.config.connect_timeout_sec
+            ),
+        )
 
     def generate(
         self, system_prompt: str, user_input: str, debug_append: Optional[str] = None
     ) -> Dict[str, Any]:
-        messages = [
-            {"role": "system", "content": system_prompt},
-        ]
+        response = self.transport.post_json(
+            _endpoint(self.config.base_url, "chat/completions"),
+            self._build_payload(system_prompt, user_input, debug_append),
+            api_key=self.config.api_key,
+            timeout=self.config.timeout_sec,
+        )
+        return _parse_model_output(_extract_content(response))
+
+    async def agenerate(
+        self, system_prompt: str, user_input: str, debug_append: Optional[str] = None
+    ) -> Dict[str, Any]:
+        response = await self.transport.apost_json(
+            _endpoint(self.config.base_url, "chat/completions"),
+            self._build_payload(system_prompt, user_input, debug_append),
+            api_key=self.config.api_key,
+            timeout=self.config.timeout_sec,
+        )
+        return _parse_model_output(_extract_content(response))
+
+    async def astream(
+        self, system_prompt: str, user_input: str, debug_append: Optional[str] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        # Yields ("delta", text) as assistant_text arrives, then ("output", parsed)
+        # once the completion is finished.
+        payload = self._build_payload(system_prompt, user_input, debug_append)
+        payload["stream"] = True
+        extractor = AssistantTextExtractor()
+        parts: List[str] = []
+        async for chunk in self.transport.astream_json(
+            _endpoint(self.config.base_url, "chat/completions"),
+            payload,
+            api_key=self.config.api_key,
+            timeout=self.config.timeout_sec,
+        ):
+            piece = _extract_stream_delta(chunk)
+            if not piece:
+                continue
+            parts.append(piece)
+            text = extractor.feed(piece)
+            if text:
+                yield ("delta", text)
+        yield ("output", _parse_model_output("".join(parts)))
+
+    def _build_payload(
+        self, system_prompt: str, user_input: str, debug_append: Optional[str]
+    ) -> Dict[str, Any]:
+        if isinstance(system_prompt, SystemPrompt):
+            messages = [
+                {"role": "system", "content": system_prompt.prefix},
+                {"role": "system", "content": system_prompt.context},
+            ]
+        else:
+            messages = [
+                {"role": "system", "content": system_prompt},
+            ]
+        PROMPT_BYTE_STATS.record(
+            *prompt_byte_sizes(system_prompt, user_input, debug_append)
+        )
         if debug_append:
             messages.append({"role": "system", "content": debug_append})
         messages.append({"role": "user", "content": user_input})
@@ -57,14 +198,81 @@ class LLMClient:
         }
         if self.config.max_tokens is not None:
             payload["max_tokens"] = self.config.max_tokens
-        response = _post_json(
-            _endpoint(self.config.base_url, "chat/completions"),
-            payload,
-            api_key=self.config.api_key,
-            timeout=self.config.timeout_sec,
-        )
-        content = _extract_content(response)
-        return _parse_model_output(content)
+        return payload
+
+
+_ASSISTANT_TEXT_KEY = re.compile(r'"assistant_text"\s*:\s*"')
+_JSON_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+
+
+class AssistantTextExtractor:
+    # Decodes the assistant_text string of a JSON object that is still being
+    # streamed; feed() returns only the characters that became available.
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._pos = 0
+        self._state = "seek"
+        self._high_surrogate: Optional[int] = None
+
+    @property
+    def done(self) -> bool:
+        return self._state == "done"
+
+    def feed(self, chunk: str) -> str:
+        self._buffer += chunk
+        if self._state == "seek":
+            match = _ASSISTANT_TEXT_KEY.search(self._buffer)
+            if match is None:
+                return ""
+            self._state = "text"
+            self._pos = match.end()
+        if self._state != "text":
+            return ""
+        out: List[str] = []
+        buffer = self._buffer
+        pos = self._pos
+        while pos < len(buffer):
+            char = buffer[pos]
+            if char == '"':
+                self._state = "done"
+                break
+            if char != "\\":
+                out.append(char)
+                pos += 1
+                continue
+            if pos + 1 >= len(buffer):
+                break
+            escape = buffer[pos + 1]
+            if escape != "u":
+                out.append(_JSON_ESCAPES.get(escape, escape))
+                pos += 2
+                continue
+            if pos + 6 > len(buffer):
+                break
+            try:
+                code = int(buffer[pos + 2 : pos + 6], 16)
+            except ValueError:
+                self._state = "done"
+                break
+            pos += 6
+            if 0xD800 <= code < 0xDC00:
+                self._high_surrogate = code
+                continue
+            high, self._high_surrogate = self._high_surrogate, None
+            if high is not None and 0xDC00 <= code < 0xE000:
+                code = 0x10000 + ((high - 0xD800) << 10) + (code - 0xDC00)
+            out.append(chr(code))
+        self._pos = pos
+        return "".join(out)
 
 
 def _endpoint(base_url: str, path: str) -> str:
@@ -74,24 +282,6 @@ def _endpoint(base_url: str, path: str) -> str:
     return f"{base}/{path.lstrip('/')}"
 
 
-def _post_json(
-    url: str, payload: Dict[str, Any], api_key: str, timeout: int
-) -> Dict[str, Any]:
-    data = json.dumps(payload).encode("utf-8")
-    request = urllib.request.Request(
-        url,
-        data=data,
-        method="POST",
-        headers={
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {api_key}",
-        },
-    )
-    with urllib.request.urlopen(request, timeout=timeout) as response:
-        body = response.read().decode("utf-8")
-    return json.loads(body)
-
-
 def _extract_content(response: Dict[str, Any]) -> str:
     try:
         return response["choices"][0]["message"]["content"]
@@ -99,6 +289,14 @@ def _extract_content(response: Dict[str, Any]) -> str:
         raise RuntimeError("Unexpected LLM response format")
 
 
+def _extract_stream_delta(chunk: Dict[str, Any]) -> str:
+    try:
+        content = chunk["choices"][0]["delta"].get("content")
+    except (KeyError, IndexError, TypeError, AttributeError):
+        return ""
+    return content if isinstance(content, str) else ""
+
+
 def _parse_model_output(content: str) -> Dict[str, Any]:
     try:
         data = json.loads(content)
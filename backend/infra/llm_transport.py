@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, Optional, Tuple
+
+import httpx
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_CONNECT_TIMEOUT_SEC = 10.0
+DEFAULT_KEEPALIVE_EXPIRY_SEC = 60.0
+
+
+class LLMTransportError(RuntimeError):
+    def __init__(self, message: str, *, status_code: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@dataclass(frozen=True)
+class LLMTransportSettings:
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    connect_timeout_sec: float = DEFAULT_CONNECT_TIMEOUT_SEC
+    keepalive_expiry_sec: float = DEFAULT_KEEPALIVE_EXPIRY_SEC
+
+
+def transport_settings(
+    max_concurrency: Optional[int] = None,
+    connect_timeout_sec: Optional[float] = None,
+) -> LLMTransportSettings:
+    return LLMTransportSettings(
+        max_concurrency=max_concurrency or DEFAULT_MAX_CONCURRENCY,
+        connect_timeout_sec=(
+            float(connect_timeout_sec)
+            if connect_timeout_sec
+            else DEFAULT_CONNECT_TIMEOUT_SEC
+        ),
+    )
+
+
+class _SlotWaiter:
+    # `granted` is only read and written under the slots guard and decides
+    # who owns the slot when a grant races a cancellation.
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        self.granted = False
+        self.loop = loop
+        self.event = threading.Event() if loop is None else None
+        self.future: Optional["asyncio.Future[None]"] = (
+            loop.create_future() if loop is not None else None
+        )
+
+    def grant(self) -> bool:
+        self.granted = True
+        if self.event is not None:
+            self.event.set()
+            return True
+        try:
+            assert self.loop is not None
+            self.loop.call_soon_threadsafe(_resolve_future, self.future)
+        except RuntimeError:
+            # The waiting loop is gone; hand the slot to the next waiter.
+            self.granted = False
+            return False
+        return True
+
+
+def _resolve_future(future: Optional["asyncio.Future[None]"]) -> None:
+    if future is not None and not future.done():
+        future.set_result(None)
+
+
+class ConcurrencySlots:
+    # In-flight request slots shared by sync callers, executor threads and
+    # every event loop, handed out in arrival order. Async callers wait on
+    # their loop instead of blocking it.
+    def __init__(self, limit: int) -> None:
+        self.limit = max(1, limit)
+        self._guard = threading.Lock()
+        self._in_use = 0
+        self._waiters: Deque[_SlotWaiter] = deque()
+
+    @property
+    def in_use(self) -> int:
+        with self._guard:
+            return self._in_use
+
+    @contextmanager
+    def hold(self) -> Iterator[None]:
+        waiter = self._enqueue(None)
+        if waiter is not None:
+            assert waiter.event is not None
+            waiter.event.wait()
+        try:
+            yield
+        finally:
+            self.release()
+
+    @asynccontextmanager
+    async def ahold(self) -> AsyncIterator[None]:
+        waiter = self._enqueue(asyncio.get_running_loop())
+        if waiter is not None:
+            try:
+                await waiter.future  # type: ignore[misc]
+            except BaseException:
+                with self._guard:
+                    granted = waiter.granted
+                    if not granted:
+                        self._waiters.remove(waiter)
+                if granted:
+                    self.release()
+                raise
+        try:
+            yield
+        finally:
+            self.release()
+
+    def release(self) -> None:
+        with self._guard:
+            while self._waiters:
+                if self._waiters.popleft().grant():
+                    return
+            self._in_use -= 1
+
+    def _enqueue(self, loop: Optional[asyncio.AbstractEventLoop]) -> Optional[_SlotWaiter]:
+        with self._guard:
+            if self._in_use < self.limit and not self._waiters:
+                self._in_use += 1
+                return None
+            waiter = _SlotWaiter(loop)
+            self._waiters.append(waiter)
+            return waiter
+
+
+class LLMTransport:
+    # Pooled keep-alive HTTP for one LLM profile. The sync client is shared by
+    # every thread; async clients are bound to an event loop, so one is kept
+    # per loop. max_concurrency caps in-flight requests across all of them.
+    def __init__(self, settings: Optional[LLMTransportSettings] = None) -> None:
+        self.settings = settings or LLMTransportSettings()
+        self.max_concurrency = max(1, self.settings.max_concurrency)
+        self._limits = httpx.Limits(
+            max_connections=self.max_concurrency,
+            max_keepalive_connections=self.max_concurrency,
+            keepalive_expiry=self.settings.keepalive_expiry_sec,
+        )
+        self._guard = threading.Lock()
+        self._client: Optional[httpx.Client] = None
+        self.slots = ConcurrencySlots(self.max_concurrency)
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def post_json(
+        self,
+        url: str,
+        payload: Dict[str, Any],
+        *,
+        api_key: str,
+        timeout: float,
+    ) -> Dict[str, Any]:
+        client = self._sync_client()
+        with self.slots.hold():
+            try:
+                response = client.post(
+                    url,
+                    json=payload,
+                    headers=_headers(api_key),
+                    timeout=self._timeout(timeout),
+                )
+            except httpx.TimeoutException as exc:
+                raise LLMTransportError(f"LLM request timed out: {url}") from exc
+            except httpx.HTTPError as exc:
+                raise LLMTransportError(f"LLM request failed: {exc}") from exc
+        return _decode_response(response)
+
+    async def apost_json(
+        self,
+        url: str,
+        payload: Dict[str, Any],
+        *,
+        api_key: str,
+        timeout: float,
+    ) -> Dict[str, Any]:
+        client = self._async_client()
+        async with self.slots.ahold():
+            try:
+                response = await client.post(
+                    url,
+                    json=payload,
+                    headers=_headers(api_key),
+                    timeout=self._timeout(timeout),
+                )
+            except httpx.TimeoutException as exc:
+                raise LLMTransportError(f"LLM request timed out: {url}") from exc
+            except httpx.HTTPError as exc:
+                raise LLMTransportError(f"LLM request failed: {exc}") from exc
+        return _decode_response(response)
+
+    async def astream_json(
+        self,
+        url: str,
+        payload: Dict[str, Any],
+        *,
+        api_key: str,
+        timeout: float,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        # Server-sent events from a `"stream": true` request, one decoded
+        # `data:` object at a time; the read timeout applies per chunk.
+        client = self._async_client()
+        async with self.slots.ahold():
+            try:
+                async with client.stream(
+                    "POST",
+                    url,
+                    json=payload,
+                    headers=_headers(api_key),
+                    timeout=self._timeout(timeout),
+                ) as response:
+                    if response.status_code >= 400:
+                        raise LLMTransportError(
+                            f"LLM request failed with HTTP {response.status_code}",
+                            status_code=response.status_code,
+                        )
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        data = line[len("data:"):].strip()
+                        if data == "[DONE]":
+                            return
+                        try:
+                            chunk = json.loads(data)
+                        except ValueError as exc:
+                            raise LLMTransportError(
+                                "LLM stream chunk is not valid JSON"
+                            ) from exc
+                        if isinstance(chunk, dict):
+                            yield chunk
+            except httpx.TimeoutException as exc:
+                raise LLMTransportError(f"LLM request timed out: {url}") from exc
+            except httpx.HTTPError as exc:
+                raise LLMTransportError(f"LLM request failed: {exc}") from exc
+
+    def close(self) -> None:
+        with self._guard:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+    async def aclose(self) -> None:
+        # Closes the sync pool and the async pool bound to the running loop.
+        self.close()
+        with self._guard:
+            client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    def _timeout(self, timeout: float) -> httpx.Timeout:
+        return httpx.Timeout(
+            timeout, connect=min(timeout, self.settings.connect_timeout_sec)
+        )
+
+    def _sync_client(self) -> httpx.Client:
+        with self._guard:
+            if self._client is None:
+                self._client = httpx.Client(limits=self._limits)
+            return self._client
+
+    def _async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        with self._guard:
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = httpx.AsyncClient(limits=self._limits)
+                self._async_clients[loop] = client
+            return client
+
+
+def _headers(api_key: str) -> Dict[str, str]:
+    return {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {api_key}",
+    }
+
+
+def _decode_response(response: httpx.Response) -> Dict[str, Any]:
+    if response.status_code >= 400:
+        raise LLMTransportError(
+            f"LLM request failed with HTTP {response.status_code}",
+            status_code=response.status_code,
+        )
+    try:
+        data = response.json()
+    except ValueError as exc:
+        raise LLMTransportError("LLM response is not valid JSON") from exc
+    if not isinstance(data, dict):
+        raise LLMTransportError("LLM response root must be an object")
+    return data
+
+
+_SHARED_TRANSPORTS: Dict[Tuple[str, LLMTransportSettings], LLMTransport] = {}
+_SHARED_TRANSPORTS_GUARD = threading.Lock()
+
+
+def shared_llm_transport(
+    profile_key: str, settings: Optional[LLMTransportSettings] = None
+) -> LLMTransport:
+    # Clients are built per request; sharing the transport per profile keeps
+    # connections (and TLS sessions) warm across turns and retries.
+    resolved = settings or LLMTransportSettings()
+    key = (profile_key, resolved)
+    with _SHARED_TRANSPORTS_GUARD:
+        transport = _SHARED_TRANSPORTS.get(key)
+        if transport is None:
+            transport = LLMTransport(resolved)
+            _SHARED_TRANSPORTS[key] = transport
+        return transport
+
+
+def close_shared_llm_transports() -> None:
+    with _SHARED_TRANSPORTS_GUARD:
+        transports = list(_SHARED_TRANSPORTS.values())
+        _SHARED_TRANSPORTS.clear()
+    for transport in transports:
+        transport.close()
+
+
+async def aclose_shared_llm_transports() -> None:
+    with _SHARED_TRANSPORTS_GUARD:
+        transports = list(_SHARED_TRANSPORTS.values())
+        _SHARED_TRANSPORTS.clear()
+    for transport in transports:
+        await transport.aclose()
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Optional
+
+from backend.infra.file_repo import FileRepo
+from backend.infra.repository import Repository
+from backend.infra.sqlite_repo import SqliteRepo
+
+STORAGE_BACKEND_ENV = "AI_TRPG_STORAGE_BACKEND"
+STORAGE_BACKENDS = ("file", "sqlite")
+
+
+def storage_backend_name(value: Optional[str] = None) -> str:
+    raw = value if value is not None else os.getenv(STORAGE_BACKEND_ENV, "file")
+    name = raw.strip().lower() or "file"
+    if name not in STORAGE_BACKENDS:
+        raise ValueError(f"unknown storage backend: {raw}")
+    return name
+
+
+def create_repo(storage_root: Path, *, backend: Optional[str] = None) -> Repository:
+    if storage_backend_name(backend) == "sqlite":
+        return SqliteRepo(storage_root)
+    return FileRepo(storage_root)
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Protocol
+
+from backend.domain.models import Campaign, CampaignSummary, TurnLogEntry
+from backend.domain.world_models import World
+from backend.infra.campaign_checkpoints import CampaignCheckpoint
+
+
+class Repository(Protocol):
+    # The storage surface the app layer relies on. FileRepo and SqliteRepo
+    # implement it and share the on-disk artifacts through StorageFiles.
+    storage_root: Path
+
+    def to_storage_relative_path(self, path: Path) -> str: ...
+
+    def get_world(self, world_id: str) -> Optional[World]: ...
+
+    def save_world(self, world: World) -> None: ...
+
+    def get_or_create_world_stub(
+        self,
+        world_id: str,
+        *,
+        seed_source: str = "world_id_hash",
+        generator_default: str = "stub",
+    ) -> World: ...
+
+    def find_character_fact_batch_path(
+        self, campaign_id: str, request_id: str
+    ) -> Optional[Path]: ...
+
+    def save_character_fact_batch(
+        self,
+        campaign_id: str,
+        request_id: str,
+        payload: Dict[str, Any],
+        utc_ts: Optional[str] = None,
+    ) -> Path: ...
+
+    def save_character_fact_draft(
+        self, campaign_id: str, character_file_id: str, payload: Dict[str, Any]
+    ) -> Path: ...
+
+    def character_fact_draft_path(self, campaign_id: str, character_id: str) -> Path: ...
+
+    def save_character_fact_acceptance(
+        self, campaign_id: str, character_id: str, payload: Dict[str, Any]
+    ) -> Path: ...
+
+    def load_character_fact_acceptance(
+        self, campaign_id: str, character_id: str
+    ) -> Optional[Dict[str, Any]]: ...
+
+    def load_character_fact_draft(
+        self, campaign_id: str, character_id: str
+    ) -> Optional[Dict[str, Any]]: ...
+
+    def load_character_fact_batch(
+        self, campaign_id: str, request_id: str
+    ) -> Optional[Dict[str, Any]]: ...
+
+    def load_character_fact_from_batches(
+        self, campaign_id: str, character_id: str
+    ) -> Optional[Dict[str, Any]]: ...
+
+    def character_fact_id_exists(self, campaign_id: str, character_id: str) -> bool: ...
+
+    def list_character_fact_batches(
+        self, campaign_id: str, limit: int = 20
+    ) -> List[Dict[str, Any]]: ...
+
+    def next_campaign_id(self) -> str: ...
+
+    def next_turn_id(self, campaign_id: str) -> str: ...
+
+    def turn_log_row_count(self, campaign_id: str) -> int: ...
+
+    def create_campaign(self, campaign: Campaign) -> None: ...
+
+    def save_campaign(self, campaign: Campaign) -> None: ...
+
+    def get_campaign(self, campaign_id: str) -> Campaign: ...
+
+    def campaign_exists(self, campaign_id: str) -> bool: ...
+
+    def turn_lock_path(self, campaign_id: str) -> Path: ...
+
+    def list_campaigns(self) -> List[CampaignSummary]: ...
+
+    def update_active_actor(self, campaign: Campaign, actor_id: str) -> Campaign: ...
+
+    def append_turn_log(self, campaign_id: str, entry: TurnLogEntry) -> None: ...
+
+    def read_recent_turn_log_rows(
+        self, campaign_id: str, limit: int = 3
+    ) -> List[Dict[str, Any]]: ...
+
+    def iter_turn_log_rows(
+        self,
+        campaign_id: str,
+        *,
+        reverse: bool = False,
+        state_summary: bool = True,
+        after_row: int = 0,
+        before_row: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]: ...
+
+    def truncate_turn_log(self, campaign_id: str, row_count: int) -> int: ...
+
+    def save_checkpoint(
+        self, campaign: Campaign, turn_id: str, *, keep: int
+    ) -> CampaignCheckpoint: ...
+
+    def list_checkpoints(self, campaign_id: str) -> List[CampaignCheckpoint]: ...
+
+    def load_checkpoint(
+        self, campaign_id: str, checkpoint: CampaignCheckpoint
+    ) -> Campaign: ...
+
+    def drop_checkpoints_after(self, campaign_id: str, row_count: int) -> int: ...
+
+    def get_turn_log_row(
+        self, campaign_id: str, turn_id: str
+    ) -> Optional[Dict[str, Any]]: ...
+
+    def get_turn_state_summary(
+        self, campaign_id: str, turn_id: str
+    ) -> Optional[Dict[str, Any]]: ...
@@ -0,0 +1,413 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from backend.domain.models import Campaign, CampaignSummary, TurnLogEntry
+from backend.infra.campaign_cache import CampaignCache, shared_campaign_cache
+from backend.infra.campaign_checkpoints import CampaignCheckpoint
+from backend.infra.file_repo import (
+    FileRepo,
+    StaleCampaignError,
+    _hydrate_campaign,
+    _prepare_campaign_for_save,
+)
+from backend.infra.storage_files import StorageFileMethods, StorageFiles, _model_to_dict
+from backend.infra.turn_log_index import TurnLogRebuildResult
+
+SQLITE_DB_FILENAME = "ai_trpg.sqlite3"
+SQLITE_SCHEMA_VERSION = 1
+_TURN_PAGE_ROWS = 256
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS campaigns (
+    id TEXT PRIMARY KEY,
+    seq INTEGER,
+    world_id TEXT NOT NULL,
+    active_actor_id TEXT NOT NULL,
+    revision INTEGER NOT NULL DEFAULT 1,
+    data TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS campaigns_seq ON campaigns (seq);
+CREATE TABLE IF NOT EXISTS turns (
+    campaign_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    turn_id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (campaign_id, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS turns_turn_id ON turns (campaign_id, turn_id);
+"""
+
+_CONNECTIONS = threading.local()
+_INITIALIZED: set[Path] = set()
+_INITIALIZED_GUARD = threading.Lock()
+
+
+def _campaign_seq(campaign_id: str) -> Optional[int]:
+    suffix = campaign_id.split("_", 1)[1] if campaign_id.startswith("camp_") else ""
+    return int(suffix) if suffix.isdigit() else None
+
+
+def _dumps(data: Dict[str, Any]) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    # One connection per thread and database; routes build a repo per request,
+    # so opening a fresh connection each time would dominate small queries.
+    connections: Dict[Path, sqlite3.Connection] = getattr(_CONNECTIONS, "by_path", None)
+    if connections is None:
+        connections = {}
+        _CONNECTIONS.by_path = connections
+    conn = connections.get(db_path)
+    if conn is not None:
+        return conn
+    conn = sqlite3.connect(str(db_path), isolation_level=None, timeout=30.0)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    with _INITIALIZED_GUARD:
+        if db_path not in _INITIALIZED:
+            conn.executescript(_SCHEMA)
+            conn.execute(f"PRAGMA user_version={SQLITE_SCHEMA_VERSION}")
+            _INITIALIZED.add(db_path)
+    connections[db_path] = conn
+    return conn
+
+
+def close_thread_connections() -> None:
+    connections: Dict[Path, sqlite3.Connection] = getattr(_CONNECTIONS, "by_path", {})
+    for conn in connections.values():
+        conn.close()
+    connections.clear()
+    with _INITIALIZED_GUARD:
+        _INITIALIZED.clear()
+
+
+class SqliteRepo(StorageFileMethods):
+    # Campaign state and turn logs live in one SQLite database (WAL mode);
+    # worlds, checkpoints, turn lock files and character fact artifacts stay
+    # on disk through the same StorageFiles helper FileRepo uses.
+    def __init__(
+        self,
+        storage_root: Path,
+        *,
+        campaign_cache: Optional[CampaignCache] = None,
+        db_path: Optional[Path] = None,
+    ) -> None:
+        self.files = StorageFiles(storage_root)
+        self.storage_root = storage_root
+        self.campaigns_root = self.files.campaigns_root
+        self.db_path = (db_path or storage_root / SQLITE_DB_FILENAME).resolve()
+        self.campaign_cache = (
+            campaign_cache
+            if campaign_cache is not None
+            else shared_campaign_cache(self.db_path)
+        )
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        return _connect(self.db_path)
+
+    def next_campaign_id(self) -> str:
+        row = self._conn.execute("SELECT MAX(seq) FROM campaigns").fetchone()
+        return f"camp_{(row[0] or 0) + 1:04d}"
+
+    def next_turn_id(self, campaign_id: str) -> str:
+        return f"turn_{self.turn_log_row_count(campaign_id) + 1:04d}"
+
+    def turn_log_row_count(self, campaign_id: str) -> int:
+        row = self._conn.execute(
+            "SELECT MAX(seq) FROM turns WHERE campaign_id = ?", (campaign_id,)
+        ).fetchone()
+        return row[0] or 0
+
+    def rebuild_turn_log_index(
+        self, campaign_id: str, *, repair: bool = False
+    ) -> TurnLogRebuildResult:
+        # The turns table is its own index; report what it holds.
+        row = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(data) + 1), 0) FROM turns"
+            " WHERE campaign_id = ?",
+            (campaign_id,),
+        ).fetchone()
+        return TurnLogRebuildResult(row_count=row[0], log_bytes=row[1])
+
+    def create_campaign(self, campaign: Campaign) -> None:
+        if self.campaign_exists(campaign.id):
+            raise FileExistsError(f"Campaign already exists: {campaign.id}")
+        self.save_campaign(campaign)
+
+    def save_campaign(self, campaign: Campaign) -> None:
+        # The revision column is the compare-and-swap: the update only matches
+        # the row at the revision this copy was loaded at. A campaign with no
+        # row yet is inserted instead. rowcount rather than RETURNING, which
+        # needs SQLite 3.35.
+        data = _prepare_campaign_for_save(campaign)
+        revision = campaign.revision + 1
+        data["revision"] = revision
+        encoded = _dumps(data)
+        updated_at = datetime.now(timezone.utc).isoformat()
+        conn = self._conn
+        cursor = conn.execute(
+            "UPDATE campaigns SET world_id = ?, active_actor_id = ?, revision = ?,"
+            " data = ?, updated_at = ? WHERE id = ? AND revision = ?",
+            (
+                campaign.selected.world_id,
+                campaign.selected.active_actor_id,
+                revision,
+                encoded,
+                updated_at,
+                campaign.id,
+                campaign.revision,
+            ),
+        )
+        if cursor.rowcount == 0:
+            try:
+                conn.execute(
+                    "INSERT INTO campaigns"
+                    " (id, seq, world_id, active_actor_id, revision, data, updated_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        campaign.id,
+                        _campaign_seq(campaign.id),
+                        campaign.selected.world_id,
+                        campaign.selected.active_actor_id,
+                        revision,
+                        encoded,
+                        updated_at,
+                    ),
+                )
+            except sqlite3.IntegrityError as exc:
+                stored = conn.execute(
+                    "SELECT revision FROM campaigns WHERE id = ?", (campaign.id,)
+                ).fetchone()
+                raise StaleCampaignError(
+                    f"campaign {campaign.id} was saved elsewhere (revision "
+                    f"{stored[0] if stored else '?'}, loaded at {campaign.revision}); "
+                    "reload and retry."
+                ) from exc
+        campaign.revision = revision
+        self.campaign_cache.put(campaign.id, (revision,), campaign)
+
+    def get_campaign(self, campaign_id: str) -> Campaign:
+        conn = self._conn
+        row = conn.execute(
+            "SELECT revision FROM campaigns WHERE id = ?", (campaign_id,)
+        ).fetchone()
+        if row is None:
+            self.campaign_cache.invalidate(campaign_id)
+            raise FileNotFoundError(f"Campaign not found: {campaign_id}")
+        cached = self.campaign_cache.get(campaign_id, (row[0],))
+        if cached is not None:
+            return cached
+        campaign, updated = self._read_campaign(campaign_id)
+        if updated:
+            try:
+                self.save_campaign(campaign)
+            except StaleCampaignError:
+                # Read once more, as FileRepo does, and never save again here.
+                campaign, _ = self._read_campaign(campaign_id)
+        else:
+            self.campaign_cache.put(campaign_id, (campaign.revision,), campaign)
+        return campaign
+
+    def _read_campaign(self, campaign_id: str) -> Tuple[Campaign, bool]:
+        row = self._conn.execute(
+            "SELECT revision, data FROM campaigns WHERE id = ?", (campaign_id,)
+        ).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"Campaign not found: {campaign_id}")
+        campaign, updated = _hydrate_campaign(json.loads(row[1]))
+        campaign.revision = row[0]
+        return campaign, updated
+
+    def campaign_exists(self, campaign_id: str) -> bool:
+        row = self._conn.execute(
+            "SELECT 1 FROM campaigns WHERE id = ?", (campaign_id,)
+        ).fetchone()
+        return row is not None
+
+    def campaign_cache_stats(self) -> Dict[str, int]:
+        return self.campaign_cache.stats()
+
+    def list_campaigns(self) -> List[CampaignSummary]:
+        rows = self._conn.execute(
+            "SELECT id, world_id, active_actor_id FROM campaigns ORDER BY seq, id"
+        ).fetchall()
+        return [
+            CampaignSummary(id=row[0], world_id=row[1], active_actor_id=row[2])
+            for row in rows
+        ]
+
+    def update_active_actor(self, campaign: Campaign, actor_id: str) -> Campaign:
+        campaign.selected.active_actor_id = actor_id
+        self.save_campaign(campaign)
+        return campaign
+
+    def append_turn_log(self, campaign_id: str, entry: TurnLogEntry) -> None:
+        data = _model_to_dict(entry)
+        self._conn.execute(
+            "INSERT INTO turns (campaign_id, seq, turn_id, data)"
+            " SELECT ?, COALESCE(MAX(seq), 0) + 1, ?, ? FROM turns"
+            " WHERE campaign_id = ?",
+            (campaign_id, entry.turn_id, _dumps(data), campaign_id),
+        )
+
+    def truncate_turn_log(self, campaign_id: str, row_count: int) -> int:
+        cursor = self._conn.execute(
+            "DELETE FROM turns WHERE campaign_id = ? AND seq > ?",
+            (campaign_id, max(0, row_count)),
+        )
+        return cursor.rowcount
+
+    def get_turn_log_row(
+        self, campaign_id: str, turn_id: str
+    ) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute(
+            "SELECT data FROM turns WHERE campaign_id = ? AND turn_id = ?"
+            " ORDER BY seq LIMIT 1",
+            (campaign_id, turn_id),
+        ).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def get_turn_state_summary(
+        self, campaign_id: str, turn_id: str
+    ) -> Optional[Dict[str, Any]]:
+        row = self.get_turn_log_row(campaign_id, turn_id)
+        if row is None:
+            return None
+        summary = row.get("state_summary")
+        return summary if isinstance(summary, dict) else None
+
+    def read_recent_turn_log_rows(
+        self, campaign_id: str, limit: int = 3
+    ) -> List[Dict[str, Any]]:
+        capped = max(1, min(limit, 200))
+        return list(
+            islice(self.iter_turn_log_rows(campaign_id, reverse=True), capped)
+        )
+
+    def iter_turn_log_rows(
+        self,
+        campaign_id: str,
+        *,
+        reverse: bool = False,
+        state_summary: bool = True,
+        after_row: int = 0,
+        before_row: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        # Keyset pages instead of one open cursor, so a consumer that stops
+        # early (or writes in between) never pins a read snapshot.
+        if reverse and after_row:
+            raise ValueError("after_row only applies to forward reads")
+        if reverse:
+            query = (
+                "SELECT seq, data FROM turns WHERE campaign_id = ? AND seq < ?"
+                " ORDER BY seq DESC LIMIT ?"
+            )
+            cursor = self.turn_log_row_count(campaign_id) + 1
+            if before_row is not None:
+                cursor = min(cursor, before_row)
+        else:
+            query = (
+                "SELECT seq, data FROM turns WHERE campaign_id = ? AND seq > ?"
+                " ORDER BY seq LIMIT ?"
+            )
+            cursor = max(0, after_row)
+        while True:
+            rows = self._conn.execute(
+                query, (campaign_id, cursor, _TURN_PAGE_ROWS)
+            ).fetchall()
+            for seq, raw in rows:
+                if not reverse and before_row is not None and seq >= before_row:
+                    return
+                cursor = seq
+                payload = json.loads(raw)
+                if isinstance(payload, dict):
+                    if not state_summary:
+                        payload.pop("state_summary", None)
+                    yield payload
+            if len(rows) < _TURN_PAGE_ROWS:
+                return
+
+    def save_checkpoint(
+        self, campaign: Campaign, turn_id: str, *, keep: int
+    ) -> CampaignCheckpoint:
+        return self.files.checkpoint_store(campaign.id).save(
+            self.turn_log_row_count(campaign.id),
+            turn_id,
+            _prepare_campaign_for_save(campaign),
+            keep=keep,
+        )
+
+    def list_checkpoints(self, campaign_id: str) -> List[CampaignCheckpoint]:
+        return self.files.checkpoint_store(campaign_id).list()
+
+    def load_checkpoint(self, campaign_id: str, checkpoint: CampaignCheckpoint) -> Campaign:
+        campaign, _ = _hydrate_campaign(self.files.checkpoint_store(campaign_id).load(checkpoint))
+        return campaign
+
+    def drop_checkpoints_after(self, campaign_id: str, row_count: int) -> int:
+        return self.files.checkpoint_store(campaign_id).drop_after(row_count)
+
+    def import_campaign(
+        self,
+        source: FileRepo,
+        campaign_id: str,
+        *,
+        replace: bool = False,
+    ) -> int:
+        # Copies campaign.json and the decoded turn_log.jsonl rows (full
+        # state_summary, whatever the log format) in a single transaction;
+        # returns the number of imported turn rows.
+        data = json.loads(source._campaign_path(campaign_id).read_text(encoding="utf-8"))
+        campaign, _ = _hydrate_campaign(data)
+        payload = _prepare_campaign_for_save(campaign)
+        payload["revision"] = max(1, campaign.revision)
+        turns = [
+            (campaign_id, seq, str(row.get("turn_id", "")), _dumps(row))
+            for seq, row in enumerate(source.iter_turn_log_rows(campaign_id), start=1)
+        ]
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            exists = conn.execute(
+                "SELECT 1 FROM campaigns WHERE id = ?", (campaign_id,)
+            ).fetchone()
+            if exists is not None:
+                if not replace:
+                    raise FileExistsError(f"Campaign already exists: {campaign_id}")
+                conn.execute("DELETE FROM turns WHERE campaign_id = ?", (campaign_id,))
+                conn.execute("DELETE FROM campaigns WHERE id = ?", (campaign_id,))
+            conn.execute(
+                "INSERT INTO campaigns"
+                " (id, seq, world_id, active_actor_id, revision, data, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    campaign_id,
+                    _campaign_seq(campaign_id),
+                    campaign.selected.world_id,
+                    campaign.selected.active_actor_id,
+                    payload["revision"],
+                    _dumps(payload),
+                    datetime.now(timezone.utc).isoformat(),
+                ),
+            )
+            conn.executemany(
+                "INSERT INTO turns (campaign_id, seq, turn_id, data) VALUES (?, ?, ?, ?)",
+                turns,
+            )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        self.campaign_cache.invalidate(campaign_id)
+        return len(turns)
@@ -0,0 +1,451 @@
+from __future__ import annotations
+
+import json
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from backend.domain.world_models import (
+    World,
+    build_world_stub,
+    normalize_world,
+    require_valid_world,
+)
+from backend.infra.campaign_checkpoints import CHECKPOINT_DIRNAME, CheckpointStore
+from backend.infra.campaign_turn_locks import TURN_LOCK_FILENAME
+
+BATCH_FILE_PATTERN = re.compile(r"^batch_(\d{8}T\d{6}Z)_(.+)\.json$")
+
+
+def _model_to_dict(model: object) -> Dict[str, Any]:
+    if hasattr(model, "model_dump"):
+        return model.model_dump()  # type: ignore[no-any-return]
+    if hasattr(model, "dict"):
+        return model.dict()  # type: ignore[no-any-return]
+    raise TypeError("Unsupported model type")
+
+
+def _model_from_dict(model_cls: object, data: Dict[str, Any]) -> object:
+    if hasattr(model_cls, "model_validate"):
+        return model_cls.model_validate(data)  # type: ignore[no-any-return]
+    if hasattr(model_cls, "parse_obj"):
+        return model_cls.parse_obj(data)  # type: ignore[no-any-return]
+    raise TypeError("Unsupported model type")
+
+
+class StorageFiles:
+    # The on-disk half of a storage root that every backend shares: worlds,
+    # per-campaign checkpoints, turn lock files and character fact artifacts.
+    # FileRepo and SqliteRepo each own one and differ only in where campaign
+    # state and turn logs live.
+    def __init__(self, storage_root: Path) -> None:
+        self.storage_root = storage_root
+        self.campaigns_root = storage_root / "campaigns"
+        self.worlds_root = storage_root / "worlds"
+        self.campaigns_root.mkdir(parents=True, exist_ok=True)
+        self.worlds_root.mkdir(parents=True, exist_ok=True)
+
+    def campaign_dir(self, campaign_id: str) -> Path:
+        return self.campaigns_root / campaign_id
+
+    def checkpoint_store(self, campaign_id: str) -> CheckpointStore:
+        return CheckpointStore(self.campaign_dir(campaign_id) / CHECKPOINT_DIRNAME)
+
+    def turn_lock_path(self, campaign_id: str) -> Path:
+        # Flocked by the turn lock registry in file mode, so workers sharing
+        # this storage root run one turn per campaign between them.
+        return self.campaign_dir(campaign_id) / TURN_LOCK_FILENAME
+
+    def _generated_characters_dir(self, campaign_id: str) -> Path:
+        return self.campaign_dir(campaign_id) / "characters" / "generated"
+
+    def _world_dir(self, world_id: str) -> Path:
+        return self.worlds_root / world_id
+
+    def world_path(self, world_id: str) -> Path:
+        return self._world_dir(world_id) / "world.json"
+
+    def _sanitize_request_id(self, request_id: str) -> str:
+        cleaned = re.sub(r"[^a-zA-Z0-9_-]+", "_", request_id.strip())
+        return cleaned or "req"
+
+    def _sanitize_character_file_id(self, character_id: str) -> str:
+        cleaned = re.sub(r"[^a-zA-Z0-9_-]+", "_", character_id.strip())
+        return cleaned or "character"
+
+    def to_storage_relative_path(self, path: Path) -> str:
+        try:
+            relative = path.relative_to(self.storage_root)
+            if self.storage_root.name == "storage":
+                return str(Path("storage") / relative).replace("\\", "/")
+            return str(relative).replace("\\", "/")
+        except ValueError:
+            return str(path).replace("\\", "/")
+
+    def _read_json_file(self, path: Path) -> Optional[Any]:
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            return None
+
+    def _extract_batch_parts(self, path: Path) -> tuple[Optional[str], Optional[str]]:
+        match = BATCH_FILE_PATTERN.match(path.name)
+        if not match:
+            return None, None
+        return match.group(1), match.group(2)
+
+    def get_world(self, world_id: str) -> Optional[World]:
+        normalized_world_id = world_id.strip()
+        if not normalized_world_id:
+            return None
+        path = self.world_path(normalized_world_id)
+        if not path.exists():
+            return None
+        payload = self._read_json_file(path)
+        if not isinstance(payload, dict):
+            raise ValueError(f"Invalid world JSON: {path}")
+        world = _model_from_dict(World, payload)
+        require_valid_world(world)
+        normalize_world(world)
+        return world
+
+    def save_world(self, world: World) -> None:
+        require_valid_world(world)
+        normalize_world(world)
+        world_dir = self._world_dir(world.world_id)
+        world_dir.mkdir(parents=True, exist_ok=True)
+        path = self.world_path(world.world_id)
+        payload = _model_to_dict(world)
+        path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+    def get_or_create_world_stub(
+        self,
+        world_id: str,
+        *,
+        seed_source: str = "world_id_hash",
+        generator_default: str = "stub",
+    ) -> World:
+        normalized_world_id = world_id.strip()
+        if not normalized_world_id:
+            raise ValueError("world_id is required")
+
+        existing = self.get_world(normalized_world_id)
+        if existing is not None:
+            return existing
+
+        world = build_world_stub(
+            normalized_world_id,
+            seed_source=seed_source,
+            generator_default=generator_default,
+        )
+        world_dir = self._world_dir(normalized_world_id)
+        world_dir.mkdir(parents=True, exist_ok=True)
+        path = self.world_path(normalized_world_id)
+        payload = _model_to_dict(world)
+
+        try:
+            with path.open("x", encoding="utf-8") as handle:
+                json.dump(payload, handle, indent=2)
+            return world
+        except FileExistsError:
+            # Concurrent request won the race; read the winner.
+            existing_after_race = self.get_world(normalized_world_id)
+            if existing_after_race is None:
+                raise
+            return existing_after_race
+
+    def find_character_fact_batch_path(
+        self,
+        campaign_id: str,
+        request_id: str,
+    ) -> Optional[Path]:
+        generated_dir = self._generated_characters_dir(campaign_id)
+        if not generated_dir.exists():
+            return None
+
+        safe_request_id = self._sanitize_request_id(request_id)
+        unreadable_candidate: Optional[Path] = None
+
+        for path in sorted(generated_dir.glob("batch_*.json"), reverse=True):
+            payload = self._read_json_file(path)
+            if isinstance(payload, dict):
+                stored_request_id = payload.get("request_id")
+                if isinstance(stored_request_id, str) and stored_request_id == request_id:
+                    return path
+            _, suffix = self._extract_batch_parts(path)
+            if suffix == safe_request_id and not isinstance(payload, dict):
+                unreadable_candidate = path
+
+        return unreadable_candidate
+
+    def save_character_fact_batch(
+        self,
+        campaign_id: str,
+        request_id: str,
+        payload: Dict[str, Any],
+        utc_ts: Optional[str] = None,
+    ) -> Path:
+        generated_dir = self._generated_characters_dir(campaign_id)
+        generated_dir.mkdir(parents=True, exist_ok=True)
+        existing = self.find_character_fact_batch_path(campaign_id, request_id)
+        if existing is not None:
+            raise FileExistsError(
+                f"Character batch already exists for request_id={request_id}"
+            )
+        timestamp = utc_ts or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        safe_request_id = self._sanitize_request_id(request_id)
+        path = generated_dir / f"batch_{timestamp}_{safe_request_id}.json"
+        with path.open("x", encoding="utf-8") as handle:
+            json.dump(payload, handle, indent=2)
+        return path
+
+    def save_character_fact_draft(
+        self,
+        campaign_id: str,
+        character_file_id: str,
+        payload: Dict[str, Any],
+    ) -> Path:
+        generated_dir = self._generated_characters_dir(campaign_id)
+        generated_dir.mkdir(parents=True, exist_ok=True)
+        safe_character_id = self._sanitize_character_file_id(character_file_id)
+        path = generated_dir / f"{safe_character_id}.fact.draft.json"
+        path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        return path
+
+    def character_fact_draft_path(self, campaign_id: str, character_id: str) -> Path:
+        safe_character_id = self._sanitize_character_file_id(character_id)
+        return self._generated_characters_dir(campaign_id) / (
+            f"{safe_character_id}.fact.draft.json"
+        )
+
+    def character_fact_acceptance_path(self, campaign_id: str, character_id: str) -> Path:
+        safe_character_id = self._sanitize_character_file_id(character_id)
+        return self._generated_characters_dir(campaign_id) / (
+            f"{safe_character_id}.fact.accepted.json"
+        )
+
+    def save_character_fact_acceptance(
+        self,
+        campaign_id: str,
+        character_id: str,
+        payload: Dict[str, Any],
+    ) -> Path:
+        generated_dir = self._generated_characters_dir(campaign_id)
+        generated_dir.mkdir(parents=True, exist_ok=True)
+        path = self.character_fact_acceptance_path(campaign_id, character_id)
+        path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        return path
+
+    def load_character_fact_acceptance(
+        self,
+        campaign_id: str,
+        character_id: str,
+    ) -> Optional[Dict[str, Any]]:
+        path = self.character_fact_acceptance_path(campaign_id, character_id)
+        if not path.exists():
+            return None
+        payload = self._read_json_file(path)
+        if isinstance(payload, dict):
+            return payload
+        return None
+
+    def load_character_fact_draft(
+        self,
+        campaign_id: str,
+        character_id: str,
+    ) -> Optional[Dict[str, Any]]:
+        path = self.character_fact_draft_path(campaign_id, character_id)
+        if not path.exists():
+            return None
+        data = self._read_json_file(path)
+        if isinstance(data, dict):
+            return data
+        return None
+
+    def load_character_fact_batch(
+        self,
+        campaign_id: str,
+        request_id: str,
+    ) -> Optional[Dict[str, Any]]:
+        path = self.find_character_fact_batch_path(campaign_id, request_id)
+        if path is None:
+            return None
+        payload = self._read_json_file(path)
+        if isinstance(payload, dict):
+            return payload
+        return None
+
+    def load_character_fact_from_batches(
+        self,
+        campaign_id: str,
+        character_id: str,
+    ) -> Optional[Dict[str, Any]]:
+        generated_dir = self._generated_characters_dir(campaign_id)
+        if not generated_dir.exists():
+            return None
+        batch_paths = sorted(generated_dir.glob("batch_*.json"), reverse=True)
+        for path in batch_paths:
+            payload = self._read_json_file(path)
+            if not isinstance(payload, dict):
+                continue
+            items = payload.get("items")
+            if not isinstance(items, list):
+                continue
+            for item in items:
+                if not isinstance(item, dict):
+                    continue
+                if item.get("character_id") == character_id:
+                    return item
+        return None
+
+    def character_fact_id_exists(self, campaign_id: str, character_id: str) -> bool:
+        if self.load_character_fact_draft(campaign_id, character_id) is not None:
+            return True
+        return self.load_character_fact_from_batches(campaign_id, character_id) is not None
+
+    def list_character_fact_batches(
+        self,
+        campaign_id: str,
+        limit: int = 20,
+    ) -> List[Dict[str, Any]]:
+        generated_dir = self._generated_characters_dir(campaign_id)
+        if not generated_dir.exists():
+            return []
+        capped_limit = max(1, min(limit, 200))
+        summaries: List[Dict[str, Any]] = []
+        for path in sorted(generated_dir.glob("batch_*.json"), reverse=True):
+            payload = self._read_json_file(path)
+            utc_ts, request_suffix = self._extract_batch_parts(path)
+            request_id = request_suffix or ""
+            count = 0
+            if isinstance(payload, dict):
+                raw_request_id = payload.get("request_id")
+                if isinstance(raw_request_id, str) and raw_request_id.strip():
+                    request_id = raw_request_id
+                raw_utc_ts = payload.get("utc_ts")
+                if isinstance(raw_utc_ts, str) and raw_utc_ts.strip():
+                    utc_ts = raw_utc_ts
+                items = payload.get("items")
+                if isinstance(items, list):
+                    count = len(items)
+            summaries.append(
+                {
+                    "request_id": request_id,
+                    "utc_ts": utc_ts or "",
+                    "path": self.to_storage_relative_path(path),
+                    "count": count,
+                }
+            )
+            if len(summaries) >= capped_limit:
+                break
+        return summaries
+
+
+
+class StorageFileMethods:
+    # The Repository methods answered by StorageFiles, for repos that keep
+    # theirs in `self.files`.
+    files: StorageFiles
+
+    def to_storage_relative_path(self, path: Path) -> str:
+        return self.files.to_storage_relative_path(path)
+
+    def turn_lock_path(self, campaign_id: str) -> Path:
+        return self.files.turn_lock_path(campaign_id)
+
+    def world_path(self, world_id: str) -> Path:
+        return self.files.world_path(world_id)
+
+    def get_world(self, world_id: str) -> Optional[World]:
+        return self.files.get_world(world_id)
+
+    def save_world(self, world: World) -> None:
+        self.files.save_world(world)
+
+    def get_or_create_world_stub(
+        self,
+        world_id: str,
+        *,
+        seed_source: str = "world_id_hash",
+        generator_default: str = "stub",
+    ) -> World:
+        return self.files.get_or_create_world_stub(
+            world_id, seed_source=seed_source, generator_default=generator_default
+        )
+
+    def find_character_fact_batch_path(
+        self,
+        campaign_id: str,
+        request_id: str,
+    ) -> Optional[Path]:
+        return self.files.find_character_fact_batch_path(campaign_id, request_id)
+
+    def save_character_fact_batch(
+        self,
+        campaign_id: str,
+        request_id: str,
+        payload: Dict[str, Any],
+        utc_ts: Optional[str] = None,
+    ) -> Path:
+        return self.files.save_character_fact_batch(campaign_id, request_id, payload, utc_ts)
+
+    def save_character_fact_draft(
+        self,
+        campaign_id: str,
+        character_file_id: str,
+        payload: Dict[str, Any],
+    ) -> Path:
+        return self.files.save_character_fact_draft(campaign_id, character_file_id, payload)
+
+    def character_fact_draft_path(self, campaign_id: str, character_id: str) -> Path:
+        return self.files.character_fact_draft_path(campaign_id, character_id)
+
+    def character_fact_acceptance_path(self, campaign_id: str, character_id: str) -> Path:
+        return self.files.character_fact_acceptance_path(campaign_id, character_id)
+
+    def save_character_fact_acceptance(
+        self,
+        campaign_id: str,
+        character_id: str,
+        payload: Dict[str, Any],
+    ) -> Path:
+        return self.files.save_character_fact_acceptance(campaign_id, character_id, payload)
+
+    def load_character_fact_acceptance(
+        self,
+        campaign_id: str,
+        character_id: str,
+    ) -> Optional[Dict[str, Any]]:
+        return self.files.load_character_fact_acceptance(campaign_id, character_id)
+
+    def load_character_fact_draft(
+        self,
+        campaign_id: str,
+        character_id: str,
+    ) -> Optional[Dict[str, Any]]:
+        return self.files.load_character_fact_draft(campaign_id, character_id)
+
+    def load_character_fact_batch(
+        self,
+        campaign_id: str,
+        request_id: str,
+    ) -> Optional[Dict[str, Any]]:
+        return self.files.load_character_fact_batch(campaign_id, request_id)
+
+    def load_character_fact_from_batches(
+        self,
+        campaign_id: str,
+        character_id: str,
+    ) -> Optional[Dict[str, Any]]:
+        return self.files.load_character_fact_from_batches(campaign_id, character_id)
+
+    def character_fact_id_exists(self, campaign_id: str, character_id: str) -> bool:
+        return self.files.character_fact_id_exists(campaign_id, character_id)
+
+    def list_character_fact_batches(
+        self,
+        campaign_id: str,
+        limit: int = 20,
+    ) -> List[Dict[str, Any]]:
+        return self.files.list_character_fact_batches(campaign_id, limit)
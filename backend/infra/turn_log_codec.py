@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+TURN_LOG_FORMAT_V1 = 1
+TURN_LOG_FORMAT_V2 = 2
+TURN_LOG_FORMATS = (TURN_LOG_FORMAT_V1, TURN_LOG_FORMAT_V2)
+DEFAULT_KEYFRAME_INTERVAL = 16
+
+# v2 rows carry "log_format": 2 and either a compact keyframe in
+# "state_summary" or a "state_summary_delta" against the keyframe row it names:
+#   {"key": <1-based row number>, "set": {...}, "del": {...}}
+# Deltas are always one hop from their keyframe, so any turn decodes with at
+# most two row reads.
+_FORMAT_FIELD = "log_format"
+_SUMMARY_FIELD = "state_summary"
+_DELTA_FIELD = "state_summary_delta"
+_MAP_FIELDS = frozenset(
+    {
+        "positions",
+        "positions_parent",
+        "positions_child",
+        "hp",
+        "character_states",
+        "inventories",
+        "active_actor_inventory",
+    }
+)
+_MISSING = object()
+
+
+@dataclass
+class TurnLogConversionResult:
+    row_count: int
+    log_format: int
+    bytes_before: int
+    bytes_after: int
+
+
+def row_log_format(row: Dict[str, Any]) -> int:
+    value = row.get(_FORMAT_FIELD)
+    return value if isinstance(value, int) else TURN_LOG_FORMAT_V1
+
+
+def row_keyframe_number(row: Dict[str, Any], row_number: int) -> Optional[int]:
+    # Row number of the keyframe a v2 row decodes against; None for v1 rows.
+    if row_log_format(row) != TURN_LOG_FORMAT_V2:
+        return None
+    delta = row.get(_DELTA_FIELD)
+    if isinstance(delta, dict) and isinstance(delta.get("key"), int):
+        return delta["key"]
+    return row_number
+
+
+def is_keyframe(row: Dict[str, Any]) -> bool:
+    return row_log_format(row) == TURN_LOG_FORMAT_V2 and _DELTA_FIELD not in row
+
+
+def compact_summary(summary: Dict[str, Any]) -> Dict[str, Any]:
+    # positions_parent mirrors positions and active_actor_inventory mirrors the
+    # active actor's inventory in almost every turn; keep them only when not.
+    compact = dict(summary)
+    if compact.get("positions_parent") == compact.get("positions"):
+        compact.pop("positions_parent", None)
+    active_inventory = _read_dict(compact.get("inventories")).get(
+        compact.get("active_actor_id"), {}
+    )
+    if compact.get("active_actor_inventory") == active_inventory:
+        compact.pop("active_actor_inventory", None)
+    return compact
+
+
+def expand_summary(compact: Dict[str, Any]) -> Dict[str, Any]:
+    summary = dict(compact)
+    if "positions_parent" not in summary:
+        summary["positions_parent"] = dict(_read_dict(summary.get("positions")))
+    if "active_actor_inventory" not in summary:
+        summary["active_actor_inventory"] = dict(
+            _read_dict(_read_dict(summary.get("inventories")).get(summary.get("active_actor_id")))
+        )
+    return summary
+
+
+def summary_delta(base: Dict[str, Any], target: Dict[str, Any]) -> Dict[str, Any]:
+    # Both sides are compact summaries.
+    changes: Dict[str, Any] = {}
+    removals: Dict[str, Optional[List[str]]] = {}
+    for field, value in target.items():
+        old = base.get(field, _MISSING)
+        if old == value:
+            continue
+        if field in _MAP_FIELDS and isinstance(old, dict) and isinstance(value, dict):
+            changed = {key: item for key, item in value.items() if old.get(key, _MISSING) != item}
+            removed = [key for key in old if key not in value]
+            if changed:
+                changes[field] = changed
+            if removed:
+                removals[field] = removed
+        else:
+            changes[field] = value
+    for field in base:
+        if field not in target:
+            removals[field] = None
+    delta: Dict[str, Any] = {}
+    if changes:
+        delta["set"] = changes
+    if removals:
+        delta["del"] = removals
+    return delta
+
+
+def apply_summary_delta(base: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    summary = dict(base)
+    for field, keys in _read_dict(delta.get("del")).items():
+        if keys is None:
+            summary.pop(field, None)
+        elif isinstance(summary.get(field), dict):
+            summary[field] = {
+                key: value for key, value in summary[field].items() if key not in keys
+            }
+    for field, value in _read_dict(delta.get("set")).items():
+        current = summary.get(field)
+        if field in _MAP_FIELDS and isinstance(current, dict) and isinstance(value, dict):
+            merged = dict(current)
+            merged.update(value)
+            summary[field] = merged
+        else:
+            summary[field] = value
+    return summary
+
+
+def encode_keyframe_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    encoded = {_FORMAT_FIELD: TURN_LOG_FORMAT_V2}
+    encoded.update(row)
+    encoded[_SUMMARY_FIELD] = compact_summary(_read_dict(row.get(_SUMMARY_FIELD)))
+    return encoded
+
+
+def encode_delta_row(
+    row: Dict[str, Any], keyframe_number: int, keyframe_summary: Dict[str, Any]
+) -> Dict[str, Any]:
+    # keyframe_summary is the compact summary stored on the keyframe row.
+    encoded = {_FORMAT_FIELD: TURN_LOG_FORMAT_V2}
+    encoded.update(row)
+    target = compact_summary(_read_dict(encoded.pop(_SUMMARY_FIELD, None)))
+    delta = {"key": keyframe_number}
+    delta.update(summary_delta(keyframe_summary, target))
+    encoded[_DELTA_FIELD] = delta
+    return encoded
+
+
+def choose_v2_encoding(
+    row: Dict[str, Any],
+    keyframe_number: Optional[int],
+    keyframe_summary: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    # Falls back to a fresh keyframe when the delta would not be much smaller.
+    keyframe = encode_keyframe_row(row)
+    if keyframe_number is None or keyframe_summary is None:
+        return keyframe
+    delta_row = encode_delta_row(row, keyframe_number, keyframe_summary)
+    delta_size = len(_dumps(delta_row[_DELTA_FIELD]))
+    if delta_size * 2 > len(_dumps(keyframe[_SUMMARY_FIELD])):
+        return keyframe
+    return delta_row
+
+
+def decode_row(
+    row: Dict[str, Any],
+    load_keyframe: Callable[[int], Optional[Dict[str, Any]]],
+    *,
+    state_summary: bool = True,
+) -> Dict[str, Any]:
+    # Returns the row in the v1 shape callers expect. load_keyframe maps a row
+    # number to that keyframe's compact summary.
+    if row_log_format(row) == TURN_LOG_FORMAT_V1:
+        if not state_summary:
+            row = dict(row)
+            row.pop(_SUMMARY_FIELD, None)
+        return row
+    decoded = dict(row)
+    decoded.pop(_FORMAT_FIELD, None)
+    delta = decoded.pop(_DELTA_FIELD, None)
+    compact = decoded.pop(_SUMMARY_FIELD, None)
+    if not state_summary:
+        return decoded
+    if isinstance(delta, dict):
+        key_number = delta.get("key")
+        base = load_keyframe(key_number) if isinstance(key_number, int) else None
+        if base is None:
+            return decoded
+        compact = apply_summary_delta(base, delta)
+    if isinstance(compact, dict):
+        decoded[_SUMMARY_FIELD] = expand_summary(compact)
+    return decoded
+
+
+def keyframe_summary(row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if not is_keyframe(row):
+        return None
+    summary = row.get(_SUMMARY_FIELD)
+    return summary if isinstance(summary, dict) else None
+
+
+def encode_row_line(row: Dict[str, Any]) -> bytes:
+    # v1 rows keep the historical json.dumps defaults; v2 rows are compact.
+    if row_log_format(row) == TURN_LOG_FORMAT_V1:
+        return (json.dumps(row) + "\n").encode("utf-8")
+    return (_dumps(row) + "\n").encode("utf-8")
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _read_dict(value: object) -> Dict[str, Any]:
+    return value if isinstance(value, dict) else {}
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import json
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional
+
+INDEX_MAGIC = b"TLIX"
+INDEX_VERSION = 1
+_HEADER = struct.Struct("<4sIQ")
+_OFFSET = struct.Struct("<Q")
+_REBUILD_CHUNK_BYTES = 1 << 16
+
+
+@dataclass
+class TurnLogRebuildResult:
+    row_count: int
+    log_bytes: int
+    truncated_bytes: int = 0
+    newline_added: bool = False
+
+
+class TurnLogIndex:
+    # Sidecar for turn_log.jsonl: a fixed header carrying the log size the index
+    # was synced against, followed by one little-endian u64 byte offset per row.
+    # A header/log size mismatch means the log changed behind our back.
+    def __init__(self, log_path: Path, index_path: Path) -> None:
+        self.log_path = log_path
+        self.index_path = index_path
+
+    def ensure_synced(self) -> int:
+        log_size = _file_size(self.log_path)
+        if log_size is None:
+            if self.index_path.exists():
+                self.index_path.unlink()
+            return 0
+        header = self._read_header()
+        if header is not None:
+            indexed_size, row_count = header
+            if indexed_size == log_size:
+                return row_count
+        return self.rebuild().row_count
+
+    def offsets(self, start: int = 0, stop: Optional[int] = None) -> List[int]:
+        row_count = self.ensure_synced()
+        end = row_count if stop is None else max(0, min(stop, row_count))
+        begin = max(0, min(start, end))
+        if begin >= end:
+            return []
+        with self.index_path.open("rb") as handle:
+            handle.seek(_HEADER.size + begin * _OFFSET.size)
+            raw = handle.read((end - begin) * _OFFSET.size)
+        return [value for (value,) in _OFFSET.iter_unpack(raw)]
+
+    def append(self, offset: int, log_size: int) -> None:
+        if not self.index_path.exists():
+            self._write_empty(0)
+        with self.index_path.open("r+b") as handle:
+            handle.seek(0, 2)
+            handle.write(_OFFSET.pack(offset))
+            handle.seek(0)
+            handle.write(_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, log_size))
+
+    def truncate(self, row_count: int) -> int:
+        # Drops every row after the first row_count from the log and the
+        # index; returns how many rows were dropped.
+        total = self.ensure_synced()
+        keep = max(0, row_count)
+        if keep >= total:
+            return 0
+        (log_size,) = self.offsets(keep, keep + 1)
+        with self.log_path.open("r+b") as handle:
+            handle.truncate(log_size)
+        with self.index_path.open("r+b") as handle:
+            handle.truncate(_HEADER.size + keep * _OFFSET.size)
+            handle.seek(0)
+            handle.write(_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, log_size))
+        return total - keep
+
+    def rebuild(self, *, repair: bool = False) -> TurnLogRebuildResult:
+        log_size = _file_size(self.log_path)
+        if log_size is None:
+            if self.index_path.exists():
+                self.index_path.unlink()
+            return TurnLogRebuildResult(row_count=0, log_bytes=0)
+
+        truncated_bytes = 0
+        newline_added = False
+        if repair:
+            truncated_bytes, newline_added = _repair_tail(self.log_path)
+            log_size = _file_size(self.log_path) or 0
+
+        offsets = list(_scan_row_offsets(self.log_path))
+        tmp_path = self.index_path.with_suffix(self.index_path.suffix + ".tmp")
+        with tmp_path.open("wb") as handle:
+            handle.write(_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, log_size))
+            for offset in offsets:
+                handle.write(_OFFSET.pack(offset))
+        tmp_path.replace(self.index_path)
+        return TurnLogRebuildResult(
+            row_count=len(offsets),
+            log_bytes=log_size,
+            truncated_bytes=truncated_bytes,
+            newline_added=newline_added,
+        )
+
+    def _read_header(self) -> Optional[tuple[int, int]]:
+        index_size = _file_size(self.index_path)
+        if index_size is None or index_size < _HEADER.size:
+            return None
+        if (index_size - _HEADER.size) % _OFFSET.size:
+            return None
+        with self.index_path.open("rb") as handle:
+            magic, version, log_size = _HEADER.unpack(handle.read(_HEADER.size))
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            return None
+        return log_size, (index_size - _HEADER.size) // _OFFSET.size
+
+    def _write_empty(self, log_size: int) -> None:
+        self.index_path.write_bytes(_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, log_size))
+
+
+def _file_size(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return None
+
+
+def _scan_row_offsets(log_path: Path) -> Iterator[int]:
+    # Mirrors the historical next_turn_id rule: every non-blank line is a row.
+    with log_path.open("rb") as handle:
+        line_start = 0
+        position = 0
+        has_content = False
+        while True:
+            chunk = handle.read(_REBUILD_CHUNK_BYTES)
+            if not chunk:
+                break
+            cursor = 0
+            while cursor < len(chunk):
+                newline = chunk.find(b"\n", cursor)
+                segment_end = len(chunk) if newline < 0 else newline
+                if not has_content and chunk[cursor:segment_end].strip():
+                    has_content = True
+                if newline < 0:
+                    break
+                if has_content:
+                    yield line_start
+                line_start = position + newline + 1
+                has_content = False
+                cursor = newline + 1
+            position += len(chunk)
+        if has_content:
+            yield line_start
+
+
+def _repair_tail(log_path: Path) -> tuple[int, bool]:
+    size = _file_size(log_path) or 0
+    if size == 0:
+        return 0, False
+    with log_path.open("r+b") as handle:
+        handle.seek(size - 1)
+        if handle.read(1) == b"\n":
+            return 0, False
+        tail_start = _find_tail_start(handle, size)
+        handle.seek(tail_start)
+        tail = handle.read(size - tail_start)
+        if _is_json_object(tail):
+            handle.seek(0, 2)
+            handle.write(b"\n")
+            return 0, True
+        handle.truncate(tail_start)
+        return size - tail_start, False
+
+
+def _find_tail_start(handle: BinaryIO, size: int) -> int:
+    position = size
+    while position > 0:
+        block_start = max(0, position - _REBUILD_CHUNK_BYTES)
+        handle.seek(block_start)
+        block = handle.read(position - block_start)
+        newline = block.rfind(b"\n")
+        if newline >= 0:
+            return block_start + newline + 1
+        position = block_start
+    return 0
+
+
+def _is_json_object(raw: bytes) -> bool:
+    try:
+        return isinstance(json.loads(raw.decode("utf-8")), dict)
+    except Exception:
+        return False
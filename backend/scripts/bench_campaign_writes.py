@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from backend.domain.models import (
+    ActorState,
+    Campaign,
+    Goal,
+    MapArea,
+    MapData,
+    Milestone,
+    Selected,
+    SettingsSnapshot,
+)
+from backend.infra.campaign_cache import CampaignCache
+from backend.infra.file_repo import FileRepo, _prepare_campaign_for_save
+
+MODES = ("legacy", "atomic", "fsync", "group")
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Compare campaign.json write cost per turn: the legacy path (several "
+            "pretty-printed in-place writes) against the coalesced atomic save "
+            "in each durability mode."
+        ),
+    )
+    parser.add_argument("--turns", type=int, default=200, help="Turns per campaign.")
+    parser.add_argument(
+        "--campaigns",
+        type=int,
+        default=4,
+        help="Campaigns saved concurrently, one thread each.",
+    )
+    parser.add_argument("--areas", type=int, default=40, help="Map areas per campaign.")
+    parser.add_argument(
+        "--legacy-saves",
+        type=int,
+        default=3,
+        help="campaign.json writes per turn on the legacy path.",
+    )
+    parser.add_argument("--mode", action="append", choices=MODES, default=[])
+    return parser
+
+
+def _read_proc_io() -> Optional[Dict[str, int]]:
+    try:
+        raw = Path("/proc/self/io").read_text(encoding="utf-8")
+    except OSError:
+        return None
+    counters: Dict[str, int] = {}
+    for line in raw.splitlines():
+        key, _, value = line.partition(":")
+        if value.strip().isdigit():
+            counters[key.strip()] = int(value)
+    return counters
+
+
+def _sample_campaign(campaign_id: str, area_count: int) -> Campaign:
+    areas = {
+        f"area_{index:03d}": MapArea(
+            id=f"area_{index:03d}",
+            name=f"Area {index}",
+            description="A quiet checkpoint lit by a flickering lantern.",
+            reachable_area_ids=[f"area_{index + 1:03d}"] if index < area_count else [],
+        )
+        for index in range(1, area_count + 1)
+    }
+    party = ["pc_001", "pc_002", "pc_003"]
+    return Campaign(
+        id=campaign_id,
+        selected=Selected(
+            world_id="world_001",
+            map_id="map_001",
+            party_character_ids=party,
+            active_actor_id="pc_001",
+        ),
+        settings_snapshot=SettingsSnapshot(),
+        goal=Goal(text="Explore the nearby areas.", status="active"),
+        milestone=Milestone(current="intro", last_advanced_turn=0),
+        map=MapData(areas=areas, connections=[]),
+        actors={
+            actor_id: ActorState(position="area_001", meta={}) for actor_id in party
+        },
+    )
+
+
+def _legacy_save(repo: FileRepo, campaign: Campaign) -> None:
+    # The pre-journal save path: pretty-printed JSON written in place.
+    path = repo.campaigns_root / campaign.id / "campaign.json"
+    data = _prepare_campaign_for_save(campaign)
+    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+
+def _run_mode(mode: str, args: argparse.Namespace) -> Dict[str, object]:
+    with tempfile.TemporaryDirectory(prefix="bench_campaign_writes_") as tmp:
+        durability = "none" if mode in {"legacy", "atomic"} else mode
+        repo = FileRepo(
+            Path(tmp) / "storage",
+            campaign_cache=CampaignCache(),
+            durability=durability,
+        )
+        campaigns: List[Campaign] = []
+        for index in range(1, args.campaigns + 1):
+            campaign = _sample_campaign(f"camp_{index:04d}", args.areas)
+            repo.create_campaign(campaign)
+            campaigns.append(campaign)
+
+        saves_per_turn = args.legacy_saves if mode == "legacy" else 1
+        save: Callable[[Campaign], None] = (
+            (lambda campaign: _legacy_save(repo, campaign))
+            if mode == "legacy"
+            else repo.save_campaign
+        )
+
+        def _worker(campaign: Campaign) -> None:
+            for turn in range(args.turns):
+                actor = campaign.actors["pc_001"]
+                actor.position = f"area_{turn % args.areas + 1:03d}"
+                for _ in range(saves_per_turn):
+                    save(campaign)
+
+        journal_before = (
+            repo.campaign_journal.stats() if repo.campaign_journal is not None else None
+        )
+        io_before = _read_proc_io()
+        started = time.perf_counter()
+        threads = [
+            threading.Thread(target=_worker, args=(campaign,)) for campaign in campaigns
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        io_after = _read_proc_io()
+
+        turns = args.turns * args.campaigns
+        result: Dict[str, object] = {
+            "mode": mode,
+            "turns": turns,
+            "saves_per_turn": saves_per_turn,
+            "campaign_json_bytes": (
+                repo.campaigns_root / "camp_0001" / "campaign.json"
+            ).stat().st_size,
+            "elapsed_ms": round(elapsed * 1000, 2),
+            "turns_per_sec": round(turns / elapsed, 1) if elapsed else None,
+        }
+        if io_before is not None and io_after is not None:
+            result["bytes_written_per_turn"] = round(
+                (io_after.get("wchar", 0) - io_before.get("wchar", 0)) / turns, 1
+            )
+            result["write_syscalls_per_turn"] = round(
+                (io_after.get("syscw", 0) - io_before.get("syscw", 0)) / turns, 2
+            )
+        if mode == "fsync":
+            # file + directory per save
+            result["fsyncs_per_turn"] = 2.0
+        if repo.campaign_journal is not None and journal_before is not None:
+            journal_after = repo.campaign_journal.stats()
+            fsyncs = journal_after["fsyncs"] - journal_before["fsyncs"]
+            result["fsyncs_per_turn"] = round(fsyncs / turns, 3)
+            result["checkpoints"] = (
+                journal_after["checkpoints"] - journal_before["checkpoints"]
+            )
+            repo.campaign_journal.close()
+        return result
+
+
+def main() -> int:
+    parser = _build_parser()
+    args = parser.parse_args()
+    args.turns = max(1, args.turns)
+    args.campaigns = max(1, args.campaigns)
+    args.areas = max(1, args.areas)
+
+    modes = list(dict.fromkeys(args.mode)) or list(MODES)
+    results = [_run_mode(mode, args) for mode in modes]
+    print(json.dumps({"results": results}, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Dict, List
+
+import backend.app.turn_service as turn_service_module
+from backend.domain.models import (
+    ActorState,
+    Campaign,
+    Goal,
+    MapArea,
+    MapData,
+    Milestone,
+    Selected,
+    SettingsSnapshot,
+)
+
+MODES = ("full", "compressed", "budgeted")
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Compare turn prompt Context size and build time across the full, "
+            "compressed and budgeted context modes as the map grows."
+        ),
+    )
+    parser.add_argument(
+        "--areas",
+        type=int,
+        action="append",
+        default=[],
+        help="Map size to test; repeatable. Defaults to 30, 90 and 300.",
+    )
+    parser.add_argument("--actors", type=int, default=24, help="Actors per campaign.")
+    parser.add_argument("--budget-bytes", type=int, default=16000)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument(
+        "--cold",
+        action="store_true",
+        help="Clear the prompt fragment cache before every build.",
+    )
+    parser.add_argument("--mode", action="append", choices=MODES, default=[])
+    return parser
+
+
+def _sample_campaign(area_count: int, actor_count: int) -> Campaign:
+    # A chain of areas with a shortcut every fifth area, the shape map_generate
+    # batches produce once several are linked together.
+    areas = {}
+    for index in range(1, area_count + 1):
+        reachable = [f"area_{index + 1:03d}"] if index < area_count else []
+        if index + 5 <= area_count and index % 5 == 0:
+            reachable.append(f"area_{index + 5:03d}")
+        areas[f"area_{index:03d}"] = MapArea(
+            id=f"area_{index:03d}",
+            name=f"Area {index}",
+            description="Moss-covered stones line a narrow path toward the ridge.",
+            reachable_area_ids=reachable,
+        )
+    actors = {
+        f"npc_{index:03d}": ActorState(
+            position=f"area_{(index * 7) % area_count + 1:03d}",
+            inventory={"coin": index},
+            meta={"name": f"NPC {index}", "spawned_by": "actor_spawn"},
+        )
+        for index in range(1, actor_count + 1)
+    }
+    actors["pc_001"] = ActorState(position="area_001", meta={"name": "Hero"})
+    return Campaign(
+        id="camp_bench",
+        selected=Selected(
+            world_id="world_001",
+            map_id="map_001",
+            party_character_ids=["pc_001"],
+            active_actor_id="pc_001",
+        ),
+        settings_snapshot=SettingsSnapshot(),
+        goal=Goal(text="Reach the ridge.", status="active"),
+        milestone=Milestone(current="intro", last_advanced_turn=0),
+        map=MapData(areas=areas, connections=[]),
+        actors=actors,
+    )
+
+
+def _configure(campaign: Campaign, mode: str, budget_bytes: int) -> None:
+    context = campaign.settings_snapshot.context
+    context.full_context_enabled = mode == "full"
+    context.compress_enabled = mode == "compressed"
+    context.budget_enabled = mode == "budgeted"
+    context.budget_bytes = budget_bytes
+
+
+def _run(area_count: int, mode: str, args: argparse.Namespace) -> Dict[str, object]:
+    campaign = _sample_campaign(area_count, args.actors)
+    _configure(campaign, mode, args.budget_bytes)
+    fragments = turn_service_module._PROMPT_FRAGMENTS
+    fragments.clear()
+    prompt = turn_service_module._build_system_prompt(campaign, "pc_001")
+    started = time.perf_counter()
+    for _ in range(args.iterations):
+        if args.cold:
+            fragments.clear()
+        turn_service_module._build_system_prompt(campaign, "pc_001")
+    elapsed = time.perf_counter() - started
+    context = json.loads(prompt.context[len("Context: "):])
+    result: Dict[str, object] = {
+        "areas": area_count,
+        "actors": len(campaign.actors),
+        "mode": mode,
+        "static_bytes": len(prompt.prefix.encode("utf-8")),
+        "context_bytes": len(prompt.context.encode("utf-8")),
+        "build_us": round(elapsed / args.iterations * 1_000_000, 1),
+    }
+    if mode == "budgeted":
+        result["areas_included"] = context["context_budget"]["areas_included"]
+        result["actors_included"] = context["context_budget"]["actors_included"]
+    return result
+
+
+def main() -> int:
+    parser = _build_parser()
+    args = parser.parse_args()
+    args.iterations = max(1, args.iterations)
+    args.actors = max(0, args.actors)
+
+    area_counts: List[int] = [max(1, count) for count in args.areas] or [30, 90, 300]
+    modes = list(dict.fromkeys(args.mode)) or list(MODES)
+    results = [_run(count, mode, args) for count in area_counts for mode in modes]
+    print(json.dumps({"results": results}, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
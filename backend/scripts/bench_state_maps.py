@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Callable, Dict, List
+
+from backend.domain.character_access import CharacterFacade, create_character_facade
+from backend.domain.models import (
+    ActorState,
+    Campaign,
+    Goal,
+    Milestone,
+    Selected,
+    SettingsSnapshot,
+)
+
+MODES = ("get_state", "read_state")
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Time CharacterFacade.build_state_maps over campaigns of growing "
+            "size: the pure read_state path against the get_state path that "
+            "writes every actor back into the legacy maps."
+        ),
+    )
+    parser.add_argument(
+        "--actors",
+        type=int,
+        action="append",
+        default=[],
+        help="Actor count to test; repeatable. Defaults to 10, 100 and 1000.",
+    )
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--mode", action="append", choices=MODES, default=[])
+    return parser
+
+
+def _sample_campaign(actor_count: int) -> Campaign:
+    actors = {
+        f"npc_{index:04d}": ActorState(
+            position=f"area_{index % 40 + 1:03d}",
+            hp=index % 12,
+            character_state="alive" if index % 7 else "dying",
+        )
+        for index in range(1, actor_count + 1)
+    }
+    return Campaign(
+        id="camp_bench",
+        selected=Selected(
+            world_id="world_001",
+            map_id="map_001",
+            party_character_ids=list(actors)[:4],
+            active_actor_id=next(iter(actors), "pc_001"),
+        ),
+        settings_snapshot=SettingsSnapshot(),
+        goal=Goal(text="Reach the ridge.", status="active"),
+        milestone=Milestone(current="intro", last_advanced_turn=0),
+        actors=actors,
+    )
+
+
+def _get_state_maps(facade: CharacterFacade, campaign: Campaign) -> None:
+    # build_state_maps as it was before the read path: one get_state per actor.
+    for character_id in list(campaign.actors):
+        facade.get_state(campaign, character_id)
+
+
+def _run(actor_count: int, mode: str, iterations: int) -> Dict[str, object]:
+    facade = create_character_facade()
+    campaign = _sample_campaign(actor_count)
+    build: Callable[[], object]
+    if mode == "get_state":
+        build = lambda: _get_state_maps(facade, campaign)  # noqa: E731
+    else:
+        build = lambda: facade.build_state_maps(campaign)  # noqa: E731
+    build()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        build()
+    elapsed = time.perf_counter() - started
+    return {
+        "actors": actor_count,
+        "mode": mode,
+        "build_us": round(elapsed / iterations * 1_000_000, 1),
+        "legacy_entries": len(campaign.positions) + len(campaign.hp),
+    }
+
+
+def main() -> int:
+    parser = _build_parser()
+    args = parser.parse_args()
+    iterations = max(1, args.iterations)
+
+    actor_counts: List[int] = [max(1, count) for count in args.actors] or [10, 100, 1000]
+    modes = list(dict.fromkeys(args.mode)) or list(MODES)
+    results = [_run(count, mode, iterations) for count in actor_counts for mode in modes]
+    print(json.dumps({"results": results}, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from backend.infra.campaign_cache import CampaignCache
+from backend.infra.campaign_turn_locks import CampaignTurnLockRegistry, FileLockProvider
+from backend.infra.file_repo import FileRepo
+from backend.scripts.bench_campaign_writes import _sample_campaign
+
+COUNTER_KEY = "bench_turns"
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Run lock/load/save turn cycles from several worker processes under "
+            "file-mode campaign turn locks, report throughput per worker count "
+            "and count lost updates."
+        ),
+    )
+    parser.add_argument("--turns", type=int, default=100, help="Turns per worker.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        action="append",
+        default=[],
+        help="Worker process count; repeat to compare (default 1, 2, 4).",
+    )
+    parser.add_argument(
+        "--hold-ms",
+        type=float,
+        default=5.0,
+        help="Time each turn holds the lock, standing in for the LLM call.",
+    )
+    parser.add_argument(
+        "--shared",
+        action="store_true",
+        help="All workers take turns on one campaign instead of one each.",
+    )
+    parser.add_argument("--lease", type=float, default=5.0, help="Lease seconds.")
+    return parser
+
+
+def run_worker(
+    storage_root: str,
+    campaign_ids: List[str],
+    turns: int,
+    hold_ms: float,
+    lease_seconds: float,
+    start: object = None,
+) -> None:
+    # One simulated server worker: its own repo, cache and lock registry, so
+    # only the file lock keeps it from interleaving with the others.
+    repo = FileRepo(Path(storage_root), campaign_cache=CampaignCache())
+    registry = CampaignTurnLockRegistry(
+        queue_depth=64,
+        wait_timeout=120.0,
+        provider=FileLockProvider(lease_seconds=lease_seconds),
+    )
+    if start is not None:
+        start.wait()  # type: ignore[attr-defined]
+    for turn in range(turns):
+        campaign_id = campaign_ids[turn % len(campaign_ids)]
+        lock = registry.acquire(campaign_id, repo.turn_lock_path(campaign_id))
+        try:
+            campaign = repo.get_campaign(campaign_id)
+            meta = campaign.actors["pc_001"].meta
+            meta[COUNTER_KEY] = int(meta.get(COUNTER_KEY, 0)) + 1
+            if hold_ms > 0:
+                time.sleep(hold_ms / 1000)
+            repo.save_campaign(campaign)
+        finally:
+            registry.release(lock)
+
+
+def run_workers(
+    storage_root: Path,
+    workers: int,
+    turns: int,
+    *,
+    hold_ms: float,
+    shared: bool,
+    lease_seconds: float,
+) -> Dict[str, object]:
+    repo = FileRepo(storage_root, campaign_cache=CampaignCache())
+    campaign_ids = [
+        f"camp_{index:04d}" for index in range(1, (1 if shared else workers) + 1)
+    ]
+    for campaign_id in campaign_ids:
+        repo.create_campaign(_sample_campaign(campaign_id, 1))
+
+    context = multiprocessing.get_context("spawn")
+    start = context.Barrier(workers + 1)
+    processes = [
+        context.Process(
+            target=run_worker,
+            args=(
+                str(storage_root),
+                campaign_ids if shared else [campaign_ids[index]],
+                turns,
+                hold_ms,
+                lease_seconds,
+                start,
+            ),
+        )
+        for index in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    # Spawn start-up (interpreter and imports) is not measured: the clock
+    # starts once every worker is ready.
+    start.wait()
+    started = time.perf_counter()
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - started
+
+    counted = sum(
+        int(repo.get_campaign(campaign_id).actors["pc_001"].meta.get(COUNTER_KEY, 0))
+        for campaign_id in campaign_ids
+    )
+    total = workers * turns
+    return {
+        "workers": workers,
+        "campaigns": len(campaign_ids),
+        "turns": total,
+        "failed_workers": sum(1 for process in processes if process.exitcode != 0),
+        "lost_updates": total - counted,
+        "elapsed_ms": round(elapsed * 1000, 1),
+        "turns_per_sec": round(total / elapsed, 1) if elapsed else None,
+    }
+
+
+def main() -> int:
+    parser = _build_parser()
+    args = parser.parse_args()
+    worker_counts = list(dict.fromkeys(max(1, count) for count in args.workers))
+    worker_counts = worker_counts or [1, 2, 4]
+
+    results: List[Dict[str, object]] = []
+    for workers in worker_counts:
+        with tempfile.TemporaryDirectory(prefix="bench_turn_lock_workers_") as tmp:
+            results.append(
+                run_workers(
+                    Path(tmp) / "storage",
+                    workers,
+                    max(1, args.turns),
+                    hold_ms=args.hold_ms,
+                    shared=args.shared,
+                    lease_seconds=args.lease,
+                )
+            )
+    baseline = results[0]["turns_per_sec"]
+    for result in results:
+        if baseline and result["turns_per_sec"]:
+            # 1.0 is perfectly linear scaling from the first worker count.
+            result["scaling"] = round(
+                result["turns_per_sec"]
+                / baseline
+                / (result["workers"] / results[0]["workers"]),
+                2,
+            )
+    print(json.dumps({"shared": args.shared, "results": results}, indent=2))
+    failed = any(result["lost_updates"] or result["failed_workers"] for result in results)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
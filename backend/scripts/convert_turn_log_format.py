@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import List
+
+from backend.infra.file_repo import FileRepo
+from backend.infra.turn_log_codec import DEFAULT_KEYFRAME_INTERVAL, TURN_LOG_FORMATS
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Rewrite turn_log.jsonl between format 1 (full state_summary per row) "
+            "and format 2 (keyframes + per-turn deltas). Run while the backend "
+            "is stopped."
+        ),
+    )
+    parser.add_argument("--storage-root", default="storage")
+    parser.add_argument(
+        "--campaign-id",
+        action="append",
+        default=[],
+        help="Campaign to convert; repeatable. Defaults to every camp_* directory.",
+    )
+    parser.add_argument("--to", type=int, choices=TURN_LOG_FORMATS, default=2)
+    parser.add_argument(
+        "--keyframe-interval",
+        type=int,
+        default=DEFAULT_KEYFRAME_INTERVAL,
+        help="Maximum rows between full state_summary keyframes (format 2).",
+    )
+    return parser
+
+
+def main() -> int:
+    parser = _build_parser()
+    args = parser.parse_args()
+
+    repo = FileRepo(Path(args.storage_root))
+    campaign_ids: List[str] = list(args.campaign_id) or sorted(
+        path.name for path in repo.campaigns_root.glob("camp_*") if path.is_dir()
+    )
+    output = []
+    for campaign_id in campaign_ids:
+        result = repo.convert_turn_log(
+            campaign_id,
+            log_format=args.to,
+            keyframe_interval=args.keyframe_interval,
+        )
+        output.append(
+            {
+                "campaign_id": campaign_id,
+                "row_count": result.row_count,
+                "log_format": result.log_format,
+                "bytes_before": result.bytes_before,
+                "bytes_after": result.bytes_after,
+            }
+        )
+    print(json.dumps(output, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
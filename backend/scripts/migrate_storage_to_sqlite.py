@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import List
+
+from backend.infra.file_repo import FileRepo
+from backend.infra.sqlite_repo import SqliteRepo
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Import storage/campaigns/camp_* (campaign.json + turn_log.jsonl) into "
+            "the SQLite storage backend."
+        ),
+    )
+    parser.add_argument("--storage-root", default="storage")
+    parser.add_argument(
+        "--db-path",
+        default=None,
+        help="SQLite database file. Defaults to <storage-root>/ai_trpg.sqlite3.",
+    )
+    parser.add_argument(
+        "--campaign-id",
+        action="append",
+        default=[],
+        help="Campaign to import; repeatable. Defaults to every camp_* directory.",
+    )
+    parser.add_argument(
+        "--replace",
+        action="store_true",
+        help="Overwrite campaigns that already exist in the database.",
+    )
+    return parser
+
+
+def main() -> int:
+    parser = _build_parser()
+    args = parser.parse_args()
+
+    storage_root = Path(args.storage_root)
+    source = FileRepo(storage_root)
+    target = SqliteRepo(
+        storage_root,
+        db_path=Path(args.db_path) if args.db_path else None,
+    )
+    campaign_ids: List[str] = list(args.campaign_id) or sorted(
+        path.name
+        for path in source.campaigns_root.glob("camp_*")
+        if (path / "campaign.json").exists()
+    )
+    output = []
+    failed = 0
+    for campaign_id in campaign_ids:
+        try:
+            turn_rows = target.import_campaign(source, campaign_id, replace=args.replace)
+        except Exception as exc:
+            failed += 1
+            output.append({"campaign_id": campaign_id, "status": "error", "error": str(exc)})
+            continue
+        output.append({"campaign_id": campaign_id, "status": "imported", "turn_rows": turn_rows})
+    print(
+        json.dumps(
+            {"db_path": str(target.db_path), "campaigns": output},
+            ensure_ascii=False,
+            indent=2,
+        )
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import List
+
+from backend.infra.file_repo import FileRepo
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Rebuild turn_log.idx sidecars from turn_log.jsonl.",
+    )
+    parser.add_argument("--storage-root", default="storage")
+    parser.add_argument(
+        "--campaign-id",
+        action="append",
+        default=[],
+        help="Campaign to rebuild; repeatable. Defaults to every camp_* directory.",
+    )
+    parser.add_argument(
+        "--repair",
+        action="store_true",
+        help=(
+            "Fix a trailing line without newline: terminate it when it is a JSON "
+            "object, otherwise truncate the partial row."
+        ),
+    )
+    return parser
+
+
+def main() -> int:
+    parser = _build_parser()
+    args = parser.parse_args()
+
+    repo = FileRepo(Path(args.storage_root))
+    campaign_ids: List[str] = list(args.campaign_id) or sorted(
+        path.name for path in repo.campaigns_root.glob("camp_*") if path.is_dir()
+    )
+    output = []
+    for campaign_id in campaign_ids:
+        result = repo.rebuild_turn_log_index(campaign_id, repair=args.repair)
+        output.append(
+            {
+                "campaign_id": campaign_id,
+                "row_count": result.row_count,
+                "log_bytes": result.log_bytes,
+                "truncated_bytes": result.truncated_bytes,
+                "newline_added": result.newline_added,
+            }
+        )
+    print(json.dumps(output, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+from backend.app.turn_replay import replay_turn_log, starter_campaign_for
+from backend.domain.models import Campaign
+from backend.infra.file_repo import FileRepo
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Rebuild campaign state by re-running turn_log.jsonl tool calls "
+            "through the tool executor (no LLM), checking every turn against "
+            "its logged state_summary."
+        ),
+    )
+    parser.add_argument("campaign_id")
+    parser.add_argument("--storage-root", default="storage")
+    parser.add_argument(
+        "--base",
+        help=(
+            "campaign.json to start from. Defaults to the starter state "
+            "create_campaign writes for the campaign's current party."
+        ),
+    )
+    parser.add_argument(
+        "--output",
+        help="Write the reconstructed campaign to this path (campaign.json is untouched).",
+    )
+    parser.add_argument("--no-verify", action="store_true")
+    parser.add_argument(
+        "--keep-going",
+        action="store_true",
+        help="Replay past the first divergence and count the rest.",
+    )
+    return parser
+
+
+def _load_base(path: str) -> Campaign:
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if hasattr(Campaign, "model_validate"):
+        return Campaign.model_validate(data)
+    return Campaign.parse_obj(data)
+
+
+def _campaign_json(campaign: Campaign) -> str:
+    if hasattr(campaign, "model_dump_json"):
+        return campaign.model_dump_json(indent=2)
+    return campaign.json(indent=2)
+
+
+def main() -> int:
+    parser = _build_parser()
+    args = parser.parse_args()
+
+    repo = FileRepo(Path(args.storage_root))
+    if args.base:
+        base = _load_base(args.base)
+    else:
+        base = starter_campaign_for(repo, repo.get_campaign(args.campaign_id))
+    started = time.perf_counter()
+    result = replay_turn_log(
+        repo,
+        args.campaign_id,
+        base,
+        verify=not args.no_verify,
+        stop_on_divergence=not args.keep_going,
+    )
+    elapsed = time.perf_counter() - started
+    if args.output:
+        Path(args.output).write_text(_campaign_json(result.campaign), encoding="utf-8")
+    output = {
+        "campaign_id": args.campaign_id,
+        "turns_replayed": result.turns_replayed,
+        "tool_calls_replayed": result.tool_calls_replayed,
+        "elapsed_ms": round(elapsed * 1000, 1),
+        "turns_per_second": round(result.turns_replayed / elapsed) if elapsed > 0 else None,
+        "divergence_count": result.divergence_count,
+        "first_divergence": asdict(result.divergence) if result.divergence else None,
+    }
+    print(json.dumps(output, ensure_ascii=False, indent=2))
+    return 1 if result.divergence else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,10 +3,11 @@ from __future__ import annotations
 import base64
 import json
 import os
+import threading
 from dataclasses import dataclass
 from getpass import getpass
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 try:
     from cryptography.hazmat.primitives import hashes
@@ -23,6 +24,11 @@ KDF_ITERATIONS = 200_000
 NONCE_BYTES = 12
 KEY_BYTES = 32
 _cached_master_key: Optional[bytes] = None
+# Decrypted keys by (keyring path, key_ref), tagged with the keyring file's
+# (mtime_ns, size) when they were read; any rewrite of the file misses.
+_FileStamp = Tuple[int, int]
+_decrypted_keys: Dict[Tuple[Path, str], Tuple[_FileStamp, str]] = {}
+_decrypted_keys_guard = threading.Lock()
 
 
 @dataclass(frozen=True)
@@ -37,15 +43,42 @@ def get_keyring_path() -> Path:
 
 def get_api_key(key_ref: str, keyring_path: Optional[Path] = None) -> str:
     path = keyring_path or get_keyring_path()
+    stamp = _file_stamp(path)
+    with _decrypted_keys_guard:
+        cached = _decrypted_keys.get((path, key_ref))
+    if cached is not None and stamp is not None and cached[0] == stamp:
+        return cached[1]
     keyring = _read_keyring(path)
     if keyring is None or key_ref not in keyring["keys"]:
         ensure_key_exists(key_ref, path)
+        stamp = _file_stamp(path)
         keyring = _read_keyring(path)
     if keyring is None or key_ref not in keyring["keys"]:
         raise RuntimeError(f"Key ref not found after initialization: {key_ref}")
     master_key = _get_master_key(keyring)
     encrypted = keyring["keys"][key_ref]
-    return _decrypt_value(master_key, encrypted, key_ref)
+    try:
+        api_key = _decrypt_value(master_key, encrypted, key_ref)
+    except ValueError:
+        # Drop a key derived from a mistyped passphrase so the next call
+        # prompts again instead of failing for the life of the process.
+        _forget_master_key(master_key)
+        raise
+    # Tagged with the stamp taken before the read, so a write racing the
+    # read is picked up on the next call.
+    if stamp is not None:
+        with _decrypted_keys_guard:
+            _decrypted_keys[(path, key_ref)] = (stamp, api_key)
+    return api_key
+
+
+def clear_api_key_cache(keyring_path: Optional[Path] = None) -> None:
+    with _decrypted_keys_guard:
+        if keyring_path is None:
+            _decrypted_keys.clear()
+            return
+        for key in [key for key in _decrypted_keys if key[0] == keyring_path]:
+            del _decrypted_keys[key]
 
 
 def ensure_key_exists(key_ref: str, keyring_path: Optional[Path] = None) -> None:
@@ -62,6 +95,7 @@ def ensure_key_exists(key_ref: str, keyring_path: Optional[Path] = None) -> None
     encrypted = _encrypt_value(master_key, api_key)
     keyring["keys"][key_ref] = encrypted
     _write_keyring(path, keyring)
+    clear_api_key_cache(path)
 
 
 def _new_keyring() -> Dict[str, Any]:
@@ -87,6 +121,14 @@ def _read_keyring(path: Path) -> Optional[Dict[str, Any]]:
     return data
 
 
+def _file_stamp(path: Path) -> Optional[_FileStamp]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
 def _write_keyring(path: Path, data: Dict[str, Any]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     tmp_path = path.with_suffix(path.suffix + ".tmp")
@@ -113,6 +155,12 @@ def _get_master_key(
     return master_key
 
 
+def _forget_master_key(master_key: bytes) -> None:
+    global _cached_master_key
+    if _cached_master_key == master_key:
+        _cached_master_key = None
+
+
 def _get_iterations(keyring: Dict[str, Any]) -> int:
     kdf = keyring.get("kdf", {})
     iterations = kdf.get("iterations", KDF_ITERATIONS)
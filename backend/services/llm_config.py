@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+import copy
 import json
+import threading
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+
+# Parsed configs by path, tagged with the file's (mtime_ns, size) when read.
+_FileStamp = Tuple[int, int]
+_loaded_configs: Dict[Path, Tuple[_FileStamp, Dict[str, Any]]] = {}
+_loaded_configs_guard = threading.Lock()
 
 
 @dataclass(frozen=True)
@@ -16,6 +23,8 @@ class LLMProfile:
     timeout_sec: int = 30
     max_tokens: Optional[int] = None
     response_format: Optional[Dict[str, Any]] = None
+    max_concurrency: Optional[int] = None
+    connect_timeout_sec: Optional[int] = None
 
 
 def get_llm_config_path() -> Path:
@@ -24,14 +33,29 @@ def get_llm_config_path() -> Path:
 
 def load_llm_config(config_path: Optional[Path] = None) -> Dict[str, Any]:
     path = config_path or get_llm_config_path()
-    if not path.exists():
-        raise FileNotFoundError(f"LLM config file not found: {path}")
-    data = json.loads(path.read_text(encoding="utf-8"))
-    if not isinstance(data, dict):
-        raise ValueError(f"LLM config root must be an object: {path}")
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"LLM config file not found: {path}") from None
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    with _loaded_configs_guard:
+        cached = _loaded_configs.get(path)
+    if cached is not None and cached[0] == stamp:
+        return copy.deepcopy(cached[1])
+    data = _read_config(path)
+    with _loaded_configs_guard:
+        _loaded_configs[path] = (stamp, copy.deepcopy(data))
     return data
 
 
+def clear_llm_config_cache(config_path: Optional[Path] = None) -> None:
+    with _loaded_configs_guard:
+        if config_path is None:
+            _loaded_configs.clear()
+        else:
+            _loaded_configs.pop(config_path, None)
+
+
 def get_active_profile(
     config: Dict[str, Any], config_path: Optional[Path] = None
 ) -> LLMProfile:
@@ -52,12 +76,23 @@ def set_current_profile(
     profile_name: str, config_path: Optional[Path] = None
 ) -> None:
     path = config_path or get_llm_config_path()
-    config = load_llm_config(path)
+    # Read-modify-write goes to the file, never to a cached copy.
+    if not path.exists():
+        raise FileNotFoundError(f"LLM config file not found: {path}")
+    config = _read_config(path)
     profiles = config.get("profiles", {})
     if not isinstance(profiles, dict) or profile_name not in profiles:
         raise ValueError(f"LLM profile not found: {profile_name}")
     config["current_profile"] = profile_name
     _atomic_write(path, config)
+    clear_llm_config_cache(path)
+
+
+def _read_config(path: Path) -> Dict[str, Any]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(data, dict):
+        raise ValueError(f"LLM config root must be an object: {path}")
+    return data
 
 
 def _parse_profile(name: str, data: Dict[str, Any], path: Path) -> LLMProfile:
@@ -67,6 +102,10 @@ def _parse_profile(name: str, data: Dict[str, Any], path: Path) -> LLMProfile:
     temperature = _require_number(data, "temperature", path, name)
     timeout_sec = _optional_int(data, "timeout_sec", default=30)
     max_tokens = _optional_int(data, "max_tokens", default=None)
+    max_concurrency = _optional_int(data, "max_concurrency", default=None)
+    if max_concurrency is not None and max_concurrency < 1:
+        raise ValueError(f"LLM profile {name} max_concurrency must be >= 1: {path}")
+    connect_timeout_sec = _optional_int(data, "connect_timeout_sec", default=None)
     response_format = data.get("response_format")
     if response_format is not None and not isinstance(response_format, dict):
         raise ValueError(f"LLM profile {name} response_format must be an object: {path}")
@@ -79,6 +118,8 @@ def _parse_profile(name: str, data: Dict[str, Any], path: Path) -> LLMProfile:
         timeout_sec=timeout_sec,
         max_tokens=max_tokens,
         response_format=response_format,
+        max_concurrency=max_concurrency,
+        connect_timeout_sec=connect_timeout_sec,
     )
 
 
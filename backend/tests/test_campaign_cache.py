@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+from backend.domain.models import (
+    ActorState,
+    Campaign,
+    Goal,
+    MapArea,
+    MapData,
+    Milestone,
+    Selected,
+    SettingsSnapshot,
+)
+from backend.infra.campaign_cache import CampaignCache
+from backend.infra.file_repo import FileRepo
+
+
+def _make_campaign(campaign_id: str) -> Campaign:
+    return Campaign(
+        id=campaign_id,
+        selected=Selected(
+            world_id="world_001",
+            map_id="map_001",
+            party_character_ids=["pc_001"],
+            active_actor_id="pc_001",
+        ),
+        settings_snapshot=SettingsSnapshot(),
+        goal=Goal(text="Goal", status="active"),
+        milestone=Milestone(current="intro", last_advanced_turn=0),
+        map=MapData(
+            areas={
+                "area_001": MapArea(
+                    id="area_001",
+                    name="Start",
+                    reachable_area_ids=["area_002"],
+                ),
+                "area_002": MapArea(id="area_002", name="Side", reachable_area_ids=[]),
+            }
+        ),
+        actors={
+            "pc_001": ActorState(
+                position="area_001", hp=10, character_state="alive", meta={}
+            )
+        },
+    )
+
+
+def _make_repo(tmp_path: Path) -> FileRepo:
+    return FileRepo(tmp_path / "storage", campaign_cache=CampaignCache(max_entries=2))
+
+
+def test_get_campaign_hits_cache_after_first_load(tmp_path: Path) -> None:
+    repo = _make_repo(tmp_path)
+    repo.create_campaign(_make_campaign("camp_0001"))
+    repo.campaign_cache.clear()
+
+    repo.get_campaign("camp_0001")
+    repo.get_campaign("camp_0001")
+
+    stats = repo.campaign_cache_stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+
+
+def test_save_campaign_writes_through_to_cache(tmp_path: Path) -> None:
+    repo = _make_repo(tmp_path)
+    repo.create_campaign(_make_campaign("camp_0001"))
+
+    campaign = repo.get_campaign("camp_0001")
+    campaign.actors["pc_001"].hp = 4
+    repo.save_campaign(campaign)
+
+    loaded = repo.get_campaign("camp_0001")
+    assert loaded.actors["pc_001"].hp == 4
+    assert repo.campaign_cache_stats()["misses"] == 0
+
+
+def test_cached_campaign_is_isolated_from_caller_mutation(tmp_path: Path) -> None:
+    repo = _make_repo(tmp_path)
+    repo.create_campaign(_make_campaign("camp_0001"))
+
+    first = repo.get_campaign("camp_0001")
+    first.actors["pc_001"].position = "area_002"
+    first.actors["pc_001"].inventory["torch"] = 1
+
+    second = repo.get_campaign("camp_0001")
+    assert second.actors["pc_001"].position == "area_001"
+    assert second.actors["pc_001"].inventory == {}
+
+
+def test_external_edit_invalidates_cached_campaign(tmp_path: Path) -> None:
+    repo = _make_repo(tmp_path)
+    repo.create_campaign(_make_campaign("camp_0001"))
+    repo.get_campaign("camp_0001")
+
+    path = tmp_path / "storage" / "campaigns" / "camp_0001" / "campaign.json"
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    payload["goal"]["text"] = "Edited outside the process"
+    path.write_text(json.dumps(payload), encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    loaded = repo.get_campaign("camp_0001")
+    assert loaded.goal.text == "Edited outside the process"
+
+
+def test_cache_evicts_least_recently_used_campaign(tmp_path: Path) -> None:
+    repo = _make_repo(tmp_path)
+    for campaign_id in ("camp_0001", "camp_0002", "camp_0003"):
+        repo.create_campaign(_make_campaign(campaign_id))
+
+    stats = repo.campaign_cache_stats()
+    assert stats["size"] == 2
+    assert stats["evictions"] == 1
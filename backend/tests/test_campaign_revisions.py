@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import pytest
+
+import backend.app.turn_service as turn_service_module
+from backend.app.settings_service import SettingsService
+from backend.app.turn_service import TurnService
+from backend.domain.models import (
+    ActorState,
+    Campaign,
+    Goal,
+    MapArea,
+    MapData,
+    Milestone,
+    Selected,
+    SettingsSnapshot,
+)
+from backend.infra.campaign_cache import CampaignCache
+from backend.infra.file_repo import FileRepo, StaleCampaignError
+from backend.infra.sqlite_repo import SqliteRepo
+
+
+def _campaign() -> Campaign:
+    return Campaign(
+        id="camp_0001",
+        selected=Selected(
+            world_id="world_001",
+            map_id="map_001",
+            party_character_ids=["pc_001", "pc_002"],
+            active_actor_id="pc_001",
+        ),
+        settings_snapshot=SettingsSnapshot(),
+        goal=Goal(text="Stay alive.", status="active"),
+        milestone=Milestone(current="intro", last_advanced_turn=0),
+        map=MapData(
+            areas={
+                "area_001": MapArea(
+                    id="area_001", name="Start", reachable_area_ids=["area_002"]
+                ),
+                "area_002": MapArea(
+                    id="area_002", name="Hall", reachable_area_ids=["area_001"]
+                ),
+            },
+            connections=[],
+        ),
+        actors={
+            "pc_001": ActorState(position="area_001", hp=10, meta={}),
+            "pc_002": ActorState(position="area_001", hp=10, meta={}),
+        },
+    )
+
+
+class _MoveLLM:
+    # Moves pc_001 to the hall; `during_call` runs while the "LLM" thinks, as
+    # a request handled concurrently with the turn would.
+    during_call: Optional[Callable[[], None]] = None
+
+    def generate(self, system_prompt: str, user_input: str, debug_append: Any) -> Dict[str, Any]:
+        if _MoveLLM.during_call is not None:
+            _MoveLLM.during_call()
+        return {
+            "assistant_text": "You walk into the hall.",
+            "dialog_type": "scene_description",
+            "tool_calls": [
+                {
+                    "id": "call_move",
+                    "tool": "move",
+                    "args": {"actor_id": "pc_001", "to_area_id": "area_002"},
+                }
+            ],
+        }
+
+
+@pytest.mark.parametrize("repo_cls", [FileRepo, SqliteRepo])
+def test_save_is_compare_and_swap_on_revision(tmp_path: Path, repo_cls: type) -> None:
+    repo = repo_cls(tmp_path / "storage", campaign_cache=CampaignCache())
+    campaign = _campaign()
+    repo.create_campaign(campaign)
+    assert campaign.revision == 1
+
+    first = repo.get_campaign("camp_0001")
+    second = repo.get_campaign("camp_0001")
+    first.goal.text = "First"
+    repo.save_campaign(first)
+    assert first.revision == 2
+    second.goal.text = "Second"
+    with pytest.raises(StaleCampaignError, match="revision 2, loaded at 1"):
+        repo.save_campaign(second)
+
+    reloaded = repo.get_campaign("camp_0001")
+    assert (reloaded.revision, reloaded.goal.text) == (2, "First")
+    with pytest.raises(StaleCampaignError, match="loaded at 0"):
+        repo.save_campaign(_campaign())
+
+
+def test_campaign_json_without_revision_loads_as_revision_zero(tmp_path: Path) -> None:
+    repo = FileRepo(tmp_path / "storage", campaign_cache=CampaignCache())
+    repo.create_campaign(_campaign())
+    path = tmp_path / "storage" / "campaigns" / "camp_0001" / "campaign.json"
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert list(data)[:2] == ["id", "revision"]
+    del data["revision"]
+    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+    legacy = FileRepo(tmp_path / "storage", campaign_cache=CampaignCache())
+    campaign = legacy.get_campaign("camp_0001")
+    assert campaign.revision == 0
+    legacy.save_campaign(campaign)
+    assert json.loads(path.read_text(encoding="utf-8"))["revision"] == 1
+
+
+
+
+def test_pretty_printed_campaign_json_keeps_its_revision(tmp_path: Path) -> None:
+    repo = FileRepo(tmp_path / "storage", campaign_cache=CampaignCache())
+    repo.create_campaign(_campaign())
+    repo.save_campaign(repo.get_campaign("camp_0001"))
+    path = tmp_path / "storage" / "campaigns" / "camp_0001" / "campaign.json"
+    data = json.loads(path.read_text(encoding="utf-8"))
+    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+    edited = FileRepo(tmp_path / "storage", campaign_cache=CampaignCache())
+    campaign = edited.get_campaign("camp_0001")
+    assert campaign.revision == 2
+    edited.save_campaign(campaign)
+    assert json.loads(path.read_text(encoding="utf-8"))["revision"] == 3
+    stale = _campaign()
+    stale.revision = 2
+    with pytest.raises(StaleCampaignError, match="loaded at 2"):
+        edited.save_campaign(stale)
+
+
+@pytest.mark.parametrize("repo_cls", [FileRepo, SqliteRepo])
+def test_migration_save_conflict_reloads_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, repo_cls: Any
+) -> None:
+    repo = repo_cls(tmp_path / "storage")
+    repo.create_campaign(_campaign())
+    repo.campaign_cache.invalidate("camp_0001")
+    module = sys.modules[repo_cls.__module__]
+    hydrate = module._hydrate_campaign
+    saves: List[int] = []
+
+    def always_migrating(data: Dict[str, Any]) -> Any:
+        return hydrate(data)[0], True
+
+    def stale_save(self: Any, campaign: Campaign) -> None:
+        saves.append(campaign.revision)
+        raise StaleCampaignError("campaign changed")
+
+    monkeypatch.setattr(module, "_hydrate_campaign", always_migrating)
+    monkeypatch.setattr(repo_cls, "save_campaign", stale_save)
+    campaign = repo.get_campaign("camp_0001")
+
+    assert (campaign.id, campaign.revision) == ("camp_0001", 1)
+    assert saves == [1]
+@pytest.mark.parametrize("repo_cls", [FileRepo, SqliteRepo])
+def test_turn_reapplies_tool_calls_over_a_concurrent_save(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, repo_cls: type
+) -> None:
+    monkeypatch.setattr(turn_service_module, "LLMClient", _MoveLLM)
+    repo = repo_cls(tmp_path / "storage", campaign_cache=CampaignCache())
+    repo.create_campaign(_campaign())
+    service = TurnService(repo)
+    settings = SettingsService(repo)
+
+    def edit_settings() -> None:
+        settings.apply_patch("camp_0001", {"dialog.turn_profile_trace_enabled": True})
+        service.select_actor("camp_0001", "pc_002")
+
+    monkeypatch.setattr(_MoveLLM, "during_call", edit_settings)
+    response = service.submit_turn("camp_0001", "go to the hall", actor_id="pc_001")
+
+    campaign = repo.get_campaign("camp_0001")
+    assert [action["tool"] for action in response["applied_actions"]] == ["move"]
+    assert response["state_summary"]["positions"]["pc_001"] == "area_002"
+    assert campaign.actors["pc_001"].position == "area_002"
+    assert campaign.settings_snapshot.dialog.turn_profile_trace_enabled is True
+    assert campaign.selected.active_actor_id == "pc_002"
+    # create, settings edit, actor selection, then the re-applied turn.
+    assert campaign.revision == 4
+    assert repo.turn_log_row_count("camp_0001") == 1
+
+
+def test_turn_fails_when_its_tools_no_longer_apply(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(turn_service_module, "LLMClient", _MoveLLM)
+    repo = FileRepo(tmp_path / "storage", campaign_cache=CampaignCache())
+    repo.create_campaign(_campaign())
+
+    def disallow_move() -> None:
+        campaign = repo.get_campaign("camp_0001")
+        campaign.allowlist.remove("move")
+        repo.save_campaign(campaign)
+
+    monkeypatch.setattr(_MoveLLM, "during_call", disallow_move)
+    with pytest.raises(StaleCampaignError, match="no longer apply"):
+        TurnService(repo).submit_turn("camp_0001", "go to the hall", actor_id="pc_001")
+
+    campaign = repo.get_campaign("camp_0001")
+    assert "move" not in campaign.allowlist
+    assert campaign.actors["pc_001"].position == "area_001"
+    assert repo.turn_log_row_count("camp_0001") == 0
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+import backend.app.turn_service as turn_service_module
+from backend.api.main import create_app
+from backend.app.turn_replay import rollback_to_turn
+from backend.app.turn_service import TurnService
+from backend.infra.file_repo import FileRepo
+from backend.infra.sqlite_repo import SqliteRepo, close_thread_connections
+
+
+class _LootLLM:
+    def generate(self, system_prompt: str, user_input: str, debug_append: Any) -> Dict[str, Any]:
+        return {
+            "assistant_text": "You find a coin.",
+            "dialog_type": "scene_description",
+            "tool_calls": [
+                {"id": "call_loot", "tool": "inventory_add", "args": {"item_id": "coin"}}
+            ],
+        }
+
+
+def _play(repo: FileRepo, turns: int, *, milestone_interval: int = 100) -> str:
+    service = TurnService(repo)
+    campaign_id = service.create_campaign("world_001", "map_001", ["pc_001"], "pc_001")
+    campaign = repo.get_campaign(campaign_id)
+    campaign.settings_snapshot.rollback.max_checkpoints = 2
+    campaign.settings_snapshot.rollback.checkpoint_interval = 3
+    campaign.milestone.turn_trigger_interval = milestone_interval
+    repo.save_campaign(campaign)
+    for _ in range(turns):
+        service.submit_turn(campaign_id, "search the room")
+    return campaign_id
+
+
+@pytest.mark.parametrize("repo_cls", [FileRepo, SqliteRepo])
+def test_rollback_restores_checkpoint_and_truncates_turn_log(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, repo_cls: Any
+) -> None:
+    monkeypatch.setattr(turn_service_module, "LLMClient", _LootLLM)
+    repo = repo_cls(tmp_path / "storage")
+    try:
+        campaign_id = _play(repo, 10)
+        assert [c.turn_id for c in repo.list_checkpoints(campaign_id)] == [
+            "turn_0006",
+            "turn_0009",
+        ]
+
+        result = rollback_to_turn(repo, campaign_id, "turn_0007")
+
+        assert (result.checkpoint_turn_id, result.replayed_turns) == ("turn_0006", 1)
+        assert (result.dropped_turns, result.dropped_checkpoints) == (3, 1)
+        campaign = repo.get_campaign(campaign_id)
+        assert campaign.actors["pc_001"].inventory == {"coin": 7}
+        assert repo.turn_log_row_count(campaign_id) == 7
+        assert [c.turn_id for c in repo.list_checkpoints(campaign_id)] == ["turn_0006"]
+
+        TurnService(repo).submit_turn(campaign_id, "search again")
+        rows = list(repo.iter_turn_log_rows(campaign_id, after_row=6))
+        assert [row["turn_id"] for row in rows] == ["turn_0007", "turn_0008"]
+        assert rows[-1]["state_summary"]["active_actor_inventory"] == {"coin": 8}
+
+        # Older than every kept checkpoint: replayed from the starting state.
+        early = rollback_to_turn(repo, campaign_id, "turn_0005")
+        assert (early.checkpoint_turn_id, early.replayed_turns) == (None, 5)
+        assert (early.dropped_turns, early.dropped_checkpoints) == (3, 1)
+        campaign = repo.get_campaign(campaign_id)
+        assert campaign.actors["pc_001"].inventory == {"coin": 5}
+        assert campaign.settings_snapshot.rollback.max_checkpoints == 2
+        assert repo.turn_log_row_count(campaign_id) == 5
+        assert repo.list_checkpoints(campaign_id) == []
+    finally:
+        close_thread_connections()
+
+
+def test_checkpoint_taken_when_milestone_advances(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(turn_service_module, "LLMClient", _LootLLM)
+    repo = FileRepo(tmp_path / "storage")
+    campaign_id = _play(repo, 5, milestone_interval=4)
+
+    assert [c.turn_id for c in repo.list_checkpoints(campaign_id)] == [
+        "turn_0003",
+        "turn_0004",
+    ]
+
+
+def test_rollback_api(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(turn_service_module, "LLMClient", _LootLLM)
+    campaign_id = _play(FileRepo(tmp_path / "storage"), 4)
+    client = TestClient(create_app())
+
+    listed = client.get(f"/api/v1/campaign/{campaign_id}/checkpoints")
+    rolled_back = client.post(
+        f"/api/v1/campaign/{campaign_id}/rollback", json={"turn_id": "turn_0003"}
+    )
+    too_early = client.post(
+        f"/api/v1/campaign/{campaign_id}/rollback", json={"turn_id": "turn_0002"}
+    )
+    unknown_turn = client.post(
+        f"/api/v1/campaign/{campaign_id}/rollback", json={"turn_id": "turn_0009"}
+    )
+    missing = client.post("/api/v1/campaign/camp_9999/rollback", json={"turn_id": "turn_0001"})
+
+    assert listed.status_code == 200
+    assert [c["turn_id"] for c in listed.json()["checkpoints"]] == ["turn_0003"]
+    assert rolled_back.status_code == 200
+    assert rolled_back.json()["replayed_turns"] == 0
+    assert rolled_back.json()["dropped_turns"] == 1
+    assert too_early.status_code == 200
+    assert too_early.json()["checkpoint_turn_id"] is None
+    assert too_early.json()["replayed_turns"] == 2
+    assert unknown_turn.status_code == 400
+    assert missing.status_code == 404
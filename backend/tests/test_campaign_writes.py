@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+import backend.app.turn_service as turn_service_module
+from backend.app.turn_service import TurnService
+from backend.domain.models import (
+    ActorState,
+    Campaign,
+    Goal,
+    MapData,
+    Milestone,
+    Selected,
+    SettingsSnapshot,
+)
+from backend.infra.campaign_cache import CampaignCache
+from backend.infra.campaign_journal import JOURNAL_FILENAME, CampaignJournal
+from backend.infra.file_repo import FileRepo
+
+
+def _campaign(campaign_id: str = "camp_0001") -> Campaign:
+    return Campaign(
+        id=campaign_id,
+        selected=Selected(
+            world_id="world_001",
+            map_id="map_001",
+            party_character_ids=["pc_001"],
+            active_actor_id="pc_001",
+        ),
+        settings_snapshot=SettingsSnapshot(),
+        goal=Goal(text="Goal", status="active"),
+        milestone=Milestone(current="intro", last_advanced_turn=0),
+        actors={"pc_001": ActorState(position=None, meta={})},
+    )
+
+
+def test_save_campaign_is_compact_and_leaves_no_temp_files(tmp_path: Path) -> None:
+    repo = FileRepo(tmp_path / "storage", campaign_cache=CampaignCache())
+    campaign = _campaign()
+    repo.create_campaign(campaign)
+    campaign.goal.text = "Updated"
+    repo.save_campaign(campaign)
+
+    campaign_dir = tmp_path / "storage" / "campaigns" / "camp_0001"
+    raw = (campaign_dir / "campaign.json").read_text(encoding="utf-8")
+    assert "\n" not in raw and ": " not in raw
+    assert json.loads(raw)["goal"]["text"] == "Updated"
+    assert sorted(path.name for path in campaign_dir.iterdir()) == ["campaign.json"]
+
+
+def test_unknown_durability_mode_is_rejected(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        FileRepo(tmp_path / "storage", durability="sometimes")
+
+
+def test_group_durability_journals_saves_and_recovers(tmp_path: Path) -> None:
+    storage_root = tmp_path / "storage"
+    repo = FileRepo(storage_root, campaign_cache=CampaignCache(), durability="group")
+    campaign = _campaign()
+    repo.create_campaign(campaign)
+    campaign.goal.text = "Journaled"
+    repo.save_campaign(campaign)
+    assert repo.campaign_journal is not None
+    assert repo.campaign_journal.stats()["commits"] == 2
+
+    # Simulate a crash that lost the renamed file but kept the journal.
+    campaign_path = storage_root / "campaigns" / "camp_0001" / "campaign.json"
+    campaign_path.write_text("{", encoding="utf-8")
+    journal = CampaignJournal(storage_root / "campaigns" / JOURNAL_FILENAME)
+    assert journal.recover() == 1
+    assert json.loads(campaign_path.read_text(encoding="utf-8"))["goal"]["text"] == "Journaled"
+    assert (storage_root / "campaigns" / JOURNAL_FILENAME).stat().st_size == 0
+    repo.campaign_journal.close()
+
+
+def test_journal_never_reverts_a_newer_campaign_revision(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import backend.infra.campaign_journal as journal_module
+
+    storage_root = tmp_path / "storage"
+    repo = FileRepo(storage_root, campaign_cache=CampaignCache(), durability="group")
+    campaign = _campaign()
+    campaign_path = storage_root / "campaigns" / "camp_0001" / "campaign.json"
+
+    # The record is durable before the rename: a crash between the two leaves
+    # the old file and a record that recovery applies.
+    monkeypatch.setattr(journal_module, "atomic_write_bytes", _crash_before_rename)
+    with pytest.raises(RuntimeError, match="crashed"):
+        repo.create_campaign(campaign)
+    monkeypatch.undo()
+    assert not campaign_path.exists()
+    assert CampaignJournal(storage_root / "campaigns" / JOURNAL_FILENAME).recover() == 1
+    assert json.loads(campaign_path.read_text(encoding="utf-8"))["revision"] == 1
+
+    # A later save in another mode leaves an older record behind in a journal
+    # that was not checkpointed; the next group start must keep the newer file.
+    repo.campaign_journal.commit(
+        "camp_0001/campaign.json", campaign_path.read_bytes()
+    )
+    plain = FileRepo(storage_root, campaign_cache=CampaignCache(), durability="none")
+    newer = plain.get_campaign("camp_0001")
+    newer.goal.text = "Saved without the journal"
+    plain.save_campaign(newer)
+    assert CampaignJournal(storage_root / "campaigns" / JOURNAL_FILENAME).recover() == 0
+    assert plain.get_campaign("camp_0001").goal.text == "Saved without the journal"
+    repo.campaign_journal.close()
+
+
+def _crash_before_rename(path: Path, payload: bytes, *, fsync: bool = False) -> None:
+    raise RuntimeError("crashed before the rename")
+
+
+def test_journal_ignores_torn_tail_and_checkpoints(tmp_path: Path) -> None:
+    root = tmp_path / "campaigns"
+    (root / "camp_0001").mkdir(parents=True)
+    target = root / "camp_0001" / "campaign.json"
+    journal = CampaignJournal(root / JOURNAL_FILENAME, checkpoint_bytes=1 << 20)
+    target.write_bytes(b'{"v":1}')
+    journal.commit("camp_0001/campaign.json", b'{"v":1}')
+    journal.close()
+    with (root / JOURNAL_FILENAME).open("ab") as handle:
+        handle.write(b"CJR1\x05")
+
+    target.write_bytes(b"")
+    recovered = CampaignJournal(root / JOURNAL_FILENAME, checkpoint_bytes=64)
+    assert recovered.recover() == 1
+    assert target.read_bytes() == b'{"v":1}'
+
+    target.write_bytes(b'{"v":2}' * 20)
+    recovered.commit("camp_0001/campaign.json", b'{"v":2}' * 20)
+    assert recovered.stats()["checkpoints"] == 1
+    assert recovered.stats()["journal_bytes"] == 0
+    with pytest.raises(ValueError):
+        recovered.commit("../escape.json", b"{}")
+    recovered.close()
+
+
+def test_group_commit_shares_fsyncs_across_threads(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import backend.infra.campaign_journal as journal_module
+
+    root = tmp_path / "campaigns"
+    journal = CampaignJournal(root / JOURNAL_FILENAME)
+    root.mkdir(parents=True)
+    gate = threading.Event()
+    real_fsync = journal_module.os.fsync
+
+    def _slow_fsync(fd: int) -> None:
+        gate.wait(timeout=2)
+        real_fsync(fd)
+
+    monkeypatch.setattr(journal_module.os, "fsync", _slow_fsync)
+    threads: List[threading.Thread] = []
+    for index in range(8):
+        (root / f"camp_{index:04d}").mkdir()
+        threads.append(
+            threading.Thread(
+                target=journal.commit,
+                args=(f"camp_{index:04d}/campaign.json", b"{}"),
+            )
+        )
+    for thread in threads:
+        thread.start()
+    gate.set()
+    for thread in threads:
+        thread.join()
+
+    stats = journal.stats()
+    assert stats["commits"] == 8
+    assert stats["fsyncs"] < 8
+    journal.close()
+
+
+class _ToolLLM:
+    def generate(self, system_prompt: str, user_input: str, debug_append: Any) -> Dict[str, Any]:
+        return {
+            "assistant_text": "You head to the side room.",
+            "dialog_type": "action_prompt",
+            "tool_calls": [
+                {
+                    "id": "call_move",
+                    "tool": "move",
+                    "args": {"actor_id": "pc_001", "to_area_id": "area_002"},
+                }
+            ],
+        }
+
+
+def test_submit_turn_saves_campaign_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(turn_service_module, "LLMClient", _ToolLLM)
+    repo = FileRepo(tmp_path / "storage", campaign_cache=CampaignCache())
+    campaign = _campaign()
+    campaign.map = MapData()
+    repo.create_campaign(campaign)
+    saves: List[str] = []
+    real_save = repo.save_campaign
+
+    def _counting_save(target: Campaign) -> None:
+        saves.append(target.id)
+        real_save(target)
+
+    monkeypatch.setattr(repo, "save_campaign", _counting_save)
+    response = TurnService(repo).submit_turn("camp_0001", "go to the side room")
+
+    assert response["applied_actions"]
+    assert saves == ["camp_0001"]
+    stored = repo.get_campaign("camp_0001")
+    assert stored.map.areas
+    assert stored.actors["pc_001"].position == "area_002"
+
+
+def test_rejected_turn_still_persists_minimum_state(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(turn_service_module, "LLMClient", _ToolLLM)
+    repo = FileRepo(tmp_path / "storage", campaign_cache=CampaignCache())
+    campaign = _campaign()
+    campaign.map = MapData()
+    repo.create_campaign(campaign)
+
+    with pytest.raises(ValueError):
+        TurnService(repo).submit_turn("camp_0001", "hello", actor_id="pc_999")
+
+    assert repo.get_campaign("camp_0001").map.areas
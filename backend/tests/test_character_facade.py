@@ -94,3 +94,24 @@ def test_list_party_views_initializes_missing_party_actor() -> None:
     assert ids == ["pc_001", "pc_002"]
     assert campaign.actors["pc_002"].hp == 10
     assert campaign.actors["pc_002"].character_state == "alive"
+
+
+def test_read_state_and_state_maps_do_not_mutate_campaign() -> None:
+    campaign = _make_campaign()
+    campaign.actors["pc_001"].hp = -3
+    facade = create_character_facade()
+    before = campaign.model_dump()
+
+    state = facade.read_state(campaign, "pc_001")
+    missing = facade.read_state(campaign, "pc_404")
+    positions, positions_parent, positions_child, hp, character_states = (
+        facade.build_state_maps(campaign)
+    )
+
+    assert (state.position, state.hp, state.character_state) == ("area_001", 0, "alive")
+    assert (missing.position, missing.hp, missing.character_state) == (None, 10, "alive")
+    assert positions == positions_parent == {"pc_001": "area_001"}
+    assert positions_child == {"pc_001": None}
+    assert hp == {"pc_001": 0}
+    assert character_states == {"pc_001": "alive"}
+    assert campaign.model_dump() == before
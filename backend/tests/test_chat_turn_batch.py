@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+import backend.app.turn_service as turn_service_module
+from backend.api.main import create_app
+from backend.domain.models import (
+    ActorState,
+    Campaign,
+    Goal,
+    MapArea,
+    MapData,
+    Milestone,
+    Selected,
+    SettingsSnapshot,
+)
+from backend.infra.file_repo import FileRepo, StaleCampaignError
+
+
+class _ScriptedLLM:
+    # Moves between the two areas on "go", loots on "loot", otherwise narrates.
+    def generate(self, system_prompt: str, user_input: str, debug_append: Any) -> Dict[str, Any]:
+        tool_calls: List[Dict[str, Any]] = []
+        if user_input.startswith("go "):
+            tool_calls.append(
+                {
+                    "id": "call_go",
+                    "tool": "move",
+                    "args": {"actor_id": "pc_001", "to_area_id": user_input[3:]},
+                }
+            )
+        elif user_input == "loot":
+            tool_calls.append(
+                {"id": "call_loot", "tool": "inventory_add", "args": {"item_id": "torch"}}
+            )
+        elif user_input == "explode":
+            raise RuntimeError("upstream exploded")
+        return {
+            "assistant_text": f"Turn: {user_input}",
+            "dialog_type": "scene_description",
+            "tool_calls": tool_calls,
+        }
+
+
+def _setup(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> FileRepo:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(turn_service_module, "LLMClient", _ScriptedLLM)
+    repo = FileRepo(tmp_path / "storage")
+    repo.create_campaign(
+        Campaign(
+            id="camp_0001",
+            selected=Selected(
+                world_id="world_001",
+                map_id="map_001",
+                party_character_ids=["pc_001"],
+                active_actor_id="pc_001",
+            ),
+            settings_snapshot=SettingsSnapshot(),
+            goal=Goal(text="Stay alive.", status="active"),
+            milestone=Milestone(current="intro", last_advanced_turn=0),
+            map=MapData(
+                areas={
+                    "area_001": MapArea(
+                        id="area_001", name="Start", reachable_area_ids=["area_002"]
+                    ),
+                    "area_002": MapArea(
+                        id="area_002", name="Hall", reachable_area_ids=["area_001"]
+                    ),
+                },
+                connections=[],
+            ),
+            actors={"pc_001": ActorState(position="area_001", hp=10, meta={})},
+        )
+    )
+    return repo
+
+
+def _count_saves(repo_cls: Any, monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    saves: List[str] = []
+    original = repo_cls.save_campaign
+
+    def counting_save(self: Any, campaign: Campaign) -> None:
+        saves.append(campaign.id)
+        original(self, campaign)
+
+    monkeypatch.setattr(repo_cls, "save_campaign", counting_save)
+    return saves
+
+
+def test_batch_runs_turns_in_order_with_one_save(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repo = _setup(tmp_path, monkeypatch)
+    saves = _count_saves(FileRepo, monkeypatch)
+    client = TestClient(create_app())
+
+    response = client.post(
+        "/api/v1/chat/turns",
+        json={
+            "campaign_id": "camp_0001",
+            "turns": [
+                {"user_input": "go area_002"},
+                {"user_input": "loot"},
+                {"user_input": "go area_001", "execution": {"actor_id": "pc_001"}},
+            ],
+        },
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["completed"] == 3 and body["error"] is None
+    positions = [result["state_summary"]["positions"]["pc_001"] for result in body["results"]]
+    assert positions == ["area_002", "area_002", "area_001"]
+    assert body["results"][1]["state_summary"]["active_actor_inventory"] == {"torch": 1}
+    assert saves == ["camp_0001"]
+    assert repo.turn_log_row_count("camp_0001") == 3
+    campaign = repo.get_campaign("camp_0001")
+    assert campaign.actors["pc_001"].position == "area_001"
+    assert campaign.actors["pc_001"].inventory == {"torch": 1}
+
+
+def test_batch_prompts_see_earlier_turns_tool_changes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Turns in a batch share the loaded campaign, so prompt sections changed in
+    # place by a tool call must not be served from their memoized hashes.
+    contexts: List[Dict[str, Any]] = []
+
+    class _RecordingLLM(_ScriptedLLM):
+        def generate(
+            self, system_prompt: Any, user_input: str, debug_append: Any
+        ) -> Dict[str, Any]:
+            contexts.append(json.loads(system_prompt.context[len("Context: "):]))
+            return super().generate(system_prompt, user_input, debug_append)
+
+    _setup(tmp_path, monkeypatch)
+    monkeypatch.setattr(turn_service_module, "LLMClient", _RecordingLLM)
+    client = TestClient(create_app())
+
+    response = client.post(
+        "/api/v1/chat/turns",
+        json={
+            "campaign_id": "camp_0001",
+            "turns": [
+                {"user_input": "go area_002"},
+                {"user_input": "loot"},
+                {"user_input": "look"},
+            ],
+        },
+    )
+
+    assert response.status_code == 200
+    assert [context["actors"]["pc_001"]["position"] for context in contexts] == [
+        "area_001",
+        "area_002",
+        "area_002",
+    ]
+    assert [context["actors"]["pc_001"]["inventory"] for context in contexts] == [
+        {},
+        {},
+        {"torch": 1},
+    ]
+
+
+def test_batch_per_turn_saves_and_stops_at_failed_turn(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repo = _setup(tmp_path, monkeypatch)
+    saves = _count_saves(FileRepo, monkeypatch)
+    client = TestClient(create_app())
+
+    response = client.post(
+        "/api/v1/chat/turns",
+        json={
+            "campaign_id": "camp_0001",
+            "save_mode": "per_turn",
+            "turns": [
+                {"user_input": "go area_002"},
+                {"user_input": "loot"},
+                {"user_input": "explode"},
+                {"user_input": "go area_001"},
+            ],
+        },
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["completed"] == 2
+    assert body["error"] == {"index": 2, "status_code": 500, "detail": "Turn failed."}
+    assert saves == ["camp_0001", "camp_0001"]
+    campaign = repo.get_campaign("camp_0001")
+    assert campaign.actors["pc_001"].position == "area_002"
+    assert repo.turn_log_row_count("camp_0001") == 2
+
+
+def test_batch_failed_final_save_drops_its_turn_log_rows(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repo = _setup(tmp_path, monkeypatch)
+    campaign = repo.get_campaign("camp_0001")
+    campaign.settings_snapshot.rollback.max_checkpoints = 5
+    campaign.settings_snapshot.rollback.checkpoint_interval = 1
+    repo.save_campaign(campaign)
+    client = TestClient(create_app())
+
+    def batch(*inputs: str) -> Any:
+        return client.post(
+            "/api/v1/chat/turns",
+            json={
+                "campaign_id": "camp_0001",
+                "turns": [{"user_input": user_input} for user_input in inputs],
+            },
+        )
+
+    assert batch("go area_002").status_code == 200
+    assert repo.turn_log_row_count("camp_0001") == 1
+    assert len(repo.list_checkpoints("camp_0001")) == 1
+
+    def stale_save(self: Any, campaign: Campaign) -> None:
+        raise StaleCampaignError("campaign changed")
+
+    monkeypatch.setattr(FileRepo, "save_campaign", stale_save)
+    response = batch("loot", "go area_001")
+
+    assert response.status_code == 409
+    assert repo.turn_log_row_count("camp_0001") == 1
+    assert [row["turn_id"] for row in repo.iter_turn_log_rows("camp_0001")] == ["turn_0001"]
+    assert [checkpoint.turn_id for checkpoint in repo.list_checkpoints("camp_0001")] == [
+        "turn_0001"
+    ]
+    campaign = repo.get_campaign("camp_0001")
+    assert campaign.actors["pc_001"].position == "area_002"
+    assert campaign.actors["pc_001"].inventory == {}
+
+def test_batch_rejects_bad_requests(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    _setup(tmp_path, monkeypatch)
+    client = TestClient(create_app())
+
+    empty = client.post("/api/v1/chat/turns", json={"campaign_id": "camp_0001", "turns": []})
+    missing = client.post(
+        "/api/v1/chat/turns",
+        json={"campaign_id": "camp_9999", "turns": [{"user_input": "look"}]},
+    )
+    bad_actor = client.post(
+        "/api/v1/chat/turns",
+        json={
+            "campaign_id": "camp_0001",
+            "turns": [{"user_input": "look"}, {"user_input": "look", "actor_id": "pc_404"}],
+        },
+    )
+
+    assert empty.status_code == 400
+    assert missing.status_code == 404
+    assert bad_actor.status_code == 200
+    assert bad_actor.json()["error"]["index"] == 1
+    assert bad_actor.json()["error"]["status_code"] == 400
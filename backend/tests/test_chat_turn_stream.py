@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+import pytest
+
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+import backend.app.turn_service as turn_service_module
+from backend.api.main import create_app
+from backend.domain.models import (
+    ActorState,
+    Campaign,
+    Goal,
+    MapArea,
+    MapData,
+    Milestone,
+    Selected,
+    SettingsSnapshot,
+)
+from backend.infra.file_repo import FileRepo
+from backend.infra.llm_client import AssistantTextExtractor
+
+_CONTENT = json.dumps(
+    {
+        "assistant_text": "The lantern \"flickers\".\nA draft: café \U0001F56F",
+        "dialog_type": "scene_description",
+        "tool_calls": [],
+    }
+)
+
+
+class _StubStreamingLLM:
+    def generate(self, *args: Any) -> Dict[str, Any]:
+        raise AssertionError("streaming turns must not call generate")
+
+    async def astream(
+        self, system_prompt: str, user_input: str, debug_append: Any
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        extractor = AssistantTextExtractor()
+        for index in range(0, len(_CONTENT), 7):
+            text = extractor.feed(_CONTENT[index : index + 7])
+            if text:
+                yield ("delta", text)
+        yield ("output", json.loads(_CONTENT))
+
+
+class _StubSyncLLM:
+    def generate(self, *args: Any) -> Dict[str, Any]:
+        return {
+            "assistant_text": "Plain turn.",
+            "dialog_type": "scene_description",
+            "tool_calls": [],
+        }
+
+
+def _create_campaign(tmp_path: Path, campaign_id: str) -> None:
+    FileRepo(tmp_path / "storage").create_campaign(
+        Campaign(
+            id=campaign_id,
+            selected=Selected(
+                world_id="world_001",
+                map_id="map_001",
+                party_character_ids=["pc_001"],
+                active_actor_id="pc_001",
+            ),
+            settings_snapshot=SettingsSnapshot(),
+            goal=Goal(text="Stay alive.", status="active"),
+            milestone=Milestone(current="intro", last_advanced_turn=0),
+            map=MapData(
+                areas={
+                    "area_001": MapArea(
+                        id="area_001",
+                        name="Start",
+                        description="Start room.",
+                        reachable_area_ids=[],
+                    )
+                },
+                connections=[],
+            ),
+            actors={
+                "pc_001": ActorState(
+                    position="area_001",
+                    hp=10,
+                    character_state="alive",
+                    inventory={},
+                    meta={},
+                )
+            },
+        )
+    )
+
+
+def _parse_sse(body: str) -> List[Tuple[str, Dict[str, Any]]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_stream_turn_emits_deltas_then_committed_final(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _create_campaign(tmp_path, "camp_stream")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(turn_service_module, "LLMClient", _StubStreamingLLM)
+
+    response = TestClient(create_app()).post(
+        "/api/v1/chat/turn/stream",
+        json={"campaign_id": "camp_stream", "user_input": "look"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = _parse_sse(response.text)
+    names = [name for name, _ in events]
+    assert names[0] == "start" and names[-1] == "final"
+    assert set(names[1:-1]) == {"delta"}
+    streamed = "".join(data["text"] for name, data in events if name == "delta")
+    assert streamed == json.loads(_CONTENT)["assistant_text"]
+
+    final = events[-1][1]
+    assert final["narrative_text"] == streamed
+    assert final["state_summary"]["positions"] == {"pc_001": "area_001"}
+    repo = FileRepo(tmp_path / "storage")
+    assert repo.get_turn_log_row("camp_stream", "turn_0001")["assistant_text"] == streamed
+
+
+def test_stream_turn_falls_back_to_whole_completion(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _create_campaign(tmp_path, "camp_stream_sync")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(turn_service_module, "LLMClient", _StubSyncLLM)
+
+    response = TestClient(create_app()).post(
+        "/api/v1/chat/turn/stream",
+        json={"campaign_id": "camp_stream_sync", "user_input": "look"},
+    )
+    events = _parse_sse(response.text)
+    assert [name for name, _ in events] == ["start", "delta", "final"]
+    assert events[1][1] == {"attempt": 1, "text": "Plain turn."}
+
+
+def test_stream_turn_keeps_http_errors_before_start(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _create_campaign(tmp_path, "camp_stream_busy")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(turn_service_module, "LLMClient", _StubSyncLLM)
+    client = TestClient(create_app())
+
+    missing = client.post(
+        "/api/v1/chat/turn/stream",
+        json={"campaign_id": "camp_missing", "user_input": "look"},
+    )
+    assert missing.status_code == 404
+
+    lock = turn_service_module._CAMPAIGN_TURN_LOCKS.try_acquire("camp_stream_busy")
+    assert lock is not None
+    try:
+        busy = client.post(
+            "/api/v1/chat/turn/stream",
+            json={"campaign_id": "camp_stream_busy", "user_input": "look"},
+        )
+        assert busy.status_code == 409
+    finally:
+        turn_service_module._CAMPAIGN_TURN_LOCKS.release(lock)
+
+
+def test_assistant_text_extractor_handles_split_escapes() -> None:
+    content = json.dumps({"dialog_type": "x", "assistant_text": 'a\\"b\né\U0001F56F"'})
+    extractor = AssistantTextExtractor()
+    text = "".join(extractor.feed(char) for char in content)
+    assert text == 'a\\"b\né\U0001F56F"'
+    assert extractor.done
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+from backend.app.context_budget import actor_priority, area_distances
+from backend.app.turn_service import _build_system_prompt, _recent_actor_ids
+from backend.domain.models import (
+    ActorState,
+    AppliedAction,
+    AssistantStructured,
+    Campaign,
+    Goal,
+    MapArea,
+    MapConnection,
+    MapData,
+    Milestone,
+    Selected,
+    SettingsSnapshot,
+    StateSummary,
+    TurnLogEntry,
+)
+from backend.domain.settings import apply_settings_patch
+from backend.infra.file_repo import FileRepo
+
+
+def _chain_map(count: int) -> MapData:
+    return MapData(
+        areas={
+            f"area_{index:03d}": MapArea(
+                id=f"area_{index:03d}",
+                name=f"Area {index}",
+                description="Moss-covered stones line a narrow path toward the ridge.",
+                reachable_area_ids=[f"area_{index + 1:03d}"] if index < count else [],
+            )
+            for index in range(1, count + 1)
+        },
+        connections=[],
+    )
+
+
+def _campaign(area_count: int, budget_bytes: int) -> Campaign:
+    actors = {
+        f"npc_{index:03d}": ActorState(
+            position=f"area_{index * 3:03d}", meta={"name": f"NPC {index}"}
+        )
+        for index in range(1, area_count // 3 + 1)
+    }
+    actors["pc_001"] = ActorState(
+        position="area_001", meta={"profile": {"name": "Hero", "role": "scout"}}
+    )
+    campaign = Campaign(
+        id="camp_budget",
+        selected=Selected(
+            world_id="world_001",
+            map_id="map_001",
+            party_character_ids=["pc_001"],
+            active_actor_id="pc_001",
+        ),
+        settings_snapshot=SettingsSnapshot(),
+        goal=Goal(text="Reach the ridge.", status="active"),
+        milestone=Milestone(current="intro", last_advanced_turn=0),
+        map=_chain_map(area_count),
+        actors=actors,
+    )
+    context = campaign.settings_snapshot.context
+    context.full_context_enabled = False
+    context.budget_enabled = True
+    context.budget_bytes = budget_bytes
+    return campaign
+
+
+def _context(campaign: Campaign, recent: Any = ()) -> Dict[str, Any]:
+    prompt = _build_system_prompt(campaign, "pc_001", recent)
+    body = prompt.context[len("Context: "):]
+    assert body == json.dumps(json.loads(body), ensure_ascii=False)
+    assert len(prompt.context.encode("utf-8")) <= campaign.settings_snapshot.context.budget_bytes
+    return json.loads(body)
+
+
+def test_area_distances_use_undirected_edges() -> None:
+    map_data = _chain_map(4)
+    map_data.areas["area_005"] = MapArea(id="area_005", name="Isle")
+    map_data.areas["area_006"] = MapArea(id="area_006", name="Cellar", parent_area_id="area_003")
+    map_data.connections.append(MapConnection(from_area_id="area_004", to_area_id="area_001"))
+
+    distances = area_distances(map_data, "area_002")
+    assert distances == {
+        "area_001": 1,
+        "area_002": 0,
+        "area_003": 1,
+        "area_004": 2,
+        "area_006": 2,
+    }
+    assert area_distances(map_data, None) == {}
+
+
+def test_budgeted_context_is_bounded_and_ranked() -> None:
+    small = _context(_campaign(12, 16000))
+    assert small["context_mode"] == "budgeted"
+    assert small["context_budget"]["areas_included"] == 12
+    assert small["adopted_profiles_by_actor"] == {"pc_001": {"name": "Hero", "role": "scout"}}
+
+    sizes = []
+    for area_count in (60, 300):
+        context = _context(_campaign(area_count, 8000))
+        areas = list(context["map"]["areas"])
+        included = context["context_budget"]["areas_included"]
+        assert 0 < included < area_count
+        assert areas == [f"area_{index:03d}" for index in range(1, included + 1)]
+        assert next(iter(context["actors"])) == "pc_001"
+        assert context["actors"]["pc_001"]["meta"] == {}
+        sizes.append(included)
+    assert sizes[0] == sizes[1]
+
+
+def test_actor_priority_prefers_active_then_near_then_recent() -> None:
+    distances = {"area_001": 0, "area_002": 1, "area_003": 2}
+
+    def priority(actor_id: str, position: str, recent: Any = ()) -> int:
+        return actor_priority(
+            actor_id,
+            ActorState(position=position),
+            effective_actor_id="pc_001",
+            distances=distances,
+            recent_actor_ids=recent,
+        )
+
+    assert priority("pc_001", "area_003") == 0
+    assert priority("npc_001", "area_001") == 1
+    assert priority("npc_001", "area_002", ["npc_001"]) == 1
+    assert priority("npc_002", "area_002") == 2
+    assert priority("npc_003", "area_999") > priority("npc_002", "area_003")
+
+
+def test_recent_actor_ids_read_from_turn_log(tmp_path: Path) -> None:
+    repo = FileRepo(tmp_path / "storage")
+    campaign = _campaign(6, 16000)
+    repo.create_campaign(campaign)
+    for turn, actor_id in enumerate(["npc_001", "npc_002", "npc_001"], start=1):
+        repo.append_turn_log(
+            campaign.id,
+            TurnLogEntry(
+                turn_id=f"turn_{turn:04d}",
+                timestamp="2026-03-03T00:00:00+00:00",
+                user_input="go",
+                dialog_type="scene_description",
+                dialog_type_source="model",
+                settings_revision=0,
+                assistant_text="",
+                assistant_structured=AssistantStructured(tool_calls=[]),
+                applied_actions=[
+                    AppliedAction(
+                        tool="move",
+                        args={"actor_id": actor_id, "to_area_id": "area_002"},
+                        result={},
+                        timestamp="2026-03-03T00:00:00+00:00",
+                    )
+                ],
+                state_summary=StateSummary(active_actor_id="pc_001"),
+            ),
+        )
+    assert _recent_actor_ids(repo, campaign.id) == ["npc_001", "npc_002"]
+    assert _recent_actor_ids(repo, campaign.id, limit=1) == ["npc_001"]
+
+
+def test_budget_mode_excludes_other_context_modes() -> None:
+    snapshot = SettingsSnapshot()
+    with pytest.raises(ValueError, match="budget_enabled"):
+        apply_settings_patch(snapshot, {"context.budget_enabled": True})
+    updated, changed = apply_settings_patch(
+        snapshot,
+        {
+            "context.full_context_enabled": False,
+            "context.budget_enabled": True,
+            "context.budget_bytes": 8000,
+        },
+    )
+    assert updated.context.budget_enabled is True
+    assert changed == [
+        "context.full_context_enabled",
+        "context.budget_enabled",
+        "context.budget_bytes",
+    ]
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+pytest.importorskip("cryptography")
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+import backend.services.keyring as keyring_module
+from backend.api.main import LLM_PRELOAD_ENV, create_app
+from backend.services.llm_config import load_llm_config, set_current_profile
+
+
+def _profile(model: str) -> Dict[str, Any]:
+    return {
+        "base_url": "http://127.0.0.1:9/v1",
+        "model": model,
+        "temperature": 0.2,
+        "api_key_ref": "test_key",
+    }
+
+
+def _write_config(path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    config = {
+        "current_profile": "a",
+        "profiles": {"a": _profile("model-a"), "b": _profile("model-b")},
+    }
+    path.write_text(json.dumps(config), encoding="utf-8")
+
+
+def _scripted_prompts(monkeypatch: pytest.MonkeyPatch, answers: Dict[str, str]) -> List[str]:
+    asked: List[str] = []
+
+    def prompt(message: str) -> str:
+        asked.append(message)
+        return next(value for key, value in answers.items() if key in message)
+
+    monkeypatch.setattr(keyring_module, "_prompt_secret", prompt)
+    monkeypatch.setattr(keyring_module, "_cached_master_key", None)
+    monkeypatch.setattr(keyring_module, "KDF_ITERATIONS", 1_000)
+    monkeypatch.setattr(keyring_module, "_decrypted_keys", {})
+    return asked
+
+
+def _count_decrypts(monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    decrypted: List[str] = []
+    original = keyring_module._decrypt_value
+
+    def counting(master_key: bytes, entry: Dict[str, Any], key_ref: str) -> str:
+        decrypted.append(key_ref)
+        return original(master_key, entry, key_ref)
+
+    monkeypatch.setattr(keyring_module, "_decrypt_value", counting)
+    return decrypted
+
+
+def test_api_key_is_decrypted_once_per_keyring_version(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "keyring.json"
+    asked = _scripted_prompts(
+        monkeypatch, {"API key": "sk-first", "passphrase": "correct horse"}
+    )
+    decrypted = _count_decrypts(monkeypatch)
+
+    assert keyring_module.get_api_key("test_key", path) == "sk-first"
+    assert keyring_module.get_api_key("test_key", path) == "sk-first"
+    assert keyring_module.get_api_key("test_key", path) == "sk-first"
+    assert decrypted == ["test_key"]
+    assert len(asked) == 2
+
+    # Writing another key invalidates the cached entries for this keyring.
+    keyring_module.ensure_key_exists("other_key", path)
+    assert keyring_module.get_api_key("test_key", path) == "sk-first"
+    assert decrypted == ["test_key", "test_key"]
+
+    # So does a write by anything else, even one that keeps the mtime.
+    data = json.loads(path.read_text(encoding="utf-8"))
+    del data["keys"]["other_key"]
+    stat = path.stat()
+    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert keyring_module.get_api_key("test_key", path) == "sk-first"
+    assert decrypted == ["test_key"] * 3
+
+
+def test_wrong_passphrase_is_not_kept(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "keyring.json"
+    _scripted_prompts(monkeypatch, {"API key": "sk-first", "passphrase": "right"})
+    keyring_module.ensure_key_exists("test_key", path)
+    monkeypatch.setattr(keyring_module, "_cached_master_key", None)
+
+    asked = _scripted_prompts(monkeypatch, {"passphrase": "wrong"})
+    with pytest.raises(ValueError, match="passphrase invalid"):
+        keyring_module.get_api_key("test_key", path)
+    _scripted_prompts(monkeypatch, {"passphrase": "right"})
+    assert keyring_module.get_api_key("test_key", path) == "sk-first"
+    assert len(asked) == 1
+
+
+def test_llm_config_is_parsed_once_per_file_version(tmp_path: Path) -> None:
+    path = tmp_path / "llm_config.json"
+    _write_config(path)
+
+    config = load_llm_config(path)
+    config["profiles"].clear()
+    assert load_llm_config(path)["profiles"]["a"]["model"] == "model-a"
+
+    # Same size and mtime: served from the cache without reading the file.
+    stat = path.stat()
+    path.write_text(path.read_text(encoding="utf-8").replace("model-a", "model-x"))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert load_llm_config(path)["profiles"]["a"]["model"] == "model-a"
+
+    set_current_profile("b", path)
+    reloaded = load_llm_config(path)
+    assert reloaded["current_profile"] == "b"
+    assert reloaded["profiles"]["a"]["model"] == "model-x"
+
+
+def test_app_startup_preloads_llm_credentials(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    asked = _scripted_prompts(
+        monkeypatch, {"API key": "sk-startup", "passphrase": "correct horse"}
+    )
+    _write_config(tmp_path / "storage" / "config" / "llm_config.json")
+
+    app = create_app()
+    with TestClient(app):
+        assert len(asked) == 2
+        service = app.state.services.turn_service()
+        assert service.llm.config.api_key == "sk-startup"
+        assert service.llm.config.model == "model-a"
+    assert len(asked) == 2
+
+    monkeypatch.setenv(LLM_PRELOAD_ENV, "0")
+    app = create_app()
+    with TestClient(app):
+        assert not app.state.services._turn_services
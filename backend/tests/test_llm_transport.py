@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from backend.app.character_fact_llm_adapter import (
+    CharacterFactLLMAdapter,
+    CharacterFactLLMAdapterConfig,
+)
+from backend.infra.llm_client import LLMClient, LLMConfig
+from backend.infra.llm_transport import (
+    LLMTransport,
+    LLMTransportError,
+    LLMTransportSettings,
+)
+
+
+class _StubLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.guard = threading.Lock()
+        self.connections: set = set()
+        self.requests: List[Dict[str, Any]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.delay_sec = 0.0
+        self.status = 200
+        self.content: str = json.dumps(
+            {"assistant_text": "ok", "dialog_type": "scene_description", "tool_calls": []}
+        )
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: _StubLLMServer
+
+    def do_POST(self) -> None:
+        server = self.server
+        length = int(self.headers.get("Content-Length", "0"))
+        payload = json.loads(self.rfile.read(length))
+        with server.guard:
+            server.connections.add(self.client_address)
+            server.requests.append(payload)
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            if server.delay_sec:
+                time.sleep(server.delay_sec)
+        finally:
+            # Counted before the reply is written: once the client has the
+            # body it may release its slot before this thread runs again.
+            with server.guard:
+                server.in_flight -= 1
+        if payload.get("stream"):
+            body = _sse_body(server.content)
+            content_type = "text/event-stream"
+        else:
+            body = json.dumps(
+                {"choices": [{"message": {"content": server.content}}]}
+            ).encode("utf-8")
+            content_type = "application/json"
+        self.send_response(server.status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        return None
+
+
+def _sse_body(content: str) -> bytes:
+    lines = [": keep-alive"]
+    for index in range(0, len(content), 5):
+        chunk = {"choices": [{"delta": {"content": content[index : index + 5]}}]}
+        lines.append(f"data: {json.dumps(chunk)}")
+    lines.append("data: [DONE]")
+    return ("\n\n".join(lines) + "\n\n").encode("utf-8")
+
+
+@pytest.fixture
+def stub_server() -> Iterator[_StubLLMServer]:
+    server = _StubLLMServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _client(server: _StubLLMServer, transport: LLMTransport, timeout_sec: int = 5) -> LLMClient:
+    config = LLMConfig(
+        base_url=server.base_url,
+        api_key="test-key",
+        model="stub-model",
+        temperature=0.2,
+        timeout_sec=timeout_sec,
+    )
+    return LLMClient(config, transport=transport)
+
+
+def test_sync_generate_reuses_one_pooled_connection(stub_server: _StubLLMServer) -> None:
+    transport = LLMTransport()
+    client = _client(stub_server, transport)
+    try:
+        outputs = [client.generate("system", f"input {index}", None) for index in range(5)]
+    finally:
+        transport.close()
+
+    assert all(output["assistant_text"] == "ok" for output in outputs)
+    assert len(stub_server.requests) == 5
+    assert len(stub_server.connections) == 1
+    assert stub_server.requests[0]["messages"][-1] == {"role": "user", "content": "input 0"}
+
+
+def test_async_generate_respects_profile_concurrency(stub_server: _StubLLMServer) -> None:
+    stub_server.delay_sec = 0.05
+    transport = LLMTransport(LLMTransportSettings(max_concurrency=2))
+    client = _client(stub_server, transport)
+
+    async def run() -> List[Dict[str, Any]]:
+        try:
+            return await asyncio.gather(
+                *(client.agenerate("system", f"input {index}", "retry") for index in range(6))
+            )
+        finally:
+            await transport.aclose()
+
+    outputs = asyncio.run(run())
+    assert [output["dialog_type"] for output in outputs] == ["scene_description"] * 6
+    assert len(stub_server.requests) == 6
+    assert stub_server.max_in_flight <= 2
+    assert len(stub_server.connections) <= 2
+    assert stub_server.requests[0]["messages"][1] == {"role": "system", "content": "retry"}
+
+
+def test_concurrency_limit_is_shared_by_threads_and_event_loops(
+    stub_server: _StubLLMServer,
+) -> None:
+    stub_server.delay_sec = 0.05
+    transport = LLMTransport(LLMTransportSettings(max_concurrency=2))
+    client = _client(stub_server, transport)
+    errors: List[BaseException] = []
+
+    def sync_calls() -> None:
+        try:
+            for index in range(2):
+                client.generate("system", f"sync {index}", None)
+        except BaseException as exc:
+            errors.append(exc)
+
+    def async_calls() -> None:
+        async def run() -> None:
+            await asyncio.gather(
+                *(client.agenerate("system", f"async {index}", None) for index in range(3))
+            )
+
+        try:
+            asyncio.run(run())
+        except BaseException as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=sync_calls) for _ in range(2)]
+    threads += [threading.Thread(target=async_calls) for _ in range(2)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+    finally:
+        transport.close()
+
+    assert errors == []
+    assert len(stub_server.requests) == 10
+    assert stub_server.max_in_flight <= 2
+    assert transport.slots.in_use == 0
+
+
+def test_transport_surfaces_timeouts_and_http_errors(stub_server: _StubLLMServer) -> None:
+    transport = LLMTransport()
+    url = f"{stub_server.base_url}/v1/chat/completions"
+    try:
+        stub_server.delay_sec = 0.5
+        with pytest.raises(LLMTransportError, match="timed out"):
+            transport.post_json(url, {}, api_key="k", timeout=0.1)
+
+        stub_server.delay_sec = 0.0
+        stub_server.status = 503
+        with pytest.raises(LLMTransportError) as excinfo:
+            transport.post_json(url, {}, api_key="k", timeout=5)
+        assert excinfo.value.status_code == 503
+    finally:
+        transport.close()
+
+
+def test_character_adapter_async_drafts(stub_server: _StubLLMServer) -> None:
+    stub_server.content = json.dumps({"items": [{"name": "Ava"}, "bad"]})
+    transport = LLMTransport()
+    adapter = CharacterFactLLMAdapter(
+        CharacterFactLLMAdapterConfig(
+            base_url=stub_server.base_url,
+            api_key="test-key",
+            model="stub-model",
+            temperature=0.2,
+            timeout_sec=5,
+        ),
+        transport=transport,
+    )
+
+    async def run() -> Any:
+        try:
+            return await adapter.agenerate_drafts(
+                system_prompt="system", user_payload={"count": 1}
+            )
+        finally:
+            await transport.aclose()
+
+    result = asyncio.run(run())
+    assert result.drafts == [{"name": "Ava"}]
+    assert len(result.warnings) == 1
+    assert json.loads(stub_server.requests[0]["messages"][1]["content"]) == {"count": 1}
+
+
+def test_astream_yields_assistant_text_deltas_then_output(
+    stub_server: _StubLLMServer,
+) -> None:
+    stub_server.content = json.dumps(
+        {"assistant_text": "Rain taps the \"old\" roof.", "tool_calls": [{"tool": "move"}]}
+    )
+    transport = LLMTransport()
+    client = _client(stub_server, transport)
+
+    async def run() -> List[Any]:
+        try:
+            return [item async for item in client.astream("system", "input", None)]
+        finally:
+            await transport.aclose()
+
+    items = asyncio.run(run())
+    deltas = [payload for kind, payload in items if kind == "delta"]
+    assert len(deltas) > 1
+    assert "".join(deltas) == 'Rain taps the "old" roof.'
+    assert items[-1] == (
+        "output",
+        {
+            "assistant_text": 'Rain taps the "old" roof.',
+            "dialog_type": "",
+            "tool_calls": [{"tool": "move"}],
+        },
+    )
+    assert stub_server.requests[0]["stream"] is True
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+from typing import List
+
+import pytest
+
+import backend.app.prompt_fragments as prompt_fragments_module
+from backend.app.prompt_fragments import PromptFragmentCache, encode_object
+from backend.app.turn_service import _build_system_prompt
+from backend.domain.models import (
+    ActorState,
+    Campaign,
+    Goal,
+    MapArea,
+    MapData,
+    Milestone,
+    Selected,
+    SettingsSnapshot,
+)
+
+
+def _campaign(*, compress: bool = False) -> Campaign:
+    areas = {
+        f"area_{index:03d}": MapArea(
+            id=f"area_{index:03d}",
+            name=f"Area {index} «北»",
+            description="Wind-worn stones and a \"quiet\" shrine.",
+            reachable_area_ids=[f"area_{(index % 30) + 1:03d}"],
+        )
+        for index in range(1, 31)
+    }
+    actors = {
+        f"pc_{index:03d}": ActorState(
+            position="area_001",
+            hp=10,
+            character_state="alive",
+            inventory={"torch": 1},
+            meta={"name": f"PC {index}", "profile": {"name": f"Profile {index}"}},
+        )
+        for index in range(1, 9)
+    }
+    campaign = Campaign(
+        id="camp_0001",
+        selected=Selected(
+            world_id="world_001",
+            map_id="map_001",
+            party_character_ids=sorted(actors),
+            active_actor_id="pc_001",
+        ),
+        settings_snapshot=SettingsSnapshot(),
+        goal=Goal(text="Find the shrine.", status="active"),
+        milestone=Milestone(current="intro", last_advanced_turn=0),
+        map=MapData(areas=areas, connections=[]),
+        actors=actors,
+    )
+    campaign.settings_snapshot.context.compress_enabled = compress
+    campaign.settings_snapshot.context.full_context_enabled = not compress
+    return campaign
+
+
+def _assert_canonical(context: str) -> None:
+    body = context[len("Context: "):]
+    assert body == json.dumps(json.loads(body), ensure_ascii=False)
+
+
+def test_fragment_assembly_matches_json_dumps() -> None:
+    payload = {"a": [1, 2.5, None], "b": {"c": "ü\n"}, "d": True}
+    cache = PromptFragmentCache()
+    nested = {"x": cache.model_fragment("model", Goal(text="g", status="active"))}
+    assert encode_object(payload) == json.dumps(payload, ensure_ascii=False)
+    assert encode_object(nested) == json.dumps(
+        {"x": Goal(text="g", status="active").model_dump()}, ensure_ascii=False
+    )
+
+    for compress in (False, True):
+        _assert_canonical(_build_system_prompt(_campaign(compress=compress), "pc_001").context)
+
+
+def test_fragments_reused_until_section_changes() -> None:
+    cache = PromptFragmentCache()
+    campaign = _campaign()
+    first = cache.model_fragment("model", campaign.map)
+    assert cache.model_fragment("model", _campaign().map) is first
+    assert cache.stats()["hits"] == 1
+
+    campaign.map.areas["area_001"].description = "Changed."
+    cache.forget(campaign.map)
+    changed = cache.model_fragment("model", campaign.map)
+    assert changed != first
+    assert json.loads(changed)["areas"]["area_001"]["description"] == "Changed."
+
+
+def test_fragment_hash_is_memoized_per_object(monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = PromptFragmentCache()
+    goal = Goal(text="g", status="active")
+    dumps: List[str] = []
+    original = prompt_fragments_module._model_json
+
+    def counting_model_json(model: object) -> str:
+        dumps.append(type(model).__name__)
+        return original(model)
+
+    monkeypatch.setattr(prompt_fragments_module, "_model_json", counting_model_json)
+    first = cache.model_fragment("model", goal)
+    assert cache.model_fragment("model", goal) is first
+    assert dumps == ["Goal"]
+
+    # An in-place change is only picked up once it is reported.
+    goal.text = "h"
+    assert cache.model_fragment("model", goal) is first
+    cache.forget(goal)
+    assert json.loads(cache.model_fragment("model", goal))["text"] == "h"
+    assert dumps == ["Goal", "Goal"]
+
+
+def test_system_prompt_reflects_mutated_actor_only() -> None:
+    before = json.loads(_build_system_prompt(_campaign(), "pc_001").context[len("Context: "):])
+    campaign = _campaign()
+    campaign.actors["pc_002"].hp = 3
+    campaign.actors["pc_002"].inventory["herb"] = 2
+    after_prompt = _build_system_prompt(campaign, "pc_001")
+    _assert_canonical(after_prompt.context)
+    after = json.loads(after_prompt.context[len("Context: "):])
+
+    assert after["actors"]["pc_002"]["hp"] == 3
+    assert after["actors"]["pc_002"]["inventory"] == {"torch": 1, "herb": 2}
+    assert "profile" not in after["actors"]["pc_002"]["meta"]
+    assert after["actors"]["pc_003"] == before["actors"]["pc_003"]
+    assert after["map"] == before["map"]
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import Any, Dict, List
 
@@ -188,11 +187,13 @@ def test_sample_playthrough_v0_persists_state_without_drift(
     assert final_actor.inventory == {"torch": 1, "herb": 2}
 
     turn_log_path = tmp_path / "storage" / "campaigns" / campaign_id / "turn_log.jsonl"
-    rows = [
-        json.loads(line)
+    raw_lines = [
+        line
         for line in turn_log_path.read_text(encoding="utf-8").splitlines()
         if line.strip()
     ]
+    assert len(raw_lines) == 10
+    rows = list(repo.iter_turn_log_rows(campaign_id))
     assert len(rows) == 10
     last_summary = rows[-1]["state_summary"]
     assert last_summary["objective"] == "Retrieve supplies and stay alive."
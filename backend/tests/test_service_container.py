@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+import backend.api.dependencies as dependencies_module
+import backend.app.turn_service as turn_service_module
+from backend.api.main import create_app
+from backend.domain.models import (
+    ActorState,
+    Campaign,
+    Goal,
+    MapArea,
+    MapData,
+    Milestone,
+    Selected,
+    SettingsSnapshot,
+)
+from backend.infra.campaign_journal import JOURNAL_FILENAME
+from backend.infra.file_repo import CAMPAIGN_DURABILITY_ENV, FileRepo
+
+
+class _CountingLLM:
+    built: List["_CountingLLM"] = []
+
+    def __init__(self) -> None:
+        try:
+            asyncio.get_running_loop()
+            self.on_event_loop = True
+        except RuntimeError:
+            self.on_event_loop = False
+        _CountingLLM.built.append(self)
+
+    def generate(self, system_prompt: str, user_input: str, debug_append: Any) -> Dict[str, Any]:
+        return {
+            "assistant_text": "Nothing happens.",
+            "dialog_type": "scene_description",
+            "tool_calls": [],
+        }
+
+
+def _setup(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(turn_service_module, "LLMClient", _CountingLLM)
+    monkeypatch.setattr(_CountingLLM, "built", [])
+    FileRepo(tmp_path / "storage").create_campaign(
+        Campaign(
+            id="camp_0001",
+            selected=Selected(
+                world_id="world_001",
+                map_id="map_001",
+                party_character_ids=["pc_001"],
+                active_actor_id="pc_001",
+            ),
+            settings_snapshot=SettingsSnapshot(),
+            goal=Goal(text="Stay alive.", status="active"),
+            milestone=Milestone(current="intro", last_advanced_turn=0),
+            map=MapData(
+                areas={"area_001": MapArea(id="area_001", name="Start")},
+                connections=[],
+            ),
+            actors={"pc_001": ActorState(position="area_001", hp=10, meta={})},
+        )
+    )
+
+
+def test_routes_share_one_repo_and_turn_service(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _setup(tmp_path, monkeypatch)
+    built_repos: List[Path] = []
+    create_repo = dependencies_module.create_repo
+
+    def counting_create_repo(storage_root: Path, **kwargs: Any) -> FileRepo:
+        built_repos.append(storage_root)
+        return create_repo(storage_root, **kwargs)
+
+    monkeypatch.setattr(dependencies_module, "create_repo", counting_create_repo)
+    app = create_app()
+    client = TestClient(app)
+
+    for _ in range(3):
+        response = client.post(
+            "/api/v1/chat/turn",
+            json={"campaign_id": "camp_0001", "user_input": "wait"},
+        )
+        assert response.status_code == 200
+    assert client.get("/api/v1/campaign/status?campaign_id=camp_0001").status_code == 200
+    assert client.get("/api/v1/map/view?campaign_id=camp_0001").status_code == 200
+
+    assert built_repos == [tmp_path / "storage"]
+    assert len(_CountingLLM.built) == 1
+    services = app.state.services
+    assert services.turn_service() is services.turn_service()
+
+
+def test_turn_service_reloads_when_llm_config_changes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _setup(tmp_path, monkeypatch)
+    config_path = tmp_path / "storage" / "config" / "llm_config.json"
+    config_path.parent.mkdir(parents=True)
+    config_path.write_text("{}", encoding="utf-8")
+    app = create_app()
+    client = TestClient(app)
+
+    def turn() -> None:
+        response = client.post(
+            "/api/v1/chat/turn",
+            json={"campaign_id": "camp_0001", "user_input": "wait"},
+        )
+        assert response.status_code == 200
+
+    turn()
+    turn()
+    assert len(_CountingLLM.built) == 1
+
+    stat = config_path.stat()
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    turn()
+    assert len(_CountingLLM.built) == 2
+    assert app.state.services.llm_reloads == 1
+
+    # A new storage root gets its own repo and turn service.
+    other = tmp_path / "other"
+    other.mkdir()
+    _setup(other, monkeypatch)
+    response = client.post(
+        "/api/v1/chat/turn",
+        json={"campaign_id": "camp_0001", "user_input": "wait"},
+    )
+    assert response.status_code == 200
+    assert len(_CountingLLM.built) == 1
+
+
+def test_async_routes_build_the_turn_service_off_the_event_loop(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _setup(tmp_path, monkeypatch)
+    app = create_app()
+    client = TestClient(app)
+    for path in ("/api/v1/chat/turn", "/api/v1/chat/turn/stream"):
+        app.state.services.clear()
+        response = client.post(path, json={"campaign_id": "camp_0001", "user_input": "wait"})
+        assert response.status_code == 200
+    response = client.post(
+        "/api/v1/chat/turns",
+        json={"campaign_id": "camp_0001", "turns": [{"user_input": "wait"}]},
+    )
+    assert response.status_code == 200
+
+    assert len(_CountingLLM.built) == 2
+    assert not any(llm.on_event_loop for llm in _CountingLLM.built)
+
+
+def test_shutdown_checkpoints_the_campaign_journal(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv(CAMPAIGN_DURABILITY_ENV, "group")
+    _setup(tmp_path, monkeypatch)
+    journal_path = tmp_path / "storage" / "campaigns" / JOURNAL_FILENAME
+
+    with TestClient(create_app()) as client:
+        response = client.post(
+            "/api/v1/chat/turn",
+            json={"campaign_id": "camp_0001", "user_input": "wait"},
+        )
+        assert response.status_code == 200
+        assert journal_path.stat().st_size > 0
+    assert journal_path.stat().st_size == 0
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import pytest
+
+import backend.app.turn_service as turn_service_module
+from backend.app.turn_service import TurnService
+from backend.domain.models import (
+    ActorState,
+    Campaign,
+    Goal,
+    MapArea,
+    MapData,
+    Milestone,
+    Selected,
+    SettingsSnapshot,
+)
+from backend.domain.settings import apply_settings_patch
+from backend.infra.file_repo import FileRepo
+
+_CONFLICTING = "We change the rules and stroll into the side room."
+
+
+def _candidate_index(debug_append: Optional[str]) -> int:
+    if not debug_append:
+        return 0
+    payload = json.loads(debug_append.split("Debug: ", 1)[1])
+    candidate = payload.get("candidate")
+    return candidate["index"] if candidate else -1
+
+
+class _CandidateLLM:
+    # First attempt always conflicts; candidate outputs come from `script`,
+    # keyed by candidate index. Candidates in `blocked` wait on `release`.
+    def __init__(self, script: Dict[int, Dict[str, Any]], blocked: tuple = ()) -> None:
+        self.script = script
+        self.blocked = blocked
+        self.release = threading.Event()
+        self.calls: list[int] = []
+        self._guard = threading.Lock()
+
+    def generate(self, system_prompt: str, user_input: str, debug_append: Any) -> Dict[str, Any]:
+        index = _candidate_index(debug_append)
+        with self._guard:
+            self.calls.append(index)
+        if index in self.blocked:
+            self.release.wait(5)
+        if index == 0:
+            return _output(_CONFLICTING, move=True)
+        return dict(self.script[index])
+
+
+def _output(text: str, *, move: bool = False) -> Dict[str, Any]:
+    tool_calls = []
+    if move:
+        tool_calls.append(
+            {
+                "id": "call_001",
+                "tool": "move",
+                "args": {"actor_id": "pc_001", "to_area_id": "area_002"},
+                "reason": "explore",
+            }
+        )
+    return {"assistant_text": text, "dialog_type": "scene_description", "tool_calls": tool_calls}
+
+
+def _setup(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, llm: _CandidateLLM, candidates: int
+) -> tuple[TurnService, FileRepo]:
+    monkeypatch.setattr(turn_service_module, "LLMClient", lambda: llm)
+    repo = FileRepo(tmp_path / "storage")
+    snapshot, _ = apply_settings_patch(
+        SettingsSnapshot(),
+        {
+            "dialog.conflict_text_checks_enabled": True,
+            "dialog.speculative_retry_candidates": candidates,
+        },
+    )
+    repo.create_campaign(
+        Campaign(
+            id="camp_0001",
+            selected=Selected(
+                world_id="world_001",
+                map_id="map_001",
+                party_character_ids=["pc_001"],
+                active_actor_id="pc_001",
+            ),
+            settings_snapshot=snapshot,
+            goal=Goal(text="Goal", status="active"),
+            milestone=Milestone(current="intro", last_advanced_turn=0),
+            map=MapData(
+                areas={
+                    "area_001": MapArea(
+                        id="area_001", name="Start", reachable_area_ids=["area_002"]
+                    ),
+                    "area_002": MapArea(id="area_002", name="Side Room"),
+                },
+                connections=[],
+            ),
+            actors={"pc_001": ActorState(position="area_001", hp=10, meta={})},
+        )
+    )
+    return TurnService(repo), repo
+
+
+def test_first_clean_candidate_commits_without_waiting_for_slow_ones(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    llm = _CandidateLLM(
+        {
+            1: _output(_CONFLICTING, move=True),
+            2: _output("A slow but clean answer."),
+            3: _output("The lantern flickers.", move=True),
+        },
+        blocked=(2,),
+    )
+    service, repo = _setup(tmp_path, monkeypatch, llm, 3)
+    try:
+        response = service.submit_turn("camp_0001", "look around")
+    finally:
+        llm.release.set()
+
+    assert response["narrative_text"] == "The lantern flickers."
+    assert response["conflict_report"]["retries"] == 1
+    assert response["conflict_report"]["conflicts"][0]["type"] == "forbidden_change"
+    assert sorted(llm.calls) == [0, 1, 2, 3]
+    # Candidate 1 was applied and rolled back before candidate 3 moved once.
+    assert repo.get_campaign("camp_0001").actors["pc_001"].position == "area_002"
+    assert response["applied_actions"][0]["result"]["from_area_id"] == "area_001"
+
+
+def test_round_without_clean_candidate_fails_turn(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    llm = _CandidateLLM({1: _output(_CONFLICTING, move=True), 2: _output(_CONFLICTING)})
+    service, repo = _setup(tmp_path, monkeypatch, llm, 2)
+
+    response = service.submit_turn("camp_0001", "look around")
+
+    assert response["narrative_text"] == ""
+    assert response["conflict_report"]["retries"] == 2
+    assert sorted(llm.calls) == [0, 1, 2]
+    assert repo.get_campaign("camp_0001").actors["pc_001"].position == "area_001"
+    assert repo.turn_log_row_count("camp_0001") == 0
+
+
+def test_candidate_that_raises_after_mutating_is_rolled_back(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    llm = _CandidateLLM({1: _output("The lantern flickers.", move=True)})
+    service, repo = _setup(tmp_path, monkeypatch, llm, 2)
+    llm.script[2] = _output("never used")
+    detect_conflicts = turn_service_module.detect_conflicts
+    checks = []
+
+    def failing_detect_conflicts(*args: Any, **kwargs: Any) -> Any:
+        # Call 1 is the loot turn, call 2 the conflicting first attempt and
+        # call 3 the first candidate, after its move was applied.
+        checks.append(len(checks) + 1)
+        if len(checks) == 3:
+            raise OSError("disk full")
+        return detect_conflicts(*args, **kwargs)
+
+    class _LootFirstLLM:
+        def generate(
+            self, system_prompt: str, user_input: str, debug_append: Any
+        ) -> Dict[str, Any]:
+            if user_input == "loot":
+                output = _output("You pick up a torch.")
+                output["tool_calls"] = [
+                    {"id": "call_loot", "tool": "inventory_add", "args": {"item_id": "torch"}}
+                ]
+                return output
+            return llm.generate(system_prompt, user_input, debug_append)
+
+    monkeypatch.setattr(turn_service_module, "detect_conflicts", failing_detect_conflicts)
+    service.llm = _LootFirstLLM()
+
+    responses, error = service.submit_turns(
+        "camp_0001", [("loot", None), ("look around", None)]
+    )
+
+    assert len(responses) == 1
+    assert isinstance(error, OSError)
+    campaign = repo.get_campaign("camp_0001")
+    assert campaign.actors["pc_001"].inventory == {"torch": 1}
+    assert campaign.actors["pc_001"].position == "area_001"
+
+
+def test_async_round_cancels_pending_candidates(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    llm = _CandidateLLM({1: _output("Clean on the first try.")})
+    llm.script[2] = _output("never used")
+    cancelled = []
+
+    class _AsyncLLM:
+        def generate(self, *args: Any) -> Dict[str, Any]:
+            return llm.generate(*args)
+
+        async def agenerate(
+            self, system_prompt: str, user_input: str, debug_append: Any
+        ) -> Dict[str, Any]:
+            if _candidate_index(debug_append) == 2:
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    cancelled.append(2)
+                    raise
+            return llm.generate(system_prompt, user_input, debug_append)
+
+    service, _ = _setup(tmp_path, monkeypatch, llm, 2)
+    service.llm = _AsyncLLM()
+
+    response = asyncio.run(service.asubmit_turn("camp_0001", "look around"))
+
+    assert response["narrative_text"] == "Clean on the first try."
+    assert response["conflict_report"]["retries"] == 1
+    assert cancelled == [2]
+
+
+def test_speculation_disabled_keeps_serial_retries(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    llm = _CandidateLLM({-1: _output("Clean after a serial retry.")})
+    service, _ = _setup(tmp_path, monkeypatch, llm, 0)
+
+    response = service.submit_turn("camp_0001", "look around")
+
+    assert response["narrative_text"] == "Clean after a serial retry."
+    assert llm.calls == [0, -1]
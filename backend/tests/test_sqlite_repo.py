@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+import backend.app.turn_service as turn_service_module
+from backend.api.main import create_app
+from backend.domain.models import (
+    ActorState,
+    AssistantStructured,
+    Campaign,
+    Goal,
+    Milestone,
+    Selected,
+    SettingsSnapshot,
+    StateSummary,
+    TurnLogEntry,
+)
+from backend.infra.campaign_cache import CampaignCache
+from backend.infra.file_repo import FileRepo, StaleCampaignError
+from backend.infra.repo_factory import STORAGE_BACKEND_ENV, create_repo
+from backend.infra.sqlite_repo import SqliteRepo
+
+
+def _campaign(campaign_id: str = "camp_0001") -> Campaign:
+    return Campaign(
+        id=campaign_id,
+        selected=Selected(
+            world_id="world_001",
+            map_id="map_001",
+            party_character_ids=["pc_001"],
+            active_actor_id="pc_001",
+        ),
+        settings_snapshot=SettingsSnapshot(),
+        goal=Goal(text="Goal", status="active"),
+        milestone=Milestone(current="intro", last_advanced_turn=0),
+        actors={"pc_001": ActorState(position=None, meta={})},
+    )
+
+
+def _entry(turn_id: str) -> TurnLogEntry:
+    return TurnLogEntry(
+        turn_id=turn_id,
+        timestamp="2026-03-03T00:00:00+00:00",
+        user_input=f"input {turn_id}",
+        dialog_type="scene_description",
+        dialog_type_source="model",
+        settings_revision=0,
+        assistant_text=f"text {turn_id}",
+        assistant_structured=AssistantStructured(tool_calls=[]),
+        state_summary=StateSummary(active_actor_id="pc_001"),
+    )
+
+
+def _append_turns(repo: FileRepo, campaign_id: str, count: int) -> None:
+    for _ in range(count):
+        repo.append_turn_log(campaign_id, _entry(repo.next_turn_id(campaign_id)))
+
+
+def test_sqlite_repo_uses_wal_and_indexed_tables(tmp_path: Path) -> None:
+    repo = SqliteRepo(tmp_path / "storage", campaign_cache=CampaignCache())
+    repo.create_campaign(_campaign())
+
+    conn = sqlite3.connect(str(repo.db_path))
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        indexes = {row[1] for row in conn.execute("SELECT * FROM sqlite_master WHERE type='index'")}
+    finally:
+        conn.close()
+    assert {"campaigns_seq", "turns_turn_id"} <= indexes
+    assert not (tmp_path / "storage" / "campaigns" / "camp_0001" / "campaign.json").exists()
+
+
+def test_sqlite_repo_campaign_roundtrip_and_listing(tmp_path: Path) -> None:
+    repo = SqliteRepo(tmp_path / "storage", campaign_cache=CampaignCache())
+    assert repo.next_campaign_id() == "camp_0001"
+    repo.create_campaign(_campaign("camp_0001"))
+    repo.create_campaign(_campaign("camp_0007"))
+    assert repo.next_campaign_id() == "camp_0008"
+
+    with pytest.raises(FileExistsError):
+        repo.create_campaign(_campaign("camp_0001"))
+    with pytest.raises(FileNotFoundError):
+        repo.get_campaign("camp_0002")
+
+    campaign = repo.get_campaign("camp_0001")
+    campaign.goal.text = "Updated"
+    repo.update_active_actor(campaign, "pc_001")
+    assert repo.get_campaign("camp_0001").goal.text == "Updated"
+    assert repo.campaign_exists("camp_0007")
+    assert [summary.id for summary in repo.list_campaigns()] == ["camp_0001", "camp_0007"]
+    assert repo.list_campaigns()[0].world_id == "world_001"
+
+
+def test_sqlite_repo_turn_log_queries(tmp_path: Path) -> None:
+    repo = SqliteRepo(tmp_path / "storage", campaign_cache=CampaignCache())
+    repo.create_campaign(_campaign())
+    assert repo.next_turn_id("camp_0001") == "turn_0001"
+
+    _append_turns(repo, "camp_0001", 300)
+
+    assert repo.turn_log_row_count("camp_0001") == 300
+    assert repo.next_turn_id("camp_0001") == "turn_0301"
+    assert repo.get_turn_log_row("camp_0001", "turn_0123")["assistant_text"] == "text turn_0123"
+    assert repo.get_turn_log_row("camp_0001", "turn_9999") is None
+    recent = repo.read_recent_turn_log_rows("camp_0001", limit=3)
+    assert [row["turn_id"] for row in recent] == ["turn_0300", "turn_0299", "turn_0298"]
+    forward = [row["turn_id"] for row in repo.iter_turn_log_rows("camp_0001")]
+    assert forward == [f"turn_{index:04d}" for index in range(1, 301)]
+    backward = [row["turn_id"] for row in repo.iter_turn_log_rows("camp_0001", reverse=True)]
+    assert backward == list(reversed(forward))
+
+    # No turn_log.jsonl helpers to fall back on; the turns table is the log.
+    assert not isinstance(repo, FileRepo)
+    assert not hasattr(repo, "convert_turn_log")
+    assert not (tmp_path / "storage" / "campaigns" / "camp_0001" / "turn_log.jsonl").exists()
+
+
+def test_sqlite_repo_keeps_shared_artifacts_on_disk(tmp_path: Path) -> None:
+    storage_root = tmp_path / "storage"
+    repo = SqliteRepo(storage_root, campaign_cache=CampaignCache())
+    repo.create_campaign(_campaign())
+    _append_turns(repo, "camp_0001", 3)
+    campaign = repo.get_campaign("camp_0001")
+
+    checkpoint = repo.save_checkpoint(campaign, "turn_0003", keep=2)
+    assert checkpoint.row_count == 3
+    assert [item.row_count for item in repo.list_checkpoints("camp_0001")] == [3]
+    assert repo.load_checkpoint("camp_0001", checkpoint).id == "camp_0001"
+    assert repo.drop_checkpoints_after("camp_0001", 2) == 1
+
+    world = repo.get_or_create_world_stub("world_001")
+    assert FileRepo(storage_root).get_world("world_001") == world
+    assert repo.turn_lock_path("camp_0001").parent == storage_root / "campaigns" / "camp_0001"
+    path = repo.save_character_fact_draft("camp_0001", "npc_001", {"character_id": "npc_001"})
+    assert path.is_relative_to(storage_root / "campaigns" / "camp_0001")
+    assert repo.character_fact_id_exists("camp_0001", "npc_001")
+
+
+def test_sqlite_repo_save_is_a_revision_cas(tmp_path: Path) -> None:
+    repo = SqliteRepo(tmp_path / "storage", campaign_cache=CampaignCache())
+    repo.create_campaign(_campaign())
+    first = repo.get_campaign("camp_0001")
+    second = SqliteRepo(tmp_path / "storage", campaign_cache=CampaignCache()).get_campaign(
+        "camp_0001"
+    )
+    repo.save_campaign(first)
+    assert first.revision == 2
+
+    with pytest.raises(StaleCampaignError):
+        repo.save_campaign(second)
+    assert repo.get_campaign("camp_0001").revision == 2
+
+
+def test_sqlite_repos_on_one_root_keep_separate_caches(tmp_path: Path) -> None:
+    storage_root = tmp_path / "storage"
+    first = SqliteRepo(storage_root, db_path=tmp_path / "first.sqlite3")
+    second = SqliteRepo(storage_root, db_path=tmp_path / "second.sqlite3")
+    assert first.campaign_cache is not second.campaign_cache
+
+    first.create_campaign(_campaign())
+    second.create_campaign(_campaign())
+    campaign = first.get_campaign("camp_0001")
+    campaign.goal.text = "Only in first"
+    first.save_campaign(campaign)
+    second_campaign = second.get_campaign("camp_0001")
+    second_campaign.goal.text = "Only in second"
+    second.save_campaign(second_campaign)
+
+    assert first.get_campaign("camp_0001").goal.text == "Only in first"
+    assert second.get_campaign("camp_0001").goal.text == "Only in second"
+
+
+def test_file_repo_get_turn_log_row_uses_index(tmp_path: Path) -> None:
+    repo = FileRepo(tmp_path / "storage", campaign_cache=CampaignCache())
+    repo.create_campaign(_campaign())
+    _append_turns(repo, "camp_0001", 5)
+
+    assert repo.get_turn_log_row("camp_0001", "turn_0004")["user_input"] == "input turn_0004"
+    assert repo.get_turn_log_row("camp_0001", "turn_0006") is None
+
+
+def test_import_campaign_copies_file_storage(tmp_path: Path) -> None:
+    storage_root = tmp_path / "storage"
+    source = FileRepo(storage_root, campaign_cache=CampaignCache())
+    source.create_campaign(_campaign())
+    _append_turns(source, "camp_0001", 4)
+
+    target = SqliteRepo(storage_root, campaign_cache=CampaignCache())
+    assert target.import_campaign(source, "camp_0001") == 4
+    assert target.get_campaign("camp_0001").selected.world_id == "world_001"
+    assert target.next_turn_id("camp_0001") == "turn_0005"
+    assert target.get_turn_log_row("camp_0001", "turn_0002") == source.get_turn_log_row(
+        "camp_0001", "turn_0002"
+    )
+
+    with pytest.raises(FileExistsError):
+        target.import_campaign(source, "camp_0001")
+    _append_turns(source, "camp_0001", 1)
+    assert target.import_campaign(source, "camp_0001", replace=True) == 5
+
+
+class _StubLLM:
+    def generate(self, system_prompt: str, user_input: str, debug_append: Any) -> Dict[str, Any]:
+        return {
+            "assistant_text": f"echo {user_input}",
+            "dialog_type": "scene_description",
+            "tool_calls": [],
+        }
+
+
+def test_api_runs_on_sqlite_backend(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv(STORAGE_BACKEND_ENV, "sqlite")
+    monkeypatch.setattr(turn_service_module, "LLMClient", _StubLLM)
+    assert isinstance(create_repo(tmp_path / "storage"), SqliteRepo)
+    client = TestClient(create_app())
+
+    campaign_id = client.post("/api/v1/campaign/create", json={}).json()["campaign_id"]
+    for text in ("hello", "again"):
+        resp = client.post(
+            "/api/v1/chat/turn", json={"campaign_id": campaign_id, "user_input": text}
+        )
+        assert resp.status_code == 200
+
+    listed = client.get("/api/v1/campaign/list").json()["campaigns"]
+    assert [item["id"] for item in listed] == [campaign_id]
+    turns = client.get(f"/api/v1/campaign/{campaign_id}/turns").json()["turns"]
+    assert [turn["turn_id"] for turn in turns] == ["turn_0001", "turn_0002"]
+    assert (tmp_path / "storage" / "ai_trpg.sqlite3").exists()
+    assert not (tmp_path / "storage" / "campaigns" / campaign_id / "turn_log.jsonl").exists()
+
+
+def test_create_repo_rejects_unknown_backend(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        create_repo(tmp_path / "storage", backend="postgres")
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from pathlib import Path
 from typing import Any, Dict
 
@@ -94,3 +95,40 @@ def test_chat_turn_returns_409_when_campaign_turn_is_busy(
     finally:
         turn_service_module._CAMPAIGN_TURN_LOCKS.release(lock)
 
+
+class _StubAsyncLLM:
+    def __init__(self) -> None:
+        self.awaited = 0
+
+    def generate(self, *args: Any) -> Dict[str, Any]:
+        raise AssertionError("async turns must not fall back to generate")
+
+    async def agenerate(
+        self,
+        system_prompt: str,
+        user_input: str,
+        debug_append: Any,
+    ) -> Dict[str, Any]:
+        self.awaited += 1
+        return {
+            "assistant_text": "Async turn.",
+            "dialog_type": "scene_description",
+            "tool_calls": [],
+        }
+
+
+def test_async_turn_awaits_llm_and_releases_lock(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _create_campaign(tmp_path, "camp_lock_async")
+    monkeypatch.setattr(turn_service_module, "LLMClient", _StubAsyncLLM)
+    service = turn_service_module.TurnService(FileRepo(tmp_path / "storage"))
+
+    response = asyncio.run(service.asubmit_turn("camp_lock_async", "hello"))
+
+    assert response["narrative_text"] == "Async turn."
+    assert service.llm.awaited == 1
+    assert FileRepo(tmp_path / "storage").next_turn_id("camp_lock_async") == "turn_0002"
+    lock = turn_service_module._CAMPAIGN_TURN_LOCKS.try_acquire("camp_lock_async")
+    assert lock is not None
+    turn_service_module._CAMPAIGN_TURN_LOCKS.release(lock)
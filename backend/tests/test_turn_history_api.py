@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Optional
+
+import pytest
+
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+import backend.infra.file_repo as file_repo_module
+from backend.api.main import create_app
+from backend.app.turn_history_service import get_turn_history_page, iter_turn_history
+from backend.domain.models import (
+    ActorState,
+    AssistantStructured,
+    Campaign,
+    Goal,
+    Milestone,
+    Selected,
+    SettingsSnapshot,
+    StateSummary,
+    TurnLogEntry,
+)
+from backend.infra.file_repo import FileRepo
+from backend.infra.repository import Repository
+from backend.infra.sqlite_repo import SqliteRepo
+
+
+def _client(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> TestClient:
+    monkeypatch.chdir(tmp_path)
+    return TestClient(create_app())
+
+
+def _create_campaign_with_turns(
+    tmp_path: Path, turn_count: int, repo: Optional[Repository] = None
+) -> str:
+    repo = repo or FileRepo(tmp_path / "storage")
+    campaign = Campaign(
+        id="camp_0001",
+        selected=Selected(
+            world_id="world_001",
+            map_id="map_001",
+            party_character_ids=["pc_001"],
+            active_actor_id="pc_001",
+        ),
+        settings_snapshot=SettingsSnapshot(),
+        goal=Goal(text="Goal", status="active"),
+        milestone=Milestone(current="intro", last_advanced_turn=0),
+        actors={"pc_001": ActorState(position=None, meta={})},
+    )
+    repo.create_campaign(campaign)
+    for _ in range(turn_count):
+        turn_id = repo.next_turn_id(campaign.id)
+        repo.append_turn_log(
+            campaign.id,
+            TurnLogEntry(
+                turn_id=turn_id,
+                timestamp="2026-03-03T00:00:00+00:00",
+                user_input=f"input {turn_id}",
+                dialog_type="scene_description",
+                dialog_type_source="model",
+                settings_revision=0,
+                assistant_text=f"text {turn_id}",
+                assistant_structured=AssistantStructured(tool_calls=[]),
+                state_summary=StateSummary(active_actor_id="pc_001"),
+            ),
+        )
+    return campaign.id
+
+
+def test_turns_endpoint_pages_backwards_from_latest(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    campaign_id = _create_campaign_with_turns(tmp_path, 5)
+    client = _client(tmp_path, monkeypatch)
+
+    first = client.get(f"/api/v1/campaign/{campaign_id}/turns", params={"limit": 2})
+    assert first.status_code == 200
+    body = first.json()
+    assert [row["turn_id"] for row in body["turns"]] == ["turn_0004", "turn_0005"]
+    assert body["has_more"] is True
+    assert body["next_before"] == "turn_0004"
+
+    second = client.get(
+        f"/api/v1/campaign/{campaign_id}/turns",
+        params={"limit": 10, "before": body["next_before"]},
+    ).json()
+    assert [row["turn_id"] for row in second["turns"]] == [
+        "turn_0001",
+        "turn_0002",
+        "turn_0003",
+    ]
+    assert second["has_more"] is False
+
+
+def test_turns_endpoint_pages_forward_with_projection(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    campaign_id = _create_campaign_with_turns(tmp_path, 5)
+    client = _client(tmp_path, monkeypatch)
+
+    response = client.get(
+        f"/api/v1/campaign/{campaign_id}/turns",
+        params={"after": "turn_0002", "limit": 2, "fields": "assistant_text,applied_actions"},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["turns"] == [
+        {"turn_id": "turn_0003", "assistant_text": "text turn_0003", "applied_actions": []},
+        {"turn_id": "turn_0004", "assistant_text": "text turn_0004", "applied_actions": []},
+    ]
+    assert body["has_more"] is True
+    assert body["next_after"] == "turn_0004"
+
+
+def test_turns_endpoint_streams_ndjson_export(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    campaign_id = _create_campaign_with_turns(tmp_path, 3)
+    client = _client(tmp_path, monkeypatch)
+
+    response = client.get(
+        f"/api/v1/campaign/{campaign_id}/turns",
+        params={"format": "ndjson", "fields": "user_input"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines() if line]
+    assert rows == [
+        {"turn_id": "turn_0001", "user_input": "input turn_0001"},
+        {"turn_id": "turn_0002", "user_input": "input turn_0002"},
+        {"turn_id": "turn_0003", "user_input": "input turn_0003"},
+    ]
+
+
+def test_turns_endpoint_rejects_unknown_fields_and_missing_campaign(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    campaign_id = _create_campaign_with_turns(tmp_path, 1)
+    client = _client(tmp_path, monkeypatch)
+
+    bad_fields = client.get(
+        f"/api/v1/campaign/{campaign_id}/turns", params={"fields": "secret"}
+    )
+    assert bad_fields.status_code == 400
+
+    missing = client.get("/api/v1/campaign/camp_9999/turns")
+    assert missing.status_code == 404
+
+
+@pytest.mark.parametrize("backend", ["file", "sqlite"])
+def test_turn_history_cursors_bound_both_directions(tmp_path: Path, backend: str) -> None:
+    storage_root = tmp_path / "storage"
+    repo = FileRepo(storage_root) if backend == "file" else SqliteRepo(storage_root)
+    campaign_id = _create_campaign_with_turns(tmp_path, 8, repo)
+
+    def ids(rows: Any) -> list:
+        return [row["turn_id"] for row in rows]
+
+    assert ids(get_turn_history_page(repo, campaign_id, before=4, limit=10).turns) == [
+        "turn_0001",
+        "turn_0002",
+        "turn_0003",
+    ]
+    assert ids(iter_turn_history(repo, campaign_id, after=2, before=6)) == [
+        "turn_0003",
+        "turn_0004",
+        "turn_0005",
+    ]
+    assert ids(iter_turn_history(repo, campaign_id, after=5, before=9, reverse=True)) == [
+        "turn_0008",
+        "turn_0007",
+        "turn_0006",
+    ]
+    assert ids(iter_turn_history(repo, campaign_id, before=3, reverse=True)) == [
+        "turn_0002",
+        "turn_0001",
+    ]
+    assert ids(iter_turn_history(repo, campaign_id, before=20, reverse=True))[0] == "turn_0008"
+    assert ids(iter_turn_history(repo, campaign_id, after=3, before=4)) == []
+
+
+def test_turn_history_pages_seek_to_their_cursor(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    campaign_id = _create_campaign_with_turns(tmp_path, 40)
+    repo = FileRepo(tmp_path / "storage")
+    parsed = []
+    parse_row = file_repo_module._parse_row
+
+    def recording_parse_row(raw: bytes) -> Any:
+        payload = parse_row(raw)
+        parsed.append(payload["turn_id"] if payload else None)
+        return payload
+
+    monkeypatch.setattr(file_repo_module, "_parse_row", recording_parse_row)
+    backward = get_turn_history_page(repo, campaign_id, before=10, limit=3)
+    assert [row["turn_id"] for row in backward.turns] == ["turn_0007", "turn_0008", "turn_0009"]
+    # The page rows, the has_more probe and the v2 keyframe in row 1.
+    assert set(parsed) == {"turn_0001", "turn_0006", "turn_0007", "turn_0008", "turn_0009"}
+
+    parsed.clear()
+    forward = get_turn_history_page(repo, campaign_id, after=30, limit=3)
+    assert [row["turn_id"] for row in forward.turns] == ["turn_0031", "turn_0032", "turn_0033"]
+    assert set(parsed) == {"turn_0017", "turn_0031", "turn_0032", "turn_0033", "turn_0034"}
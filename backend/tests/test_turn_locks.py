@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+import backend.app.turn_service as turn_service_module
+from backend.app.turn_service import TurnService
+from backend.infra.campaign_turn_locks import (
+    TURN_LOCK_MODE_ENV,
+    CampaignBusyError,
+    CampaignTurnLockRegistry,
+    FileLockProvider,
+)
+from backend.infra.file_repo import CAMPAIGN_DURABILITY_ENV, FileRepo
+from backend.scripts.bench_turn_lock_workers import run_workers
+
+pytest.importorskip("fcntl")
+
+
+def test_sharded_registry_evicts_idle_campaigns_and_reports_hold_time() -> None:
+    registry = CampaignTurnLockRegistry(shards=4)
+    locks = [registry.acquire(f"camp_{index:04d}") for index in range(1, 9)]
+    assert registry.try_acquire("camp_0001") is None
+    time.sleep(0.002)
+    stats = registry.stats()
+    assert (stats["mode"], stats["shards"], stats["held"]) == ("process", 4, 8)
+    assert (stats["contended"], stats["rejected"]) == (1, 1)
+
+    for lock in locks:
+        registry.release(lock)
+    stats = registry.stats()
+    assert (stats["held"], stats["released"]) == (0, 8)
+    assert stats["hold_ms_max"] >= 2
+    assert stats["hold_ms_total"] >= stats["hold_ms_max"]
+    assert all(not shard.locks for shard in registry._shards)
+
+
+def test_file_mode_excludes_other_registries(tmp_path: Path) -> None:
+    repo = FileRepo(tmp_path)
+    lock_path = repo.turn_lock_path("camp_0001")
+    worker_a = CampaignTurnLockRegistry(mode="file")
+    worker_b = CampaignTurnLockRegistry(mode="file", queue_depth=1, wait_timeout=0.05)
+
+    held = worker_a.acquire("camp_0001", lock_path)
+    assert lock_path.exists()
+    assert worker_b.try_acquire("camp_0001", lock_path) is None
+    with pytest.raises(CampaignBusyError, match="timed out"):
+        worker_b.acquire("camp_0001", lock_path)
+    with pytest.raises(CampaignBusyError, match="already running"):
+        CampaignTurnLockRegistry(mode="file").acquire("camp_0001", lock_path)
+    # Giving up on the file lock also drops the in-process entry.
+    assert worker_b.stats()["held"] == 0
+
+    acquired = []
+
+    def queued_turn() -> None:
+        waiting = CampaignTurnLockRegistry(mode="file", queue_depth=1, wait_timeout=5.0)
+        lock = waiting.acquire("camp_0001", lock_path)
+        acquired.append(lock)
+        waiting.release(lock)
+
+    thread = threading.Thread(target=queued_turn)
+    thread.start()
+    time.sleep(0.05)
+    assert not acquired
+    worker_a.release(held)
+    thread.join(timeout=5)
+    assert len(acquired) == 1
+    assert worker_b.try_acquire("camp_0001", lock_path) is not None
+
+
+def test_lock_mode_is_validated(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv(TURN_LOCK_MODE_ENV, "file")
+    registry = CampaignTurnLockRegistry()
+    assert registry.stats()["mode"] == "file"
+    with pytest.raises(ValueError, match="lock path"):
+        registry.acquire("camp_0001")
+    assert registry.stats()["held"] == 0
+
+    monkeypatch.setenv(TURN_LOCK_MODE_ENV, "redis")
+    with pytest.raises(ValueError, match="unknown turn lock mode"):
+        CampaignTurnLockRegistry()
+
+
+@pytest.mark.parametrize("shared", [False, True])
+def test_worker_processes_lose_no_updates(tmp_path: Path, shared: bool) -> None:
+    result = run_workers(
+        tmp_path / "storage", 3, 15, hold_ms=1.0, shared=shared, lease_seconds=5.0
+    )
+    assert (result["failed_workers"], result["lost_updates"]) == (0, 0)
+    assert result["turns"] == 45
+
+
+def test_dead_holder_lease_is_recovered(tmp_path: Path) -> None:
+    lock_path = tmp_path / "camp_0001" / ".turn.lock"
+    crash = (
+        "import os, sys\n"
+        "from pathlib import Path\n"
+        "from backend.infra.campaign_turn_locks import FileLockProvider\n"
+        "assert FileLockProvider().try_lock('camp_0001', Path(sys.argv[1]))\n"
+        "os._exit(0)\n"
+    )
+    subprocess.run(
+        [sys.executable, "-c", crash, str(lock_path)],
+        check=True,
+        cwd=Path(__file__).resolve().parents[2],
+    )
+    assert json.loads(lock_path.read_text())["pid"] != os.getpid()
+
+    provider = FileLockProvider(lease_seconds=60)
+    lease = provider.try_lock("camp_0001", lock_path)
+    assert lease is not None
+    assert provider.stats()["leases_recovered"] == 1
+    provider.unlock(lease)
+    assert lock_path.read_bytes() == b""
+
+
+def test_remote_lease_blocks_until_expiry_and_heartbeat_renews(tmp_path: Path) -> None:
+    lock_path = tmp_path / ".turn.lock"
+    remote = {"token": "remote", "pid": 1, "host": "other-host"}
+    lock_path.write_text(json.dumps({**remote, "expires_at": time.time() + 60}))
+    provider = FileLockProvider(lease_seconds=0.15)
+    assert provider.try_lock("camp_0001", lock_path) is None
+    lock_path.write_text(json.dumps({**remote, "expires_at": time.time() - 1}))
+    lease = provider.try_lock("camp_0001", lock_path)
+    assert lease is not None
+
+    # Held past several lease periods: the heartbeat keeps others out.
+    time.sleep(0.4)
+    assert FileLockProvider(lease_seconds=0.15).try_lock("camp_0001", lock_path) is None
+    stats = provider.stats()
+    assert stats["leases_renewed"] >= 2
+    assert (stats["leases_recovered"], stats["leases_held"]) == (1, 1)
+    provider.unlock(lease)
+    assert provider.stats()["leases_lost"] == 0
+
+
+def test_lost_lease_fails_the_turn_before_it_writes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repo = FileRepo(tmp_path / "storage")
+    lock_path = repo.turn_lock_path("camp_0001")
+    takeover = {"token": "other", "pid": 1, "host": "other-host"}
+
+    class _StallingLLM:
+        # Another worker takes the campaign while this one waits on the LLM.
+        def generate(
+            self, system_prompt: str, user_input: str, debug_append: Any
+        ) -> Dict[str, Any]:
+            lock_path.write_text(json.dumps({**takeover, "expires_at": time.time() + 60}))
+            return {
+                "assistant_text": "You find a coin.",
+                "dialog_type": "scene_description",
+                "tool_calls": [
+                    {"id": "call_loot", "tool": "inventory_add", "args": {"item_id": "coin"}}
+                ],
+            }
+
+    monkeypatch.setattr(turn_service_module, "LLMClient", _StallingLLM)
+    monkeypatch.setattr(
+        turn_service_module, "_CAMPAIGN_TURN_LOCKS", CampaignTurnLockRegistry(mode="file")
+    )
+    service = TurnService(repo)
+    campaign_id = service.create_campaign("world_001", "map_001", ["pc_001"], "pc_001")
+    assert repo.turn_lock_path(campaign_id) == lock_path
+    revision = repo.get_campaign(campaign_id).revision
+
+    with pytest.raises(CampaignBusyError, match="lease was lost"):
+        service.submit_turn(campaign_id, "search the room")
+
+    assert repo.turn_log_row_count(campaign_id) == 0
+    campaign = repo.get_campaign(campaign_id)
+    assert (campaign.revision, campaign.actors["pc_001"].inventory) == (revision, {})
+    # The other worker's lease is left alone.
+    assert json.loads(lock_path.read_text())["token"] == "other"
+    assert turn_service_module._CAMPAIGN_TURN_LOCKS.stats()["leases_lost"] == 1
+
+
+def test_group_durability_is_rejected_with_file_locks(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv(TURN_LOCK_MODE_ENV, "file")
+    monkeypatch.setenv(CAMPAIGN_DURABILITY_ENV, "group")
+    with pytest.raises(ValueError, match="file turn locks"):
+        FileRepo(tmp_path / "storage")
+    monkeypatch.setenv(CAMPAIGN_DURABILITY_ENV, "fsync")
+    assert FileRepo(tmp_path / "storage").durability == "fsync"
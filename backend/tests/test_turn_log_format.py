@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+from backend.domain.models import (
+    ActorState,
+    AssistantStructured,
+    Campaign,
+    Goal,
+    Milestone,
+    Selected,
+    SettingsSnapshot,
+    StateSummary,
+    TurnLogEntry,
+)
+from backend.infra.campaign_cache import CampaignCache
+from backend.infra.file_repo import FileRepo
+from backend.infra.turn_log_codec import apply_summary_delta, summary_delta
+
+ACTORS = [f"pc_{index:03d}" for index in range(1, 7)]
+
+
+def _make_repo(tmp_path: Path, **kwargs: Any) -> FileRepo:
+    repo = FileRepo(tmp_path / "storage", campaign_cache=CampaignCache(), **kwargs)
+    if not repo.campaign_exists("camp_0001"):
+        repo.create_campaign(
+            Campaign(
+                id="camp_0001",
+                selected=Selected(
+                    world_id="world_001",
+                    map_id="map_001",
+                    party_character_ids=ACTORS,
+                    active_actor_id="pc_001",
+                ),
+                settings_snapshot=SettingsSnapshot(),
+                goal=Goal(text="Goal", status="active"),
+                milestone=Milestone(current="intro", last_advanced_turn=0),
+                actors={actor_id: ActorState(position=None, meta={}) for actor_id in ACTORS},
+            )
+        )
+    return repo
+
+
+def _summary(turn: int) -> StateSummary:
+    positions = {
+        actor_id: f"area_{(turn + index) // 5 % 4 + 1:03d}"
+        for index, actor_id in enumerate(ACTORS)
+    }
+    inventories: Dict[str, Dict[str, int]] = {actor_id: {} for actor_id in ACTORS}
+    inventories["pc_001"] = {"torch": 1, "herb": turn // 3}
+    return StateSummary(
+        active_actor_id="pc_001",
+        positions=positions,
+        positions_parent=dict(positions),
+        positions_child={actor_id: None for actor_id in ACTORS},
+        hp={actor_id: 10 - (turn // 7 if actor_id == "pc_002" else 0) for actor_id in ACTORS},
+        character_states={actor_id: "alive" for actor_id in ACTORS},
+        inventories=inventories,
+        objective="Retrieve supplies and stay alive.",
+        active_area_id=positions["pc_001"],
+        active_area_name="Area",
+        active_area_description="A quiet checkpoint lit by a flickering lantern.",
+        active_actor_inventory=dict(inventories["pc_001"]),
+    )
+
+
+def _entry(turn: int) -> TurnLogEntry:
+    return TurnLogEntry(
+        turn_id=f"turn_{turn:04d}",
+        timestamp="2026-03-03T00:00:00+00:00",
+        user_input=f"input {turn}",
+        dialog_type="scene_description",
+        dialog_type_source="model",
+        settings_revision=0,
+        assistant_text=f"text {turn}",
+        assistant_structured=AssistantStructured(tool_calls=[]),
+        state_summary=_summary(turn),
+    )
+
+
+def _expected_row(turn: int) -> Dict[str, Any]:
+    return _entry(turn).model_dump()
+
+
+def _append(repo: FileRepo, turns: range) -> None:
+    for turn in turns:
+        repo.append_turn_log("camp_0001", _entry(turn))
+
+
+def _raw_rows(tmp_path: Path) -> List[Dict[str, Any]]:
+    path = tmp_path / "storage" / "campaigns" / "camp_0001" / "turn_log.jsonl"
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line]
+
+
+def test_v2_log_writes_keyframes_and_deltas(tmp_path: Path) -> None:
+    repo = _make_repo(tmp_path, turn_log_format=2, turn_log_keyframe_interval=4)
+    _append(repo, range(1, 11))
+
+    raw = _raw_rows(tmp_path)
+    assert all(row["log_format"] == 2 for row in raw)
+    keyframes = [index + 1 for index, row in enumerate(raw) if "state_summary" in row]
+    assert keyframes[0] == 1
+    assert all(later - earlier <= 4 for earlier, later in zip(keyframes, keyframes[1:]))
+    assert "positions_parent" not in raw[0]["state_summary"]
+    for index, row in enumerate(raw, start=1):
+        if "state_summary_delta" in row:
+            key = row["state_summary_delta"]["key"]
+            assert key in keyframes and key < index
+
+    assert list(repo.iter_turn_log_rows("camp_0001")) == [
+        _expected_row(turn) for turn in range(1, 11)
+    ]
+    assert list(repo.iter_turn_log_rows("camp_0001", reverse=True)) == [
+        _expected_row(turn) for turn in range(10, 0, -1)
+    ]
+    assert repo.get_turn_state_summary("camp_0001", "turn_0007") == _expected_row(7)[
+        "state_summary"
+    ]
+    assert repo.get_turn_state_summary("camp_0001", "turn_0011") is None
+    slim = next(repo.iter_turn_log_rows("camp_0001", state_summary=False))
+    assert "state_summary" not in slim and "state_summary_delta" not in slim
+
+
+def test_log_format_is_sticky_per_log(tmp_path: Path) -> None:
+    legacy = _make_repo(tmp_path, turn_log_format=1)
+    _append(legacy, range(1, 3))
+    repo = _make_repo(tmp_path, turn_log_format=2)
+    _append(repo, range(3, 5))
+
+    raw = _raw_rows(tmp_path)
+    assert all("log_format" not in row for row in raw)
+    assert raw[3]["state_summary"] == _expected_row(4)["state_summary"]
+
+
+def test_convert_turn_log_roundtrips_and_shrinks(tmp_path: Path) -> None:
+    repo = _make_repo(tmp_path, turn_log_format=1)
+    _append(repo, range(1, 41))
+    path = tmp_path / "storage" / "campaigns" / "camp_0001" / "turn_log.jsonl"
+    with path.open("ab") as handle:
+        handle.write(b"{not json\n")
+    repo.append_turn_log("camp_0001", _entry(42))
+    before = list(repo.iter_turn_log_rows("camp_0001"))
+
+    result = repo.convert_turn_log("camp_0001", log_format=2, keyframe_interval=16)
+    assert result.row_count == 42
+    assert result.bytes_after < result.bytes_before
+    assert list(repo.iter_turn_log_rows("camp_0001")) == before
+    assert repo.next_turn_id("camp_0001") == "turn_0043"
+    assert repo.get_turn_log_row("camp_0001", "turn_0042") == _expected_row(42)
+
+    repo.append_turn_log("camp_0001", _entry(43))
+    assert _raw_rows_tail(path)["log_format"] == 2
+
+    back = repo.convert_turn_log("camp_0001", log_format=1)
+    assert back.row_count == 43
+    assert list(repo.iter_turn_log_rows("camp_0001")) == before + [_expected_row(43)]
+
+
+def _raw_rows_tail(path: Path) -> Dict[str, Any]:
+    return json.loads(path.read_text(encoding="utf-8").splitlines()[-1])
+
+
+def test_summary_delta_roundtrip() -> None:
+    base = {"positions": {"a": "x", "b": "y"}, "objective": "o", "hp": {"a": 3}}
+    target = {"positions": {"a": "z"}, "hp": {"a": 3, "c": 1}, "active_area_id": None}
+    delta = summary_delta(base, target)
+    assert apply_summary_delta(base, delta) == target
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+import backend.infra.file_repo as file_repo_module
+from backend.domain.models import (
+    ActorState,
+    AssistantStructured,
+    Campaign,
+    Goal,
+    Milestone,
+    Selected,
+    SettingsSnapshot,
+    StateSummary,
+    TurnLogEntry,
+)
+from backend.infra.file_repo import FileRepo
+
+
+def _make_repo(tmp_path: Path, campaign_id: str = "camp_0001") -> FileRepo:
+    repo = FileRepo(tmp_path / "storage")
+    repo.create_campaign(
+        Campaign(
+            id=campaign_id,
+            selected=Selected(
+                world_id="world_001",
+                map_id="map_001",
+                party_character_ids=["pc_001"],
+                active_actor_id="pc_001",
+            ),
+            settings_snapshot=SettingsSnapshot(),
+            goal=Goal(text="Goal", status="active"),
+            milestone=Milestone(current="intro", last_advanced_turn=0),
+            actors={"pc_001": ActorState(position=None, meta={})},
+        )
+    )
+    return repo
+
+
+def _entry(turn_id: str) -> TurnLogEntry:
+    return TurnLogEntry(
+        turn_id=turn_id,
+        timestamp="2026-03-03T00:00:00+00:00",
+        user_input=f"input {turn_id}",
+        dialog_type="scene_description",
+        dialog_type_source="model",
+        settings_revision=0,
+        assistant_text=f"text {turn_id}",
+        assistant_structured=AssistantStructured(tool_calls=[]),
+        state_summary=StateSummary(active_actor_id="pc_001"),
+    )
+
+
+def _append_turns(repo: FileRepo, count: int) -> None:
+    for _ in range(count):
+        repo.append_turn_log("camp_0001", _entry(repo.next_turn_id("camp_0001")))
+
+
+def _log_path(tmp_path: Path) -> Path:
+    return tmp_path / "storage" / "campaigns" / "camp_0001" / "turn_log.jsonl"
+
+
+def test_next_turn_id_and_recent_rows_follow_appends(tmp_path: Path) -> None:
+    repo = _make_repo(tmp_path)
+    assert repo.next_turn_id("camp_0001") == "turn_0001"
+
+    _append_turns(repo, 5)
+
+    assert repo.next_turn_id("camp_0001") == "turn_0006"
+    rows = repo.read_recent_turn_log_rows("camp_0001", limit=3)
+    assert [row["turn_id"] for row in rows] == ["turn_0005", "turn_0004", "turn_0003"]
+
+
+def test_index_rebuilds_after_log_edited_by_hand(tmp_path: Path) -> None:
+    repo = _make_repo(tmp_path)
+    _append_turns(repo, 4)
+
+    log_path = _log_path(tmp_path)
+    lines = log_path.read_text(encoding="utf-8").splitlines()
+    log_path.write_text("\n".join(lines[:2]) + "\n\n", encoding="utf-8")
+
+    assert repo.next_turn_id("camp_0001") == "turn_0003"
+    rows = repo.read_recent_turn_log_rows("camp_0001", limit=5)
+    assert [row["turn_id"] for row in rows] == ["turn_0002", "turn_0001"]
+
+
+def test_rebuild_with_repair_truncates_partial_trailing_row(tmp_path: Path) -> None:
+    repo = _make_repo(tmp_path)
+    _append_turns(repo, 2)
+
+    log_path = _log_path(tmp_path)
+    with log_path.open("a", encoding="utf-8") as handle:
+        handle.write('{"turn_id": "turn_0003", "user_in')
+
+    result = repo.rebuild_turn_log_index("camp_0001", repair=True)
+
+    assert result.row_count == 2
+    assert result.truncated_bytes > 0
+    _append_turns(repo, 1)
+    rows = [
+        json.loads(line)
+        for line in log_path.read_text(encoding="utf-8").splitlines()
+        if line.strip()
+    ]
+    assert [row["turn_id"] for row in rows] == ["turn_0001", "turn_0002", "turn_0003"]
+
+
+def test_iter_turn_log_rows_reverse_reads_across_small_blocks(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(file_repo_module, "TURN_LOG_REVERSE_BLOCK_BYTES", 7)
+    repo = _make_repo(tmp_path)
+    _append_turns(repo, 4)
+    with _log_path(tmp_path).open("a", encoding="utf-8") as handle:
+        handle.write("not json\n\n")
+
+    reverse_ids = [row["turn_id"] for row in repo.iter_turn_log_rows("camp_0001", reverse=True)]
+    forward_ids = [row["turn_id"] for row in repo.iter_turn_log_rows("camp_0001")]
+
+    assert reverse_ids == ["turn_0004", "turn_0003", "turn_0002", "turn_0001"]
+    assert forward_ids == list(reversed(reverse_ids))
+    assert [row["turn_id"] for row in repo.read_recent_turn_log_rows("camp_0001", limit=2)] == [
+        "turn_0004",
+        "turn_0003",
+    ]
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+import backend.app.turn_service as turn_service_module
+from backend.api.main import create_app
+from backend.app.turn_service import CampaignBusyError, CampaignTurnLockRegistry
+from backend.infra.file_repo import FileRepo
+
+
+def test_queued_acquire_is_fifo_and_evicts_idle_campaigns() -> None:
+    registry = CampaignTurnLockRegistry(queue_depth=3, wait_timeout=5.0)
+    order: List[int] = []
+    first = registry.acquire("camp_0001")
+
+    def wait_turn(index: int) -> None:
+        lock = registry.acquire("camp_0001")
+        order.append(index)
+        registry.release(lock)
+
+    threads = []
+    for index in range(3):
+        thread = threading.Thread(target=wait_turn, args=(index,))
+        thread.start()
+        threads.append(thread)
+        while registry.stats()["waiting"] < index + 1:
+            time.sleep(0.001)
+    with pytest.raises(CampaignBusyError, match="queue is full"):
+        registry.acquire("camp_0001")
+    registry.release(first)
+    for thread in threads:
+        thread.join(timeout=5)
+
+    stats = registry.stats()
+    assert order == [0, 1, 2]
+    assert (stats["held"], stats["waiting"]) == (0, 0)
+    assert (stats["acquired"], stats["queued"], stats["rejected"]) == (4, 3, 1)
+    assert stats["wait_ms_max"] > 0
+
+
+def test_queued_acquire_times_out_and_default_mode_rejects() -> None:
+    queued = CampaignTurnLockRegistry(queue_depth=1, wait_timeout=0.01)
+    lock = queued.acquire("camp_0001")
+    with pytest.raises(CampaignBusyError, match="timed out"):
+        queued.acquire("camp_0001")
+    queued.release(lock)
+    assert queued.stats()["timed_out"] == 1
+    assert queued.try_acquire("camp_0001") is not None
+
+    immediate = CampaignTurnLockRegistry(queue_depth=0)
+    lock = immediate.acquire("camp_0001")
+    with pytest.raises(CampaignBusyError, match="already running"):
+        immediate.acquire("camp_0001")
+    immediate.release(lock)
+
+
+def test_async_acquire_cancelled_waiter_leaves_queue() -> None:
+    registry = CampaignTurnLockRegistry(queue_depth=2, wait_timeout=5.0)
+
+    async def scenario() -> None:
+        lock = await registry.aacquire("camp_0001")
+        cancelled = asyncio.create_task(registry.aacquire("camp_0001"))
+        waiting = asyncio.create_task(registry.aacquire("camp_0001"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        registry.release(lock)
+        registry.release(await asyncio.wait_for(waiting, 1))
+
+    asyncio.run(scenario())
+    assert registry.stats()["held"] == 0
+
+
+class _GatedLLM:
+    gate: "asyncio.Event"
+    started: List[str] = []
+
+    async def agenerate(
+        self, system_prompt: str, user_input: str, debug_append: Any
+    ) -> Dict[str, Any]:
+        _GatedLLM.started.append(user_input)
+        if user_input == "first":
+            await _GatedLLM.gate.wait()
+        return {
+            "assistant_text": f"Turn: {user_input}",
+            "dialog_type": "scene_description",
+            "tool_calls": [],
+        }
+
+
+def test_concurrent_async_turns_queue_instead_of_conflicting(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(turn_service_module, "LLMClient", _GatedLLM)
+    registry = turn_service_module._CAMPAIGN_TURN_LOCKS
+    monkeypatch.setattr(registry, "queue_depth", 4)
+    monkeypatch.setattr(registry, "wait_timeout", 5.0)
+    repo = FileRepo(tmp_path / "storage")
+    service = turn_service_module.TurnService(repo)
+    campaign_id = service.create_campaign("world_001", "map_001", ["pc_001"], "pc_001")
+    _GatedLLM.started = []
+
+    async def scenario() -> List[Dict[str, object]]:
+        _GatedLLM.gate = asyncio.Event()
+        first = asyncio.create_task(service.asubmit_turn(campaign_id, "first"))
+        while _GatedLLM.started != ["first"]:
+            await asyncio.sleep(0.001)
+        second = asyncio.create_task(service.asubmit_turn(campaign_id, "second"))
+        await asyncio.sleep(0.05)
+        assert _GatedLLM.started == ["first"]
+        _GatedLLM.gate.set()
+        return [await first, await second]
+
+    responses = asyncio.run(scenario())
+
+    assert [response["narrative_text"] for response in responses] == [
+        "Turn: first",
+        "Turn: second",
+    ]
+    assert [row["turn_id"] for row in repo.iter_turn_log_rows(campaign_id)] == [
+        "turn_0001",
+        "turn_0002",
+    ]
+    assert registry.stats()["held"] == 0
+
+
+def test_turn_queue_stats_endpoint(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    client = TestClient(create_app())
+
+    response = client.get("/api/v1/chat/turn_queue/stats")
+
+    assert response.status_code == 200
+    assert {"queue_depth", "waiting", "wait_ms_total", "timed_out"} <= set(response.json())
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+import backend.app.turn_service as turn_service_module
+from backend.app.turn_replay import replay_turn_log, starter_campaign_for
+from backend.app.turn_service import TurnService
+from backend.infra.file_repo import FileRepo
+
+_SCRIPT: Dict[str, List[Dict[str, Any]]] = {
+    "go": [{"id": "call_go", "tool": "move", "args": {"actor_id": "pc_001", "to_area_id": "area_002"}}],
+    "loot": [{"id": "call_loot", "tool": "inventory_add", "args": {"item_id": "rope", "quantity": 2}}],
+    "hurt": [
+        {
+            "id": "call_hurt",
+            "tool": "hp_delta",
+            "args": {"target_character_id": "pc_001", "delta": -3, "cause": "trap"},
+        }
+    ],
+    "spawn": [
+        {"id": "call_spawn", "tool": "actor_spawn", "args": {"character_id": "char_knight"}}
+    ],
+    "look": [],
+}
+
+
+class _ScriptedLLM:
+    def generate(self, system_prompt: str, user_input: str, debug_append: Any) -> Dict[str, Any]:
+        return {
+            "assistant_text": f"Turn: {user_input}",
+            "dialog_type": "scene_description",
+            "tool_calls": _SCRIPT[user_input],
+        }
+
+
+def _play(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, inputs: List[str]) -> FileRepo:
+    monkeypatch.setattr(turn_service_module, "LLMClient", _ScriptedLLM)
+    repo = FileRepo(tmp_path / "storage")
+    service = TurnService(repo)
+    campaign_id = service.create_campaign("world_001", "map_001", ["pc_001"], "pc_001")
+    for user_input in inputs:
+        response = service.submit_turn(campaign_id, user_input)
+        assert response["applied_actions"] or not _SCRIPT[user_input]
+    return repo
+
+
+def test_replay_rebuilds_campaign_state_from_turn_log(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repo = _play(tmp_path, monkeypatch, ["look", "go", "loot", "hurt", "spawn", "loot"])
+    saved = repo.get_campaign("camp_0001")
+
+    result = replay_turn_log(repo, "camp_0001", starter_campaign_for(repo, saved))
+
+    assert result.divergence is None
+    assert result.turns_replayed == 6
+    assert result.tool_calls_replayed == 5
+    rebuilt = result.campaign
+    assert rebuilt.actors["pc_001"].position == "area_002"
+    assert rebuilt.actors["pc_001"].inventory == {"rope": 4}
+    assert rebuilt.actors["pc_001"].hp == saved.actors["pc_001"].hp
+    assert sorted(rebuilt.actors) == sorted(saved.actors)
+    assert rebuilt.milestone == saved.milestone
+
+
+def test_replay_reports_first_divergence(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repo = _play(tmp_path, monkeypatch, ["look", "go", "loot", "hurt"])
+    base = starter_campaign_for(repo, repo.get_campaign("camp_0001"))
+    # The area the move targets is missing, so the move is rejected in replay.
+    base.map.areas["area_001"].reachable_area_ids = []
+
+    result = replay_turn_log(repo, "camp_0001", base)
+
+    divergence = result.divergence
+    assert divergence is not None
+    assert (divergence.turn_id, divergence.row_number) == ("turn_0002", 2)
+    assert divergence.fields[0] == "applied_actions"
+    assert divergence.expected["applied_actions"] == ["move"]
+    assert divergence.actual["applied_actions"] == []
+    assert divergence.expected["positions"] == {"pc_001": "area_002"}
+    assert result.turns_replayed == 2
+
+    kept_going = replay_turn_log(
+        repo,
+        "camp_0001",
+        starter_campaign_for(repo, repo.get_campaign("camp_0001")),
+        stop_on_divergence=False,
+    )
+    assert kept_going.divergence is None and kept_going.turns_replayed == 4
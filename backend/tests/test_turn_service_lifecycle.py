@@ -18,6 +18,7 @@ from backend.domain.models import (
     SettingsSnapshot,
 )
 from backend.infra.file_repo import FileRepo
+from backend.infra.llm_client import PROMPT_BYTE_STATS, LLMClient, LLMConfig, SystemPrompt
 
 
 class _StubLLM:
@@ -301,3 +302,103 @@ def test_turn_profile_trace_debug_gated_by_setting(
         ).encode("utf-8")
     ).hexdigest()
     assert debug["used_profile_hash"] == expected_hash
+    prompt_bytes = debug["prompt_bytes"]
+    assert prompt_bytes["attempts"] == 1
+    assert prompt_bytes["static_bytes"] == len(
+        service.llm.system_prompt.prefix.encode("utf-8")
+    )
+    assert prompt_bytes["dynamic_bytes"] > 0
+
+
+def test_system_prompt_prefix_is_static_across_turns(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    service, repo = _make_service(tmp_path, monkeypatch)
+    llm = service.llm
+    _create_campaign(repo, "camp_0009")
+    _create_campaign(repo, "camp_0010", party_ids=["pc_001", "pc_002"])
+
+    service.submit_turn("camp_0009", "hello")
+    first = llm.system_prompt
+    service.submit_turn("camp_0010", "hello", actor_id="pc_002")
+    second = llm.system_prompt
+
+    assert isinstance(first, SystemPrompt)
+    assert first.prefix is second.prefix
+    assert first.context != second.context
+    assert str(first) == f"{first.prefix} {first.context}"
+    assert _extract_prompt_context(second)["effective_actor_id"] == "pc_002"
+
+    client = LLMClient(
+        LLMConfig(
+            base_url="http://127.0.0.1:9",
+            api_key="k",
+            model="m",
+            temperature=0.0,
+            timeout_sec=1,
+        )
+    )
+    PROMPT_BYTE_STATS.reset()
+    messages = client._build_payload(second, "look", None)["messages"]
+    assert messages[0] == {"role": "system", "content": second.prefix}
+    assert messages[1] == {"role": "system", "content": second.context}
+    stats = PROMPT_BYTE_STATS.snapshot()
+    assert stats["requests"] == 1
+    assert stats["static_bytes"] == len(second.prefix.encode("utf-8"))
+
+
+def test_state_summary_is_built_once_per_distinct_state(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    service, repo = _make_service(tmp_path, monkeypatch)
+    campaign = _create_campaign(repo, "camp_0011")
+    campaign.settings_snapshot.dialog.conflict_text_checks_enabled = True
+    repo.save_campaign(campaign)
+    summaries = []
+    original = turn_service_module._state_summary_dict
+
+    def counting_summary(*args: Any, **kwargs: Any) -> Dict[str, Any]:
+        summary = original(*args, **kwargs)
+        summaries.append(
+            (summary["positions"]["pc_001"], summary["active_actor_inventory"].get("torch", 0))
+        )
+        return summary
+
+    monkeypatch.setattr(turn_service_module, "_state_summary_dict", counting_summary)
+    move = {
+        "id": "call_move",
+        "tool": "move",
+        "args": {"actor_id": "pc_001", "to_area_id": "area_002"},
+    }
+    service.llm = _StubLLM(
+        {
+            "assistant_text": "You step aside.",
+            "dialog_type": "scene_description",
+            "tool_calls": [move],
+        }
+    )
+
+    result = service.submit_turn("camp_0011", "move")
+
+    assert summaries == [("area_001", 0), ("area_002", 0)]
+    entry = repo.read_recent_turn_log_rows("camp_0011", 1)[0]
+    assert result["state_summary"] == entry["state_summary"]
+    assert result["state_summary"]["positions"] == {"pc_001": "area_002"}
+
+    summaries.clear()
+    service.llm = _StubLLM(
+        {
+            "assistant_text": "We change the rules.",
+            "dialog_type": "scene_description",
+            "tool_calls": [
+                {"id": "call_loot", "tool": "inventory_add", "args": {"item_id": "torch"}}
+            ],
+        }
+    )
+    failed = service.submit_turn("camp_0011", "loot")
+
+    # The pre-turn summary is reused for the debug appends and, after the last
+    # rollback, for the failure response.
+    assert summaries == [("area_002", 0), ("area_002", 1), ("area_002", 1), ("area_002", 1)]
+    assert failed["conflict_report"]["retries"] == 2
+    assert failed["state_summary"]["active_actor_inventory"] == {}
@@ -1,14 +1,18 @@
 from __future__ import annotations
 
-from backend.app.turn_service import _restore_state, _snapshot_state
+from backend.app.tool_executor import execute_tool_calls
+from backend.domain.campaign_undo import CampaignUndoLog
 from backend.domain.character_access import CharacterState, create_character_facade
 from backend.domain.models import (
     ActorState,
     Campaign,
     Goal,
+    MapArea,
+    MapData,
     Milestone,
     Selected,
     SettingsSnapshot,
+    ToolCall,
 )
 
 
@@ -35,22 +39,86 @@ def _make_campaign() -> Campaign:
     )
 
 
-def test_snapshot_restore_reverts_legacy_mirrors_and_actor_state() -> None:
+def test_undo_log_reverts_legacy_mirrors_and_actor_state() -> None:
     campaign = _make_campaign()
     facade = create_character_facade()
 
-    snapshot = _snapshot_state(campaign)
+    undo_log = CampaignUndoLog(campaign)
+    undo_log.record_actor("pc_001")
     facade.set_state(
         campaign,
         "pc_001",
         CharacterState(position="area_002", hp=4, character_state="dying"),
     )
 
-    _restore_state(campaign, snapshot)
+    undo_log.rollback()
 
     assert campaign.actors["pc_001"].position == "area_001"
     assert campaign.actors["pc_001"].hp == 10
     assert campaign.actors["pc_001"].character_state == "alive"
-    assert campaign.positions["pc_001"] == "area_001"
-    assert campaign.hp["pc_001"] == 10
-    assert campaign.character_states["pc_001"] == "alive"
+    # Mirrors the facade filled in are removed again, not left at new values.
+    assert "pc_001" not in campaign.positions
+    assert "pc_001" not in campaign.hp
+    assert "pc_001" not in campaign.character_states
+    assert "pc_001" not in campaign.state.positions
+
+
+def test_undo_log_reverts_map_generate_and_actor_spawn() -> None:
+    campaign = _make_campaign()
+    campaign.map = MapData(
+        areas={"area_001": MapArea(id="area_001", name="Start")}, connections=[]
+    )
+    map_before = campaign.map.model_dump()
+    undo_log = CampaignUndoLog(campaign)
+
+    applied, feedback = execute_tool_calls(
+        campaign,
+        "pc_001",
+        [
+            ToolCall(
+                id="call_001",
+                tool="map_generate",
+                args={"parent_area_id": "area_001", "constraints": {"size": 3}},
+                reason="expand",
+            ),
+            ToolCall(
+                id="call_002",
+                tool="actor_spawn",
+                args={"character_id": "char_knight"},
+                reason="spawn",
+            ),
+            ToolCall(
+                id="call_003",
+                tool="inventory_add",
+                args={"actor_id": "pc_001", "item_id": "torch"},
+                reason="loot",
+            ),
+        ],
+        undo_log=undo_log,
+    )
+    assert [action.tool for action in applied] == [
+        "map_generate",
+        "actor_spawn",
+        "inventory_add",
+    ], feedback
+    assert len(campaign.map.areas) > 1 and len(campaign.actors) == 2
+
+    undo_log.rollback()
+
+    assert campaign.map.model_dump() == map_before
+    assert list(campaign.actors) == ["pc_001"]
+    assert campaign.actors["pc_001"].inventory == {}
+    assert campaign.positions == {}
+
+
+def test_untouched_fields_are_not_copied() -> None:
+    campaign = _make_campaign()
+    map_before = campaign.map
+    undo_log = CampaignUndoLog(campaign)
+    undo_log.record_actor("pc_001")
+    campaign.actors["pc_001"].hp = 3
+
+    undo_log.rollback()
+
+    assert campaign.map is map_before
+    assert campaign.actors["pc_001"].hp == 10
@@ -59,3 +59,30 @@ export async function getMapView(baseUrl, campaignId, actorId = null) {
   }
   return request(baseUrl, `/api/v1/map/view?${params.toString()}`);
 }
+
+export async function listCampaignTurns(baseUrl, campaignId, options = {}) {
+  if (!campaignId) {
+    return {
+      ok: false,
+      status: 400,
+      data: null,
+      text: "campaign_id is required",
+    };
+  }
+  const params = new URLSearchParams();
+  if (options.before) {
+    params.set("before", options.before);
+  }
+  if (options.after) {
+    params.set("after", options.after);
+  }
+  if (options.limit) {
+    params.set("limit", String(options.limit));
+  }
+  if (Array.isArray(options.fields) && options.fields.length > 0) {
+    params.set("fields", options.fields.join(","));
+  }
+  const query = params.toString();
+  const path = `/api/v1/campaign/${encodeURIComponent(campaignId)}/turns`;
+  return request(baseUrl, query ? `${path}?${query}` : path);
+}
@@ -1,6 +1,52 @@
 import { renderDeltaLines } from "../renderers/delta_renderer.js";
 
-export function renderLogPanel(body, state) {
+function renderCampaignHistory(body, state, context) {
+  const history = state.campaignHistory;
+  if (!state.campaignId || !history || !context?.loadEarlierTurns) {
+    return;
+  }
+
+  const section = document.createElement("div");
+  section.className = "log-history";
+
+  if (!history.loaded || history.hasMore) {
+    const loadButton = document.createElement("button");
+    loadButton.className = "ghost";
+    loadButton.textContent = history.loaded ? "Load earlier turns" : "Load campaign history";
+    loadButton.addEventListener("click", context.loadEarlierTurns);
+    section.appendChild(loadButton);
+  }
+
+  for (const turn of history.turns) {
+    const item = document.createElement("article");
+    item.className = "log-item";
+
+    const head = document.createElement("div");
+    head.className = "log-head";
+    const identity = document.createElement("strong");
+    identity.textContent = turn.turn_id;
+    const status = document.createElement("span");
+    status.className = "log-status";
+    const actionCount = Array.isArray(turn.applied_actions) ? turn.applied_actions.length : 0;
+    status.textContent = `${actionCount} actions`;
+    head.appendChild(identity);
+    head.appendChild(status);
+
+    const narrative = document.createElement("p");
+    narrative.className = "log-narrative";
+    narrative.textContent = turn.assistant_text || "(empty)";
+
+    item.appendChild(head);
+    item.appendChild(narrative);
+    section.appendChild(item);
+  }
+
+  body.appendChild(section);
+}
+
+export function renderLogPanel(body, state, context) {
+  renderCampaignHistory(body, state, context);
+
   if (!Array.isArray(state.turnHistory) || state.turnHistory.length === 0) {
     const empty = document.createElement("div");
     empty.className = "note";
@@ -1,7 +1,8 @@
-import { createCampaign, getMapView, listCampaigns } from "./api/api.js";
+import { createCampaign, getMapView, listCampaignTurns, listCampaigns } from "./api/api.js";
 import {
   getState,
   initializeStore,
+  prependCampaignHistory,
   setBaseUrl,
   setCampaignId,
   setCampaignOptions,
@@ -40,6 +41,26 @@ async function refreshMapView(campaignId, actorId = null) {
   }
 }
 
+const HISTORY_PAGE_SIZE = 20;
+const HISTORY_FIELDS = ["turn_id", "assistant_text", "applied_actions"];
+
+async function loadEarlierTurns() {
+  const state = getState();
+  if (!state.campaignId) {
+    return;
+  }
+  const result = await listCampaignTurns(state.baseUrl, state.campaignId, {
+    before: state.campaignHistory.nextBefore,
+    limit: HISTORY_PAGE_SIZE,
+    fields: HISTORY_FIELDS,
+  });
+  if (!result.ok || !result.data) {
+    setStatus(`Failed to load turn history (${result.status}).`);
+    return;
+  }
+  prependCampaignHistory(result.data);
+}
+
 async function refreshCampaigns() {
   const state = getState();
   const result = await listCampaigns(state.baseUrl);
@@ -147,6 +168,7 @@ function mountPlayPanels() {
     createCampaign: createCampaignAndRefresh,
     setPartyActors,
     setPartyFromSummary,
+    loadEarlierTurns,
   };
 
   const render = () => {
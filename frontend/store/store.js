@@ -14,6 +14,12 @@ const state = {
   stateSummary: null,
   mapView: null,
   turnHistory: [],
+  campaignHistory: {
+    turns: [],
+    nextBefore: null,
+    hasMore: false,
+    loaded: false,
+  },
   debug: {
     requestText: "",
     responseText: "",
@@ -74,6 +80,32 @@ export function setCampaignOptions(campaigns) {
 
 export function setCampaignId(campaignId) {
   state.campaignId = campaignId || null;
+  resetCampaignHistoryState();
+  emit();
+}
+
+function resetCampaignHistoryState() {
+  state.campaignHistory = {
+    turns: [],
+    nextBefore: null,
+    hasMore: false,
+    loaded: false,
+  };
+}
+
+export function resetCampaignHistory() {
+  resetCampaignHistoryState();
+  emit();
+}
+
+export function prependCampaignHistory(page) {
+  const turns = Array.isArray(page?.turns) ? page.turns : [];
+  state.campaignHistory = {
+    turns: [...turns, ...state.campaignHistory.turns],
+    nextBefore: page?.next_before || state.campaignHistory.nextBefore,
+    hasMore: Boolean(page?.has_more),
+    loaded: true,
+  };
   emit();
 }
 